@@ -43,6 +43,10 @@ class DefaultSampler(Sampler):
             processes in the distributed group. Defaults to None.
         round_up (bool): Whether to add extra samples to make the number of
             samples evenly divisible by the world size. Defaults to True.
+
+    The sampler can be resumed in the middle of an epoch with
+    :meth:`load_state_dict`, which makes the next iteration start after the
+    samples consumed before the checkpoint.
     """
 
     def __init__(self,
@@ -61,6 +65,8 @@ class DefaultSampler(Sampler):
         self.seed = seed
         self.epoch = 0
         self.round_up = round_up
+        # the number of samples of this rank skipped by the next iteration
+        self._start_index = 0
 
         if self.round_up:
             self.num_samples = math.ceil(len(self.dataset) / world_size)
@@ -89,7 +95,9 @@ class DefaultSampler(Sampler):
         # subsample
         indices = indices[self.rank:self.total_size:self.world_size]
 
-        return iter(indices)
+        # skip the samples consumed before resuming, only once
+        start_index, self._start_index = self._start_index, 0
+        return iter(indices[start_index:])
 
     def __len__(self) -> int:
         """The number of samples in this rank."""
@@ -107,6 +115,32 @@ class DefaultSampler(Sampler):
         """
         self.epoch = epoch
 
+    def state_dict(self) -> dict:
+        """The state of the sampler, which is the same for all ranks.
+
+        Returns:
+            dict: The seed, the epoch and the world size.
+        """
+        return dict(
+            seed=self.seed, epoch=self.epoch, world_size=self.world_size)
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        """Load the state of :meth:`state_dict`.
+
+        If ``state_dict`` has ``num_consumed``, the number of samples per rank
+        consumed in the epoch, the next iteration starts after them. It is
+        scaled if the world size changed, in which case the ranks start from
+        the same position of the epoch but a few samples may be repeated.
+
+        Args:
+            state_dict (dict): The state of the sampler.
+        """
+        self.seed = state_dict['seed']
+        self.epoch = state_dict['epoch']
+        num_consumed = state_dict.get('num_consumed', 0) * state_dict.get(
+            'world_size', self.world_size) // self.world_size
+        self._start_index = min(num_consumed, self.num_samples)
+
 
 @DATA_SAMPLERS.register_module()
 class InfiniteSampler(Sampler):
@@ -121,6 +155,10 @@ class InfiniteSampler(Sampler):
         shuffle (bool): Whether shuffle the dataset or not. Defaults to True.
         seed (int, optional): Random seed. If None, set a random seed.
             Defaults to None.
+
+    Every pass over the dataset is shuffled with its own seed, so that the
+    sampler can be resumed at any position with :meth:`load_state_dict`
+    without drawing the permutations of the previous passes.
     """  # noqa: W605
 
     def __init__(self,
@@ -141,21 +179,26 @@ class InfiniteSampler(Sampler):
         self.size = len(dataset)
         self.indices = self._indices_of_rank()
 
-    def _infinite_indices(self) -> Iterator[int]:
-        """Infinitely yield a sequence of indices."""
+    def _infinite_indices(self, start: int = 0) -> Iterator[int]:
+        """Infinitely yield a sequence of indices, from the ``start``-th
+        index of all ranks."""
+        epoch, offset = divmod(start, self.size)
         g = torch.Generator()
-        g.manual_seed(self.seed)
         while True:
             if self.shuffle:
-                yield from torch.randperm(self.size, generator=g).tolist()
-
+                g.manual_seed(self.seed + epoch)
+                indices = torch.randperm(self.size, generator=g)
             else:
-                yield from torch.arange(self.size).tolist()
+                indices = torch.arange(self.size)
+            yield from indices[offset:].tolist()
+            epoch, offset = epoch + 1, 0
 
-    def _indices_of_rank(self) -> Iterator[int]:
-        """Slice the infinite indices by rank."""
-        yield from itertools.islice(self._infinite_indices(), self.rank, None,
-                                    self.world_size)
+    def _indices_of_rank(self, num_consumed: int = 0) -> Iterator[int]:
+        """Slice the infinite indices by rank, after the first
+        ``num_consumed`` indices of the rank."""
+        start = self.rank + num_consumed * self.world_size
+        yield from itertools.islice(
+            self._infinite_indices(start), 0, None, self.world_size)
 
     def __iter__(self) -> Iterator[int]:
         """Iterate the indices."""
@@ -168,3 +211,26 @@ class InfiniteSampler(Sampler):
     def set_epoch(self, epoch: int) -> None:
         """Not supported in iteration-based runner."""
         pass
+
+    def state_dict(self) -> dict:
+        """The state of the sampler, which is the same for all ranks.
+
+        Returns:
+            dict: The seed, the epoch and the world size.
+        """
+        return dict(seed=self.seed, epoch=0, world_size=self.world_size)
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        """Load the state of :meth:`state_dict`.
+
+        If ``state_dict`` has ``num_consumed``, the number of samples
+        consumed per rank, the indices continue after them. It is scaled if
+        the world size changed.
+
+        Args:
+            state_dict (dict): The state of the sampler.
+        """
+        self.seed = state_dict['seed']
+        num_consumed = state_dict.get('num_consumed', 0) * state_dict.get(
+            'world_size', self.world_size) // self.world_size
+        self.indices = self._indices_of_rank(num_consumed)
@@ -6,7 +6,7 @@
 
 import random
 import warnings
-from typing import Any, Mapping, Sequence
+from typing import Any, List, Mapping, Optional, Sequence
 
 import numpy as np
 import torch
@@ -168,3 +168,113 @@ def default_collate(data_batch: Sequence) -> Any:
         })
     else:
         return torch_default_collate(data_batch)
+
+
+# the shared memory slots of the batches collated by this dataloader worker
+_shared_slots: List[Optional[torch.Tensor]] = []
+_num_shared_batches = 0
+# the offsets of the tensors in a slot are aligned to a cache line
+_SLOT_ALIGNMENT = 64
+
+
+def _map_tensors(data: Any, func) -> Any:
+    """Apply ``func`` to the tensors in ``data`` in a fixed order, including
+    the data fields of data elements, which are updated in place."""
+    if isinstance(data, torch.Tensor):
+        return func(data)
+    elif isinstance(data, BaseDataElement):
+        for key in data.keys():
+            setattr(data, key, _map_tensors(getattr(data, key), func))
+        return data
+    elif isinstance(data, tuple) and hasattr(data, '_fields'):
+        # named tuple
+        return type(data)(*(_map_tensors(item, func) for item in data))
+    elif isinstance(data, (list, tuple)):
+        return type(data)(_map_tensors(item, func) for item in data)
+    elif isinstance(data, Mapping):
+        return type(data)(
+            {key: _map_tensors(value, func)
+             for key, value in data.items()})
+    return data
+
+
+def _aligned_nbytes(tensor: torch.Tensor) -> int:
+    nbytes = tensor.numel() * tensor.element_size()
+    return -(-nbytes // _SLOT_ALIGNMENT) * _SLOT_ALIGNMENT
+
+
+@FUNCTIONS.register_module()
+def shared_memory_collate(data_batch: Sequence, num_slots: int = 4) -> Any:
+    """Collate like :func:`pseudo_collate`, with the tensors of the batch
+    written into a shared memory slot reused by the dataloader worker.
+
+    By default, every tensor returned by a worker is moved to a new shared
+    memory segment when it is sent to the main process, which maps it and
+    copies it again when pinning. Here every worker allocates ``num_slots``
+    shared memory buffers once and cycles through them: the tensors of a
+    batch are copied into the next slot, so the main process receives views
+    of a buffer it has already mapped, i.e. only the handle of the slot and
+    the offsets and shapes of the tensors. Combined with
+    :class:`SharedMemoryPinHook`, the slots are also pinned once, instead of
+    every batch being copied to pinned memory by ``pin_memory=True``.
+
+    A slot is overwritten ``num_slots`` batches of the same worker later, so
+    the tensors of a batch must not be used after the batches that follow
+    it are requested, and ``num_slots`` must be at least
+    ``prefetch_factor + 2`` of the dataloader. The runner holds to this as
+    it synchronizes with the device every iteration to log the losses. In
+    the main process, i.e. with ``num_workers=0``, this is
+    :func:`pseudo_collate`.
+
+    Example:
+        >>> train_dataloader = dict(
+        >>>     num_workers=8,
+        >>>     pin_memory=False,
+        >>>     collate_fn=dict(type='shared_memory_collate', num_slots=4),
+        >>>     ...)
+        >>> custom_hooks = [dict(type='SharedMemoryPinHook')]
+
+    Args:
+        data_batch (Sequence): Batch of data from dataloader.
+        num_slots (int): The number of shared memory slots of every worker.
+            Defaults to 4.
+
+    Returns:
+        Any: The batch in the format of :func:`pseudo_collate`.
+    """
+    global _num_shared_batches
+    data_batch = pseudo_collate(data_batch)
+    if torch.utils.data.get_worker_info() is None:
+        return data_batch
+
+    nbytes = 0
+
+    def count(tensor):
+        nonlocal nbytes
+        nbytes += _aligned_nbytes(tensor)
+        return tensor
+
+    _map_tensors(data_batch, count)
+
+    index = _num_shared_batches % num_slots
+    _num_shared_batches += 1
+    if len(_shared_slots) < num_slots:
+        _shared_slots.extend([None] * (num_slots - len(_shared_slots)))
+    slot = _shared_slots[index]
+    if slot is None or slot.numel() < nbytes:
+        # allocated once for fixed-shape samples, grown for larger batches
+        slot = torch.empty(nbytes, dtype=torch.uint8).share_memory_()
+        _shared_slots[index] = slot
+
+    offset = 0
+
+    def copy_to_slot(tensor):
+        nonlocal offset
+        size = tensor.numel() * tensor.element_size()
+        view = slot[offset:offset + size].view(tensor.dtype).view(
+            tensor.shape)
+        view.copy_(tensor)
+        offset += _aligned_nbytes(tensor)
+        return view
+
+    return _map_tensors(data_batch, copy_to_slot)
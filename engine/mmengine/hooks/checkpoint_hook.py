@@ -13,8 +13,8 @@ from math import inf
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Sequence, Union
 
-from mmengine.dist import is_main_process, master_only
-from mmengine.fileio import FileClient, get_file_backend
+from mmengine.dist import barrier, is_main_process, master_only
+from mmengine.fileio import FileClient, LocalBackend, get_file_backend
 from mmengine.logging import print_log
 from mmengine.registry import HOOKS
 from mmengine.utils import is_list_of, is_seq_of
@@ -101,6 +101,19 @@ class CheckpointHook(Hook):
             at which checkpoint saving begins. Defaults to 0, which means
             saving at the beginning.
             `New in version 0.8.3.`
+        async_save (bool): Whether to snapshot the tensors to host memory
+            and write the periodic checkpoints in a background thread, so
+            that training continues while the checkpoint is written. The
+            checkpoint is written to a temporary file and renamed, and
+            ``last_checkpoint`` is only updated after that. Only local
+            ``out_dir`` is supported. Defaults to False.
+        shard_per_rank (bool): Whether every rank writes a part of the
+            tensors of the periodic checkpoints to
+            ``{filename}/rank_{rank}-of-{world_size}.pth``. The shards are
+            merged when the checkpoint directory is loaded.
+            ``last_checkpoint`` is only updated once all the ranks wrote
+            their shards, i.e. at the next checkpoint or after training with
+            ``async_save``. Defaults to False.
 
     Examples:
         >>> # Save best based on single metric
@@ -150,6 +163,8 @@ class CheckpointHook(Hook):
                  backend_args: Optional[dict] = None,
                  published_keys: Union[str, List[str], None] = None,
                  save_begin: int = 0,
+                 async_save: bool = False,
+                 shard_per_rank: bool = False,
                  **kwargs) -> None:
         self.interval = interval
         self.by_epoch = by_epoch
@@ -174,6 +189,15 @@ class CheckpointHook(Hook):
         self.file_client_args = file_client_args
         self.backend_args = backend_args
 
+        self.async_saver = None
+        if async_save:
+            from mmengine.runner.checkpoint import AsyncCheckpointSaver
+            self.async_saver = AsyncCheckpointSaver()
+        self.shard_per_rank = shard_per_rank
+        # the `last_checkpoint` file and the sharded checkpoint it points to,
+        # written once the shards of all the ranks are complete
+        self._pending_last_ckpt: Optional[tuple] = None
+
         if filename_tmpl is None:
             if self.by_epoch:
                 self.filename_tmpl = 'epoch_{}.pth'
@@ -284,6 +308,12 @@ class CheckpointHook(Hook):
         else:
             self.file_backend = self.file_client
 
+        if (self.async_saver is not None or self.shard_per_rank) and \
+                not isinstance(self.file_backend, LocalBackend):
+            raise ValueError(
+                '`async_save` and `shard_per_rank` only support saving '
+                f'checkpoints to a local out_dir, but got {self.out_dir}')
+
         # if `self.out_dir` is not equal to `runner.work_dir`, it means that
         # `self.out_dir` is set so the final `self.out_dir` is the
         # concatenation of `self.out_dir` and the last level directory of
@@ -371,6 +401,10 @@ class CheckpointHook(Hook):
         Args:
             runner (Runner): The runner of the training process.
         """
+        if self.async_saver is not None:
+            self.async_saver.wait()
+        self._write_pending_last_checkpoint()
+
         if self.published_keys is None:
             return
 
@@ -415,7 +449,28 @@ class CheckpointHook(Hook):
             f'{final_path}.',
             logger='current')
 
+    def _write_pending_last_checkpoint(self) -> None:
+        """Point ``last_checkpoint`` to the pending sharded checkpoint once
+        the shards of all the ranks are written.
+
+        Every rank must call this after its shard is written, on the main
+        thread, since it synchronizes the ranks.
+        """
+        if self._pending_last_ckpt is None:
+            return
+        save_file, last_ckpt = self._pending_last_ckpt
+        self._pending_last_ckpt = None
+        barrier()
+        if is_main_process():
+            with open(save_file, 'w') as f:
+                f.write(last_ckpt)
+
     def _save_checkpoint_with_step(self, runner, step, meta):
+        # finish the pending write before removing or rewriting checkpoints
+        if self.async_saver is not None:
+            self.async_saver.wait()
+        self._write_pending_last_checkpoint()
+
         # remove other checkpoints before save checkpoint to make the
         # self.keep_ckpt_ids are saved as expected
         if self.max_keep_ckpts > 0:
@@ -445,6 +500,24 @@ class CheckpointHook(Hook):
                                                      ckpt_filename)
         runner.message_hub.update_info('last_ckpt', self.last_ckpt)
 
+        save_file = osp.join(runner.work_dir, 'last_checkpoint')
+        last_ckpt = self.last_ckpt
+
+        def write_last_checkpoint():
+            with open(save_file, 'w') as f:
+                f.write(last_ckpt)  # type: ignore
+
+        save_kwargs = dict()
+        if self.async_saver is not None or self.shard_per_rank:
+            # `last_checkpoint` must only point to a completely written file.
+            # The shards are complete once all the ranks wrote theirs, which
+            # needs a barrier on the main thread instead of the callback.
+            save_kwargs = dict(
+                async_saver=self.async_saver,
+                shard_per_rank=self.shard_per_rank,
+                callback=write_last_checkpoint if is_main_process()
+                and not self.shard_per_rank else None)
+
         runner.save_checkpoint(
             self.out_dir,
             ckpt_filename,
@@ -454,16 +527,20 @@ class CheckpointHook(Hook):
             meta=meta,
             by_epoch=self.by_epoch,
             backend_args=self.backend_args,
+            **save_kwargs,
             **self.args)
 
+        if self.shard_per_rank:
+            self._pending_last_ckpt = (save_file, last_ckpt)
+            if self.async_saver is None:
+                self._write_pending_last_checkpoint()
+
         # Model parallel-like training should involve pulling sharded states
         # from all ranks, but skip the following procedure.
-        if not is_main_process():
+        if save_kwargs or not is_main_process():
             return
 
-        save_file = osp.join(runner.work_dir, 'last_checkpoint')
-        with open(save_file, 'w') as f:
-            f.write(self.last_ckpt)  # type: ignore
+        write_last_checkpoint()
 
     def _save_checkpoint(self, runner) -> None:
         """Save the current checkpoint and delete outdated checkpoint.
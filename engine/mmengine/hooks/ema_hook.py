@@ -65,6 +65,8 @@ class EMAHook(Hook):
         # If `begin_epoch` and `begin_iter` are not set, `EMAHook` will be
         # enabled at 0 iteration.
         self.enabled_by_epoch = self.begin_epoch > 0
+        # the source tensors while the ema parameters are swapped in
+        self._src_data: Optional[list] = None
 
     def before_run(self, runner) -> None:
         """Create an ema copy of the model.
@@ -113,6 +115,7 @@ class EMAHook(Hook):
         if self._ema_started(runner):
             self.ema_model.update_parameters(self.src_model)
         else:
+            self.ema_model.sync()
             ema_params = self.ema_model.module.state_dict()
             src_params = self.src_model.state_dict()
             for k, p in ema_params.items():
@@ -167,6 +170,7 @@ class EMAHook(Hook):
         Args:
             runner (Runner): The runner of the testing process.
         """
+        self.ema_model.sync()
         checkpoint['ema_state_dict'] = self.ema_model.state_dict()
         # Save ema parameters to the source model's state dict so that we
         # can directly load the averaged model weights for deployment.
@@ -182,6 +186,7 @@ class EMAHook(Hook):
             runner (Runner): The runner of the testing process.
         """
         from mmengine.runner.checkpoint import load_state_dict
+        self.ema_model.sync()
         if 'ema_state_dict' in checkpoint and runner._resume:
             # The original model parameters are actually saved in ema
             # field swap the weights back to resume ema state.
@@ -202,7 +207,15 @@ class EMAHook(Hook):
                 strict=self.strict_load)
 
     def _swap_ema_parameters(self) -> None:
-        """Swap the parameter of model with ema_model."""
+        """Swap the parameter of model with ema_model.
+
+        The first call loads the ema parameters into the source model, the
+        next one restores the source parameters. The source tensors are kept
+        aside instead of being copied into the ema model, so that they are
+        restored bit-identical even if the ema model is stored in a lower
+        precision, e.g. ``dtype=torch.bfloat16``.
+        """
+        self.ema_model.sync()
         avg_param = (
             itertools.chain(self.ema_model.module.parameters(),
                             self.ema_model.module.buffers())
@@ -212,10 +225,19 @@ class EMAHook(Hook):
             itertools.chain(self.src_model.parameters(),
                             self.src_model.buffers())
             if self.ema_model.update_buffers else self.src_model.parameters())
-        for p_avg, p_src in zip(avg_param, src_param):
-            tmp = p_avg.data.clone()
-            p_avg.data.copy_(p_src.data)
-            p_src.data.copy_(tmp)
+        if self._src_data is None:
+            self._src_data = []
+            for p_avg, p_src in zip(avg_param, src_param):
+                self._src_data.append(p_src.data)
+                p_src.data = p_avg.data.to(
+                    device=p_src.device, dtype=p_src.dtype, copy=True)
+        else:
+            src_param = list(src_param)
+            assert len(src_param) == len(self._src_data), \
+                'The parameters of the source model changed during the swap'
+            for p_src, data in zip(src_param, self._src_data):
+                p_src.data = data
+            self._src_data = None
 
     def _swap_ema_state_dict(self, checkpoint):
         """Swap the state dict values of model with ema_model."""
@@ -0,0 +1,103 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from collections import OrderedDict
+from typing import Any, Mapping, Optional, Union
+
+import torch
+
+from mmengine.registry import HOOKS
+from mmengine.structures import BaseDataElement
+from .hook import Hook
+
+DATA_BATCH = Optional[Union[dict, tuple, list]]
+
+
+def _iter_tensors(data: Any):
+    if isinstance(data, torch.Tensor):
+        yield data
+    elif isinstance(data, BaseDataElement):
+        for value in data.values():
+            yield from _iter_tensors(value)
+    elif isinstance(data, Mapping):
+        for value in data.values():
+            yield from _iter_tensors(value)
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            yield from _iter_tensors(item)
+
+
+@HOOKS.register_module()
+class SharedMemoryPinHook(Hook):
+    """Pin the shared memory slots of :func:`shared_memory_collate` once.
+
+    With ``pin_memory=True``, the dataloader copies every batch to a new
+    pinned buffer in its pin memory thread. The slots of
+    :func:`shared_memory_collate` are reused by the workers, so this hook
+    page-locks every slot in place with ``cudaHostRegister`` the first time
+    it is received instead, and the batches are copied to the device
+    asynchronously without the extra copy. It should be used with
+    ``pin_memory=False`` in the dataloader and ``non_blocking=True`` in the
+    data preprocessor.
+
+    The hook keeps a reference to the registered slots, so that they are not
+    freed while registered. Slots are unregistered in the order they were
+    registered once there are more than ``max_slots``, e.g. when the workers
+    are restarted every epoch without ``persistent_workers``.
+
+    Args:
+        max_slots (int): The maximum number of registered slots, which
+            should be at least ``num_workers * num_slots`` of the dataloader.
+            Defaults to 64.
+    """
+
+    priority = 'VERY_HIGH'
+
+    def __init__(self, max_slots: int = 64) -> None:
+        self.max_slots = max_slots
+        self._slots: OrderedDict = OrderedDict()
+
+    def _register(self, storage) -> None:
+        ptr = storage.data_ptr()
+        if ptr in self._slots:
+            return
+        torch.cuda.check_error(torch.cuda.cudart().cudaHostRegister(
+            ptr, storage.nbytes(), 0))
+        self._slots[ptr] = storage
+        while len(self._slots) > self.max_slots:
+            ptr, _ = self._slots.popitem(last=False)
+            torch.cuda.check_error(
+                torch.cuda.cudart().cudaHostUnregister(ptr))
+
+    def before_train_iter(self,
+                          runner,
+                          batch_idx: int,
+                          data_batch: DATA_BATCH = None) -> None:
+        """Register the slots of the batch that are not registered yet.
+
+        Args:
+            runner (Runner): The runner of the training process.
+            batch_idx (int): The index of the current batch in the train loop.
+            data_batch (dict or tuple or list, optional): Data from dataloader.
+        """
+        if not torch.cuda.is_available():
+            return
+        for tensor in _iter_tensors(data_batch):
+            storage = tensor.untyped_storage()
+            if tensor.device.type == 'cpu' and storage.is_shared(
+            ) and not tensor.is_pinned():
+                self._register(storage)
+
+    def after_train(self, runner) -> None:
+        """Unregister all the slots.
+
+        Args:
+            runner (Runner): The runner of the training process.
+        """
+        for ptr in self._slots:
+            torch.cuda.check_error(
+                torch.cuda.cudart().cudaHostUnregister(ptr))
+        self._slots.clear()
@@ -11,8 +11,9 @@ from .averaged_model import (BaseAveragedModel, ExponentialMovingAverage,
 from .base_model import BaseDataPreprocessor, BaseModel, ImgDataPreprocessor
 from .base_module import BaseModule, ModuleDict, ModuleList, Sequential
 from .test_time_aug import BaseTTAModel
-from .utils import (convert_sync_batchnorm, detect_anomalous_params,
-                    merge_dict, revert_sync_batchnorm, stack_batch)
+from .utils import (bgr_to_hsv, convert_sync_batchnorm,
+                    detect_anomalous_params, hsv_to_bgr, merge_dict,
+                    revert_sync_batchnorm, stack_batch)
 from .weight_init import (BaseInit, Caffe2XavierInit, ConstantInit,
                           KaimingInit, NormalInit, PretrainedInit,
                           TruncNormalInit, UniformInit, XavierInit,
@@ -35,7 +36,7 @@ __all__ = [
     'bias_init_with_prob', 'BaseInit', 'ConstantInit', 'XavierInit',
     'NormalInit', 'TruncNormalInit', 'UniformInit', 'KaimingInit',
     'Caffe2XavierInit', 'PretrainedInit', 'initialize',
-    'convert_sync_batchnorm', 'BaseTTAModel'
+    'convert_sync_batchnorm', 'BaseTTAModel', 'bgr_to_hsv', 'hsv_to_bgr'
 ]
 
 if digit_version(TORCH_VERSION) >= digit_version('2.0.0'):
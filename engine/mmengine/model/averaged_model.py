@@ -5,9 +5,11 @@
 # LICENSE file in the root directory of this source tree.
 
 import logging
+import threading
 from abc import abstractmethod
+from collections import defaultdict
 from copy import deepcopy
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 import torch
 import torch.nn as nn
@@ -17,6 +19,18 @@ from mmengine.logging import print_log
 from mmengine.registry import MODELS
 
 
+def _foreach_lerp_(averaged_params: List[Tensor],
+                   source_params: List[Tensor], weight: float) -> None:
+    """In-place ``lerp`` of lists of tensors with the same device and dtype,
+    fused into a few kernels if ``torch._foreach_lerp_`` is available."""
+    if hasattr(torch, '_foreach_lerp_'):
+        torch._foreach_lerp_(averaged_params, source_params, weight)
+    else:
+        for averaged_param, source_param in zip(averaged_params,
+                                                source_params):
+            averaged_param.lerp_(source_param, weight)
+
+
 class BaseAveragedModel(nn.Module):
     """A base class for averaging model weights.
 
@@ -48,6 +62,13 @@ class BaseAveragedModel(nn.Module):
        >>> # use ema model as teacher
        >>> ema_teacher = ExponentialMovingAverage(student)
 
+    The parameters are updated with multi-tensor (``torch._foreach_*``)
+    operations, grouped by device and dtype. Subclasses can override
+    :meth:`foreach_avg_func` to fuse the update, by default it calls
+    :meth:`avg_func` for every parameter. The fused updates of
+    :class:`StochasticWeightAverage` and :class:`ExponentialMovingAverage`
+    are skipped for subclasses that only override :meth:`avg_func`.
+
     Args:
         model (nn.Module): The model to be averaged.
         interval (int): Interval between two updates. Defaults to 1.
@@ -56,18 +77,35 @@ class BaseAveragedModel(nn.Module):
         update_buffers (bool): if True, it will compute running averages for
             both the parameters and the buffers of the model. Defaults to
             False.
+        dtype (torch.dtype | str, optional): If provided, the floating point
+            parameters of the averaged model are stored in this dtype, e.g.
+            ``torch.bfloat16`` to halve its memory. Note that small updates
+            are lost in low precision, so it is meant to be used with a
+            larger ``interval``. Defaults to None.
+        async_update (bool): Whether to update the averaged model in a
+            background thread. The source parameters are copied to pinned
+            host buffers without blocking and averaged on the cpu while
+            training continues. Only supported with ``device='cpu'``. Call
+            :meth:`sync` before reading the averaged parameters.
+            Defaults to False.
     """  # noqa: E501
 
     def __init__(self,
                  model: nn.Module,
                  interval: int = 1,
                  device: Optional[torch.device] = None,
-                 update_buffers: bool = False) -> None:
+                 update_buffers: bool = False,
+                 dtype: Union[torch.dtype, str, None] = None,
+                 async_update: bool = False) -> None:
         super().__init__()
         self.module = deepcopy(model).requires_grad_(False)
         self.interval = interval
         if device is not None:
             self.module = self.module.to(device)
+        if isinstance(dtype, str):
+            dtype = getattr(torch, dtype)
+        if dtype is not None:
+            self.module = self.module.to(dtype)
         self.register_buffer('steps',
                              torch.tensor(0, dtype=torch.long, device=device))
         self.update_buffers = update_buffers
@@ -76,6 +114,14 @@ class BaseAveragedModel(nn.Module):
         else:
             self.avg_parameters = dict(self.module.named_parameters())
 
+        if async_update:
+            assert device is not None and torch.device(device).type == 'cpu', \
+                '`async_update` is only supported with `device="cpu"`'
+        self.async_update = async_update
+        self._staging: Optional[Dict[str, Tensor]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
     @abstractmethod
     def avg_func(self, averaged_param: Tensor, source_param: Tensor,
                  steps: int) -> None:
@@ -89,14 +135,82 @@ class BaseAveragedModel(nn.Module):
                 updated.
         """
 
+    def foreach_avg_func(self, averaged_params: List[Tensor],
+                         source_params: List[Tensor], steps: int) -> None:
+        """Use in-place operation to compute the average of a group of
+        parameters with the same device and dtype.
+
+        Args:
+            averaged_params (List[Tensor]): The averaged parameters.
+            source_params (List[Tensor]): The source parameters.
+            steps (int): The number of times the parameters have been
+                updated.
+        """
+        for averaged_param, source_param in zip(averaged_params,
+                                                source_params):
+            self.avg_func(averaged_param, source_param, steps)
+
     def forward(self, *args, **kwargs):
         """Forward method of the averaged model."""
         return self.module(*args, **kwargs)
 
+    def _group_parameters(self, src_parameters: dict) -> list:
+        """Group the floating point parameters by device and dtype."""
+        groups: dict = defaultdict(lambda: ([], []))
+        for k, p_avg in self.avg_parameters.items():
+            if p_avg.dtype.is_floating_point:
+                averaged, source = groups[(p_avg.device, p_avg.dtype)]
+                averaged.append(p_avg.data)
+                source.append(src_parameters[k].data.to(
+                    device=p_avg.device, dtype=p_avg.dtype))
+        return list(groups.values())
+
+    def _update_async(self, src_parameters: dict, steps: int) -> None:
+        """Stage the source parameters on the host and average them in a
+        background thread."""
+        self.sync()
+        if self._staging is None:
+            pin_memory = torch.cuda.is_available()
+            self._staging = {
+                k: torch.empty(
+                    src_parameters[k].shape,
+                    dtype=src_parameters[k].dtype,
+                    pin_memory=pin_memory and src_parameters[k].is_cuda)
+                for k, p_avg in self.avg_parameters.items()
+                if p_avg.dtype.is_floating_point
+            }
+        for k, buffer in self._staging.items():
+            buffer.copy_(src_parameters[k].data, non_blocking=True)
+        event = None
+        if torch.cuda.is_available():
+            event = torch.cuda.Event()
+            event.record()
+        self._thread = threading.Thread(
+            target=self._apply_staged, args=(event, steps), daemon=True)
+        self._thread.start()
+
+    def _apply_staged(self, event, steps: int) -> None:
+        try:
+            if event is not None:
+                event.synchronize()
+            for averaged, source in self._group_parameters(self._staging):
+                self.foreach_avg_func(averaged, source, steps)
+        except BaseException as e:
+            self._error = e
+
+    def sync(self) -> None:
+        """Wait for the pending asynchronous update."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
     def update_parameters(self, model: nn.Module) -> None:
         """Update the parameters of the model. This method will execute the
-        ``avg_func`` to compute the new parameters and update the model's
-        parameters.
+        ``foreach_avg_func`` to compute the new parameters and update the
+        model's parameters.
 
         Args:
             model (nn.Module): The model whose parameters will be averaged.
@@ -105,15 +219,16 @@ class BaseAveragedModel(nn.Module):
             model.state_dict()
             if self.update_buffers else dict(model.named_parameters()))
         if self.steps == 0:
+            self.sync()
             for k, p_avg in self.avg_parameters.items():
                 p_avg.data.copy_(src_parameters[k].data)
         elif self.steps % self.interval == 0:
-            for k, p_avg in self.avg_parameters.items():
-                if p_avg.dtype.is_floating_point:
-                    device = p_avg.device
-                    self.avg_func(p_avg.data,
-                                  src_parameters[k].data.to(device),
-                                  self.steps)
+            if self.async_update:
+                self._update_async(src_parameters, int(self.steps))
+            else:
+                for averaged, source in self._group_parameters(
+                        src_parameters):
+                    self.foreach_avg_func(averaged, source, int(self.steps))
         if not self.update_buffers:
             # If not update the buffers,
             # keep the buffers in sync with the source model.
@@ -147,6 +262,24 @@ class StochasticWeightAverage(BaseAveragedModel):
             source_param - averaged_param,
             alpha=1 / float(steps // self.interval + 1))
 
+    def foreach_avg_func(self, averaged_params: List[Tensor],
+                         source_params: List[Tensor], steps: int) -> None:
+        """Compute the average of a group of parameters using stochastic
+        weight average.
+
+        Args:
+            averaged_params (List[Tensor]): The averaged parameters.
+            source_params (List[Tensor]): The source parameters.
+            steps (int): The number of times the parameters have been
+                updated.
+        """
+        if type(self).avg_func is not StochasticWeightAverage.avg_func:
+            # a subclass that only overrides avg_func
+            super().foreach_avg_func(averaged_params, source_params, steps)
+            return
+        _foreach_lerp_(averaged_params, source_params,
+                       1 / float(steps // self.interval + 1))
+
 
 @MODELS.register_module()
 class ExponentialMovingAverage(BaseAveragedModel):
@@ -178,6 +311,11 @@ class ExponentialMovingAverage(BaseAveragedModel):
         update_buffers (bool): if True, it will compute running averages for
             both the parameters and the buffers of the model. Defaults to
             False.
+        dtype (torch.dtype | str, optional): The dtype of the averaged
+            parameters. See :class:`BaseAveragedModel`. Defaults to None.
+        async_update (bool): Whether to update the averaged model in a
+            background thread. See :class:`BaseAveragedModel`.
+            Defaults to False.
     """  # noqa: W605
 
     def __init__(self,
@@ -185,8 +323,11 @@ class ExponentialMovingAverage(BaseAveragedModel):
                  momentum: float = 0.0002,
                  interval: int = 1,
                  device: Optional[torch.device] = None,
-                 update_buffers: bool = False) -> None:
-        super().__init__(model, interval, device, update_buffers)
+                 update_buffers: bool = False,
+                 dtype: Union[torch.dtype, str, None] = None,
+                 async_update: bool = False) -> None:
+        super().__init__(model, interval, device, update_buffers, dtype,
+                         async_update)
         assert 0.0 < momentum < 1.0, 'momentum must be in range (0.0, 1.0)'\
                                      f'but got {momentum}'
         if momentum > 0.5:
@@ -212,6 +353,24 @@ class ExponentialMovingAverage(BaseAveragedModel):
         """
         averaged_param.lerp_(source_param, self.momentum)
 
+    def foreach_avg_func(self, averaged_params: List[Tensor],
+                         source_params: List[Tensor], steps: int) -> None:
+        """Compute the moving average of a group of parameters using
+        exponential moving average.
+
+        Args:
+            averaged_params (List[Tensor]): The averaged parameters.
+            source_params (List[Tensor]): The source parameters.
+            steps (int): The number of times the parameters have been
+                updated.
+        """
+        if type(self).avg_func is not ExponentialMovingAverage.avg_func:
+            # a subclass that only overrides avg_func, e.g. with a momentum
+            # schedule, is updated parameter by parameter
+            super().foreach_avg_func(averaged_params, source_params, steps)
+            return
+        _foreach_lerp_(averaged_params, source_params, self.momentum)
+
 
 @MODELS.register_module()
 class MomentumAnnealingEMA(ExponentialMovingAverage):
@@ -234,6 +393,11 @@ class MomentumAnnealingEMA(ExponentialMovingAverage):
         update_buffers (bool): if True, it will compute running averages for
             both the parameters and the buffers of the model. Defaults to
             False.
+        dtype (torch.dtype | str, optional): The dtype of the averaged
+            parameters. See :class:`BaseAveragedModel`. Defaults to None.
+        async_update (bool): Whether to update the averaged model in a
+            background thread. See :class:`BaseAveragedModel`.
+            Defaults to False.
     """
 
     def __init__(self,
@@ -242,13 +406,17 @@ class MomentumAnnealingEMA(ExponentialMovingAverage):
                  gamma: int = 100,
                  interval: int = 1,
                  device: Optional[torch.device] = None,
-                 update_buffers: bool = False) -> None:
+                 update_buffers: bool = False,
+                 dtype: Union[torch.dtype, str, None] = None,
+                 async_update: bool = False) -> None:
         super().__init__(
             model=model,
             momentum=momentum,
             interval=interval,
             device=device,
-            update_buffers=update_buffers)
+            update_buffers=update_buffers,
+            dtype=dtype,
+            async_update=async_update)
         assert gamma > 0, f'gamma must be greater than 0, but got {gamma}'
         self.gamma = gamma
 
@@ -266,3 +434,17 @@ class MomentumAnnealingEMA(ExponentialMovingAverage):
         momentum = max(self.momentum,
                        self.gamma / (self.gamma + self.steps.item()))
         averaged_param.lerp_(source_param, momentum)
+
+    def foreach_avg_func(self, averaged_params: List[Tensor],
+                         source_params: List[Tensor], steps: int) -> None:
+        """Compute the moving average of a group of parameters using the
+        linear momentum strategy.
+
+        Args:
+            averaged_params (List[Tensor]): The averaged parameters.
+            source_params (List[Tensor]): The source parameters.
+            steps (int): The number of times the parameters have been
+                updated.
+        """
+        momentum = max(self.momentum, self.gamma / (self.gamma + steps))
+        _foreach_lerp_(averaged_params, source_params, momentum)
@@ -6,7 +6,7 @@
 
 import logging
 import warnings
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import torch
 import torch.nn as nn
@@ -71,6 +71,46 @@ def stack_batch(tensor_list: List[torch.Tensor],
     return torch.stack(batch_tensor)
 
 
+def bgr_to_hsv(img: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+    """Convert BGR images in shape (B, 3, H, W) to their hue in [0, 6),
+    saturation in [0, 1] and value, each in shape (B, H, W).
+
+    Args:
+        img (Tensor): The BGR images.
+
+    Returns:
+        Tuple[Tensor, Tensor, Tensor]: The hue, saturation and value.
+    """
+    b, g, r = img.unbind(dim=1)
+    v = img.max(dim=1)[0]
+    delta = v - img.min(dim=1)[0]
+    s = delta / v.clamp(min=1e-6)
+    d = delta.clamp(min=1e-6)
+    h = torch.where(v == r, ((g - b) / d) % 6,
+                    torch.where(v == g, (b - r) / d + 2, (r - g) / d + 4))
+    h = torch.where(delta > 0, h, torch.zeros_like(h))
+    return h, s, v
+
+
+def hsv_to_bgr(h: torch.Tensor, s: torch.Tensor,
+               v: torch.Tensor) -> torch.Tensor:
+    """The inverse of :func:`bgr_to_hsv`.
+
+    Args:
+        h (Tensor): The hue in [0, 6), in shape (B, H, W).
+        s (Tensor): The saturation in [0, 1], in shape (B, H, W).
+        v (Tensor): The value, in shape (B, H, W).
+
+    Returns:
+        Tensor: The BGR images in shape (B, 3, H, W).
+    """
+    channels = []
+    for n in (1, 3, 5):
+        k = (n + h) % 6
+        channels.append(v - v * s * torch.minimum(k, 4 - k).clamp(0, 1))
+    return torch.stack(channels, dim=1)
+
+
 def detect_anomalous_params(loss: torch.Tensor, model) -> None:
     parameters_in_graph = set()
     visited = set()
@@ -488,6 +488,7 @@ class PretrainedInit:
 
     def __call__(self, module):
         from mmengine.runner.checkpoint import (_load_checkpoint_with_prefix,
+                                                _log_peak_rss,
                                                 load_checkpoint,
                                                 load_state_dict)
         if self.prefix is None:
@@ -505,6 +506,7 @@ class PretrainedInit:
             state_dict = _load_checkpoint_with_prefix(
                 self.prefix, self.checkpoint, map_location=self.map_location)
             load_state_dict(module, state_dict, strict=False, logger='current')
+            _log_peak_rss(self.checkpoint)
 
         if hasattr(module, '_params_init_info'):
             update_init_info(module, init_info=self._get_init_info())
@@ -7,6 +7,8 @@
 from .build_functions import (build_from_cfg, build_model_from_cfg,
                               build_runner_from_cfg, build_scheduler_from_cfg)
 from .default_scope import DefaultScope
+from .manifest import (dump_registry_manifest, generate_registry_manifest,
+                       load_registry_manifest)
 from .registry import Registry
 from .root import (DATA_SAMPLERS, DATASETS, EVALUATOR, FUNCTIONS, HOOKS,
                    INFERENCERS, LOG_PROCESSORS, LOOPS, METRICS, MODEL_WRAPPERS,
@@ -25,5 +27,7 @@ __all__ = [
     'VISBACKENDS', 'VISUALIZERS', 'LOG_PROCESSORS', 'EVALUATOR', 'INFERENCERS',
     'DefaultScope', 'traverse_registry_tree', 'count_registered_modules',
     'build_model_from_cfg', 'build_runner_from_cfg', 'build_from_cfg',
-    'build_scheduler_from_cfg', 'init_default_scope', 'FUNCTIONS', 'STRATEGIES'
+    'build_scheduler_from_cfg', 'init_default_scope', 'FUNCTIONS', 'STRATEGIES',
+    'load_registry_manifest', 'generate_registry_manifest',
+    'dump_registry_manifest'
 ]
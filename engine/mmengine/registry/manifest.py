@@ -0,0 +1,239 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import ast
+import json
+import os
+import os.path as osp
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+
+# written into the package directory, next to its ``__init__.py``
+MANIFEST_FILENAME = 'registry_manifest.json'
+
+_manifests: Dict[str, Optional[dict]] = dict()
+
+
+def _package_dir(package: str) -> Optional[str]:
+    try:
+        spec = find_spec(package)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return list(spec.submodule_search_locations)[0]
+
+
+def load_registry_manifest(scope: str) -> Optional[dict]:
+    """Load the registry manifest of a package.
+
+    The manifest maps the name of every registry of the package to the
+    names registered in it and the modules that register them, so that a
+    registry only imports the module of the name it looks up. Set the
+    environment variable ``MMENGINE_LAZY_REGISTRY=0`` to ignore the
+    manifests and import all the locations of a registry as before.
+
+    Args:
+        scope (str): The scope of the registry, i.e. the package name.
+
+    Returns:
+        dict, optional: The manifest, or None if the package has none.
+    """
+    if os.environ.get('MMENGINE_LAZY_REGISTRY', '1') == '0':
+        return None
+    if scope not in _manifests:
+        manifest = None
+        package_dir = _package_dir(scope)
+        if package_dir is not None:
+            manifest_file = osp.join(package_dir, MANIFEST_FILENAME)
+            if osp.isfile(manifest_file):
+                with open(manifest_file) as f:
+                    manifest = json.load(f)
+        _manifests[scope] = manifest
+    return _manifests[scope]
+
+
+def _iter_modules(package: str, package_dir: str):
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs
+                         if osp.isfile(osp.join(root, d, '__init__.py')))
+        for filename in sorted(files):
+            if not filename.endswith('.py'):
+                continue
+            parts = osp.relpath(osp.join(root, filename[:-3]),
+                                package_dir).split(os.sep)
+            is_package = parts[-1] == '__init__'
+            if is_package:
+                parts = parts[:-1]
+            yield '.'.join([package] + parts), is_package, osp.join(
+                root, filename)
+
+
+def _resolve_import(module: str, is_package: bool,
+                    node: ast.ImportFrom) -> str:
+    if not node.level:
+        return node.module or ''
+    base = module.split('.')
+    base = base[:len(base) - node.level + (1 if is_package else 0)]
+    return '.'.join(base + ([node.module] if node.module else []))
+
+
+def _str_list(node: Optional[ast.AST]) -> Optional[List[str]]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)) and all(
+            isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+            for elt in node.elts):
+        return [elt.value for elt in node.elts]
+    return None
+
+
+def _registered_names(call: ast.Call,
+                      module: Optional[ast.AST]) -> Optional[List[str]]:
+    """The names given to ``register_module`` or the name of the
+    module."""
+    kwargs = {keyword.arg: keyword.value for keyword in call.keywords}
+    name = kwargs.get('name', call.args[0] if call.args else None)
+    if name is not None and not (isinstance(name, ast.Constant)
+                                 and name.value is None):
+        return _str_list(name)
+    module = kwargs.get('module', call.args[2] if len(call.args) > 2 else
+                        module)
+    if isinstance(module, (ast.ClassDef, ast.FunctionDef)):
+        return [module.name]
+    if isinstance(module, ast.Name):
+        return [module.id]
+    if isinstance(module, ast.Attribute):
+        return [module.attr]
+    return None
+
+
+def generate_registry_manifest(package: str,
+                               package_dir: Optional[str] = None) -> dict:
+    """Find the module that registers every name in the registries of a
+    package, without importing it.
+
+    The sources are parsed for ``@REGISTRY.register_module()`` decorators
+    and ``REGISTRY.register_module(...)`` calls, where ``REGISTRY`` is one
+    of the registries created in the package, e.g. in ``mmseg/registry``,
+    or an alias of one like ``BACKBONES = MODELS``. Registrations with
+    computed names are skipped: looking them up imports all the locations
+    of the registry as without a manifest.
+
+    Args:
+        package (str): The package name, e.g. ``'mmseg'``.
+        package_dir (str, optional): The directory of the package. Defaults
+            to the installed package.
+
+    Returns:
+        dict: The manifest, see :func:`load_registry_manifest`.
+    """
+    package_dir = package_dir or _package_dir(package)
+    assert package_dir is not None, f'Cannot find the package {package}'
+    modules = [(module, is_package, ast.parse(open(path).read(), path))
+               for module, is_package, path in _iter_modules(
+                   package, package_dir)]
+
+    # the registries of the package by the module and name that define them
+    registries: Dict[tuple, str] = dict()
+    for module, _, tree in modules:
+        for node in tree.body:
+            if (isinstance(node, ast.Assign)
+                    and isinstance(node.value, ast.Call)
+                    and isinstance(node.value.func, ast.Name)
+                    and node.value.func.id == 'Registry'):
+                call = node.value
+                kwargs = {kw.arg: kw.value for kw in call.keywords}
+                name = _str_list(call.args[0] if call.args else kwargs.get(
+                    'name'))
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and name:
+                        registries[(module, target.id)] = name[0]
+
+    # follow imports and aliases, e.g. `from .registry import MODELS` in
+    # `mmseg.registry.__init__` and `BACKBONES = MODELS` in `builder.py`
+    local_names: Dict[str, Dict[str, str]] = dict()
+    changed = True
+    while changed:
+        changed = False
+        for module, is_package, tree in modules:
+            names = local_names.setdefault(module, dict())
+            for node in tree.body:
+                pairs = []
+                if isinstance(node, ast.ImportFrom):
+                    source = _resolve_import(module, is_package, node)
+                    pairs = [(alias.asname or alias.name, (source, alias.name))
+                             for alias in node.names]
+                elif isinstance(node, ast.Assign) and isinstance(
+                        node.value, ast.Name):
+                    pairs = [(target.id, (module, node.value.id))
+                             for target in node.targets
+                             if isinstance(target, ast.Name)]
+                for local, (source, name) in pairs:
+                    registry = registries.get(
+                        (source, name),
+                        local_names.get(source, dict()).get(name))
+                    if registry is not None and local not in names:
+                        names[local] = registry
+                        changed = True
+        for (module, name), registry in registries.items():
+            local_names[module].setdefault(name, registry)
+
+    manifest: Dict[str, Dict[str, str]] = dict()
+
+    def add(module, registry_node, call, target=None):
+        if not (isinstance(registry_node, ast.Name)
+                and registry_node.id in local_names[module]):
+            return
+        registry = local_names[module][registry_node.id]
+        for name in _registered_names(call, target) or []:
+            manifest.setdefault(registry, dict()).setdefault(name, module)
+
+    def is_register_call(node):
+        return (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'register_module')
+
+    for module, _, tree in modules:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+                for decorator in node.decorator_list:
+                    if is_register_call(decorator):
+                        add(module, decorator.func.value, decorator, node)
+            elif isinstance(node, ast.Call):
+                # `REGISTRY.register_module()(module)`
+                if is_register_call(node.func) and node.args:
+                    add(module, node.func.func.value, node.func,
+                        node.args[0])
+                # `REGISTRY.register_module(module=module)`
+                elif is_register_call(node) and (
+                        len(node.args) > 2
+                        or any(kw.arg == 'module' for kw in node.keywords)):
+                    add(module, node.func.value, node)
+    return manifest
+
+
+def dump_registry_manifest(package: str,
+                           package_dir: Optional[str] = None) -> str:
+    """Generate the registry manifest of a package and write it into the
+    package.
+
+    Args:
+        package (str): The package name, e.g. ``'mmseg'``.
+        package_dir (str, optional): The directory of the package. Defaults
+            to the installed package.
+
+    Returns:
+        str: The manifest file.
+    """
+    package_dir = package_dir or _package_dir(package)
+    manifest = generate_registry_manifest(package, package_dir)
+    manifest_file = osp.join(package_dir, MANIFEST_FILENAME)
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    _manifests.pop(package, None)
+    return manifest_file
@@ -16,8 +16,10 @@ from rich.console import Console
 from rich.table import Table
 
 from mmengine.config.utils import MODULE2PACKAGE
-from mmengine.utils import get_object_from_string, is_seq_of
+from mmengine.utils import (get_object_from_string, import_lazy_module,
+                            is_seq_of)
 from .default_scope import DefaultScope
+from .manifest import load_registry_manifest
 
 
 class Registry:
@@ -378,7 +380,7 @@ class Registry:
                     module.register_all_modules(False)  # type: ignore
 
             for loc in self._locations:
-                import_module(loc)
+                import_lazy_module(loc)
                 print_log(
                     f"Modules of {self.scope}'s {self.name} registry have "
                     f'been automatically imported from {loc}',
@@ -386,6 +388,50 @@ class Registry:
                     level=logging.DEBUG)
             self._imported = True
 
+    def _import_from_manifest(self, key: str) -> bool:
+        """Import only the module that registers ``key``, according to the
+        registry manifest of the scope.
+
+        Args:
+            key (str): Name of the registered item without scope.
+
+        Returns:
+            bool: Whether ``key`` is found without importing all the
+            locations, in this registry or in its ancestors.
+        """
+        if self._imported:
+            return False
+        if key in self._module_dict:
+            return True
+        manifest = load_registry_manifest(self.scope)
+        if manifest is None:
+            return False
+
+        # Avoid circular import
+        from ..logging import print_log
+
+        module_name = manifest.get(self.name, dict()).get(key)
+        if module_name is not None:
+            try:
+                import_module(module_name)
+            except ImportError:
+                # a stale manifest, fall back to the locations which raise
+                # the error again if it is a real one
+                return False
+            print_log(
+                f'`{key}` of {self.scope}\'s {self.name} registry has been '
+                f'imported from {module_name}',
+                logger='current',
+                level=logging.DEBUG)
+            return key in self._module_dict
+        # not registered by this package, e.g. mmengine or mmcv modules
+        parent = self.parent
+        while parent is not None:
+            if key in parent._module_dict:
+                return True
+            parent = parent.parent
+        return False
+
     def get(self, key: str) -> Optional[Type]:
         """Get the registry record.
 
@@ -452,8 +498,11 @@ class Registry:
         registry_name = self.name
         scope_name = self.scope
 
-        # lazy import the modules to register them into the registry
-        self.import_from_location()
+        # lazy import the modules to register them into the registry, only
+        # the module of `key` if the scope has a registry manifest
+        if scope not in (None, self._scope) or \
+                not self._import_from_manifest(real_key):
+            self.import_from_location()
 
         if scope is None or scope == self._scope:
             # get from self
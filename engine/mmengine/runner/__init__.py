@@ -5,14 +5,19 @@
 # LICENSE file in the root directory of this source tree.
 
 from ._flexible_runner import FlexibleRunner
-from .activation_checkpointing import turn_on_activation_checkpointing
+from .activation_checkpointing import (find_checkpoint_candidates,
+                                       plan_activation_checkpointing,
+                                       profile_activation_memory,
+                                       turn_on_activation_checkpointing)
 from .amp import autocast
 from .base_loop import BaseLoop
-from .checkpoint import (CheckpointLoader, find_latest_checkpoint,
-                         get_deprecated_model_names, get_external_models,
-                         get_mmcls_models, get_state_dict,
-                         get_torchvision_models, load_checkpoint,
-                         load_state_dict, save_checkpoint, weights_to_cpu)
+from .checkpoint import (AsyncCheckpointSaver, CheckpointLoader,
+                         find_latest_checkpoint, get_deprecated_model_names,
+                         get_external_models, get_mmcls_models,
+                         get_state_dict, get_torchvision_models,
+                         load_checkpoint, load_sharded_checkpoint,
+                         load_state_dict, save_checkpoint, shard_checkpoint,
+                         weights_to_cpu)
 from .log_processor import LogProcessor
 from .loops import EpochBasedTrainLoop, IterBasedTrainLoop, TestLoop, ValLoop
 from .priority import Priority, get_priority
@@ -26,5 +31,8 @@ __all__ = [
     'save_checkpoint', 'EpochBasedTrainLoop', 'IterBasedTrainLoop', 'ValLoop',
     'TestLoop', 'Runner', 'get_priority', 'Priority', 'find_latest_checkpoint',
     'autocast', 'LogProcessor', 'set_random_seed', 'FlexibleRunner',
-    'turn_on_activation_checkpointing'
+    'turn_on_activation_checkpointing', 'AsyncCheckpointSaver',
+    'load_sharded_checkpoint', 'shard_checkpoint',
+    'find_checkpoint_candidates', 'plan_activation_checkpointing',
+    'profile_activation_memory'
 ]
@@ -4,28 +4,266 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import time
 from functools import wraps
 from operator import attrgetter
-from typing import List, Union
+from typing import Dict, List, Optional, Sequence, Union
 
 import torch
+import torch.nn as nn
 from torch.utils.checkpoint import checkpoint
 
 
 def wrap_forward(forward):
 
     @wraps(forward)
-    def wrapper(*args):
-        return checkpoint(forward, *args)
+    def wrapper(*args, **kwargs):
+        return checkpoint(forward, *args, use_reentrant=False, **kwargs)
+
+    return wrapper
+
+
+def wrap_forward_offload(forward):
+    """Keep the tensors saved for backward in pinned cpu memory."""
+
+    @wraps(forward)
+    def wrapper(*args, **kwargs):
+        with torch.autograd.graph.save_on_cpu(pin_memory=True):
+            return forward(*args, **kwargs)
 
     return wrapper
 
 
 def turn_on_activation_checkpointing(model: torch.nn.Module,
-                                     modules: Union[List[str], str]):
+                                     modules: Union[List[str], str, dict]):
+    """Recompute or offload the activations of sub-modules.
 
+    Args:
+        model (nn.Module): The model.
+        modules (list[str] | str | dict): Names of the sub-modules to
+            checkpoint, or a dict with the ``checkpoint`` and ``offload``
+            lists, e.g. the plan printed by
+            ``tools/analysis_tools/plan_activation_checkpointing.py``.
+            Offloaded modules keep their saved tensors in pinned cpu memory
+            instead of recomputing them.
+    """
     if isinstance(modules, str):
         modules = [modules]
-    for module_name in modules:
+    if not isinstance(modules, dict):
+        modules = dict(checkpoint=modules)
+    for module_name in modules.get('checkpoint', []):
         module = attrgetter(module_name)(model)
         module.forward = wrap_forward(module.forward)
+    for module_name in modules.get('offload', []):
+        module = attrgetter(module_name)(model)
+        module.forward = wrap_forward_offload(module.forward)
+
+
+def find_checkpoint_candidates(model: nn.Module,
+                               types: Sequence[str] = (
+                                   'TransformerEncoderLayer', ),
+                               names: Sequence[str] = (
+                                   'decode_head.deconv_layers',
+                                   'decode_head.conv_layers',
+                                   'head.deconv_layers', 'head.conv_layers'),
+                               ) -> List[str]:
+    """Names of the sub-modules that the planner may checkpoint: every
+    module whose class name is in ``types`` and the ``names`` that exist and
+    hold parameters."""
+    candidates = []
+    for name, module in model.named_modules():
+        if type(module).__name__ in types or (
+                name in names and any(True for _ in module.parameters())):
+            candidates.append(name)
+    return candidates
+
+
+def _tensor_bytes(tensors) -> int:
+    return sum(t.numel() * t.element_size() for t in tensors
+               if isinstance(t, torch.Tensor))
+
+
+def profile_activation_memory(model: nn.Module,
+                              inputs: torch.Tensor,
+                              candidates: Sequence[str],
+                              forward_kwargs: Optional[dict] = None) -> dict:
+    """Measure the tensors saved for backward by each candidate module.
+
+    Runs one training forward pass. On a real device the forward time of
+    every candidate is measured; on the ``meta`` device nothing is computed
+    and the FLOPs of every candidate are counted instead, so the estimate
+    runs on a machine without the memory or the GPU to train.
+
+    Args:
+        model (nn.Module): The model in training mode.
+        inputs (Tensor): A training batch.
+        candidates (Sequence[str]): Names of non-nested sub-modules.
+        forward_kwargs (dict, optional): Extra arguments of the forward,
+            e.g. ``dict(mode='tensor')``.
+
+    Returns:
+        dict: ``modules`` maps every candidate to its saved bytes, the bytes
+        of its inputs, and its forward ``time`` in seconds or ``flops``;
+        ``other`` is the bytes saved outside the candidates and
+        ``param_bytes`` the bytes of the trainable parameters.
+    """
+    is_meta = inputs.device.type == 'meta'
+    params = [p for p in model.parameters() if p.requires_grad]
+    param_storages = {p.untyped_storage()._cdata for p in model.parameters()}
+    stats = {
+        name: dict(saved=0, inputs=0, time=0.0, flops=0)
+        for name in candidates
+    }
+    seen = set()
+    active = []
+    other = [0]
+
+    def pack(tensor):
+        storage = tensor.untyped_storage()
+        key = storage._cdata
+        if key not in seen and key not in param_storages:
+            seen.add(key)
+            if active:
+                stats[active[-1]]['saved'] += storage.nbytes()
+            else:
+                other[0] += storage.nbytes()
+        return tensor
+
+    flop_counter = None
+    if is_meta:
+        from torch.utils.flop_counter import FlopCounterMode
+        flop_counter = FlopCounterMode(display=False)
+
+    def measure():
+        if is_meta:
+            return flop_counter.get_total_flops()
+        if inputs.device.type == 'cuda':
+            torch.cuda.synchronize(inputs.device)
+        return time.perf_counter()
+
+    def pre_hook(name, module, args, kwargs):
+        active.append(name)
+        stats[name]['inputs'] += _tensor_bytes(list(args) +
+                                               list(kwargs.values()))
+        stats[name]['start'] = measure()
+
+    def post_hook(name, module, args, kwargs, output):
+        key = 'flops' if is_meta else 'time'
+        stats[name][key] += measure() - stats[name].pop('start')
+        active.pop()
+
+    handles = []
+    for name in candidates:
+        module = model.get_submodule(name)
+        handles.append(
+            module.register_forward_pre_hook(
+                lambda m, a, k, name=name: pre_hook(name, m, a, k),
+                with_kwargs=True))
+        handles.append(
+            module.register_forward_hook(
+                lambda m, a, k, o, name=name: post_hook(name, m, a, k, o),
+                with_kwargs=True))
+    try:
+        with torch.autograd.graph.saved_tensors_hooks(pack, lambda t: t):
+            if flop_counter is not None:
+                with flop_counter:
+                    model(inputs, **(forward_kwargs or {}))
+            else:
+                model(inputs, **(forward_kwargs or {}))
+    finally:
+        for handle in handles:
+            handle.remove()
+
+    return dict(
+        modules=stats,
+        other=other[0],
+        param_bytes=_tensor_bytes(params))
+
+
+def plan_activation_checkpointing(profile: dict,
+                                  budget: int,
+                                  fixed_bytes: int = 0,
+                                  allow_offload: bool = False,
+                                  device_flops: float = 100e12,
+                                  offload_bandwidth: float = 12e9) -> dict:
+    """Pick the cheapest set of modules to checkpoint or offload so that the
+    predicted peak memory fits a budget.
+
+    The peak memory is predicted as ``fixed_bytes`` plus the saved
+    activations plus, while one checkpointed module is recomputed during
+    backward, its saved activations. Checkpointing a module frees its saved
+    bytes except its inputs and costs one more forward of the module;
+    offloading frees all of them and costs their transfer to the host.
+    Modules are picked greedily by cost per freed byte.
+
+    Args:
+        profile (dict): The output of :func:`profile_activation_memory`.
+        budget (int): The memory budget in bytes.
+        fixed_bytes (int): Memory that does not depend on the plan, e.g.
+            the parameters, gradients and optimizer states.
+        allow_offload (bool): Whether modules may be offloaded.
+            Defaults to False.
+        device_flops (float): FLOP/s used to turn counted FLOPs into time.
+        offload_bandwidth (float): Host transfer bandwidth in bytes/s.
+
+    Returns:
+        dict: ``checkpoint`` and ``offload`` lists of module names, the
+        predicted ``peak`` and ``overhead`` in seconds per forward, and
+        whether the plan ``fits``.
+    """
+    modules = profile['modules']
+
+    def recompute_time(stat):
+        return stat['time'] or stat['flops'] / device_flops
+
+    options = []
+    for name, stat in modules.items():
+        freed = stat['saved'] - stat['inputs']
+        if freed > 0:
+            options.append(('checkpoint', name, freed, recompute_time(stat)))
+        if allow_offload and stat['saved'] > 0:
+            options.append(('offload', name, stat['saved'],
+                            stat['saved'] / offload_bandwidth))
+    options.sort(key=lambda option: option[3] / option[2])
+
+    plan = dict(checkpoint=[], offload=[])
+
+    def predict():
+        resident = profile['other']
+        recompute = 0
+        for name, stat in modules.items():
+            if name in plan['checkpoint']:
+                resident += stat['inputs']
+                recompute = max(recompute, stat['saved'])
+            elif name not in plan['offload']:
+                resident += stat['saved']
+        return fixed_bytes + resident + recompute
+
+    peak = predict()
+    overhead = 0.0
+    for action, name, _, cost in options:
+        if peak <= budget:
+            break
+        if name in plan['checkpoint'] or name in plan['offload']:
+            continue
+        plan[action].append(name)
+        overhead += cost
+        peak = predict()
+
+    order = {name: i for i, name in enumerate(modules)}
+    for action in ('checkpoint', 'offload'):
+        plan[action].sort(key=order.get)
+    return dict(plan, peak=peak, overhead=overhead, fits=peak <= budget)
+
+
+def summarize_plan(profile: dict, plan: dict) -> Dict[str, str]:
+    """The action of every candidate module, for logging."""
+    actions = {}
+    for name in profile['modules']:
+        if name in plan['checkpoint']:
+            actions[name] = 'checkpoint'
+        elif name in plan['offload']:
+            actions[name] = 'offload'
+        else:
+            actions[name] = 'keep'
+    return actions
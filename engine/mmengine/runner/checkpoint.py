@@ -10,6 +10,9 @@ import os
 import os.path as osp
 import pkgutil
 import re
+import sys
+import threading
+import zipfile
 from collections import OrderedDict, namedtuple
 from importlib import import_module
 from tempfile import TemporaryDirectory
@@ -19,13 +22,13 @@ import torch
 
 import mmengine
 from mmengine.dist import get_dist_info
-from mmengine.fileio import FileClient, get_file_backend
+from mmengine.fileio import FileClient, LocalBackend, get_file_backend
 from mmengine.fileio import load as load_file
 from mmengine.logging import print_log
 from mmengine.model import BaseTTAModel, is_model_wrapper
 from mmengine.utils import (apply_to, deprecated_function, digit_version,
                             mkdir_or_exist)
-from mmengine.utils.dl_utils import load_url
+from mmengine.utils.dl_utils import TORCH_VERSION, load_url
 import socket
 
 # `MMENGINE_HOME` is the highest priority directory to save checkpoints
@@ -37,6 +40,9 @@ import socket
 ENV_MMENGINE_HOME = 'MMENGINE_HOME'
 ENV_XDG_CACHE_HOME = 'XDG_CACHE_HOME'
 DEFAULT_CACHE_DIR = '~/.cache'
+# Local checkpoints are memory-mapped so that only the tensors that are used
+# are read. Set `MMENGINE_CHECKPOINT_MMAP=0` to read the whole file instead.
+ENV_MMENGINE_CHECKPOINT_MMAP = 'MMENGINE_CHECKPOINT_MMAP'
 
 
 class _IncompatibleKeys(
@@ -337,10 +343,54 @@ class CheckpointLoader:
         return checkpoint_loader(filename, map_location)
 
 
+def _is_lazy_loadable(filename, map_location):
+    """Whether ``filename`` can be memory-mapped by ``torch.load``."""
+    if os.environ.get(ENV_MMENGINE_CHECKPOINT_MMAP, '1') == '0':
+        return False
+    if digit_version(TORCH_VERSION) < digit_version('2.1.0'):
+        return False
+    # the mapped storages live on the cpu
+    if map_location is not None and (
+            not isinstance(map_location, (str, torch.device))
+            or torch.device(map_location).type != 'cpu'):
+        return False
+    # only the zipfile serialization format can be mapped
+    return zipfile.is_zipfile(filename)
+
+
+def get_peak_rss():
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        float, optional: The peak RSS in GB, or None if it is unknown.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS and kilobytes on Linux
+    if sys.platform == 'darwin':
+        return peak_rss / 1024**3
+    return peak_rss / 1024**2
+
+
+def _log_peak_rss(filename, logger=None):
+    peak_rss = get_peak_rss()
+    if peak_rss is not None:
+        print_log(
+            f'Loaded {filename}, peak RSS of the process: {peak_rss:.2f} GB',
+            logger=logger or 'current')
+
+
 @CheckpointLoader.register_scheme(prefixes='')
 def load_from_local(filename, map_location):
     """load checkpoint by local file path.
 
+    Checkpoints in the zipfile format are memory-mapped when they are loaded
+    to the cpu, so the tensors are only read from the disk when they are
+    accessed, e.g. when they are copied into the model.
+
     Args:
         filename (str): local checkpoint file path
         map_location (str, optional): Same as :func:`torch.load`.
@@ -349,9 +399,15 @@ def load_from_local(filename, map_location):
         dict or OrderedDict: The loaded checkpoint.
     """
     filename = osp.expanduser(filename)
-    if not osp.isfile(filename):
+    if osp.isdir(filename):
+        checkpoint = load_sharded_checkpoint(filename, map_location)
+    elif not osp.isfile(filename):
         raise FileNotFoundError(f'{filename} can not be found.')
-    checkpoint = torch.load(filename, map_location=map_location)
+    elif _is_lazy_loadable(filename, map_location):
+        checkpoint = torch.load(
+            filename, map_location=map_location, mmap=True)
+    else:
+        checkpoint = torch.load(filename, map_location=map_location)
     server_name = socket.gethostname().split('.')[0]
     print(f'Done: Loaded checkpoint from {filename} on server: {server_name}')
     return checkpoint
@@ -571,8 +627,12 @@ def _load_checkpoint_with_prefix(prefix, filename, map_location=None):
     Returns:
         dict or OrderedDict: The loaded checkpoint.
     """
-
-    checkpoint = _load_checkpoint(filename, map_location=map_location)
+    # map a local file lazily to the cpu and only move the selected tensors
+    lazy = isinstance(map_location, (str, torch.device)) and osp.isfile(
+        osp.expanduser(filename)) and _is_lazy_loadable(
+            osp.expanduser(filename), 'cpu')
+    checkpoint = _load_checkpoint(
+        filename, map_location='cpu' if lazy else map_location)
 
     if 'state_dict' in checkpoint:
         state_dict = checkpoint['state_dict']
@@ -583,7 +643,7 @@ def _load_checkpoint_with_prefix(prefix, filename, map_location=None):
     prefix_len = len(prefix)
 
     state_dict = {
-        k[prefix_len:]: v
+        k[prefix_len:]: v.to(map_location) if lazy else v
         for k, v in state_dict.items() if k.startswith(prefix)
     }
 
@@ -625,6 +685,11 @@ def load_checkpoint(model,
                     revise_keys=[(r'^module\.', '')]):
     """Load checkpoint from a file or URI.
 
+    Local checkpoints loaded to the cpu are memory-mapped, so the tensors
+    that are not in the model (e.g. the optimizer states) are never read and
+    every used tensor is copied straight into the device and dtype of the
+    corresponding model parameter. The peak RSS of the process is logged.
+
     Args:
         model (Module): Module to load checkpoint.
         filename (str): Accept local filepath, URL, ``torchvision://xxx``,
@@ -648,8 +713,10 @@ def load_checkpoint(model,
         raise RuntimeError(
             f'No state_dict found in checkpoint file {filename}')
 
-    return _load_checkpoint_to_model(model, checkpoint, strict, logger,
-                                     revise_keys)
+    checkpoint = _load_checkpoint_to_model(model, checkpoint, strict, logger,
+                                           revise_keys)
+    _log_peak_rss(filename, logger)
+    return checkpoint
 
 
 def weights_to_cpu(state_dict):
@@ -797,9 +864,218 @@ def save_checkpoint(checkpoint,
         else:
             file_backend = file_client
 
-        with io.BytesIO() as f:
+        if isinstance(file_backend, LocalBackend):
+            # stream to the disk instead of serializing into memory first
+            _save_to_local(checkpoint, filename)
+        else:
+            with io.BytesIO() as f:
+                torch.save(checkpoint, f)
+                file_backend.put(f.getvalue(), filename)
+
+
+def _save_to_local(checkpoint, filename):
+    """Save a checkpoint to a temporary file and atomically rename it, so
+    that ``filename`` is either missing or complete."""
+    filename = osp.expanduser(str(filename))
+    mkdir_or_exist(osp.dirname(osp.abspath(filename)))
+    tmp_filename = f'{filename}.tmp.{os.getpid()}'
+    try:
+        with open(tmp_filename, 'wb') as f:
             torch.save(checkpoint, f)
-            file_backend.put(f.getvalue(), filename)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    finally:
+        if osp.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+
+_SHARD_TMPL = 'rank_{}-of-{}.pth'
+
+
+def shard_checkpoint(checkpoint, rank, world_size):
+    """Keep the tensors of a checkpoint that are saved by ``rank``.
+
+    Tensors are assigned to ranks greedily by size so that every rank writes
+    a similar amount of data. The tensors of the other ranks are replaced by
+    ``None`` and the rest of the checkpoint is kept on every rank.
+
+    Args:
+        checkpoint (dict): The full checkpoint.
+        rank (int): Rank of the current process.
+        world_size (int): Number of processes.
+
+    Returns:
+        dict: The shard of ``rank``.
+    """
+    loads = [0] * world_size
+    owners = []
+
+    def assign(x):
+        owner = loads.index(min(loads))
+        loads[owner] += x.numel() * x.element_size()
+        owners.append(owner)
+        return x
+
+    # tensors are visited in the same order on every rank
+    apply_to(checkpoint, lambda x: isinstance(x, torch.Tensor), assign)
+    owners = iter(owners)
+    shard = apply_to(checkpoint, lambda x: isinstance(x, torch.Tensor),
+                     lambda x: x if next(owners) == rank else None)
+    _copy_metadata(checkpoint, shard)
+    return shard
+
+
+def _copy_metadata(src, dst):
+    """Copy the ``_metadata`` of the state dict that ``apply_to`` drops."""
+    if hasattr(src.get('state_dict'), '_metadata'):
+        dst['state_dict']._metadata = src['state_dict']._metadata
+
+
+def _merge_shards(shards):
+    first = shards[0]
+    if isinstance(first, dict):
+        merged = type(first)()
+        for key in first:
+            merged[key] = _merge_shards([shard[key] for shard in shards])
+        if hasattr(first, '_metadata'):
+            merged._metadata = first._metadata
+        return merged
+    elif isinstance(first, (list, tuple)) and not hasattr(first, '_fields'):
+        return type(first)(
+            _merge_shards(values) for values in zip(*shards))
+    for shard in shards:
+        if shard is not None:
+            return shard
+    return None
+
+
+def load_sharded_checkpoint(dirname, map_location=None):
+    """Load a checkpoint saved by :func:`save_checkpoint` with
+    ``shard_per_rank=True``.
+
+    Args:
+        dirname (str): The checkpoint directory with one file per rank.
+        map_location (str, optional): Same as :func:`torch.load`.
+
+    Returns:
+        dict: The merged checkpoint.
+    """
+    names = sorted(
+        name for name in os.listdir(dirname)
+        if re.fullmatch(r'rank_\d+-of-\d+\.pth', name))
+    if not names:
+        raise FileNotFoundError(f'{dirname} has no checkpoint shards.')
+    world_size = int(re.search(r'-of-(\d+)', names[0]).group(1))
+    filenames = [
+        osp.join(dirname, _SHARD_TMPL.format(rank, world_size))
+        for rank in range(world_size)
+    ]
+    missing = [f for f in filenames if not osp.isfile(f)]
+    if missing:
+        raise FileNotFoundError(
+            f'The sharded checkpoint {dirname} is incomplete, {missing} can '
+            'not be found.')
+    return _merge_shards(
+        [torch.load(f, map_location=map_location) for f in filenames])
+
+
+class AsyncCheckpointSaver:
+    """Save checkpoints in a background thread.
+
+    :meth:`save` copies the tensors of the checkpoint into reusable (pinned if
+    CUDA is available) host buffers with non-blocking copies and returns.
+    The background thread waits for the copies, streams the checkpoint to a
+    temporary file and renames it. Only one save is in flight at a time, a
+    new :meth:`save` waits for the previous one, so that the host memory is
+    bounded by one snapshot. Errors of the background thread are raised by
+    the next :meth:`save` or :meth:`wait`.
+
+    Args:
+        pin_memory (bool): Whether to use pinned host buffers when CUDA is
+            available. Defaults to True.
+    """
+
+    def __init__(self, pin_memory: bool = True):
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._buffers: list = []
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _snapshot(self, checkpoint):
+        index = 0
+
+        def copy(x):
+            nonlocal index
+            if index < len(self._buffers) and \
+                    self._buffers[index].shape == x.shape and \
+                    self._buffers[index].dtype == x.dtype:
+                buffer = self._buffers[index]
+            else:
+                buffer = torch.empty(
+                    x.shape,
+                    dtype=x.dtype,
+                    pin_memory=self.pin_memory and x.is_cuda)
+                if index < len(self._buffers):
+                    self._buffers[index] = buffer
+                else:
+                    self._buffers.append(buffer)
+            index += 1
+            buffer.copy_(x.detach(), non_blocking=True)
+            return buffer
+
+        snapshot = apply_to(checkpoint,
+                            lambda x: isinstance(x, torch.Tensor), copy)
+        _copy_metadata(checkpoint, snapshot)
+        del self._buffers[index:]
+
+        event = None
+        if torch.cuda.is_available():
+            event = torch.cuda.Event()
+            event.record()
+        return snapshot, event
+
+    def _write(self, snapshot, event, filename, callback):
+        try:
+            if event is not None:
+                event.synchronize()
+            _save_to_local(snapshot, filename)
+            if callback is not None:
+                callback()
+        except BaseException as e:
+            self._error = e
+
+    def save(self,
+             checkpoint: dict,
+             filename: str,
+             callback: Optional[Callable] = None) -> None:
+        """Snapshot ``checkpoint`` and write it to ``filename`` in the
+        background.
+
+        Args:
+            checkpoint (dict): The checkpoint, its tensors can be on any
+                device.
+            filename (str): Local path of the checkpoint.
+            callback (Callable, optional): Called without arguments in the
+                background thread after the checkpoint is written.
+                Defaults to None.
+        """
+        self.wait()
+        snapshot, event = self._snapshot(checkpoint)
+        self._thread = threading.Thread(
+            target=self._write,
+            args=(snapshot, event, filename, callback),
+            daemon=False)
+        self._thread.start()
+
+    def wait(self) -> None:
+        """Wait until the pending checkpoint is written."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
 
 
 def find_latest_checkpoint(path: str) -> Optional[str]:
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Sequence, Tuple, Union
 import torch
 from torch.utils.data import DataLoader
 
+from mmengine.dist import get_dist_info
 from mmengine.evaluator import Evaluator
 from mmengine.logging import print_log
 from mmengine.registry import LOOPS
@@ -21,6 +22,63 @@ from .utils import calc_dynamic_intervals
 import socket
 
 
+def _get_sampler(dataloader: DataLoader):
+    """The sampler of the dataloader, which is wrapped by its batch sampler
+    if there is one."""
+    batch_sampler = getattr(dataloader, 'batch_sampler', None)
+    if batch_sampler is not None and hasattr(batch_sampler, 'sampler'):
+        return batch_sampler.sampler
+    return getattr(dataloader, 'sampler', None)
+
+
+def _get_batch_size(dataloader: DataLoader) -> int:
+    batch_size = getattr(dataloader, 'batch_size', None)
+    if batch_size is None:
+        batch_size = getattr(dataloader.batch_sampler, 'batch_size', 1)
+    return batch_size
+
+
+def _dataloader_state_dict(dataloader: DataLoader,
+                           num_consumed: int) -> Optional[dict]:
+    """The state of the sampler of the dataloader and the number of samples
+    per rank consumed since it was last iterated, or None if the sampler has
+    no state."""
+    sampler = _get_sampler(dataloader)
+    if not hasattr(sampler, 'state_dict'):
+        return None
+    state_dict = sampler.state_dict()
+    state_dict['num_consumed'] = num_consumed
+    return state_dict
+
+
+def _load_dataloader_state_dict(dataloader: DataLoader,
+                                state_dict: dict) -> int:
+    """Load the state of :func:`_dataloader_state_dict` to the sampler of
+    the dataloader, so that its next iteration starts after the consumed
+    samples.
+
+    The sampler receives the saved ``num_consumed`` and ``world_size`` as
+    they are, so that it can rescale the position or refuse a world size it
+    cannot resume with.
+
+    Returns:
+        int: The number of consumed samples per rank, scaled to the current
+        world size.
+    """
+    sampler = _get_sampler(dataloader)
+    if not hasattr(sampler, 'load_state_dict'):
+        print_log(
+            f'{sampler.__class__.__name__} has no `load_state_dict`, the '
+            'data order restarts from the beginning of the epoch.',
+            logger='current',
+            level=logging.WARNING)
+        return 0
+    sampler.load_state_dict(state_dict)
+    _, world_size = get_dist_info()
+    return state_dict.get('num_consumed', 0) * state_dict.get(
+        'world_size', world_size) // world_size
+
+
 @LOOPS.register_module()
 class EpochBasedTrainLoop(BaseLoop):
     """Loop for epoch-based training.
@@ -54,6 +112,10 @@ class EpochBasedTrainLoop(BaseLoop):
         self._max_iters = self._max_epochs * len(self.dataloader)
         self._epoch = 0
         self._iter = 0
+        # the samples per rank consumed in the epoch, and the first batch
+        # index of an epoch resumed in the middle
+        self._num_consumed = 0
+        self._start_batch_idx = 0
         self.val_begin = val_begin
         self.val_interval = val_interval
         # This attribute will be updated by `EarlyStoppingHook`
@@ -116,12 +178,42 @@ class EpochBasedTrainLoop(BaseLoop):
 
         self.runner.model.train()
 
-        for idx, data_batch in enumerate(self.dataloader):
+        batch_size = _get_batch_size(self.dataloader)
+        for idx, data_batch in enumerate(self.dataloader,
+                                         self._start_batch_idx):
+            self._num_consumed = (idx + 1) * batch_size
             self.run_iter(idx, data_batch)
 
+        self._num_consumed = 0
+        self._start_batch_idx = 0
         self.runner.call_hook('after_train_epoch')
         self._epoch += 1
 
+    def dataloader_state_dict(self) -> Optional[dict]:
+        """The state of the sampler and the number of samples per rank
+        consumed in the current epoch, saved in the checkpoints to resume
+        the data order in the middle of an epoch.
+
+        Returns:
+            dict, optional: The state, or None if the sampler has no
+            ``state_dict``.
+        """
+        return _dataloader_state_dict(self.dataloader, self._num_consumed)
+
+    def load_dataloader_state_dict(self, state_dict: dict) -> None:
+        """Resume the data order of :meth:`dataloader_state_dict`, so that
+        the next batch is the one after the checkpoint.
+
+        Args:
+            state_dict (dict): The state of the dataloader.
+        """
+        # a checkpoint saved at the end of an epoch resumes the next one
+        state_dict = dict(state_dict, epoch=self._epoch)
+        self._num_consumed = _load_dataloader_state_dict(
+            self.dataloader, state_dict)
+        self._start_batch_idx = self._num_consumed // _get_batch_size(
+            self.dataloader)
+
     def run_iter(self, idx, data_batch: Sequence[dict]) -> None:
         """Iterate one min-batch.
 
@@ -158,17 +250,36 @@ class _InfiniteDataloaderIterator:
     workers need to be restarted every time the dataloader is reset. It is
     recommended to use `mmengine.dataset.InfiniteSampler` to enable the
     dataloader to iterate infinitely.
+
+    The dataloader is iterated from the first call of ``next``, so that the
+    state of its sampler can be resumed with :meth:`load_state_dict` before.
     """
 
     def __init__(self, dataloader: DataLoader) -> None:
         self._dataloader = dataloader
-        self._iterator = iter(self._dataloader)
+        self._iterator = None
         self._epoch = 0
+        # the samples per rank consumed since the dataloader was restarted
+        self._num_consumed = 0
+        self._batch_size = _get_batch_size(dataloader)
 
     def __iter__(self):
         return self
 
+    def state_dict(self) -> Optional[dict]:
+        """The state of the sampler and the consumed samples."""
+        return _dataloader_state_dict(self._dataloader, self._num_consumed)
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        """Resume the state of :meth:`state_dict`."""
+        self._epoch = state_dict.get('epoch', 0)
+        self._num_consumed = _load_dataloader_state_dict(
+            self._dataloader, state_dict)
+        self._iterator = None
+
     def __next__(self) -> Sequence[dict]:
+        if self._iterator is None:
+            self._iterator = iter(self._dataloader)
         try:
             data = next(self._iterator)
         except StopIteration:
@@ -195,7 +306,9 @@ class _InfiniteDataloaderIterator:
                 self._dataloader.batch_sampler.sampler.set_epoch(self._epoch)
             time.sleep(2)  # Prevent possible deadlock during epoch transition
             self._iterator = iter(self._dataloader)
+            self._num_consumed = 0
             data = next(self._iterator)
+        self._num_consumed += self._batch_size
         return data
 
 
@@ -274,6 +387,27 @@ class IterBasedTrainLoop(BaseLoop):
         """int: Current iteration."""
         return self._iter
 
+    def dataloader_state_dict(self) -> Optional[dict]:
+        """The state of the sampler and the number of samples per rank
+        consumed since the dataloader was last restarted, saved in the
+        checkpoints to resume the data order.
+
+        Returns:
+            dict, optional: The state, or None if the sampler has no
+            ``state_dict``.
+        """
+        return self.dataloader_iterator.state_dict()
+
+    def load_dataloader_state_dict(self, state_dict: dict) -> None:
+        """Resume the data order of :meth:`dataloader_state_dict`, so that
+        the next batch is the one after the checkpoint, without iterating
+        the dataloader over the consumed batches.
+
+        Args:
+            state_dict (dict): The state of the dataloader.
+        """
+        self.dataloader_iterator.load_state_dict(state_dict)
+
     def run(self) -> None:
         """Launch training."""
         self.runner.call_hook('before_train')
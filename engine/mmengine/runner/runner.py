@@ -49,9 +49,9 @@ from mmengine.utils.dl_utils import (TORCH_VERSION, collect_env,
 from mmengine.visualization import Visualizer
 from .activation_checkpointing import turn_on_activation_checkpointing
 from .base_loop import BaseLoop
-from .checkpoint import (_load_checkpoint, _load_checkpoint_to_model,
-                         find_latest_checkpoint, save_checkpoint,
-                         weights_to_cpu)
+from .checkpoint import (_SHARD_TMPL, AsyncCheckpointSaver, _load_checkpoint,
+                         _load_checkpoint_to_model, find_latest_checkpoint,
+                         save_checkpoint, shard_checkpoint)
 from .log_processor import LogProcessor
 from .loops import EpochBasedTrainLoop, IterBasedTrainLoop, TestLoop, ValLoop
 from .priority import Priority, get_priority
@@ -2073,6 +2073,12 @@ class Runner:
 
         self.message_hub.load_state_dict(checkpoint['message_hub'])
 
+        # resume the data order in the middle of an epoch
+        dataloader_state = checkpoint['meta'].get('dataloader_state', None)
+        if dataloader_state is not None and hasattr(
+                self.train_loop, 'load_dataloader_state_dict'):
+            self.train_loop.load_dataloader_state_dict(dataloader_state)
+
         # resume optimizer
         if 'optimizer' in checkpoint and resume_optimizer:
             self.optim_wrapper = self.build_optim_wrapper(self.optim_wrapper)
@@ -2142,7 +2148,6 @@ class Runner:
 
         return checkpoint
 
-    @master_only
     def save_checkpoint(
         self,
         out_dir: str,
@@ -2153,6 +2158,9 @@ class Runner:
         meta: Optional[dict] = None,
         by_epoch: bool = True,
         backend_args: Optional[dict] = None,
+        async_saver: Optional[AsyncCheckpointSaver] = None,
+        shard_per_rank: bool = False,
+        callback: Optional[Callable] = None,
     ):
         """Save checkpoints.
 
@@ -2177,7 +2185,20 @@ class Runner:
             backend_args (dict, optional): Arguments to instantiate the
                 prefix of uri corresponding backend. Defaults to None.
                 New in v0.2.0.
+            async_saver (AsyncCheckpointSaver, optional): If given, the
+                checkpoint is snapshotted and written in the background.
+                Only local paths are supported. Defaults to None.
+            shard_per_rank (bool): Whether every rank writes a part of the
+                tensors to ``filename/rank_{rank}-of-{world_size}.pth``
+                instead of the main process writing the whole checkpoint.
+                Defaults to False.
+            callback (Callable, optional): Called without arguments after the
+                checkpoint (or the shard of this rank) is written.
+                Defaults to None.
         """
+        if not shard_per_rank and self.rank != 0:
+            return
+
         if meta is None:
             meta = {}
         elif not isinstance(meta, dict):
@@ -2220,26 +2241,42 @@ class Runner:
         if hasattr(self.train_dataloader.dataset, 'metainfo'):
             meta.update(dataset_meta=self.train_dataloader.dataset.metainfo)
 
+        if isinstance(self._train_loop, BaseLoop) and hasattr(
+                self._train_loop, 'dataloader_state_dict'):
+            dataloader_state = self._train_loop.dataloader_state_dict()
+            if dataloader_state is not None:
+                meta.update(dataloader_state=dataloader_state)
+
         if is_model_wrapper(self.model):
             model = self.model.module
         else:
             model = self.model
 
+        if async_saver is not None:
+            # the saver copies the tensors to the host without blocking
+            def to_cpu(x):
+                return x
+        else:
+
+            def to_cpu(x):
+                return apply_to(x, lambda x: hasattr(x, 'cpu'),
+                                lambda x: x.cpu())
+
+        state_dict = model.state_dict()
+        metadata = getattr(state_dict, '_metadata', OrderedDict())
+        state_dict = to_cpu(state_dict)
+        state_dict._metadata = metadata
+
         checkpoint = {
-            'meta':
-            meta,
-            'state_dict':
-            weights_to_cpu(model.state_dict()),
-            'message_hub':
-            apply_to(self.message_hub.state_dict(),
-                     lambda x: hasattr(x, 'cpu'), lambda x: x.cpu()),
+            'meta': meta,
+            'state_dict': state_dict,
+            'message_hub': to_cpu(self.message_hub.state_dict()),
         }
         # save optimizer state dict to checkpoint
         if save_optimizer:
             if isinstance(self.optim_wrapper, OptimWrapper):
-                checkpoint['optimizer'] = apply_to(
-                    self.optim_wrapper.state_dict(),
-                    lambda x: hasattr(x, 'cpu'), lambda x: x.cpu())
+                checkpoint['optimizer'] = to_cpu(
+                    self.optim_wrapper.state_dict())
             else:
                 raise TypeError(
                     'self.optim_wrapper should be an `OptimWrapper` '
@@ -2267,11 +2304,23 @@ class Runner:
                     checkpoint['param_schedulers'].append(state_dict)
 
         self.call_hook('before_save_checkpoint', checkpoint=checkpoint)
-        save_checkpoint(
-            checkpoint,
-            filepath,
-            file_client_args=file_client_args,
-            backend_args=backend_args)
+
+        if shard_per_rank:
+            checkpoint = shard_checkpoint(checkpoint, self.rank,
+                                          self.world_size)
+            filepath = osp.join(
+                filepath, _SHARD_TMPL.format(self.rank, self.world_size))
+
+        if async_saver is not None:
+            async_saver.save(checkpoint, filepath, callback=callback)
+        else:
+            save_checkpoint(
+                checkpoint,
+                filepath,
+                file_client_args=file_client_args,
+                backend_args=backend_args)
+            if callback is not None:
+                callback()
 
     @master_only
     def dump_config(self) -> None:
@@ -4,6 +4,7 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+from .lazy_import import import_lazy_module, lazy_import
 from .manager import ManagerMeta, ManagerMixin
 from .misc import (apply_to, check_prerequisites, concat_list,
                    deprecated_api_warning, deprecated_function,
@@ -35,5 +36,6 @@ __all__ = [
     'get_git_hash', 'ManagerMeta', 'ManagerMixin', 'Timer', 'check_time',
     'TimerError', 'ProgressBar', 'track_iter_progress',
     'track_parallel_progress', 'track_progress', 'deprecated_function',
-    'apply_to', 'track_progress_rich', 'get_object_from_string'
+    'apply_to', 'track_progress_rich', 'get_object_from_string',
+    'lazy_import', 'import_lazy_module'
 ]
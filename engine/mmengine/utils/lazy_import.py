@@ -0,0 +1,90 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+
+def lazy_import(
+    name: str, submodules: Dict[str, Union[Sequence[str], str]]
+) -> Tuple[Callable, Callable, List[str]]:
+    """Import the attributes of a package from its submodules on first
+    access.
+
+    Replaces the ``from .submodule import Attr`` lines of a package
+    ``__init__``, so that importing the package, or one module inside it,
+    does not import all the other modules (:pep:`562`).
+
+    Examples:
+        >>> # mmseg/models/backbones/__init__.py
+        >>> __getattr__, __dir__, __all__ = lazy_import(__name__, {
+        >>>     'resnet': ['ResNet', 'ResNetV1c', 'ResNetV1d'],
+        >>>     'vit': ['VisionTransformer'],
+        >>> })
+        >>> # mmseg/models/__init__.py
+        >>> __getattr__, __dir__, __all__ = lazy_import(__name__, {
+        >>>     'backbones': '*',
+        >>> })
+
+    Args:
+        name (str): ``__name__`` of the package.
+        submodules (dict): Maps the submodules, relative to the package, to
+            the attributes imported from them. ``'*'`` takes the
+            ``__all__`` of a submodule, which imports it right away and so
+            should only be used for lazy packages.
+
+    Returns:
+        tuple: The ``__getattr__``, ``__dir__`` and ``__all__`` of the
+        package.
+    """
+    package = sys.modules[name]
+    attr_to_submodule = dict()
+    for submodule, attrs in submodules.items():
+        if attrs == '*':
+            attrs = import_module(f'{name}.{submodule}').__all__
+        for attr in attrs:
+            attr_to_submodule[attr] = submodule
+    package.__lazy_submodules__ = list(submodules)
+
+    def __getattr__(attr: str):
+        if attr in attr_to_submodule:
+            module = import_module(f'{name}.{attr_to_submodule[attr]}')
+            value = getattr(module, attr)
+        elif attr in submodules:
+            value = import_module(f'{name}.{attr}')
+        else:
+            raise AttributeError(
+                f'module {name!r} has no attribute {attr!r}')
+        # later accesses do not go through `__getattr__`
+        setattr(package, attr, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(package)) | set(attr_to_submodule))
+
+    return __getattr__, __dir__, list(attr_to_submodule)
+
+
+def import_lazy_module(module: Union[ModuleType, str]) -> ModuleType:
+    """Import a package and all the submodules that it imports lazily with
+    :func:`lazy_import`, recursively.
+
+    Registering the modules of a package, e.g. in ``register_all_modules``,
+    needs all of them to be imported.
+
+    Args:
+        module (ModuleType | str): The package or its name.
+
+    Returns:
+        ModuleType: The imported package.
+    """
+    if isinstance(module, str):
+        module = import_module(module)
+    for submodule in getattr(module, '__lazy_submodules__', []):
+        import_lazy_module(f'{module.__name__}.{submodule}')
+    return module
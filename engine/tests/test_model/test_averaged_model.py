@@ -0,0 +1,83 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import copy
+from unittest import TestCase
+
+import torch
+import torch.nn as nn
+
+from mmengine.model import ExponentialMovingAverage, MomentumAnnealingEMA
+
+
+class StepMomentumEMA(ExponentialMovingAverage):
+    """An EMA that only overrides ``avg_func``, like the ``CosineEMA`` and
+    ``ExpMomentumEMA`` of the downstream packages."""
+
+    def avg_func(self, averaged_param, source_param, steps):
+        momentum = 0.5 / steps
+        averaged_param.mul_(1 - momentum).add_(source_param, alpha=momentum)
+
+
+class TestExponentialMovingAverage(TestCase):
+
+    def test_update_parameters(self):
+        model = nn.Sequential(nn.Conv2d(1, 3, 3), nn.Linear(3, 2))
+        ema = ExponentialMovingAverage(model, momentum=0.1)
+        expected = copy.deepcopy(model)
+        for step in range(4):
+            ema.update_parameters(model)
+            with torch.no_grad():
+                for p_exp, p in zip(expected.parameters(),
+                                    model.parameters()):
+                    if step == 0:
+                        p_exp.copy_(p)
+                    else:
+                        p_exp.mul_(0.9).add_(p, alpha=0.1)
+                    p.add_(torch.randn_like(p))
+        for p_exp, p_avg in zip(expected.parameters(),
+                                ema.module.parameters()):
+            torch.testing.assert_close(p_avg, p_exp)
+
+    def test_subclass_avg_func(self):
+        # the fused update must not bypass an overridden avg_func
+        torch.manual_seed(0)
+        model = nn.Sequential(nn.Conv2d(1, 3, 3), nn.Linear(3, 2))
+        ema = StepMomentumEMA(model)
+        expected = copy.deepcopy(model)
+        for step in range(4):
+            ema.update_parameters(model)
+            with torch.no_grad():
+                for p_exp, p in zip(expected.parameters(),
+                                    model.parameters()):
+                    if step == 0:
+                        p_exp.copy_(p)
+                    else:
+                        momentum = 0.5 / step
+                        p_exp.mul_(1 - momentum).add_(p, alpha=momentum)
+                    p.add_(torch.randn_like(p))
+        for p_exp, p_avg in zip(expected.parameters(),
+                                ema.module.parameters()):
+            torch.testing.assert_close(p_avg, p_exp)
+
+    def test_momentum_annealing(self):
+        # the fused update of a subclass matches its avg_func
+        torch.manual_seed(0)
+        model = nn.Sequential(nn.Conv2d(1, 3, 3), nn.Linear(3, 2))
+        ema = MomentumAnnealingEMA(model, momentum=0.01, gamma=4)
+        ema_ref = MomentumAnnealingEMA(model, momentum=0.01, gamma=4)
+        ema_ref.foreach_avg_func = lambda averaged, source, steps: [
+            ema_ref.avg_func(a, s, steps) for a, s in zip(averaged, source)
+        ]
+        for _ in range(4):
+            ema.update_parameters(model)
+            ema_ref.update_parameters(model)
+            with torch.no_grad():
+                for p in model.parameters():
+                    p.add_(torch.randn_like(p))
+        for p_ref, p_avg in zip(ema_ref.module.parameters(),
+                                ema.module.parameters()):
+            torch.testing.assert_close(p_avg, p_ref)
@@ -0,0 +1,515 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Batch-size and throughput tuner.
+
+The tuner runs a model on synthetic batches of growing size and picks the
+batch size with the highest measured throughput that stays under an
+optional latency and memory ceiling. The batch size doubles until a trial
+runs out of memory, breaks a ceiling or stops improving the throughput. If
+a ceiling stopped the growth, a binary search refines the boundary. It can
+also compare several (dtype, compile mode) candidates. Exported checkpoints
+only accept batches up to the max of their dynamic batch dimension, which
+caps the search; a batch that fails the shape guards of a model counts as
+a ceiling like an out-of-memory error.
+
+Decisions are cached in ``<cache_dir>/batch_tuner.json`` per model, device,
+input shape, candidates and ceilings, so only the first job pays for the
+search. On cpu the memory ceiling is emulated from the peak resident set
+size of the process, which is reset before every trial.
+
+The lite demos call :func:`tune_batch_size` for ``--batch-size auto``. Any
+other model works through :class:`BatchSizeTuner` with a ``build_fn``, e.g.
+``tools/analysis_tools/optimal_batch_size.py`` for mmengine models.
+
+Example:
+    # tune a lite checkpoint, at most 20GB and 500ms per batch
+    python demo/batch_tuner.py $CHECKPOINT --max-memory 20 --max-latency 500
+
+    # cpu-only check with a tiny exported model and an emulated 2GB ceiling
+    python demo/batch_tuner.py --dummy --device cpu --dtype float32 \
+        --shape 256 192 --max-memory 2
+"""
+
+import gc
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+import torch
+
+from compile_cache import DTYPES, _atomic_write_json, dtype_name, file_digest
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sapiens_lite")
+
+
+def batch_size_arg(value):
+    """``argparse`` type of ``--batch-size``: a positive int or ``auto``."""
+    if value == "auto":
+        return value
+    return int(value)
+
+
+def is_oom_error(exception):
+    message = str(exception)
+    return isinstance(exception, torch.cuda.OutOfMemoryError) or (
+        isinstance(exception, RuntimeError)
+        and (
+            "out of memory" in message
+            or "DefaultCPUAllocator: can't allocate memory" in message
+        )
+    )
+
+
+def is_shape_error(exception):
+    """Whether an exported program rejected the shape of its input."""
+    message = str(exception)
+    return isinstance(exception, (AssertionError, RuntimeError)) and (
+        "Guard failed" in message or "Expected input at" in message
+    )
+
+
+def exported_max_batch_size(checkpoint):
+    """The largest batch size an exported checkpoint accepts.
+
+    Returns:
+        int, optional: The max of the batch dimension of the first input, or
+        None if it is unbounded or the checkpoint is not an exported program.
+    """
+    if "_torchscript" in checkpoint:
+        return None
+    exported = torch.export.load(checkpoint)
+    name = exported.graph_signature.user_inputs[0]
+    node = next(
+        n for n in exported.graph.nodes if n.op == "placeholder" and n.name == name
+    )
+    batch = node.meta["val"].shape[0]
+    if isinstance(batch, int):
+        return batch
+    try:
+        return int(exported.range_constraints[batch.node.expr].upper)
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+
+
+def _proc_status_bytes(field):
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def reset_peak_memory(device):
+    """Free cached memory and restart the peak memory counter of a device."""
+    gc.collect()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        torch.cuda.empty_cache()
+        torch.cuda.reset_peak_memory_stats(device)
+        return
+    try:
+        # resets VmHWM, the peak resident set size (linux >= 4.0)
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_memory(device):
+    """Peak memory in bytes since :func:`reset_peak_memory`.
+
+    On cuda this is the memory reserved by the caching allocator, on cpu the
+    peak resident set size of the process.
+    """
+    if device.type == "cuda":
+        return torch.cuda.max_memory_reserved(device)
+    try:
+        return _proc_status_bytes("VmHWM")
+    except OSError:
+        return 0
+
+
+def _synchronize(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def device_name(device):
+    if device.type == "cuda":
+        return torch.cuda.get_device_name(device).replace(" ", "-")
+    return f"cpu{os.cpu_count()}"
+
+
+class BatchSizeTuner:
+    """Search the batch size with the highest throughput under ceilings.
+
+    Args:
+        input_shape (tuple): The (C, H, W) input shape.
+        device (str): The device to tune on.
+        max_batch_size (int): The largest batch size to try. Defaults to 256.
+        max_latency (float, optional): The latency ceiling per batch in
+            seconds. Defaults to None.
+        max_memory (int, optional): The memory ceiling in bytes. Defaults to
+            None, which only stops at an out-of-memory error.
+        warmup (int): Untimed iterations per trial. Defaults to 2.
+        iters (int): Timed iterations per trial. Defaults to 5.
+        min_gain (float): Relative throughput gain for a larger batch size
+            to count as an improvement. Among batch sizes within this margin
+            of the best throughput the smallest one is picked.
+            Defaults to 0.03.
+        patience (int): Stop doubling after this many doublings without
+            improvement. Defaults to 2.
+        cache_dir (str, optional): Where decisions are cached. Defaults to
+            None, which disables the cache.
+    """
+
+    def __init__(
+        self,
+        input_shape,
+        device,
+        max_batch_size=256,
+        max_latency=None,
+        max_memory=None,
+        warmup=2,
+        iters=5,
+        min_gain=0.03,
+        patience=2,
+        cache_dir=None,
+    ):
+        self.input_shape = tuple(input_shape)
+        self.device = torch.device(device)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_memory = max_memory
+        self.warmup = warmup
+        self.iters = iters
+        self.min_gain = min_gain
+        self.patience = patience
+        self.cache_dir = cache_dir
+
+    def measure(self, forward_fn, batch_size, dtype):
+        """Time ``forward_fn`` on one synthetic batch.
+
+        Returns:
+            dict: The batch size, the median latency in seconds, the
+            throughput in images per second, the peak memory in bytes and
+            whether the trial fits the ceilings.
+        """
+        trial = dict(batch_size=batch_size, fits=False)
+        inputs = None
+        reset_peak_memory(self.device)
+        try:
+            inputs = torch.randn(
+                batch_size, *self.input_shape, device=self.device
+            ).to(dtype)
+            times = []
+            with torch.inference_mode():
+                for i in range(self.warmup + self.iters):
+                    _synchronize(self.device)
+                    start = time.perf_counter()
+                    forward_fn(inputs)
+                    _synchronize(self.device)
+                    if i >= self.warmup:
+                        times.append(time.perf_counter() - start)
+        except (RuntimeError, AssertionError) as exception:
+            if is_oom_error(exception):
+                trial["reason"] = "out of memory"
+            elif is_shape_error(exception):
+                trial["reason"] = "batch size not accepted by the model"
+            else:
+                raise
+            return trial
+        finally:
+            del inputs
+            trial["peak_memory"] = peak_memory(self.device)
+            reset_peak_memory(self.device)
+
+        latency = sorted(times)[len(times) // 2]
+        trial.update(latency=latency, throughput=batch_size / latency)
+        if self.max_memory is not None and trial["peak_memory"] > self.max_memory:
+            trial["reason"] = "memory ceiling"
+        elif self.max_latency is not None and latency > self.max_latency:
+            trial["reason"] = "latency ceiling"
+        else:
+            trial["fits"] = True
+        return trial
+
+    def search(self, forward_fn, dtype, verbose=True):
+        """Find the best batch size for one model.
+
+        Returns:
+            dict: The best trial, with all trials under ``trials``.
+        """
+        trials = {}
+
+        def fits(batch_size):
+            if batch_size not in trials:
+                trial = self.measure(forward_fn, batch_size, dtype)
+                trials[batch_size] = trial
+                if verbose:
+                    print(_format_trial(trial), flush=True)
+            return trials[batch_size]["fits"]
+
+        low, high, batch_size = 0, None, 1
+        best, stale = 0.0, 0
+        while True:
+            if not fits(batch_size):
+                high = batch_size
+                break
+            low = batch_size
+            throughput = trials[batch_size]["throughput"]
+            if throughput > best * (1 + self.min_gain):
+                best, stale = throughput, 0
+            else:
+                stale += 1
+            if stale >= self.patience or batch_size >= self.max_batch_size:
+                break
+            batch_size = min(batch_size * 2, self.max_batch_size)
+
+        assert low > 0, (
+            f"batch size 1 does not fit: {trials[1].get('reason')}, "
+            f"peak memory {trials[1]['peak_memory'] / 2**30:.2f}GB"
+        )
+        # a ceiling stopped the growth while the throughput was improving
+        if high is not None and stale == 0:
+            while high - low > max(1, low // 8):
+                mid = (low + high) // 2
+                if fits(mid):
+                    low = mid
+                else:
+                    high = mid
+
+        fitting = [trial for trial in trials.values() if trial["fits"]]
+        best = max(trial["throughput"] for trial in fitting)
+        choice = min(
+            (t for t in fitting if t["throughput"] >= best * (1 - self.min_gain)),
+            key=lambda t: t["batch_size"],
+        )
+        return dict(choice, trials=sorted(trials.values(), key=lambda t: t["batch_size"]))
+
+    def cache_key(self, model_key, candidates):
+        """The key of a decision in the cache file."""
+        shape = "x".join(str(s) for s in self.input_shape)
+        candidates = ",".join(f"{dtype_name(d)}:{mode}" for d, mode in candidates)
+        version = torch.__version__.split("+")[0]
+        return (
+            f"{model_key}_{device_name(self.device)}_{shape}_{candidates}_"
+            f"max{self.max_batch_size}_lat{self.max_latency}_mem{self.max_memory}_"
+            f"torch{version}"
+        )
+
+    def tune(self, build_fn, candidates, model_key=None, verbose=True):
+        """Pick the batch size, dtype and compile mode with the highest
+        throughput.
+
+        Args:
+            build_fn (callable): ``build_fn(dtype, compile_mode)`` returns the
+                forward function of the model, called with an input batch.
+            candidates (list[tuple]): The (dtype, compile mode) pairs to
+                compare. A compile mode of None runs the model eagerly.
+            model_key (str, optional): Identifies the model in the cache,
+                e.g. the checkpoint digest. Defaults to None, which disables
+                the cache.
+
+        Returns:
+            dict: ``batch_size``, ``dtype``, ``compile_mode`` and the measured
+            ``throughput``, ``latency`` and ``peak_memory`` of the decision.
+        """
+        cache_file = None
+        if self.cache_dir and model_key:
+            cache_file = os.path.join(self.cache_dir, "batch_tuner.json")
+            key = self.cache_key(model_key, candidates)
+            cache = _load_json(cache_file)
+            if key in cache:
+                if verbose:
+                    print(f"Using the cached batch size decision {key}")
+                return cache[key]
+
+        decision = None
+        for dtype, compile_mode in candidates:
+            if verbose:
+                print(f"Tuning {dtype_name(dtype)}, compile mode {compile_mode}")
+            result = self.search(build_fn(dtype, compile_mode), dtype, verbose)
+            if decision is None or result["throughput"] > decision["throughput"]:
+                decision = dict(
+                    batch_size=result["batch_size"],
+                    dtype=dtype_name(dtype),
+                    compile_mode=compile_mode,
+                    throughput=result["throughput"],
+                    latency=result["latency"],
+                    peak_memory=result["peak_memory"],
+                )
+            if compile_mode is not None:
+                torch._dynamo.reset()
+
+        if cache_file is not None:
+            # re-read so that concurrent tuners do not drop each other's keys
+            cache = _load_json(cache_file)
+            cache[key] = decision
+            _atomic_write_json(cache_file, cache)
+        return decision
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _format_trial(trial):
+    text = f"batch size {trial['batch_size']:>4}: "
+    if "throughput" in trial:
+        text += (
+            f"{trial['throughput']:8.2f} img/s, {trial['latency'] * 1000:8.1f} ms, "
+        )
+    text += f"peak {trial['peak_memory'] / 2**30:6.2f}GB"
+    if not trial["fits"]:
+        text += f" ({trial['reason']})"
+    return text
+
+
+def load_lite_model(checkpoint, dtype, device):
+    """Load a lite checkpoint on any device, see ``cpu_backend.py`` for cpu."""
+    if torch.device(device).type == "cpu":
+        from cpu_backend import load_cpu_model
+
+        return load_cpu_model(checkpoint, dtype, compile=False)[0]
+    if "_torchscript" in checkpoint:
+        return torch.jit.load(checkpoint, map_location=device)
+    return torch.export.load(checkpoint).module().to(device).to(dtype)
+
+
+def build_lite_forward(checkpoint, device, dtype, compile_mode=None):
+    model = load_lite_model(checkpoint, dtype, device)
+    if compile_mode is not None:
+        model = torch.compile(model, mode=compile_mode, fullgraph=True)
+    return model
+
+
+def tune_batch_size(
+    checkpoint,
+    input_shape,
+    device,
+    fp16=False,
+    cache_dir=None,
+    max_memory=None,
+    max_latency=None,
+):
+    """The batch size of ``--batch-size auto`` in the lite demos.
+
+    The checkpoint runs eagerly at the dtype of the demo. The decision is
+    cached in ``cache_dir``, by default ``~/.cache/sapiens_lite``.
+
+    Args:
+        max_memory (float, optional): The memory ceiling in GB.
+        max_latency (float, optional): The latency ceiling per batch in ms.
+    """
+    if "_torchscript" in checkpoint:
+        dtype = torch.float32
+    elif torch.device(device).type == "cpu":
+        from cpu_backend import select_dtype
+
+        dtype = select_dtype()
+    else:
+        dtype = torch.half if fp16 else torch.bfloat16
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    tuner = BatchSizeTuner(
+        input_shape,
+        device,
+        max_batch_size=min(256, exported_max_batch_size(checkpoint) or 256),
+        max_latency=max_latency / 1000 if max_latency else None,
+        max_memory=int(max_memory * 2**30) if max_memory else None,
+        cache_dir=cache_dir,
+    )
+    decision = tuner.tune(
+        lambda dtype, mode: build_lite_forward(checkpoint, device, dtype, mode),
+        [(dtype, None)],
+        model_key=file_digest(checkpoint, cache_dir)[:16],
+    )
+    print(
+        f"Tuned batch size {decision['batch_size']}: "
+        f"{decision['throughput']:.2f} img/s, "
+        f"peak memory {decision['peak_memory'] / 2**30:.2f}GB"
+    )
+    return decision["batch_size"]
+
+
+def main():
+    parser = ArgumentParser(description="Tune the batch size of a lite checkpoint")
+    parser.add_argument("checkpoint", nargs="?", default="", help="Checkpoint file")
+    parser.add_argument("--device", default="cuda:0", help="Device used for inference")
+    parser.add_argument("--dtype", nargs="+", default=["bfloat16"], choices=sorted(DTYPES))
+    parser.add_argument(
+        "--compile-mode",
+        nargs="+",
+        default=["none"],
+        help="torch.compile modes to compare, none for eager",
+    )
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[1024, 768],
+        help="input image size (height, width)",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-memory", type=float, default=None, help="In GB")
+    parser.add_argument("--max-latency", type=float, default=None, help="Per batch in ms")
+    parser.add_argument("--cache-dir", default=None, help="Decision cache directory")
+    parser.add_argument(
+        "--dummy",
+        action="store_true",
+        help="Use a tiny exported conv model instead of a checkpoint",
+    )
+    args = parser.parse_args()
+
+    if len(args.shape) == 1:
+        input_shape = (3, args.shape[0], args.shape[0])
+    elif len(args.shape) == 2:
+        input_shape = (3,) + tuple(args.shape)
+    else:
+        raise ValueError("invalid input shape")
+
+    checkpoint = args.checkpoint
+    if args.dummy:
+        from compile_cache import _export_dummy_checkpoint
+
+        checkpoint = os.path.join(tempfile.mkdtemp(), "dummy_float32.pt2")
+        _export_dummy_checkpoint(checkpoint, input_shape)
+    assert checkpoint, "a checkpoint or --dummy is required"
+
+    def build_fn(dtype, compile_mode):
+        return build_lite_forward(checkpoint, args.device, dtype, compile_mode)
+
+    max_batch_size = args.max_batch_size
+    exported_max = exported_max_batch_size(checkpoint)
+    if exported_max is not None and exported_max < max_batch_size:
+        print(f"The exported model accepts batches up to {exported_max}")
+        max_batch_size = exported_max
+    tuner = BatchSizeTuner(
+        input_shape,
+        args.device,
+        max_batch_size=max_batch_size,
+        max_latency=args.max_latency / 1000 if args.max_latency else None,
+        max_memory=int(args.max_memory * 2**30) if args.max_memory else None,
+        cache_dir=args.cache_dir,
+    )
+    candidates = [
+        (DTYPES[dtype], None if mode == "none" else mode)
+        for dtype in args.dtype
+        for mode in args.compile_mode
+    ]
+    model_key = file_digest(checkpoint, args.cache_dir)[:16] if args.cache_dir else None
+    decision = tuner.tune(build_fn, candidates, model_key=model_key)
+    print(json.dumps(decision, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmark the vectorized overlay renderer of ``vis_renderer.py`` against
+the per-link and per-class loops it replaces, on synthetic video frames.
+
+Example:
+    python benchmark_vis.py --num-instances 5 --num-frames 50
+"""
+
+import time
+from argparse import ArgumentParser
+
+import cv2
+import numpy as np
+import torch
+from classes_and_palettes import GOLIATH_CLASSES, GOLIATH_KPTS_COLORS, GOLIATH_PALETTE
+
+from vis_renderer import draw_links, palette_lut, render_seg, render_seg_torch
+
+
+def loop_links(img, kpts, score, links, link_colors, kpt_thr, thickness):
+    # the link loop of FastVisualizer.draw_pose
+    for sk_id, sk in enumerate(links):
+        if score[sk[0]] < kpt_thr or score[sk[1]] < kpt_thr:
+            continue
+        pos1 = (int(kpts[sk[0], 0]), int(kpts[sk[0], 1]))
+        pos2 = (int(kpts[sk[1], 0]), int(kpts[sk[1], 1]))
+        cv2.line(img, pos1, pos2, link_colors[sk_id].tolist(), thickness=thickness)
+    return img
+
+
+def loop_seg(image, sem_seg, classes, palette, opacity):
+    # the per-class loop of img_save_and_viz in vis_seg.py
+    num_classes = len(classes)
+    ids = np.unique(sem_seg)[::-1]
+    labels = np.array(ids[ids < num_classes], dtype=np.int64)
+    mask = np.zeros_like(image)
+    for label in labels:
+        mask[sem_seg == label, :] = palette[label]
+    return (image * (1 - opacity) + mask * opacity).astype(np.uint8)
+
+
+def synthetic_frame(args, rng):
+    height, width = args.frame_size
+    small = rng.integers(0, 255, (height // 40, width // 40, 3), dtype=np.uint8)
+    image = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+
+    num_keypoints = len(GOLIATH_KPTS_COLORS)
+    centres = rng.uniform((0, 0), (width, height), (args.num_instances, 1, 2))
+    keypoints = centres + rng.normal(0, height / 8, (args.num_instances, num_keypoints, 2))
+    scores = rng.uniform(0, 1, (args.num_instances, num_keypoints))
+
+    labels = rng.integers(0, len(GOLIATH_CLASSES), (height // 32, width // 32))
+    sem_seg = cv2.resize(labels.astype(np.uint8), (width, height), interpolation=cv2.INTER_NEAREST)
+    return image, keypoints.astype(np.float32), scores.astype(np.float32), sem_seg.astype(np.int64)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    output = func(*args)
+    return output, time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the overlay renderer")
+    parser.add_argument("--num-frames", type=int, default=20)
+    parser.add_argument("--num-instances", type=int, default=5)
+    parser.add_argument("--frame-size", type=int, nargs=2, default=(1080, 1920), help="(height, width)")
+    parser.add_argument("--kpt-thr", type=float, default=0.3)
+    parser.add_argument("--opacity", type=float, default=0.5)
+    parser.add_argument("--device", default="cuda:0" if torch.cuda.is_available() else None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    kpt_colors = np.asarray(GOLIATH_KPTS_COLORS)
+    lut = palette_lut(GOLIATH_PALETTE, len(GOLIATH_CLASSES))
+    num_keypoints = len(kpt_colors)
+    links = np.stack([np.arange(num_keypoints - 1), np.arange(1, num_keypoints)], axis=1)
+    link_colors = kpt_colors[np.arange(num_keypoints - 1) // 16]
+
+    times = {key: [] for key in ("loop_links", "links", "loop_seg", "seg", "seg_device")}
+    diffs = {key: [] for key in ("links", "seg", "seg_device")}
+    for _ in range(args.num_frames):
+        image, keypoints, scores, sem_seg = synthetic_frame(args, rng)
+        ref, t = timed(loop_links, image.copy(), keypoints[0], scores[0], links, link_colors, args.kpt_thr, 3)
+        times["loop_links"].append(t)
+        out, t = timed(draw_links, image.copy(), keypoints[0], scores[0], links, link_colors, args.kpt_thr, 3)
+        times["links"].append(t)
+        diffs["links"].append((ref != out).any(axis=-1).mean())
+
+        ref, t = timed(loop_seg, image, sem_seg, GOLIATH_CLASSES, GOLIATH_PALETTE, args.opacity)
+        times["loop_seg"].append(t)
+        out, t = timed(render_seg, image, sem_seg, lut, args.opacity)
+        times["seg"].append(t)
+        diffs["seg"].append(np.abs(ref.astype(np.int16) - out).max())
+
+        if args.device is not None:
+            image_device = torch.from_numpy(image).to(args.device)
+            sem_seg_device = torch.from_numpy(sem_seg).to(args.device)
+            lut_device = torch.from_numpy(lut).to(args.device)
+            torch.cuda.synchronize()
+            out, t = timed(render_seg_torch, image_device, sem_seg_device, lut_device, args.opacity)
+            torch.cuda.synchronize()
+            times["seg_device"].append(t)
+            diffs["seg_device"].append(np.abs(ref.astype(np.int16) - out.cpu().numpy()).max())
+
+    def report(name, loop_key, key, diff_name):
+        if not times[key]:
+            return
+        loop_ms = np.mean(times[loop_key]) * 1e3
+        ms = np.mean(times[key]) * 1e3
+        print(f"{name}: loop {loop_ms:.2f} ms, vectorized {ms:.2f} ms per frame, {loop_ms / ms:.1f}x, {diff_name}")
+
+    report("links", "loop_links", "links", f"{np.mean(diffs['links']) * 100:.3f}% pixels differ")
+    report("seg", "loop_seg", "seg", f"max difference {np.max(diffs['seg'])}")
+    if args.device is not None:
+        report("seg on device", "loop_seg", "seg_device", f"max difference {np.max(diffs['seg_device'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -566,3 +566,41 @@ GOLIATH_KPTS_COLORS = [
     [32, 192, 192],   # 342: r_border_of_pupil_6
     [32, 192, 192],   # 343: r_border_of_pupil_midpoint_2
 ]
+
+
+## the index of the mirrored keypoint of every keypoint, to flip the heatmaps back
+
+COCO_KPTS_FLIP_INDICES = [
+    0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15,
+]
+
+COCO_WHOLEBODY_KPTS_FLIP_INDICES = [
+    0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15, 20, 21, 22, 17, 18,
+    19, 39, 38, 37, 36, 35, 34, 33, 32, 31, 30, 29, 28, 27, 26, 25, 24, 23, 49, 48,
+    47, 46, 45, 44, 43, 42, 41, 40, 50, 51, 52, 53, 58, 57, 56, 55, 54, 68, 67, 66,
+    65, 70, 69, 62, 61, 60, 59, 64, 63, 77, 76, 75, 74, 73, 72, 71, 82, 81, 80, 79,
+    78, 87, 86, 85, 84, 83, 90, 89, 88, 112, 113, 114, 115, 116, 117, 118, 119, 120,
+    121, 122, 123, 124, 125, 126, 127, 128, 129, 130, 131, 132, 91, 92, 93, 94, 95,
+    96, 97, 98, 99, 100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111,
+]
+
+GOLIATH_KPTS_FLIP_INDICES = [
+    0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 18, 19, 20, 15, 16, 17, 42,
+    43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62,
+    21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40,
+    41, 64, 63, 66, 65, 68, 67, 69, 70, 71, 72, 73, 74, 75, 76, 77, 78, 79, 80, 81,
+    82, 83, 84, 85, 86, 87, 88, 89, 90, 91, 92, 93, 94, 95, 120, 121, 122, 124, 123,
+    128, 127, 126, 125, 129, 136, 135, 134, 133, 132, 131, 130, 143, 142, 141, 140,
+    139, 138, 137, 96, 97, 98, 100, 99, 104, 103, 102, 101, 105, 112, 111, 110, 109,
+    108, 107, 106, 119, 118, 117, 116, 115, 114, 113, 161, 162, 163, 165, 164, 169,
+    168, 167, 166, 170, 177, 176, 175, 174, 173, 172, 171, 144, 145, 146, 148, 147,
+    152, 151, 150, 149, 153, 160, 159, 158, 157, 156, 155, 154, 178, 179, 181, 180,
+    185, 186, 187, 182, 183, 184, 189, 188, 190, 191, 192, 193, 194, 195, 196, 197,
+    198, 199, 200, 201, 202, 203, 205, 204, 206, 207, 208, 209, 210, 211, 212, 213,
+    214, 215, 216, 217, 218, 219, 246, 247, 248, 249, 250, 251, 252, 253, 254, 271,
+    256, 257, 258, 259, 260, 261, 262, 263, 264, 265, 266, 267, 268, 269, 270, 255,
+    220, 221, 222, 223, 224, 225, 226, 227, 228, 245, 230, 231, 232, 233, 234, 235,
+    236, 237, 238, 239, 240, 241, 242, 243, 244, 229, 281, 282, 283, 284, 285, 286,
+    287, 288, 289, 272, 273, 274, 275, 276, 277, 278, 279, 280, 299, 300, 301, 302,
+    303, 304, 305, 306, 307, 290, 291, 292, 293, 294, 295, 296, 297, 298,
+]
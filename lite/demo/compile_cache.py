@@ -0,0 +1,350 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Persistent cache of compiled lite models.
+
+``torch.compile(mode="max-autotune")`` re-tunes every kernel in every new
+process. This module compiles a lite checkpoint once per
+(checkpoint hash, dtype, batch size, input shape, device type, torch version)
+and stores the result on disk, so later jobs load it directly:
+
+- ``aoti``: an AOTInductor package (``torch._inductor.aoti_compile_and_package``)
+  that contains the compiled kernels and the weights. A cache hit does not
+  load the ``.pt2`` checkpoint nor run dynamo at all.
+- ``inductor``: a per-key inductor/FX-graph cache directory used by
+  ``torch.compile``. A cache hit still traces the model but skips autotuning
+  and code generation. Used when AOTInductor is unavailable.
+
+Example:
+    # precompile, then measure the startup time of a cold vs a warm cache
+    python demo/compile_cache.py $CHECKPOINT --cache-dir $CACHE --batch-size 8 --benchmark
+
+    # cpu-only check with a tiny exported model
+    python demo/compile_cache.py --dummy --cache-dir /tmp/cache --device cpu \
+        --dtype float32 --shape 64 48 --benchmark
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from argparse import ArgumentParser
+
+import torch
+
+DTYPES = {
+    "float32": torch.float32,
+    "bfloat16": torch.bfloat16,
+    "float16": torch.float16,
+}
+
+
+def file_digest(path, cache_dir=None, block_size=1 << 24):
+    """Return the sha256 of a checkpoint file.
+
+    Hashing a multi-GB checkpoint takes seconds, so the digest is memoized in
+    ``cache_dir/digests.json`` keyed by the absolute path, size and mtime.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    index_file = os.path.join(cache_dir, "digests.json") if cache_dir else None
+    index = {}
+    if index_file and os.path.exists(index_file):
+        with open(index_file, "r") as f:
+            index = json.load(f)
+        if stamp in index:
+            return index[stamp]
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+    digest = sha.hexdigest()
+
+    if index_file:
+        index[stamp] = digest
+        _atomic_write_json(index_file, index)
+    return digest
+
+
+def _atomic_write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+def dtype_name(dtype):
+    return str(dtype).replace("torch.", "")
+
+
+def artifact_key(digest, dtype, batch_size, input_shape, device):
+    """Build the cache key of one compiled artifact.
+
+    Args:
+        digest (str): The checkpoint sha256.
+        dtype (torch.dtype): The inference dtype.
+        batch_size (int): The padded (static) batch size.
+        input_shape (tuple): The (C, H, W) input shape.
+        device (str): The device, only its type is part of the key.
+    """
+    device_type = torch.device(device).type
+    shape = "x".join(str(s) for s in input_shape)
+    version = torch.__version__.split("+")[0]
+    return (
+        f"{digest[:16]}_{dtype_name(dtype)}_b{batch_size}_{shape}_"
+        f"{device_type}_torch{version}"
+    )
+
+
+def has_aoti():
+    return hasattr(torch._inductor, "aoti_compile_and_package") and hasattr(
+        torch._inductor, "aoti_load_package"
+    )
+
+
+def _example_inputs(dtype, batch_size, input_shape, device):
+    return (torch.randn(batch_size, *input_shape, device=device).to(dtype),)
+
+
+def _warmup(model, example_inputs, iters=2):
+    with torch.no_grad():
+        for _ in range(iters):
+            model(*example_inputs)
+    if str(example_inputs[0].device).startswith("cuda"):
+        torch.cuda.synchronize()
+
+
+class CompileCache:
+    """Compile lite models once and reuse the artifacts across processes.
+
+    Args:
+        cache_dir (str): The root directory of the cache.
+        backend (str): ``aoti``, ``inductor`` or ``auto``. ``auto`` picks
+            ``aoti`` when this torch build supports it. Defaults to "auto".
+        mode (str): The ``torch.compile`` mode of the inductor backend, also
+            used to enable autotuning of the AOTInductor build.
+            Defaults to "max-autotune".
+    """
+
+    def __init__(self, cache_dir, backend="auto", mode="max-autotune"):
+        if backend == "auto":
+            backend = "aoti" if has_aoti() else "inductor"
+        assert backend in ("aoti", "inductor"), f"unknown backend {backend}"
+        if backend == "aoti":
+            assert has_aoti(), "AOTInductor packaging needs torch>=2.6"
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.backend = backend
+        self.mode = mode
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, checkpoint, dtype, batch_size, input_shape, device):
+        digest = file_digest(checkpoint, self.cache_dir)
+        return artifact_key(digest, dtype, batch_size, input_shape, device)
+
+    def package_path(self, key):
+        return os.path.join(self.cache_dir, "aoti", key + ".pt2")
+
+    def contains(self, checkpoint, dtype, batch_size, input_shape, device):
+        key = self.key(checkpoint, dtype, batch_size, input_shape, device)
+        if self.backend == "aoti":
+            return os.path.exists(self.package_path(key))
+        return os.path.exists(os.path.join(self.cache_dir, "inductor", key, "done"))
+
+    def load(self, checkpoint, load_fn, dtype, batch_size, input_shape, device):
+        """Return a compiled, warmed-up model, building the artifact on a miss.
+
+        Args:
+            checkpoint (str): The lite ``.pt2`` checkpoint, used for the key.
+            load_fn (callable): Returns the eager (exported) module. It is only
+                called on a cache miss for the ``aoti`` backend.
+            dtype (torch.dtype): The inference dtype.
+            batch_size (int): The padded (static) batch size.
+            input_shape (tuple): The (C, H, W) input shape.
+            device (str): The inference device.
+        """
+        key = self.key(checkpoint, dtype, batch_size, input_shape, device)
+        example_inputs = _example_inputs(dtype, batch_size, input_shape, device)
+        if self.backend == "aoti":
+            model = self._load_aoti(key, load_fn, dtype, device, example_inputs)
+        else:
+            model = self._load_inductor(key, load_fn, dtype, device, example_inputs)
+        _warmup(model, example_inputs)
+        return model
+
+    def _load_aoti(self, key, load_fn, dtype, device, example_inputs):
+        path = self.package_path(key)
+        if not os.path.exists(path):
+            model = load_fn().to(device).to(dtype)
+            with torch.no_grad():
+                exported = torch.export.export(model, example_inputs)
+            inductor_configs = {"max_autotune": self.mode == "max-autotune"}
+
+            # build into a temporary file so that concurrent jobs never load a
+            # partially written package
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".pt2")
+            os.close(fd)
+            try:
+                torch._inductor.aoti_compile_and_package(
+                    exported,
+                    package_path=tmp,
+                    inductor_configs=inductor_configs,
+                )
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return torch._inductor.aoti_load_package(path)
+
+    def _load_inductor(self, key, load_fn, dtype, device, example_inputs):
+        key_dir = os.path.join(self.cache_dir, "inductor", key)
+        os.makedirs(key_dir, exist_ok=True)
+        # inductor reads the cache location from the environment at lookup
+        # time, so this redirects both the FX graph and the autotuning caches
+        os.environ["TORCHINDUCTOR_CACHE_DIR"] = key_dir
+        torch._inductor.config.fx_graph_cache = True
+
+        model = load_fn().to(device).to(dtype)
+        model = torch.compile(model, mode=self.mode, fullgraph=True)
+        _warmup(model, example_inputs, iters=1)
+        open(os.path.join(key_dir, "done"), "w").close()
+        return model
+
+
+def load_compiled_model(
+    checkpoint, load_fn, dtype, batch_size, input_shape, device, cache_dir, backend="auto"
+):
+    """Shortcut of :meth:`CompileCache.load` used by the lite entry points."""
+    cache = CompileCache(cache_dir, backend=backend)
+    return cache.load(checkpoint, load_fn, dtype, batch_size, input_shape, device)
+
+
+def _export_dummy_checkpoint(path, input_shape, max_batch_size=32):
+    """Export a tiny conv model with a dynamic batch dimension, like the
+    lite checkpoints of ``tools/deployment/torch_optimization.py``."""
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(input_shape[0], 16, 3, padding=1),
+        torch.nn.GELU(),
+        torch.nn.Conv2d(16, 4, 1),
+    ).eval()
+    # an example batch of 1 would be specialized
+    example_inputs = (torch.randn(2, *input_shape),)
+    dynamic_batch = torch.export.Dim("batch", min=1, max=max_batch_size)
+    exported = torch.export.export(
+        model, example_inputs, dynamic_shapes=({0: dynamic_batch},)
+    )
+    torch.export.save(exported, path)
+
+
+def _time_first_inference(build_fn, example_inputs):
+    start = time.perf_counter()
+    model = build_fn()
+    _warmup(model, example_inputs, iters=1)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("checkpoint", nargs="?", default="", help="Checkpoint file")
+    parser.add_argument("--cache-dir", required=True, help="Compile cache directory")
+    parser.add_argument(
+        "--backend", default="auto", choices=["auto", "aoti", "inductor"]
+    )
+    parser.add_argument("--device", default="cuda:0", help="Device used for inference")
+    parser.add_argument("--dtype", default="bfloat16", choices=sorted(DTYPES))
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[1024, 768],
+        help="input image size (height, width)",
+    )
+    parser.add_argument(
+        "--dummy",
+        action="store_true",
+        help="Use a tiny exported conv model instead of a checkpoint",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compare the startup time of torch.compile, a cold and a warm cache",
+    )
+    args = parser.parse_args()
+
+    if len(args.shape) == 1:
+        input_shape = (3, args.shape[0], args.shape[0])
+    elif len(args.shape) == 2:
+        input_shape = (3,) + tuple(args.shape)
+    else:
+        raise ValueError("invalid input shape")
+
+    dtype = DTYPES[args.dtype]
+    tmp_dir = None
+    checkpoint = args.checkpoint
+    if args.dummy:
+        tmp_dir = tempfile.mkdtemp()
+        checkpoint = os.path.join(tmp_dir, "dummy_float32.pt2")
+        _export_dummy_checkpoint(checkpoint, input_shape)
+    assert checkpoint, "a checkpoint or --dummy is required"
+
+    def load_fn():
+        return torch.export.load(checkpoint).module()
+
+    cache = CompileCache(args.cache_dir, backend=args.backend)
+    key = cache.key(checkpoint, dtype, args.batch_size, input_shape, args.device)
+    print(f"backend: {cache.backend}, key: {key}")
+
+    def build_cached():
+        return cache.load(
+            checkpoint, load_fn, dtype, args.batch_size, input_shape, args.device
+        )
+
+    if not args.benchmark:
+        start = time.perf_counter()
+        build_cached()
+        print(f"ready in {time.perf_counter() - start:.2f}s")
+    else:
+        example_inputs = _example_inputs(dtype, args.batch_size, input_shape, args.device)
+
+        def build_compiled():
+            torch._dynamo.reset()
+            model = load_fn().to(args.device).to(dtype)
+            return torch.compile(model, mode=cache.mode, fullgraph=True)
+
+        # the baseline must not hit the managed cache directory
+        baseline_dir = tempfile.mkdtemp()
+        os.environ["TORCHINDUCTOR_CACHE_DIR"] = baseline_dir
+        baseline = _time_first_inference(build_compiled, example_inputs)
+        shutil.rmtree(baseline_dir, ignore_errors=True)
+
+        torch._dynamo.reset()
+        cached = cache.contains(
+            checkpoint, dtype, args.batch_size, input_shape, args.device
+        )
+        first = _time_first_inference(build_cached, example_inputs)
+        torch._dynamo.reset()
+        warm = _time_first_inference(build_cached, example_inputs)
+
+        print(f"torch.compile({cache.mode}): {baseline:8.2f}s to first output")
+        print(
+            f"{'warm' if cached else 'cold'} cache build:   {first:8.2f}s to first output"
+        )
+        print(f"warm cache load:       {warm:8.2f}s to first output")
+        print(f"startup speedup:       {baseline / warm:8.2f}x")
+
+    if tmp_dir is not None:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
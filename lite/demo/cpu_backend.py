@@ -0,0 +1,255 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""CPU backend for the lite demos.
+
+One model replica runs per NUMA node, pinned to the physical cores of its
+node with intra-op threads for every core and a single inter-op thread.
+``job_scheduler.py --devices numa`` starts one worker per node and routes
+chunks of images to whichever replica is free. The model runs in bfloat16
+when the CPU has native bf16 support (AVX512-BF16 / AMX) and in float32
+otherwise, with channels-last inputs and ``torch.compile`` (inductor with
+weight freezing).
+
+Both checkpoint flavours work: TorchScript checkpoints are loaded to the cpu
+and frozen; exported checkpoints have the devices and dtypes baked into their
+graph retargeted to the cpu.
+
+Example:
+    # throughput of sapiens_0.3b at a reduced resolution, one replica per node
+    python demo/cpu_backend.py $CHECKPOINT --shape 512 384 --batch-size 8
+
+    # seg on all NUMA nodes
+    python demo/job_scheduler.py seg $CHECKPOINT --input $INPUT \
+        --output-root $OUTPUT --devices numa --shape 512 384
+"""
+
+import glob
+import os
+from argparse import ArgumentParser
+
+
+def parse_cpulist(text):
+    """Parse a kernel cpu list like ``0-3,8-11`` into a list of cpu ids."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read(path):
+    with open(path, "r") as file:
+        return file.read()
+
+
+def numa_nodes():
+    """The usable cpus of every NUMA node, a single node if unknown."""
+    affinity = set(os.sched_getaffinity(0))
+    nodes = []
+    paths = glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")
+    for path in sorted(paths, key=lambda p: int(p.split("node")[-1].split("/")[0])):
+        cpus = sorted(set(parse_cpulist(_read(path))) & affinity)
+        if cpus:
+            nodes.append(cpus)
+    return nodes or [sorted(affinity)]
+
+
+def physical_cores(cpus):
+    """Keep one hyperthread per physical core."""
+    cores = []
+    seen = set()
+    for cpu in cpus:
+        path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+        siblings = tuple(parse_cpulist(_read(path))) if os.path.exists(path) else (cpu,)
+        if siblings not in seen:
+            seen.add(siblings)
+            cores.append(cpu)
+    return cores
+
+
+def numa_devices():
+    """One ``numa:<node>`` device per NUMA node, see ``job_scheduler.py``."""
+    return [f"numa:{node}" for node in range(len(numa_nodes()))]
+
+
+def bind_numa_node(node, interop_threads=1):
+    """Pin the current process to the physical cores of a NUMA node and size
+    the torch thread pools accordingly. Call before running any model."""
+    import torch
+
+    cores = physical_cores(numa_nodes()[node])
+    os.sched_setaffinity(0, cores)
+    os.environ["OMP_NUM_THREADS"] = str(len(cores))
+    torch.set_num_threads(len(cores))
+    torch.set_num_interop_threads(interop_threads)
+    return cores
+
+
+def has_native_bf16():
+    """Whether the CPU has bfloat16 instructions (AVX512-BF16 or AMX)."""
+    try:
+        flags = _read("/proc/cpuinfo")
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def select_dtype(name="auto"):
+    import torch
+
+    if name == "auto":
+        return torch.bfloat16 if has_native_bf16() else torch.float32
+    return {"bf16": torch.bfloat16, "fp32": torch.float32}[name]
+
+
+def _retarget_graph(graph_module, dtype):
+    """Rewrite the devices and floating dtypes baked into an exported graph."""
+    import torch
+
+    floating = (torch.float32, torch.bfloat16, torch.float16)
+    for node in graph_module.graph.nodes:
+        kwargs = dict(node.kwargs)
+        if isinstance(kwargs.get("device"), torch.device):
+            kwargs["device"] = torch.device("cpu")
+        if kwargs.get("dtype") in floating:
+            kwargs["dtype"] = dtype
+        node.kwargs = kwargs
+    graph_module.recompile()
+    return graph_module
+
+
+def load_cpu_model(checkpoint, dtype=None, compile=True, channels_last=True):
+    """Load a lite checkpoint for cpu inference.
+
+    Returns:
+        tuple: The model and the dtype of its inputs.
+    """
+    import torch
+
+    if "_torchscript" in checkpoint:
+        ## torchscript checkpoints are traced at fp32
+        model = torch.jit.load(checkpoint, map_location="cpu").eval()
+        dtype = torch.float32
+        if channels_last:
+            model = model.to(memory_format=torch.channels_last)
+        model = torch.jit.optimize_for_inference(torch.jit.freeze(model))
+        return model, dtype
+
+    dtype = dtype or select_dtype()
+    model = _retarget_graph(torch.export.load(checkpoint).module(), dtype)
+    model = model.to(device="cpu", dtype=dtype)
+    if channels_last:
+        model = model.to(memory_format=torch.channels_last)
+    if compile:
+        ## fold the weights into the compiled graph and prepack them for onednn
+        torch._inductor.config.freezing = True
+        torch._inductor.config.cpp.weight_prepack = True
+        model = torch.compile(model)
+    return model, dtype
+
+
+def to_cpu_inputs(imgs, dtype, channels_last=True):
+    import torch
+
+    imgs = imgs.to(dtype)
+    if channels_last:
+        imgs = imgs.contiguous(memory_format=torch.channels_last)
+    return imgs
+
+
+class BenchmarkRunner:
+    """Run synthetic batches through a cpu replica, one item per batch."""
+
+    def __init__(self, device, checkpoint, shape, batch_size, dtype, compile, warmup):
+        import torch
+
+        self.torch = torch
+        self.batch_size = batch_size
+        self.model, self.dtype = load_cpu_model(
+            checkpoint, select_dtype(dtype), compile=compile
+        )
+        self.imgs = to_cpu_inputs(
+            torch.randn(batch_size, 3, *shape), self.dtype
+        )
+        with torch.inference_mode():
+            for _ in range(warmup):
+                self.model(self.imgs)
+
+    def __call__(self, items):
+        with self.torch.inference_mode():
+            for _ in items:
+                self.model(self.imgs)
+        return len(items) * self.batch_size
+
+
+def build_benchmark_runner(device, **kwargs):
+    return BenchmarkRunner(device, **kwargs)
+
+
+def main():
+    from job_scheduler import JobScheduler, print_summary
+
+    parser = ArgumentParser(description="Benchmark the lite cpu backend")
+    parser.add_argument("checkpoint", help="Lite checkpoint file")
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs=2,
+        default=[512, 384],
+        help="input image size (height, width)",
+    )
+    parser.add_argument("--batch_size", "--batch-size", type=int, default=8)
+    parser.add_argument(
+        "--num_batches", "--num-batches", type=int, default=32, help="Batches in total"
+    )
+    parser.add_argument("--warmup", type=int, default=3, help="Warmup batches")
+    parser.add_argument(
+        "--dtype", choices=["auto", "bf16", "fp32"], default="auto", help="Model dtype"
+    )
+    parser.add_argument(
+        "--replicas",
+        default="numa",
+        help="'numa' for one replica per NUMA node or a number of unpinned replicas",
+    )
+    parser.add_argument(
+        "--no_compile", "--no-compile", action="store_true", help="Skip torch.compile"
+    )
+    args = parser.parse_args()
+
+    if args.replicas == "numa":
+        devices = numa_devices()
+    else:
+        devices = ["cpu"] * int(args.replicas)
+    print(
+        f"{len(devices)} replicas, native bf16: {has_native_bf16()}, "
+        f"shape {args.shape}, batch size {args.batch_size}"
+    )
+
+    scheduler = JobScheduler(
+        build_benchmark_runner,
+        devices,
+        build_kwargs=dict(
+            checkpoint=args.checkpoint,
+            shape=tuple(args.shape),
+            batch_size=args.batch_size,
+            dtype=args.dtype,
+            compile=not args.no_compile,
+            warmup=args.warmup,
+        ),
+        chunk_size=1,
+    )
+    stats = scheduler.run(list(range(args.num_batches)))
+    print_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ import torchvision
 from adhoc_image_dataset import AdhocImageDataset
 from tqdm import tqdm
 
+from batch_tuner import batch_size_arg, tune_batch_size
+from compile_cache import load_compiled_model
 from worker_pool import WorkerPool
 
 torchvision.disable_beta_transforms_warning()
@@ -54,13 +56,80 @@ def warmup_model(model, batch_size):
     del imgs, s
 
 
-def inference_model(model, imgs, dtype=torch.bfloat16):
+def inference_model(model, imgs, dtype=torch.bfloat16, device="cuda"):
     # forward the model
     with torch.no_grad():
-        (results,) = model(imgs.to(dtype).cuda())
+        results = model(imgs.to(dtype).to(device))
         imgs.cpu()
 
-    return results
+    ## B x C x H x W for one tapped layer, B x L x C x H x W for several
+    if len(results) == 1:
+        return results[0]
+    return torch.stack(results, dim=1)
+
+
+def fit_pca(feats, n_components):
+    """Fit a PCA on the tokens of a batch of features, like pca_feature.py.
+
+    Returns the mean (L x C) and the components (L x C x K) of every layer.
+    """
+    C, H, W = feats.shape[-3:]
+    tokens = feats.reshape(feats.shape[0], -1, C, H * W).float()
+    tokens = tokens.permute(1, 0, 3, 2).reshape(tokens.shape[1], -1, C)
+    means, components = [], []
+    for layer_tokens in tokens:
+        _, _, V = torch.pca_lowrank(layer_tokens, q=n_components, center=True)
+        means.append(layer_tokens.mean(dim=0))
+        components.append(V)
+    return torch.stack(means), torch.stack(components)
+
+
+class FeaturePostprocessor:
+    """Pool, PCA-project and cast the features on device before saving."""
+
+    def __init__(self, pool=1, pca_dim=0, pca_basis=None, save_dtype="float16"):
+        self.pool = pool
+        self.pca_dim = pca_dim
+        self.pca_basis = pca_basis
+        self.save_dtype = getattr(torch, save_dtype)
+        self.mean = None
+        self.components = None
+        if pca_dim and pca_basis and os.path.exists(pca_basis):
+            basis = np.load(pca_basis)
+            self.mean = torch.from_numpy(basis["mean"])
+            self.components = torch.from_numpy(basis["components"])
+            assert self.components.shape[-1] == pca_dim, "PCA basis mismatch"
+
+    def fit(self, feats):
+        self.mean, self.components = fit_pca(feats, self.pca_dim)
+        if self.pca_basis:
+            np.savez(
+                self.pca_basis,
+                mean=self.mean.cpu().numpy(),
+                components=self.components.cpu().numpy(),
+            )
+
+    def __call__(self, feats):
+        if self.pool > 1:
+            shape = feats.shape
+            feats = F.avg_pool2d(
+                feats.reshape(-1, *shape[-3:]), self.pool, ceil_mode=True
+            )
+            feats = feats.reshape(*shape[:-2], *feats.shape[-2:])
+
+        if self.pca_dim:
+            if self.components is None:
+                self.fit(feats)
+            self.mean = self.mean.to(feats.device)
+            self.components = self.components.to(feats.device)
+            C, H, W = feats.shape[-3:]
+            tokens = feats.reshape(feats.shape[0], -1, C, H * W).float()
+            tokens = tokens - self.mean[None, :, :, None]
+            ## B x L x K x (H * W)
+            tokens = torch.einsum("blcn,lck->blkn", tokens, self.components)
+            feats = tokens.reshape(*feats.shape[:-3], self.pca_dim, H, W)
+
+        return feats.to(self.save_dtype)
 
 
 def fake_pad_images_to_batchsize(imgs):
@@ -78,6 +147,7 @@ def feat_save(feature, output_path):
     )
     np.save(pred_save_path, feature)
 
+
 def load_model(checkpoint, use_torchscript=False):
     if use_torchscript:
         return torch.jit.load(checkpoint)
@@ -99,13 +169,19 @@ def main():
     parser.add_argument(
         "--batch_size",
         "--batch-size",
-        type=int,
+        type=batch_size_arg,
         default=64,
-        help="Set batch size to do batch inference. ",
+        help="Set batch size to do batch inference, or auto to tune it. ",
     )
     parser.add_argument(
         "--fp16", action="store_true", default=False, help="Model inference dtype"
     )
+    parser.add_argument(
+        "--compile_cache",
+        "--compile-cache",
+        default=None,
+        help="Directory of the persistent compiled-model cache",
+    )
     parser.add_argument(
         "--shape",
         type=int,
@@ -113,6 +189,33 @@ def main():
         default=[1024, 1024],
         help="input image size (height, width)",
     )
+    parser.add_argument(
+        "--pool",
+        type=int,
+        default=1,
+        help="Average pool the feature maps by this factor before saving",
+    )
+    parser.add_argument(
+        "--pca_dim",
+        "--pca-dim",
+        type=int,
+        default=0,
+        help="Project the features of every layer onto this many PCA components",
+    )
+    parser.add_argument(
+        "--pca_basis",
+        "--pca-basis",
+        default=None,
+        help="npz file of the PCA basis. Fitted on the first batch and saved "
+        "there if it does not exist",
+    )
+    parser.add_argument(
+        "--save_dtype",
+        "--save-dtype",
+        choices=["float16", "float32"],
+        default="float16",
+        help="Dtype of the saved features",
+    )
 
     args = parser.parse_args()
 
@@ -136,16 +239,32 @@ def main():
         os.makedirs(args.output_root)
 
     USE_TORCHSCRIPT = '_torchscript' in args.checkpoint
-
-    # build the model from a checkpoint file
-    model = load_model(args.checkpoint, USE_TORCHSCRIPT)
+    if args.batch_size == "auto":
+        args.batch_size = tune_batch_size(
+            args.checkpoint, input_shape, args.device, args.fp16, args.compile_cache
+        )
 
     ## no precision conversion needed for torchscript. run at fp32
-    if not USE_TORCHSCRIPT:
+    if not USE_TORCHSCRIPT and args.compile_cache:
+        # load the compiled artifact, the checkpoint is only read on a cache miss
+        dtype = torch.half if args.fp16 else torch.bfloat16
+        model = load_compiled_model(
+            args.checkpoint,
+            partial(load_model, args.checkpoint),
+            dtype,
+            args.batch_size,
+            input_shape,
+            args.device,
+            args.compile_cache,
+        )
+    elif not USE_TORCHSCRIPT:
+        # build the model from a checkpoint file
+        model = load_model(args.checkpoint, USE_TORCHSCRIPT)
         dtype = torch.half if args.fp16 else torch.bfloat16
         model.to(dtype)
         model = torch.compile(model, mode="max-autotune", fullgraph=True)
     else:
+        model = load_model(args.checkpoint, USE_TORCHSCRIPT)
         dtype = torch.float32  # TorchScript models use float32
         model = model.to(args.device)
 
@@ -191,19 +310,23 @@ def main():
     feat_save_pool = WorkerPool(
         feat_save, processes=max(min(args.batch_size, cpu_count()) // 2, 4)
     )
+    postprocess = FeaturePostprocessor(
+        args.pool, args.pca_dim, args.pca_basis, args.save_dtype
+    )
 
     for batch_idx, (batch_image_name, batch_orig_imgs, batch_imgs) in tqdm(
         enumerate(inference_dataloader), total=len(inference_dataloader)
     ):
         valid_images_len = len(batch_imgs)
         batch_imgs = fake_pad_images_to_batchsize(batch_imgs)
-        results = inference_model(model, batch_imgs, dtype=dtype)
+        results = inference_model(model, batch_imgs, dtype=dtype, device=args.device)
+        results = postprocess(results[:valid_images_len]).cpu()
         args_list = [
             (
-                feat.cpu().float().numpy(),
+                feat.numpy(),
                 os.path.join(args.output_root, os.path.basename(img_name)),
             )
-            for feat, img_name in zip(results[:valid_images_len], batch_image_name)
+            for feat, img_name in zip(results, batch_image_name)
         ]
         feat_save_pool.run_async(args_list)
 
@@ -0,0 +1,626 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Multi-device job scheduler for the lite demos.
+
+One long-lived worker process is started per device (or several per device
+with ``--jobs-per-device``). Each worker loads and compiles the model once and
+then pulls small chunks of images from a shared queue until it is empty, so a
+slow chunk never leaves the other devices idle and ``torch.compile`` is paid
+once per worker instead of once per static image split.
+
+Example:
+    python demo/job_scheduler.py seg $CHECKPOINT --input $INPUT \
+        --output-root $OUTPUT --devices cuda:0 cuda:1 --batch-size 8
+
+    # CPU smoke test with a dummy model and two worker processes
+    python demo/job_scheduler.py dummy --input $INPUT --devices cpu cpu
+
+    # one cpu replica per NUMA node, see cpu_backend.py
+    python demo/job_scheduler.py seg $CHECKPOINT --input $INPUT \
+        --output-root $OUTPUT --devices numa
+"""
+
+import importlib
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback as tb
+from argparse import ArgumentParser
+from functools import partial
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from batch_tuner import batch_size_arg, tune_batch_size
+
+_STOP = None
+# seconds between the checks that the workers are still alive
+_POLL_INTERVAL = 1.0
+
+
+def chunk_items(items, chunk_size):
+    """Split ``items`` into consecutive chunks of at most ``chunk_size``."""
+    assert chunk_size > 0, "chunk_size must be positive"
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _worker_loop(worker_id, device, build_fn, build_kwargs, task_queue, result_queue):
+    if device.startswith("cuda"):
+        # the lite entry points call .cuda(), so pin the process to one gpu
+        # before cuda gets initialized and address it as cuda:0
+        index = device.split(":")[1] if ":" in device else "0"
+        os.environ["CUDA_VISIBLE_DEVICES"] = index
+        device = "cuda:0"
+    elif device.startswith("numa"):
+        # pin the replica to the cores of its node before the model is built
+        from cpu_backend import bind_numa_node
+
+        bind_numa_node(int(device.split(":")[1]))
+        device = "cpu"
+
+    try:
+        start = time.perf_counter()
+        runner = build_fn(device, **build_kwargs)
+        result_queue.put(("ready", worker_id, time.perf_counter() - start))
+
+        while True:
+            chunk = task_queue.get()
+            if chunk is _STOP:
+                break
+            start = time.perf_counter()
+            num_items = runner(chunk)
+            result_queue.put(
+                ("chunk", worker_id, (num_items, time.perf_counter() - start))
+            )
+
+        close = getattr(runner, "close", None)
+        if close is not None:
+            close()
+        result_queue.put(("done", worker_id, None))
+    except Exception:
+        result_queue.put(("error", worker_id, tb.format_exc()))
+
+
+class JobScheduler:
+    """Run a chunked job on long-lived per-device workers.
+
+    Args:
+        build_fn (callable): A picklable (module-level) factory called once in
+            every worker as ``build_fn(device, **build_kwargs)``. It returns a
+            callable that processes a list of items and returns the number of
+            processed items. If the callable has a ``close`` method, it is
+            called after the queue is drained.
+        devices (list[str]): One worker is started per entry, e.g.
+            ``["cuda:0", "cuda:1"]``, ``["cpu", "cpu"]`` or
+            ``["numa:0", "numa:1"]`` for cpu workers pinned to NUMA nodes.
+        build_kwargs (dict, optional): Keyword arguments of ``build_fn``.
+        chunk_size (int): Number of items handed out per request. Small
+            chunks balance the load better; large chunks amortize the
+            per-chunk overhead. Defaults to 32.
+        start_method (str): Multiprocessing start method. ``spawn`` is
+            required for cuda. Defaults to "spawn".
+    """
+
+    def __init__(
+        self, build_fn, devices, build_kwargs=None, chunk_size=32, start_method="spawn"
+    ):
+        assert len(devices) > 0, "at least one device is required"
+        self.build_fn = build_fn
+        self.devices = list(devices)
+        self.build_kwargs = build_kwargs or {}
+        self.chunk_size = chunk_size
+        self.ctx = mp.get_context(start_method)
+
+    def run(self, items, timeout=None):
+        """Process all ``items`` and return the aggregated statistics.
+
+        Args:
+            items (list): The work items, e.g. image paths.
+            timeout (float, optional): Seconds to wait for any worker message
+                before giving up. Defaults to None (no limit, but a worker
+                that dies without reporting, e.g. killed for running out of
+                memory, still fails the run).
+
+        Returns:
+            dict: The statistics computed by :func:`summarize`.
+        """
+        items = list(items)
+        task_queue = self.ctx.Queue()
+        result_queue = self.ctx.Queue()
+        for chunk in chunk_items(items, self.chunk_size):
+            task_queue.put(chunk)
+        for _ in self.devices:
+            task_queue.put(_STOP)
+
+        start = time.perf_counter()
+        workers = [
+            self.ctx.Process(
+                target=_worker_loop,
+                args=(
+                    worker_id,
+                    device,
+                    self.build_fn,
+                    self.build_kwargs,
+                    task_queue,
+                    result_queue,
+                ),
+                # workers spawn their own dataloader and save pools
+                daemon=False,
+            )
+            for worker_id, device in enumerate(self.devices)
+        ]
+        for worker in workers:
+            worker.start()
+
+        startup = {}
+        chunks = []
+        pending = set(range(len(workers)))
+        try:
+            last_message = time.perf_counter()
+            while pending:
+                try:
+                    kind, worker_id, payload = result_queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    dead = [i for i in sorted(pending) if not workers[i].is_alive()]
+                    if dead:
+                        num_items = sum(c[1] for c in chunks)
+                        raise RuntimeError(
+                            f"workers {dead} on {[self.devices[i] for i in dead]} "
+                            f"exited with codes {[workers[i].exitcode for i in dead]} "
+                            f"before finishing, {num_items}/{len(items)} items were "
+                            "processed"
+                        )
+                    idle = time.perf_counter() - last_message
+                    if timeout is not None and idle > timeout:
+                        raise TimeoutError(
+                            f"no message from workers {sorted(pending)} in {timeout}s"
+                        )
+                    continue
+                last_message = time.perf_counter()
+                if kind == "ready":
+                    startup[worker_id] = payload
+                elif kind == "chunk":
+                    chunks.append((worker_id,) + payload)
+                elif kind == "done":
+                    pending.discard(worker_id)
+                elif kind == "error":
+                    raise RuntimeError(
+                        f"worker {worker_id} on {self.devices[worker_id]} failed:\n"
+                        f"{payload}"
+                    )
+        finally:
+            for worker in workers:
+                if pending:
+                    worker.terminate()
+                worker.join()
+
+        return summarize(
+            chunks, startup, self.devices, time.perf_counter() - start
+        )
+
+
+def summarize(chunks, startup, devices, wall_time):
+    """Aggregate per-chunk records into throughput and latency statistics.
+
+    Args:
+        chunks (list[tuple]): ``(worker_id, num_items, seconds)`` per chunk.
+        startup (dict): Model build time in seconds per worker id.
+        devices (list[str]): The device of every worker id.
+        wall_time (float): The end-to-end time including worker startup.
+
+    Returns:
+        dict: The aggregated statistics.
+    """
+    latencies = np.array([c[2] for c in chunks], dtype=np.float64)
+    num_items = int(sum(c[1] for c in chunks))
+    busy_time = float(latencies.sum()) if len(chunks) else 0.0
+
+    workers = []
+    for worker_id, device in enumerate(devices):
+        own = [c for c in chunks if c[0] == worker_id]
+        items = sum(c[1] for c in own)
+        seconds = sum(c[2] for c in own)
+        workers.append(
+            dict(
+                device=device,
+                chunks=len(own),
+                items=items,
+                startup=startup.get(worker_id, float("nan")),
+                fps=items / seconds if seconds > 0 else 0.0,
+            )
+        )
+
+    return dict(
+        items=num_items,
+        chunks=len(chunks),
+        wall_time=wall_time,
+        fps=num_items / wall_time if wall_time > 0 else 0.0,
+        # throughput once the models are compiled
+        steady_fps=sum(w["fps"] for w in workers),
+        chunk_latency_mean=float(latencies.mean()) if len(chunks) else 0.0,
+        chunk_latency_p50=float(np.percentile(latencies, 50)) if len(chunks) else 0.0,
+        chunk_latency_p95=float(np.percentile(latencies, 95)) if len(chunks) else 0.0,
+        busy_time=busy_time,
+        workers=workers,
+    )
+
+
+def print_summary(stats):
+    for worker_id, w in enumerate(stats["workers"]):
+        print(
+            f"worker {worker_id} [{w['device']}]: startup {w['startup']:.2f}s, "
+            f"{w['chunks']} chunks, {w['items']} images, {w['fps']:.2f} FPS"
+        )
+    print(
+        f"chunk latency: mean {stats['chunk_latency_mean']:.3f}s, "
+        f"p50 {stats['chunk_latency_p50']:.3f}s, p95 {stats['chunk_latency_p95']:.3f}s"
+    )
+    print(
+        f"\033[92mTotal inference time: {stats['wall_time']:.2f} seconds. "
+        f"FPS: {stats['fps']:.2f} (steady state {stats['steady_fps']:.2f})\033[0m"
+    )
+
+
+class DummyRunner:
+    """A tiny conv model standing in for a Sapiens checkpoint, used to test
+    the scheduler on cpu."""
+
+    def __init__(self, device, batch_size=4, shape=(64, 48), delay=0.0, compile=False):
+        import torch
+
+        self.torch = torch
+        self.device = device
+        self.batch_size = batch_size
+        self.shape = tuple(shape)
+        self.delay = delay
+        self.model = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 8, 3, padding=1),
+            torch.nn.ReLU(),
+            torch.nn.Conv2d(8, 1, 1),
+        ).to(device)
+        if compile:
+            self.model = torch.compile(self.model)
+
+    def __call__(self, items):
+        torch = self.torch
+        for i in range(0, len(items), self.batch_size):
+            n = len(items[i : i + self.batch_size])
+            imgs = torch.randn(n, 3, *self.shape, device=self.device)
+            with torch.no_grad():
+                self.model(imgs)
+        if self.delay > 0:
+            time.sleep(self.delay * len(items))
+        return len(items)
+
+
+def build_dummy_runner(device, **kwargs):
+    return DummyRunner(device, **kwargs)
+
+
+def _seg_save_args(args, image, result, output_path):
+    from classes_and_palettes import GOLIATH_CLASSES, GOLIATH_PALETTE
+
+    return (
+        image,
+        result,
+        output_path,
+        GOLIATH_CLASSES,
+        GOLIATH_PALETTE,
+        0.3,
+        args["title"],
+        args["opacity"],
+    )
+
+
+def _depth_save_args(args, image, result, output_path):
+    return (image, result, output_path, args["seg_dir"])
+
+
+def _feature_save_args(args, image, result, output_path):
+    return (result.numpy(), output_path)
+
+
+## entry point module, save function and its arguments of every task
+TASKS = {
+    "seg": ("vis_seg", "img_save_and_viz", _seg_save_args),
+    "depth": ("vis_depth", "img_save_and_viz", _depth_save_args),
+    "normal": ("vis_normal", "img_save_and_viz", _depth_save_args),
+    "feature": ("extract_feature", "feat_save", _feature_save_args),
+}
+
+
+class ImageTaskRunner:
+    """Run one of the lite demo tasks on chunks of image paths, reusing the
+    loaded and compiled model of the entry point module."""
+
+    def __init__(self, device, task, args):
+        import torch
+        from adhoc_image_dataset import AdhocImageDataset
+        from compile_cache import load_compiled_model
+        from worker_pool import WorkerPool
+
+        module_name, save_name, save_args_fn = TASKS[task]
+        self.torch = torch
+        self.dataset_cls = AdhocImageDataset
+        self.module = importlib.import_module(module_name)
+        self.module.BATCH_SIZE = args["batch_size"]
+        self.save_args_fn = save_args_fn
+        self.args = args
+
+        torch._inductor.config.force_fuse_int_mm_with_mul = True
+        torch._inductor.config.use_mixed_mm = True
+
+        self.device = device
+        use_torchscript = "_torchscript" in args["checkpoint"]
+        ## no precision conversion needed for torchscript. run at fp32
+        if device == "cpu":
+            from cpu_backend import load_cpu_model, select_dtype
+
+            model, self.dtype = load_cpu_model(
+                args["checkpoint"], select_dtype(args["cpu_dtype"])
+            )
+        elif not use_torchscript and args["compile_cache"]:
+            self.dtype = torch.half if args["fp16"] else torch.bfloat16
+            model = load_compiled_model(
+                args["checkpoint"],
+                partial(self.module.load_model, args["checkpoint"]),
+                self.dtype,
+                args["batch_size"],
+                (3,) + tuple(args["shape"]),
+                device,
+                args["compile_cache"],
+            )
+        elif not use_torchscript:
+            model = self.module.load_model(args["checkpoint"], use_torchscript)
+            self.dtype = torch.half if args["fp16"] else torch.bfloat16
+            model.to(self.dtype)
+            model = torch.compile(model, mode="max-autotune", fullgraph=True)
+        else:
+            model = self.module.load_model(args["checkpoint"], use_torchscript)
+            self.dtype = torch.float32
+            model = model.to(device)
+        self.model = model
+
+        self.postprocess = None
+        if task == "feature":
+            self.postprocess = self.module.FeaturePostprocessor(
+                args["pool"], args["pca_dim"], args["pca_basis"], args["save_dtype"]
+            )
+
+        self.num_workers = max(min(args["batch_size"], cpu_count()) // 2, 4)
+        if device == "cpu":
+            ## leave the cores to the model
+            self.num_workers = 2
+        self.save_pool = WorkerPool(
+            getattr(self.module, save_name), processes=self.num_workers
+        )
+
+    def __call__(self, image_paths):
+        dataset = self.dataset_cls(
+            image_paths,
+            tuple(self.args["shape"]),
+            mean=[123.5, 116.5, 103.5],
+            std=[58.5, 57.0, 57.5],
+        )
+        dataloader = self.torch.utils.data.DataLoader(
+            dataset,
+            batch_size=self.args["batch_size"],
+            shuffle=False,
+            num_workers=min(self.num_workers, len(image_paths)),
+        )
+        for batch_image_name, batch_orig_imgs, batch_imgs in dataloader:
+            valid_images_len = len(batch_imgs)
+            batch_imgs = self.module.fake_pad_images_to_batchsize(batch_imgs)
+            if self.device == "cpu":
+                from cpu_backend import to_cpu_inputs
+
+                batch_imgs = to_cpu_inputs(batch_imgs, self.dtype)
+            result = self.module.inference_model(
+                self.model, batch_imgs, dtype=self.dtype, device=self.device
+            )
+            if self.postprocess is not None:
+                result = self.postprocess(result[:valid_images_len]).cpu()
+            args_list = [
+                self.save_args_fn(
+                    self.args,
+                    i,
+                    r,
+                    os.path.join(self.args["output_root"], os.path.basename(img_name)),
+                )
+                for i, r, img_name in zip(
+                    batch_orig_imgs[:valid_images_len],
+                    result[:valid_images_len],
+                    batch_image_name,
+                )
+            ]
+            self.save_pool.run_async(args_list)
+        return len(image_paths)
+
+    def close(self):
+        self.save_pool.finish()
+
+
+def build_image_task_runner(device, task, args):
+    return ImageTaskRunner(device, task, args)
+
+
+def list_images(input):
+    """List the images of a directory or of a text file with one path per line."""
+    if os.path.isdir(input):
+        return [
+            os.path.join(input, image_name)
+            for image_name in sorted(os.listdir(input))
+            if image_name.lower().endswith((".jpg", ".png", ".jpeg"))
+        ]
+    elif os.path.isfile(input) and input.endswith(".txt"):
+        with open(input, "r") as file:
+            return [line.strip() for line in file if line.strip()]
+    raise ValueError(f"invalid input {input}")
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("task", choices=sorted(TASKS) + ["dummy"], help="Demo task")
+    parser.add_argument("checkpoint", nargs="?", default="", help="Checkpoint file")
+    parser.add_argument("--input", help="Input image dir or text file of paths")
+    parser.add_argument(
+        "--output_root", "--output-root", default=None, help="Path to output dir"
+    )
+    parser.add_argument("--seg_dir", "--seg-dir", default=None, help="Path to seg dir")
+    parser.add_argument(
+        "--devices",
+        nargs="+",
+        default=["cuda:0"],
+        help="Devices to run on, e.g. cuda:0 cuda:1, cpu cpu or numa for one cpu "
+        "replica per NUMA node",
+    )
+    parser.add_argument(
+        "--jobs_per_device",
+        "--jobs-per-device",
+        type=int,
+        default=1,
+        help="Number of workers started per device",
+    )
+    parser.add_argument(
+        "--chunk_size",
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Images handed out per request. Defaults to 4 batches",
+    )
+    parser.add_argument(
+        "--batch_size",
+        "--batch-size",
+        type=batch_size_arg,
+        default=8,
+        help="Set batch size to do batch inference, or auto to tune it. ",
+    )
+    parser.add_argument(
+        "--max_memory",
+        "--max-memory",
+        type=float,
+        default=None,
+        help="Memory ceiling per worker in GB for --batch-size auto",
+    )
+    parser.add_argument(
+        "--max_latency",
+        "--max-latency",
+        type=float,
+        default=None,
+        help="Latency ceiling per batch in ms for --batch-size auto",
+    )
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[1024, 768],
+        help="input image size (height, width)",
+    )
+    parser.add_argument(
+        "--fp16", action="store_true", default=False, help="Model inference dtype"
+    )
+    parser.add_argument(
+        "--compile_cache",
+        "--compile-cache",
+        default=None,
+        help="Directory of the persistent compiled-model cache",
+    )
+    parser.add_argument(
+        "--cpu_dtype",
+        "--cpu-dtype",
+        choices=["auto", "bf16", "fp32"],
+        default="auto",
+        help="Model dtype on cpu. auto uses bf16 if the cpu supports it",
+    )
+    parser.add_argument(
+        "--opacity",
+        type=float,
+        default=0.5,
+        help="Opacity of painted segmentation map. In (0, 1] range.",
+    )
+    parser.add_argument("--title", default="result", help="The image identifier.")
+    parser.add_argument(
+        "--pool", type=int, default=1, help="Feature average pooling factor"
+    )
+    parser.add_argument(
+        "--pca_dim", "--pca-dim", type=int, default=0, help="Feature PCA components"
+    )
+    parser.add_argument(
+        "--pca_basis",
+        "--pca-basis",
+        default=None,
+        help="npz file of the feature PCA basis, see extract_feature.py",
+    )
+    parser.add_argument(
+        "--save_dtype",
+        "--save-dtype",
+        choices=["float16", "float32"],
+        default="float16",
+        help="Dtype of the saved features",
+    )
+    args = parser.parse_args()
+
+    if len(args.shape) == 1:
+        args.shape = [args.shape[0], args.shape[0]]
+    elif len(args.shape) != 2:
+        raise ValueError("invalid input shape")
+
+    if args.pca_dim:
+        ## every worker has to project onto the same basis
+        assert args.pca_basis and os.path.exists(
+            args.pca_basis
+        ), "fit the PCA basis first, e.g. with extract_feature.py --pca-basis"
+
+    image_paths = list_images(args.input)
+    if "numa" in args.devices:
+        from cpu_backend import numa_devices
+
+        args.devices = [
+            d for device in args.devices
+            for d in (numa_devices() if device == "numa" else [device])
+        ]
+    devices = [d for d in args.devices for _ in range(args.jobs_per_device)]
+    if args.batch_size == "auto":
+        assert args.task != "dummy", "--batch-size auto needs a checkpoint"
+        device = "cpu" if devices[0].startswith("numa") else devices[0]
+        # tune in a child process so that this one never initializes cuda
+        with mp.get_context("spawn").Pool(1) as pool:
+            args.batch_size = pool.apply(
+                tune_batch_size,
+                (args.checkpoint, (3, *args.shape), device, args.fp16),
+                dict(
+                    cache_dir=args.compile_cache,
+                    max_memory=args.max_memory,
+                    max_latency=args.max_latency,
+                ),
+            )
+    chunk_size = args.chunk_size or 4 * args.batch_size
+
+    if args.task == "dummy":
+        build_fn = build_dummy_runner
+        build_kwargs = dict(batch_size=args.batch_size)
+    else:
+        assert args.checkpoint, "a checkpoint is required"
+        if not os.path.exists(args.output_root):
+            os.makedirs(args.output_root)
+        build_fn = build_image_task_runner
+        build_kwargs = dict(task=args.task, args=vars(args))
+
+    print(
+        f"Distributing {len(image_paths)} images over {len(devices)} workers "
+        f"in chunks of {chunk_size}."
+    )
+    scheduler = JobScheduler(
+        build_fn, devices, build_kwargs=build_kwargs, chunk_size=chunk_size
+    )
+    stats = scheduler.run(image_paths)
+    print_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
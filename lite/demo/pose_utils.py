@@ -283,30 +283,26 @@ def nms(dets: np.ndarray, thr: float):
     if len(dets) == 0:
         return []
 
-    x1 = dets[:, 0]
-    y1 = dets[:, 1]
-    x2 = dets[:, 2]
-    y2 = dets[:, 3]
-    scores = dets[:, 4]
-
+    x1, y1, x2, y2, scores = (dets[:, i] for i in range(5))
     areas = (x2 - x1 + 1) * (y2 - y1 + 1)
     order = scores.argsort()[::-1]
 
+    # pairwise overlaps once, then greedy suppression over the boolean matrix
+    w = np.maximum(
+        0.0, np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1) + 1
+    )
+    h = np.maximum(
+        0.0, np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1) + 1
+    )
+    inter = w * h
+    suppress = ~(inter / (areas[:, None] + areas - inter) <= thr)
+
+    suppressed = np.zeros(len(dets), dtype=bool)
     keep = []
-    while len(order) > 0:
-        i = order[0]
+    for i in order:
+        if suppressed[i]:
+            continue
         keep.append(i)
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
-
-        w = np.maximum(0.0, xx2 - xx1 + 1)
-        h = np.maximum(0.0, yy2 - yy1 + 1)
-        inter = w * h
-        ovr = inter / (areas[i] + areas[order[1:]] - inter)
-
-        inds = np.where(ovr <= thr)[0]
-        order = order[inds + 1]
+        suppressed |= suppress[i]
 
     return keep
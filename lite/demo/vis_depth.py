@@ -20,6 +20,8 @@ import torchvision
 from adhoc_image_dataset import AdhocImageDataset
 from tqdm import tqdm
 
+from batch_tuner import batch_size_arg, tune_batch_size
+from compile_cache import load_compiled_model
 from worker_pool import WorkerPool
 
 torchvision.disable_beta_transforms_warning()
@@ -52,9 +54,9 @@ def warmup_model(model, batch_size):
     del imgs, s
 
 
-def inference_model(model, imgs, dtype=torch.bfloat16):
+def inference_model(model, imgs, dtype=torch.bfloat16, device="cuda"):
     with torch.no_grad():
-        results = model(imgs.to(dtype).cuda())
+        results = model(imgs.to(dtype).to(device))
         imgs.cpu()
 
     results = [r.cpu() for r in results]
@@ -188,9 +190,9 @@ def main():
     parser.add_argument(
         "--batch_size",
         "--batch-size",
-        type=int,
+        type=batch_size_arg,
         default=18,
-        help="Set batch size to do batch inference. ",
+        help="Set batch size to do batch inference, or auto to tune it. ",
     )
     parser.add_argument(
         "--shape",
@@ -202,6 +204,12 @@ def main():
     parser.add_argument(
         "--fp16", action="store_true", default=False, help="Model inference dtype"
     )
+    parser.add_argument(
+        "--compile_cache",
+        "--compile-cache",
+        default=None,
+        help="Directory of the persistent compiled-model cache",
+    )
     args = parser.parse_args()
 
     if len(args.shape) == 1:
@@ -218,16 +226,32 @@ def main():
     start = time.time()
 
     USE_TORCHSCRIPT = '_torchscript' in args.checkpoint
-
-    # build the model from a checkpoint file
-    exp_model = load_model(args.checkpoint, USE_TORCHSCRIPT)
+    if args.batch_size == "auto":
+        args.batch_size = tune_batch_size(
+            args.checkpoint, input_shape, args.device, args.fp16, args.compile_cache
+        )
 
     ## no precision conversion needed for torchscript. run at fp32
-    if not USE_TORCHSCRIPT:
+    if not USE_TORCHSCRIPT and args.compile_cache:
+        # load the compiled artifact, the checkpoint is only read on a cache miss
+        dtype = torch.half if args.fp16 else torch.bfloat16
+        exp_model = load_compiled_model(
+            args.checkpoint,
+            partial(load_model, args.checkpoint),
+            dtype,
+            args.batch_size,
+            input_shape,
+            args.device,
+            args.compile_cache,
+        )
+    elif not USE_TORCHSCRIPT:
+        # build the model from a checkpoint file
+        exp_model = load_model(args.checkpoint, USE_TORCHSCRIPT)
         dtype = torch.half if args.fp16 else torch.bfloat16
         exp_model.to(dtype)
         exp_model = torch.compile(exp_model, mode="max-autotune", fullgraph=True)
     else:
+        exp_model = load_model(args.checkpoint, USE_TORCHSCRIPT)
         dtype = torch.float32  # TorchScript models use float32
         exp_model = exp_model.to(args.device)
 
@@ -284,7 +308,7 @@ def main():
     ):
         valid_images_len = len(batch_imgs)
         batch_imgs = fake_pad_images_to_batchsize(batch_imgs)
-        result = inference_model(exp_model, batch_imgs, dtype=dtype)
+        result = inference_model(exp_model, batch_imgs, dtype=dtype, device=args.device)
         args_list = [
             (
                 i,
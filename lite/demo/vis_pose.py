@@ -24,17 +24,26 @@ import torch.nn.functional as F
 from adhoc_image_dataset import AdhocImageDataset
 from classes_and_palettes import (
     COCO_KPTS_COLORS,
+    COCO_KPTS_FLIP_INDICES,
     COCO_WHOLEBODY_KPTS_COLORS,
+    COCO_WHOLEBODY_KPTS_FLIP_INDICES,
     GOLIATH_KPTS_COLORS,
+    GOLIATH_KPTS_FLIP_INDICES,
+)
+from pose_utils import (
+    get_heatmap_maximum,
+    nms,
+    top_down_affine_transform,
+    udp_decode,
 )
-from pose_utils import nms, top_down_affine_transform, udp_decode
 
 from tqdm import tqdm
 
+from compile_cache import load_compiled_model
 from worker_pool import WorkerPool
 
 try:
-    from mmdet.apis import inference_detector, init_detector
+    from mmdet.apis import inference_detector
     from mmdet.structures import DetDataSample, SampleList
     from mmdet.utils import get_test_pipeline_cfg
 
@@ -78,11 +87,17 @@ def batch_inference_topdown(
     imgs: List[Union[np.ndarray, str]],
     dtype=torch.bfloat16,
     flip=False,
+    device="cuda",
+    flip_indices=None,
 ):
-    with torch.no_grad(), torch.autocast(device_type="cuda", dtype=dtype):
-        heatmaps = model(imgs.cuda())
+    device_type = torch.device(device).type
+    with torch.no_grad(), torch.autocast(device_type=device_type, dtype=dtype):
+        heatmaps = model(imgs.to(device))
         if flip:
-            heatmaps_ = model(imgs.to(dtype).cuda().flip(-1))
+            assert flip_indices is not None, "flip test needs the flip indices"
+            heatmaps_ = model(imgs.to(dtype).to(device).flip(-1))
+            # flip the heatmaps back and swap the left and right keypoints
+            heatmaps_ = heatmaps_.flip(-1)[:, flip_indices]
             heatmaps = (heatmaps + heatmaps_) * 0.5
         imgs.cpu()
     return heatmaps.cpu()
@@ -99,15 +114,20 @@ def img_save_and_viz(
     instance_keypoints = []
     instance_scores = []
     # print(scales[0], centres[0])
+    input_shapes = results.get("input_shapes", [input_shape] * len(heatmap))
     for i in range(len(heatmap)):
+        # instances of the low-resolution bucket have smaller heatmaps
         result = udp_decode(
             heatmap[i].cpu().unsqueeze(0).float().data[0].numpy(),
-            input_shape,
-            (int(input_shape[0] / heatmap_scale), int(input_shape[1] / heatmap_scale)),
+            input_shapes[i],
+            (
+                int(input_shapes[i][0] / heatmap_scale),
+                int(input_shapes[i][1] / heatmap_scale),
+            ),
         )
 
         keypoints, keypoint_scores = result
-        keypoints = (keypoints / input_shape) * scales[i] + centres[i] - 0.5 * scales[i]
+        keypoints = (keypoints / input_shapes[i]) * scales[i] + centres[i] - 0.5 * scales[i]
         instance_keypoints.append(keypoints[0])
         instance_scores.append(keypoint_scores[0])
 
@@ -163,8 +183,89 @@ def img_save_and_viz(
     cv2.imwrite(output_path, img)
 
 
-def fake_pad_images_to_batchsize(imgs):
-    return F.pad(imgs, (0, 0, 0, 0, 0, 0, 0, BATCH_SIZE - imgs.shape[0]), value=0)
+def fake_pad_images_to_batchsize(imgs, batch_size=None):
+    batch_size = BATCH_SIZE if batch_size is None else batch_size
+    return F.pad(imgs, (0, 0, 0, 0, 0, 0, 0, batch_size - imgs.shape[0]), value=0)
+
+
+def split_bboxes_by_size(bboxes_batch, size_thr, padding=1.25):
+    """Split the per-image bboxes into people whose padded bbox height is at
+    most ``size_thr`` pixels and the remaining (large) people."""
+    small_batch, large_batch = [], []
+    for bboxes in bboxes_batch:
+        bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        is_small = (bboxes[:, 3] - bboxes[:, 1]) * padding <= size_thr
+        small_batch.append(bboxes[is_small])
+        large_batch.append(bboxes[~is_small])
+    return small_batch, large_batch
+
+
+def preprocess_bucket(pool, orig_imgs, bboxes_batch, input_shape):
+    """Crop the people of one bucket at the bucket input resolution.
+
+    Returns:
+        dict: The crops, centres, scales, bboxes and image index per instance.
+    """
+    img_ids = [i for i, bboxes in enumerate(bboxes_batch) if len(bboxes) > 0]
+    bucket = dict(imgs=[], centres=[], scales=[], bboxes=[], img_ids=[])
+    if len(img_ids) == 0:
+        return bucket
+
+    args_list = [
+        (
+            orig_imgs[i],
+            bboxes_batch[i],
+            (input_shape[1], input_shape[2]),
+            [123.5, 116.5, 103.5],
+            [58.5, 57.0, 57.5],
+        )
+        for i in img_ids
+    ]
+    for i, op in zip(img_ids, pool.run(args_list)):
+        bucket["imgs"].extend(op[0])
+        bucket["centres"].extend(op[1])
+        bucket["scales"].extend(op[2])
+        bucket["bboxes"].extend(bboxes_batch[i])
+        bucket["img_ids"].extend([i] * len(op[0]))
+    return bucket
+
+
+def run_pose_bucket(
+    model, imgs, batch_size, dtype, flip=False, device="cuda", flip_indices=None
+):
+    """Run the crops of one bucket through its model in padded batches."""
+    heatmaps = []
+    # use this to tell torch compiler the start of model invocation as in 'flip' mode the tensor output is overwritten
+    torch.compiler.cudagraph_mark_step_begin()
+    for i in range(0, len(imgs), batch_size):
+        batch = torch.stack(imgs[i : i + batch_size], dim=0)
+        valid_len = len(batch)
+        batch = fake_pad_images_to_batchsize(batch, batch_size)
+        heatmaps.extend(
+            batch_inference_topdown(
+                model,
+                batch,
+                dtype=dtype,
+                flip=flip,
+                device=device,
+                flip_indices=flip_indices,
+            )[:valid_len]
+        )
+    return heatmaps
+
+
+def heatmap_keypoints(heatmaps, centres, scales):
+    """Decode heatmap maxima (without refinement) to image coordinates."""
+    keypoints = []
+    for heatmap, centre, scale in zip(heatmaps, centres, scales):
+        locs, _ = get_heatmap_maximum(heatmap.float().numpy())
+        K, H, W = heatmap.shape
+        keypoints.append(locs / [W - 1, H - 1] * scale + centre - 0.5 * scale)
+    return keypoints
+
+
+def mean_keypoint_scores(heatmaps):
+    return [float(h.float().flatten(1).amax(dim=1).mean()) for h in heatmaps]
 
 def load_model(checkpoint, use_torchscript=False):
     if use_torchscript:
@@ -172,6 +273,35 @@ def load_model(checkpoint, use_torchscript=False):
     else:
         return torch.export.load(checkpoint).module()
 
+
+def build_pose_estimator(checkpoint, args, input_shape, batch_size):
+    USE_TORCHSCRIPT = '_torchscript' in checkpoint
+
+    ## no precision conversion needed for torchscript. run at fp32
+    if not USE_TORCHSCRIPT and args.compile_cache:
+        # load the compiled artifact, the checkpoint is only read on a cache miss
+        dtype = torch.half if args.fp16 else torch.bfloat16
+        pose_estimator = load_compiled_model(
+            checkpoint,
+            partial(load_model, checkpoint),
+            dtype,
+            batch_size,
+            input_shape,
+            args.device,
+            args.compile_cache,
+        )
+    elif not USE_TORCHSCRIPT:
+        # build the model from a checkpoint file
+        pose_estimator = load_model(checkpoint, USE_TORCHSCRIPT)
+        dtype = torch.half if args.fp16 else torch.bfloat16
+        pose_estimator.to(dtype)
+        pose_estimator = torch.compile(pose_estimator, mode="max-autotune", fullgraph=True)
+    else:
+        pose_estimator = load_model(checkpoint, USE_TORCHSCRIPT)
+        dtype = torch.float32  # TorchScript models use float32
+        pose_estimator = pose_estimator.to(args.device)
+    return pose_estimator, dtype
+
 def main():
     """Visualize the demo images.
     Using mmdet to detect the human.
@@ -211,6 +341,12 @@ def main():
     parser.add_argument(
         "--fp16", action="store_true", default=False, help="Model inference dtype"
     )
+    parser.add_argument(
+        "--compile_cache",
+        "--compile-cache",
+        default=None,
+        help="Directory of the persistent compiled-model cache",
+    )
     parser.add_argument("--device", default="cuda:0", help="Device used for inference")
     parser.add_argument(
         "--det-cat-id",
@@ -239,6 +375,46 @@ def main():
         default=False,
         help="Flip the input image horizontally and inference again",
     )
+    parser.add_argument(
+        "--small-pose-checkpoint",
+        default="",
+        help="Pose checkpoint for small people, exported at --small-shape or a "
+        "smaller arch. Enables the adaptive-resolution mode",
+    )
+    parser.add_argument(
+        "--small-shape",
+        type=int,
+        nargs=2,
+        default=[512, 384],
+        help="input image size (height, width) of the small-people checkpoint",
+    )
+    parser.add_argument(
+        "--small-batch-size",
+        type=int,
+        default=None,
+        help="Batch size of the small-people checkpoint. Defaults to --batch-size",
+    )
+    parser.add_argument(
+        "--size-thr",
+        type=float,
+        default=None,
+        help="People whose padded bbox is at most this many pixels tall use the "
+        "small-people checkpoint. Defaults to the small input height",
+    )
+    parser.add_argument(
+        "--rerun-kpt-thr",
+        type=float,
+        default=0.5,
+        help="Small people whose mean keypoint score is below this threshold "
+        "(e.g. occluded) are run again through the full model",
+    )
+    parser.add_argument(
+        "--bucket-report",
+        action="store_true",
+        default=False,
+        help="Also run the small people through the full model and report the "
+        "keypoint agreement of the small bucket",
+    )
 
     args = parser.parse_args()
 
@@ -288,19 +464,26 @@ def main():
         detector.cfg = adapt_mmdet_pipeline(detector.cfg)
 
     # build pose estimator
-    USE_TORCHSCRIPT = '_torchscript' in args.pose_checkpoint
-
-    # build the model from a checkpoint file
-    pose_estimator = load_model(args.pose_checkpoint, USE_TORCHSCRIPT)
+    pose_estimator, dtype = build_pose_estimator(
+        args.pose_checkpoint, args, input_shape, args.batch_size
+    )
 
-    ## no precision conversion needed for torchscript. run at fp32
-    if not USE_TORCHSCRIPT:
-        dtype = torch.half if args.fp16 else torch.bfloat16
-        pose_estimator.to(dtype)
-        pose_estimator = torch.compile(pose_estimator, mode="max-autotune", fullgraph=True)
-    else:
-        dtype = torch.float32  # TorchScript models use float32
-        pose_estimator = pose_estimator.to(args.device)
+    # build the low-resolution (or smaller arch) estimator for small people
+    small_estimator = None
+    if args.small_pose_checkpoint:
+        small_input_shape = (3,) + tuple(args.small_shape)
+        small_batch_size = args.small_batch_size or args.batch_size
+        small_estimator, small_dtype = build_pose_estimator(
+            args.small_pose_checkpoint, args, small_input_shape, small_batch_size
+        )
+        size_thr = args.size_thr or args.small_shape[0]
+        print(
+            f"Adaptive resolution: people up to {size_thr}px tall run at "
+            f"{args.small_shape[0]}x{args.small_shape[1]}, "
+            f"the rest at {input_shape[1]}x{input_shape[2]}"
+        )
+    bucket_stats = defaultdict(lambda: dict(instances=0, time=0.0))
+    agreement = dict(errors=[], pck=[])
 
     global BATCH_SIZE
     BATCH_SIZE = args.batch_size
@@ -345,11 +528,14 @@ def main():
     )
 
     KPTS_COLORS = COCO_WHOLEBODY_KPTS_COLORS  ## 133 keypoints
+    FLIP_INDICES = COCO_WHOLEBODY_KPTS_FLIP_INDICES
 
     if args.num_keypoints == 17:
         KPTS_COLORS = COCO_KPTS_COLORS
+        FLIP_INDICES = COCO_KPTS_FLIP_INDICES
     elif args.num_keypoints == 308:
         KPTS_COLORS = GOLIATH_KPTS_COLORS
+        FLIP_INDICES = GOLIATH_KPTS_FLIP_INDICES
 
     for batch_idx, (batch_image_name, batch_orig_imgs, batch_imgs) in tqdm(
         enumerate(inference_dataloader), total=len(inference_dataloader)
@@ -373,55 +559,127 @@ def main():
                     [[0, 0, orig_img_shape[1], orig_img_shape[0]]]
                 )
 
-        img_bbox_map = {}
-        for i, bboxes in enumerate(bboxes_batch):
-            img_bbox_map[i] = len(bboxes)
+        orig_imgs = batch_orig_imgs.numpy()
+        if small_estimator is not None:
+            small_bboxes, large_bboxes = split_bboxes_by_size(bboxes_batch, size_thr)
+        else:
+            small_bboxes, large_bboxes = None, bboxes_batch
 
-        args_list = [
-            (
-                i,
-                bbox_list,
-                (input_shape[1], input_shape[2]),
-                [123.5, 116.5, 103.5],
-                [58.5, 57.0, 57.5],
+        instances = []  # (img_id, heatmap, centre, scale, input_shape)
+        if small_estimator is not None:
+            small = preprocess_bucket(
+                pose_preprocess_pool, orig_imgs, small_bboxes, small_input_shape
             )
-            for i, bbox_list in zip(batch_orig_imgs.numpy(), bboxes_batch)
-        ]
-        pose_ops = pose_preprocess_pool.run(args_list)
-
-        pose_imgs, pose_img_centers, pose_img_scales = [], [], []
-        for op in pose_ops:
-            pose_imgs.extend(op[0])
-            pose_img_centers.extend(op[1])
-            pose_img_scales.extend(op[2])
-
-        n_pose_batches = (len(pose_imgs) + args.batch_size - 1) // args.batch_size
-
-        # use this to tell torch compiler the start of model invocation as in 'flip' mode the tensor output is overwritten
-        torch.compiler.cudagraph_mark_step_begin()  
-        pose_results = []
-        for i in range(n_pose_batches):
-            imgs = torch.stack(
-                pose_imgs[i * args.batch_size : (i + 1) * args.batch_size], dim=0
+            start_time = time.time()
+            small_heatmaps = run_pose_bucket(
+                small_estimator,
+                small["imgs"],
+                small_batch_size,
+                small_dtype,
+                args.flip,
+                args.device,
+                FLIP_INDICES,
             )
-            valid_len = len(imgs)
-            imgs = fake_pad_images_to_batchsize(imgs)
-            pose_results.extend(
-                batch_inference_topdown(pose_estimator, imgs, dtype=dtype)[:valid_len]
+            bucket_stats["small"]["time"] += time.time() - start_time
+            bucket_stats["small"]["instances"] += len(small_heatmaps)
+
+            # people the small model is unsure about go to the full model
+            rerun = [[] for _ in range(len(orig_imgs))]
+            small_scores = mean_keypoint_scores(small_heatmaps)
+            for j, score in enumerate(small_scores):
+                if score < args.rerun_kpt_thr and not args.bucket_report:
+                    rerun[small["img_ids"][j]].append(small["bboxes"][j])
+                    continue
+                instances.append(
+                    (
+                        small["img_ids"][j],
+                        small_heatmaps[j],
+                        small["centres"][j],
+                        small["scales"][j],
+                        (small_input_shape[2], small_input_shape[1]),
+                    )
+                )
+            if args.bucket_report:
+                # the full model sees every small person as reference
+                rerun = [list(bboxes) for bboxes in small_bboxes]
+            large_bboxes = [
+                np.concatenate([large, np.asarray(extra).reshape(-1, 4)])
+                if len(extra) > 0
+                else large
+                for large, extra in zip(large_bboxes, rerun)
+            ]
+
+        large = preprocess_bucket(
+            pose_preprocess_pool, orig_imgs, large_bboxes, input_shape
+        )
+        start_time = time.time()
+        large_heatmaps = run_pose_bucket(
+            pose_estimator,
+            large["imgs"],
+            args.batch_size,
+            dtype,
+            args.flip,
+            args.device,
+            FLIP_INDICES,
+        )
+        bucket_stats["full"]["time"] += time.time() - start_time
+        bucket_stats["full"]["instances"] += len(large_heatmaps)
+
+        if small_estimator is not None and args.bucket_report:
+            # the last instances of every image are the small people
+            is_reference = np.zeros(len(large_heatmaps), dtype=bool)
+            for i in range(len(orig_imgs)):
+                ids = np.flatnonzero(np.asarray(large["img_ids"]) == i)
+                if len(small_bboxes[i]) > 0:
+                    is_reference[ids[-len(small_bboxes[i]) :]] = True
+            reference_ids = np.flatnonzero(is_reference)
+            small_kpts = heatmap_keypoints(
+                small_heatmaps, small["centres"], small["scales"]
+            )
+            full_kpts = heatmap_keypoints(
+                [large_heatmaps[j] for j in reference_ids],
+                [large["centres"][j] for j in reference_ids],
+                [large["scales"][j] for j in reference_ids],
+            )
+            full_scores = mean_keypoint_scores(
+                [large_heatmaps[j] for j in reference_ids]
+            )
+            for kpts, ref, bbox, score in zip(
+                small_kpts, full_kpts, small["bboxes"], full_scores
+            ):
+                if score < args.kpt_thr:
+                    continue
+                # distance normalized by the bbox size
+                size = max(bbox[2] - bbox[0], bbox[3] - bbox[1], 1.0)
+                errors = np.linalg.norm(kpts - ref, axis=-1) / size
+                agreement["errors"].append(float(errors.mean()))
+                agreement["pck"].append(float((errors < 0.05).mean()))
+        else:
+            is_reference = np.zeros(len(large_heatmaps), dtype=bool)
+
+        for j in range(len(large_heatmaps)):
+            if is_reference[j]:
+                continue
+            instances.append(
+                (
+                    large["img_ids"][j],
+                    large_heatmaps[j],
+                    large["centres"][j],
+                    large["scales"][j],
+                    (input_shape[2], input_shape[1]),
+                )
             )
 
         batched_results = []
-        for _, bbox_len in img_bbox_map.items():
-            result = {
-                "heatmaps": pose_results[:bbox_len].copy(),
-                "centres": pose_img_centers[:bbox_len].copy(),
-                "scales": pose_img_scales[:bbox_len].copy(),
-            }
-            batched_results.append(result)
-            del (
-                pose_results[:bbox_len],
-                pose_img_centers[:bbox_len],
-                pose_img_scales[:bbox_len],
+        for i in range(len(orig_imgs)):
+            own = [inst for inst in instances if inst[0] == i]
+            batched_results.append(
+                {
+                    "heatmaps": [inst[1] for inst in own],
+                    "centres": [inst[2] for inst in own],
+                    "scales": [inst[3] for inst in own],
+                    "input_shapes": [inst[4] for inst in own],
+                }
             )
 
         assert len(batched_results) == len(batch_orig_imgs)
@@ -453,6 +711,19 @@ def main():
     print(
         f"\033[92mTotal inference time: {total_time:.2f} seconds. FPS: {fps:.2f}\033[0m"
     )
+    if small_estimator is not None:
+        for name, stats in bucket_stats.items():
+            throughput = stats["instances"] / max(stats["time"], 1e-6)
+            print(
+                f"bucket {name}: {stats['instances']} people, "
+                f"{stats['time']:.2f}s model time, {throughput:.2f} people/s"
+            )
+        if len(agreement["errors"]) > 0:
+            print(
+                f"small vs full model on {len(agreement['errors'])} people: "
+                f"mean normalized error {np.mean(agreement['errors']):.4f}, "
+                f"PCK@0.05 {np.mean(agreement['pck']):.4f}"
+            )
 
 
 if __name__ == "__main__":
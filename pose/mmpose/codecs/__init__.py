@@ -4,20 +4,19 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .associative_embedding import AssociativeEmbedding
-from .decoupled_heatmap import DecoupledHeatmap
-from .image_pose_lifting import ImagePoseLifting
-from .integral_regression_label import IntegralRegressionLabel
-from .megvii_heatmap import MegviiHeatmap
-from .msra_heatmap import MSRAHeatmap
-from .regression_label import RegressionLabel
-from .simcc_label import SimCCLabel
-from .spr import SPR
-from .udp_heatmap import UDPHeatmap
-from .video_pose_lifting import VideoPoseLifting
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'MSRAHeatmap', 'MegviiHeatmap', 'UDPHeatmap', 'RegressionLabel',
-    'SimCCLabel', 'IntegralRegressionLabel', 'AssociativeEmbedding', 'SPR',
-    'DecoupledHeatmap', 'VideoPoseLifting', 'ImagePoseLifting', 
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'associative_embedding': ['AssociativeEmbedding'],
+        'decoupled_heatmap': ['DecoupledHeatmap'],
+        'image_pose_lifting': ['ImagePoseLifting'],
+        'integral_regression_label': ['IntegralRegressionLabel'],
+        'megvii_heatmap': ['MegviiHeatmap'],
+        'msra_heatmap': ['MSRAHeatmap'],
+        'regression_label': ['RegressionLabel'],
+        'simcc_label': ['SimCCLabel'],
+        'spr': ['SPR'],
+        'udp_heatmap': ['UDPHeatmap'],
+        'video_pose_lifting': ['VideoPoseLifting'],
+    })
@@ -4,10 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .builder import build_dataset
-from .dataset_wrappers import CombinedDataset
-from .datasets import *  # noqa
-from .samplers import MultiSourceSampler
-from .transforms import *  # noqa
+from mmengine.utils import lazy_import
 
-__all__ = ['build_dataset', 'CombinedDataset', 'MultiSourceSampler']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'builder': ['build_dataset'],
+        'dataset_wrappers': ['CombinedDataset'],
+        'datasets': '*',
+        'samplers': ['MultiSourceSampler'],
+        'transforms': '*',
+    })
@@ -4,11 +4,16 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .animal import *  # noqa: F401, F403
-from .base import *  # noqa: F401, F403
-from .body import *  # noqa: F401, F403
-from .body3d import *  # noqa: F401, F403
-from .face import *  # noqa: F401, F403
-from .fashion import *  # noqa: F401, F403
-from .hand import *  # noqa: F401, F403
-from .wholebody import *  # noqa: F401, F403
+from mmengine.utils import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'animal': '*',
+        'base': '*',
+        'body': '*',
+        'body3d': '*',
+        'face': '*',
+        'fashion': '*',
+        'hand': '*',
+        'wholebody': '*',
+    })
@@ -4,18 +4,17 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .animalkingdom_dataset import AnimalKingdomDataset
-from .animalpose_dataset import AnimalPoseDataset
-from .ap10k_dataset import AP10KDataset
-from .atrw_dataset import ATRWDataset
-from .fly_dataset import FlyDataset
-from .horse10_dataset import Horse10Dataset
-from .locust_dataset import LocustDataset
-from .macaque_dataset import MacaqueDataset
-from .zebra_dataset import ZebraDataset
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'AnimalPoseDataset', 'AP10KDataset', 'Horse10Dataset', 'MacaqueDataset',
-    'FlyDataset', 'LocustDataset', 'ZebraDataset', 'ATRWDataset',
-    'AnimalKingdomDataset'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'animalkingdom_dataset': ['AnimalKingdomDataset'],
+        'animalpose_dataset': ['AnimalPoseDataset'],
+        'ap10k_dataset': ['AP10KDataset'],
+        'atrw_dataset': ['ATRWDataset'],
+        'fly_dataset': ['FlyDataset'],
+        'horse10_dataset': ['Horse10Dataset'],
+        'locust_dataset': ['LocustDataset'],
+        'macaque_dataset': ['MacaqueDataset'],
+        'zebra_dataset': ['ZebraDataset'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base_coco_style_dataset import BaseCocoStyleDataset
-from .base_mocap_dataset import BaseMocapDataset
+from mmengine.utils import lazy_import
 
-__all__ = ['BaseCocoStyleDataset', 'BaseMocapDataset']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base_coco_style_dataset': ['BaseCocoStyleDataset'],
+        'base_mocap_dataset': ['BaseMocapDataset'],
+    })
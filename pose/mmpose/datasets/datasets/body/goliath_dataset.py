@@ -11,8 +11,6 @@ import torch
 import torch.utils.data
 import torch.multiprocessing as mp
 import numpy as np
-import os
-import cv2
 import pickle
 from PIL import ImageDraw
 from tqdm import tqdm
@@ -22,7 +20,6 @@ import copy
 from PIL import Image
 from concurrent.futures import ThreadPoolExecutor
 import random
-from matplotlib import pyplot as plt
 
 import copy
 import os.path as osp
@@ -37,16 +34,9 @@ from xtcocotools.coco import COCO
 
 from mmpose.registry import DATASETS
 from mmpose.structures.bbox import bbox_xywh2xyxy
-from ..utils import parse_pose_metainfo
+from ..utils import (decode_reduced_image, get_decode_scale, is_greyscale,
+                     parse_pose_metainfo)
 
-from contextlib import redirect_stderr
-
-with open(os.devnull, 'w') as f, redirect_stderr(f):
-    try:
-        from care.data.io import typed
-    except Exception:
-        # If the import fails, you can handle it here without printing any errors.
-        pass
 
 # - image (binary): Image file binary in jpg or png format.
 # - keypoint (numpy.array): Keypoint coordinates array with shape (3, num_points). Rows represent (x, y, annot_flag) where:
@@ -65,6 +55,30 @@ with open(os.devnull, 'w') as f, redirect_stderr(f):
 
 @DATASETS.register_module()
 class GoliathDataset(BaseCocoStyleDataset):
+    """Goliath 344-keypoint training dataset streamed from AIRStore.
+
+    Args:
+        decode_cfg (dict, optional): Settings of the reduced-resolution
+            decoding. If given, the person bbox is computed from the keypoints
+            before the image is decoded, and the JPEG is decoded at the
+            smallest DCT scale that still covers the top-down crop at the
+            model input resolution. The keypoints and bbox are rescaled to the
+            decoded image, so ``TopdownAffine`` produces the same crop. The
+            following keys are supported:
+
+            - input_size (Tuple[int, int]): The model input size (w, h)
+            - min_crop_ratio (float): The smallest crop size relative to the
+              aspect-ratio-fixed bbox that the pipeline can produce after
+              padding, half-body and random-scale augmentation. Defaults to
+              0.3
+            - max_scale (int): The largest down-scaling factor. Defaults to 8
+            - thumbnail_size (int): The longer side of the thumbnail used for
+              the greyscale check. Defaults to 128
+
+            Defaults to ``None``, which decodes the full-resolution image.
+        **kwargs: Other arguments of :class:`BaseCocoStyleDataset`.
+    """
+
     METAINFO: dict = dict(from_file='configs/_base_/datasets/goliath.py')
 
     def __init__(self,
@@ -80,7 +94,17 @@ class GoliathDataset(BaseCocoStyleDataset):
                  pipeline: List[Union[dict, Callable]] = [],
                  test_mode: bool = False,
                  lazy_init: bool = False,
-                 max_refetch: int = 1000):
+                 max_refetch: int = 1000,
+                 decode_cfg: Optional[dict] = None):
+
+        if decode_cfg is not None:
+            assert 'input_size' in decode_cfg, \
+                '`input_size` is required in `decode_cfg`'
+            decode_cfg = {
+                **dict(min_crop_ratio=0.3, max_scale=8, thumbnail_size=128),
+                **decode_cfg
+            }
+        self.decode_cfg = decode_cfg
 
         super().__init__(
             ann_file=ann_file,
@@ -140,6 +164,7 @@ class GoliathDataset(BaseCocoStyleDataset):
         self.airstore = True
 
     def _read_from_airstore(self, asset: str, sid: str) -> io.BytesIO:
+        from care.data.io import typed
         with typed.open(self.path_template + f"/{asset}?sampleId={sid}").open() as f:
             data = io.BytesIO(f.read())
         return data
@@ -161,10 +186,7 @@ class GoliathDataset(BaseCocoStyleDataset):
             print(f"Error loading data: {e}")
             return None
 
-        img = np.array(img) ## RGB image
-        img = img[:, :, ::-1]  # Convert RGB to BGR, the model preprocessor will convert this to rgb again
-
-        img_w, img_h = img.shape[1], img.shape[0]
+        img_w, img_h = img.size  ## only the header is parsed so far
 
         # process keypoints
         keypoints = keypoints_np[:2].T.reshape(1, -1, 2)  # shape 1 x 344 x 2
@@ -199,17 +221,36 @@ class GoliathDataset(BaseCocoStyleDataset):
 
         num_keypoints = np.count_nonzero(keypoints_visible)
 
-        ## atleast 8 vis keypoints
+        ## atleast 8 vis keypoints, checked before decoding the image
         if num_keypoints < self.metainfo['min_visible_keypoints']:
             random_idx = np.random.randint(0, len(self.data_list))
             return self.get_data_info(random_idx)
 
+        if self.decode_cfg is None:
+            img = np.array(img) ## RGB image
+            decode_scale = np.ones(2, dtype=np.float32)
+            thumbnail_size = 0
+        else:
+            scale = get_decode_scale(
+                bbox, (img_w, img_h),
+                input_size=self.decode_cfg['input_size'],
+                min_crop_ratio=self.decode_cfg['min_crop_ratio'],
+                max_scale=self.decode_cfg['max_scale'])
+            img, decode_scale = decode_reduced_image(img, scale)
+            thumbnail_size = self.decode_cfg['thumbnail_size']
+
+            # move the annotations to the decoded image, so that the affine
+            # transform of the pipeline crops the same region
+            keypoints = (keypoints / decode_scale).astype(np.float32)
+            bbox = bbox / np.tile(decode_scale, 2)
+
         ## ignore greyscale images for training
-        B, G, R = cv2.split(img)
-        if np.array_equal(B, G) and np.array_equal(B, R):
+        if is_greyscale(img, thumbnail_size=thumbnail_size):
             random_idx = np.random.randint(0, len(self.data_list))
             return self.get_data_info(random_idx)
 
+        img = img[:, :, ::-1]  # Convert RGB to BGR, the model preprocessor will convert this to rgb again
+
         data_info = {
             'img': img,
             'img_id': '',
@@ -220,6 +261,7 @@ class GoliathDataset(BaseCocoStyleDataset):
             'airstore_id': data_info['airstore_id'],
             'bbox': bbox,
             'bbox_score': np.ones(1, dtype=np.float32),
+            'decode_scale': decode_scale,
             'num_keypoints': num_keypoints,
             'keypoints': keypoints,
             'keypoints_visible': keypoints_visible,
@@ -4,11 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .h36m_dataset import Human36mDataset
-from .goliath3d_dataset import Goliath3dDataset
-from .aic2goliath3d_dataset import Aic2Goliath3dDataset
-from .coco_wholebody2goliath3d_dataset import CocoWholeBody2Goliath3dDataset
-from .crowdpose2goliath3d_dataset import Crowdpose2Goliath3dDataset
-from .mpii2goliath3d_dataset import Mpii2Goliath3dDataset
+from mmengine.utils import lazy_import
 
-__all__ = ['Human36mDataset', 'Goliath3dDataset', 'Aic2Goliath3dDataset', 'CocoWholeBody2Goliath3dDataset', 'Crowdpose2Goliath3dDataset', 'Mpii2Goliath3dDataset']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'h36m_dataset': ['Human36mDataset'],
+        'goliath3d_dataset': ['Goliath3dDataset'],
+        'aic2goliath3d_dataset': ['Aic2Goliath3dDataset'],
+        'coco_wholebody2goliath3d_dataset': ['CocoWholeBody2Goliath3dDataset'],
+        'crowdpose2goliath3d_dataset': ['Crowdpose2Goliath3dDataset'],
+        'mpii2goliath3d_dataset': ['Mpii2Goliath3dDataset'],
+    })
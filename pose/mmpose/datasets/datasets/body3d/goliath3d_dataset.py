@@ -23,7 +23,6 @@ import pandas as pd
 from PIL import Image
 from concurrent.futures import ThreadPoolExecutor
 import random
-from matplotlib import pyplot as plt
 
 import copy
 import os.path as osp
@@ -40,15 +39,6 @@ from mmpose.registry import DATASETS
 from mmpose.structures.bbox import bbox_xywh2xyxy
 from ..utils import parse_pose_metainfo
 
-from contextlib import redirect_stderr
-
-with open(os.devnull, 'w') as f, redirect_stderr(f):
-    try:
-        from care.data.io import typed
-        from care.strict.data.io.typed.file.calib import load_krt
-    except Exception:
-        # If the import fails, you can handle it here without printing any errors.
-        pass
 
 @DATASETS.register_module()
 class Goliath3dDataset(BaseCocoStyleDataset):
@@ -129,6 +119,7 @@ class Goliath3dDataset(BaseCocoStyleDataset):
         self.airstore = True
 
     def _read_from_airstore(self, asset: str, sid: str) -> io.BytesIO:
+        from care.data.io import typed
         with typed.open(self.path_template + f"/{asset}?sampleId={sid}").open() as f:
             data = io.BytesIO(f.read())
         return data
@@ -156,6 +147,7 @@ class Goliath3dDataset(BaseCocoStyleDataset):
         pose3d[df['point_id'].values.astype(int), :3] = df[['x', 'y', 'z']].values
         pose3d[df['point_id'].values.astype(int), 3] = 1  # Set visibility to 1. N x 4
 
+        from care.strict.data.io.typed.file.calib import load_krt
         try:
             session_krt = load_krt(session_camera_file)
             camera_krt = session_krt[data_info['camera_id']]
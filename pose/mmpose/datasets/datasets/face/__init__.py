@@ -4,14 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .aflw_dataset import AFLWDataset
-from .coco_wholebody_face_dataset import CocoWholeBodyFaceDataset
-from .cofw_dataset import COFWDataset
-from .face_300w_dataset import Face300WDataset
-from .lapa_dataset import LapaDataset
-from .wflw_dataset import WFLWDataset
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'Face300WDataset', 'WFLWDataset', 'AFLWDataset', 'COFWDataset',
-    'CocoWholeBodyFaceDataset', 'LapaDataset'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'aflw_dataset': ['AFLWDataset'],
+        'coco_wholebody_face_dataset': ['CocoWholeBodyFaceDataset'],
+        'cofw_dataset': ['COFWDataset'],
+        'face_300w_dataset': ['Face300WDataset'],
+        'lapa_dataset': ['LapaDataset'],
+        'wflw_dataset': ['WFLWDataset'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .deepfashion2_dataset import DeepFashion2Dataset
-from .deepfashion_dataset import DeepFashionDataset
+from mmengine.utils import lazy_import
 
-__all__ = ['DeepFashionDataset', 'DeepFashion2Dataset']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'deepfashion2_dataset': ['DeepFashion2Dataset'],
+        'deepfashion_dataset': ['DeepFashionDataset'],
+    })
@@ -4,13 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .coco_wholebody_hand_dataset import CocoWholeBodyHandDataset
-from .freihand_dataset import FreiHandDataset
-from .onehand10k_dataset import OneHand10KDataset
-from .panoptic_hand2d_dataset import PanopticHand2DDataset
-from .rhd2d_dataset import Rhd2DDataset
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'OneHand10KDataset', 'FreiHandDataset', 'PanopticHand2DDataset',
-    'Rhd2DDataset', 'CocoWholeBodyHandDataset'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'coco_wholebody_hand_dataset': ['CocoWholeBodyHandDataset'],
+        'freihand_dataset': ['FreiHandDataset'],
+        'onehand10k_dataset': ['OneHand10KDataset'],
+        'panoptic_hand2d_dataset': ['PanopticHand2DDataset'],
+        'rhd2d_dataset': ['Rhd2DDataset'],
+    })
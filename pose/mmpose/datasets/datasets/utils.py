@@ -6,10 +6,14 @@
 
 import os.path as osp
 import warnings
+from typing import TYPE_CHECKING, Tuple
 
 import numpy as np
 from mmengine import Config
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 
 def parse_pose_metainfo(metainfo: dict):
     """Load meta information of pose dataset and check its integrity.
@@ -226,3 +230,94 @@ def parse_pose_metainfo(metainfo: dict):
         parsed['skeleton_link_colors'], dtype=np.uint8)
 
     return parsed
+
+
+def get_decode_scale(bbox: np.ndarray,
+                     img_size: Tuple[int, int],
+                     input_size: Tuple[int, int],
+                     min_crop_ratio: float = 0.3,
+                     max_scale: int = 8) -> int:
+    """Get the largest JPEG DCT down-scaling factor that still covers the
+    top-down crop of ``bbox`` at the model input resolution.
+
+    The crop produced by the top-down pipeline is the bbox expanded to the
+    aspect ratio of ``input_size`` and then rescaled by padding, half-body
+    and random-scale augmentation. ``min_crop_ratio`` is the smallest such
+    rescaling the pipeline may apply, so the decoded image keeps at least one
+    source pixel per output pixel for every crop the pipeline can produce.
+
+    Args:
+        bbox (np.ndarray): The person bbox in (x1, y1, x2, y2) format in the
+            full-resolution image, shape (4, ) or (1, 4)
+        img_size (Tuple[int, int]): The full-resolution image size (w, h)
+        input_size (Tuple[int, int]): The model input size (w, h)
+        min_crop_ratio (float): The smallest crop size relative to the
+            aspect-ratio-fixed bbox. Defaults to 0.3
+        max_scale (int): The largest down-scaling factor. JPEG DCT scaling
+            supports 1/2, 1/4 and 1/8. Defaults to 8
+
+    Returns:
+        int: The down-scaling factor, one of 1, 2, 4 and 8
+    """
+    x1, y1, x2, y2 = np.asarray(bbox, dtype=np.float32).reshape(4)
+    bbox_w, bbox_h = max(x2 - x1, 1.), max(y2 - y1, 1.)
+    input_w, input_h = input_size
+    aspect_ratio = input_w / input_h
+
+    # the affine crop is the bbox expanded to the input aspect ratio
+    crop_w = max(bbox_w, bbox_h * aspect_ratio) * min_crop_ratio
+    # a crop covering the full image is bounded by the image itself
+    crop_w = min(crop_w, max(img_size[0], img_size[1] * aspect_ratio))
+
+    scale = 1
+    while scale * 2 <= max_scale and crop_w / (scale * 2) >= input_w:
+        scale *= 2
+    return scale
+
+
+def decode_reduced_image(img: 'Image.Image',
+                         scale: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode a lazily opened PIL image at a reduced resolution.
+
+    For JPEG images the down-scaling is done inside the decoder via
+    :meth:`PIL.Image.Image.draft`, so the full-resolution image is never
+    materialized. Other formats are decoded at full resolution.
+
+    Args:
+        img (PIL.Image.Image): The opened (not yet loaded) image
+        scale (int): The requested down-scaling factor
+
+    Returns:
+        tuple:
+        - img (np.ndarray): The decoded RGB image in shape (h, w, 3)
+        - decode_scale (np.ndarray): The actual (sx, sy) factors from the
+          full-resolution to the decoded image coordinates
+    """
+    full_w, full_h = img.size
+    if scale > 1:
+        img.draft('RGB', ((full_w + scale - 1) // scale,
+                          (full_h + scale - 1) // scale))
+    img = np.array(img.convert('RGB'))
+    decode_scale = np.array(
+        [full_w / img.shape[1], full_h / img.shape[0]], dtype=np.float32)
+    return img, decode_scale
+
+
+def is_greyscale(img: np.ndarray, thumbnail_size: int = 0) -> bool:
+    """Check whether all channels of an image are identical.
+
+    Args:
+        img (np.ndarray): The image in shape (h, w, 3)
+        thumbnail_size (int): If positive, only check a strided thumbnail
+            whose longer side is about ``thumbnail_size`` pixels. Defaults
+            to 0, which checks the full image
+
+    Returns:
+        bool: Whether the image is greyscale
+    """
+    if thumbnail_size > 0:
+        stride = max(max(img.shape[:2]) // thumbnail_size, 1)
+        img = img[::stride, ::stride]
+    return bool(
+        np.array_equal(img[..., 0], img[..., 1])
+        and np.array_equal(img[..., 0], img[..., 2]))
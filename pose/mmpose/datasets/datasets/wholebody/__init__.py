@@ -4,8 +4,11 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .coco_wholebody_dataset import CocoWholeBodyDataset
-from .halpe_dataset import HalpeDataset
-from .coco_wholebody2goliath_dataset import CocoWholeBody2GoliathDataset
+from mmengine.utils import lazy_import
 
-__all__ = ['CocoWholeBodyDataset', 'HalpeDataset', 'CocoWholeBody2GoliathDataset']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'coco_wholebody_dataset': ['CocoWholeBodyDataset'],
+        'halpe_dataset': ['HalpeDataset'],
+        'coco_wholebody2goliath_dataset': ['CocoWholeBody2GoliathDataset'],
+    })
@@ -4,26 +4,26 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .bottomup_transforms import (BottomupGetHeatmapMask, BottomupRandomAffine,
-                                  BottomupResize)
-from .common_transforms import (Albumentation, GenerateTarget,
-                                GetBBoxCenterScale, PhotometricDistortion,
-                                RandomBBoxTransform, RandomFlip,
-                                RandomHalfBody)
-from .converting import KeypointConverter
-from .formatting import PackPoseInputs
-from .loading import LoadImage
-from .pose3d_transforms import RandomFlipAroundRoot
-from .topdown_transforms import TopdownAffine
-from .pose3d_transforms import Pose3dRandomFlip, Pose3dRandomBBoxTransform, Pose3dTopdownAffine,\
-        Pose3dGenerateTarget, PackPose3dInputs
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'GetBBoxCenterScale', 'RandomBBoxTransform', 'RandomFlip',
-    'RandomHalfBody', 'TopdownAffine', 'Albumentation',
-    'PhotometricDistortion', 'PackPoseInputs', 'LoadImage',
-    'BottomupGetHeatmapMask', 'BottomupRandomAffine', 'BottomupResize',
-    'GenerateTarget', 'KeypointConverter', 'RandomFlipAroundRoot',
-    'Pose3dRandomFlip', 'Pose3dRandomBBoxTransform', 'Pose3dTopdownAffine',
-    'Pose3dGenerateTarget', 'PackPose3dInputs'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'bottomup_transforms': [
+            'BottomupGetHeatmapMask', 'BottomupRandomAffine',
+            'BottomupResize'
+        ],
+        'common_transforms': [
+            'Albumentation', 'GenerateTarget', 'GetBBoxCenterScale',
+            'PhotometricDistortion', 'RandomBBoxTransform', 'RandomFlip',
+            'RandomHalfBody'
+        ],
+        'converting': ['KeypointConverter'],
+        'formatting': ['PackPoseInputs'],
+        'loading': ['LoadImage'],
+        'pose3d_transforms': [
+            'RandomFlipAroundRoot', 'Pose3dRandomFlip',
+            'Pose3dRandomBBoxTransform', 'Pose3dTopdownAffine',
+            'Pose3dGenerateTarget', 'PackPose3dInputs'
+        ],
+        'topdown_transforms': ['TopdownAffine'],
+    })
@@ -4,10 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ema_hook import ExpMomentumEMA
-from .visualization_hook import PoseVisualizationHook
-from .custom_visualization_hook import CustomPoseVisualizationHook
-from .general_visualization_hook import GeneralPoseVisualizationHook
-from .pose3d_visualization_hook import Pose3dVisualizationHook
+from mmengine.utils import lazy_import
 
-__all__ = ['PoseVisualizationHook', 'ExpMomentumEMA', 'CustomPoseVisualizationHook', 'GeneralPoseVisualizationHook', 'Pose3dVisualizationHook']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ema_hook': ['ExpMomentumEMA'],
+        'visualization_hook': ['PoseVisualizationHook'],
+        'custom_visualization_hook': ['CustomPoseVisualizationHook'],
+        'general_visualization_hook': ['GeneralPoseVisualizationHook'],
+        'pose3d_visualization_hook': ['Pose3dVisualizationHook'],
+    })
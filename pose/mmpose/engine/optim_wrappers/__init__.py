@@ -4,6 +4,9 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .layer_decay_optim_wrapper import LayerDecayOptimWrapperConstructor
+from mmengine.utils import lazy_import
 
-__all__ = ['LayerDecayOptimWrapperConstructor']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'layer_decay_optim_wrapper': ['LayerDecayOptimWrapperConstructor'],
+    })
@@ -4,5 +4,17 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .functional import *  # noqa: F401,F403
-from .metrics import *  # noqa: F401,F403
+from mmengine.utils import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'functional': [
+            'keypoint_pck_accuracy', 'keypoint_auc', 'keypoint_nme',
+            'keypoint_epe', 'pose_pck_accuracy',
+            'multilabel_classification_accuracy', 'simcc_pck_accuracy', 'nms',
+            'oks_nms', 'soft_oks_nms', 'keypoint_mpjpe', 'batched_nms',
+            'batched_oks_nms', 'oks_iou_matrix', 'KeypointAPEvaluator',
+            'keypoint_pair_oks'
+        ],
+        'metrics': '*',
+    })
@@ -4,14 +4,18 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+from .keypoint_ap import KeypointAPEvaluator, keypoint_pair_oks
 from .keypoint_eval import (keypoint_auc, keypoint_epe, keypoint_mpjpe,
                             keypoint_nme, keypoint_pck_accuracy,
                             multilabel_classification_accuracy,
                             pose_pck_accuracy, simcc_pck_accuracy)
-from .nms import nms, oks_nms, soft_oks_nms
+from .nms import (batched_nms, batched_oks_nms, nms, oks_iou_matrix, oks_nms,
+                  soft_oks_nms)
 
 __all__ = [
     'keypoint_pck_accuracy', 'keypoint_auc', 'keypoint_nme', 'keypoint_epe',
     'pose_pck_accuracy', 'multilabel_classification_accuracy',
-    'simcc_pck_accuracy', 'nms', 'oks_nms', 'soft_oks_nms', 'keypoint_mpjpe'
+    'simcc_pck_accuracy', 'nms', 'oks_nms', 'soft_oks_nms', 'keypoint_mpjpe',
+    'batched_nms', 'batched_oks_nms', 'oks_iou_matrix', 'KeypointAPEvaluator',
+    'keypoint_pair_oks'
 ]
@@ -0,0 +1,419 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+KEYPOINT_STATS_NAMES = [
+    'AP', 'AP .5', 'AP .75', 'AP (M)', 'AP (L)', 'AR', 'AR .5', 'AR .75',
+    'AR (M)', 'AR (L)'
+]
+
+
+def _compact(array: np.ndarray) -> np.ndarray:
+    """Store float64 values as float32 when that is lossless."""
+    array32 = array.astype(np.float32)
+    if np.array_equal(array32, array, equal_nan=True):
+        return array32
+    return array
+
+
+def keypoint_pair_oks(gt_keypoints: np.ndarray,
+                      gt_areas: np.ndarray,
+                      gt_bboxes: np.ndarray,
+                      dt_keypoints: np.ndarray,
+                      sigmas: np.ndarray,
+                      device: Optional[str] = None) -> np.ndarray:
+    """The OKS of pairs of ground truth and detected instances, computed as
+    in ``xtcocotools.cocoeval.COCOeval.computeOks``.
+
+    Ground truth instances without visible keypoints are scored by the
+    distance of the detected keypoints to their doubled bbox. On numpy the
+    visible terms of every pair are summed in the same order as COCOeval, so
+    the OKS are identical to the last bit; with ``device`` the pairs are
+    computed in float64 with torch, which is faster for many pairs but may
+    round differently.
+
+    Note:
+
+        - number of pairs: P
+        - number of keypoints: K
+
+    Args:
+        gt_keypoints (np.ndarray): Shape: (P, K, 3)
+        gt_areas (np.ndarray): Areas used to normalize the distances.
+            Shape: (P, )
+        gt_bboxes (np.ndarray): Ground truth bboxes in (x, y, w, h).
+            Shape: (P, 4)
+        dt_keypoints (np.ndarray): Shape: (P, K, 3)
+        sigmas (np.ndarray): Keypoint labelling uncertainty. Shape: (K, )
+        device (str, optional): Compute with torch on this device.
+            Defaults to ``None``
+
+    Returns:
+        np.ndarray: The OKS of every pair. Shape: (P, )
+    """
+    vars = (sigmas * 2)**2
+    num_keypoints = len(sigmas)
+    xg = gt_keypoints[..., 0].astype(np.float64)
+    yg = gt_keypoints[..., 1].astype(np.float64)
+    visible = gt_keypoints[..., 2] > 0
+    xd = dt_keypoints[..., 0].astype(np.float64)
+    yd = dt_keypoints[..., 1].astype(np.float64)
+    num_visible = visible.sum(axis=1)
+
+    dx = xd - xg
+    dy = yd - yg
+    no_visible = num_visible == 0
+    if no_visible.any():
+        # distance to the doubled bbox of the ground truth
+        bb = gt_bboxes[no_visible].astype(np.float64)
+        x0 = (bb[:, 0] - bb[:, 2])[:, None]
+        x1 = (bb[:, 0] + bb[:, 2] * 2)[:, None]
+        y0 = (bb[:, 1] - bb[:, 3])[:, None]
+        y1 = (bb[:, 1] + bb[:, 3] * 2)[:, None]
+        x, y = xd[no_visible], yd[no_visible]
+        dx[no_visible] = np.maximum(0, x0 - x) + np.maximum(0, x - x1)
+        dy[no_visible] = np.maximum(0, y0 - y) + np.maximum(0, y - y1)
+        visible[no_visible] = True
+    areas = gt_areas.astype(np.float64)[:, None] + np.spacing(1)
+
+    if device is not None:
+        import torch
+        dx, dy, areas = (
+            torch.from_numpy(x).to(device) for x in (dx, dy, areas))
+        e = (dx**2 + dy**2) / torch.from_numpy(vars.astype(
+            np.float64)).to(device) / areas / 2
+        mask = torch.from_numpy(visible).to(device)
+        total = torch.where(mask, torch.exp(-e), e.new_zeros(())).sum(dim=1)
+        return (total / mask.sum(dim=1)).cpu().numpy()
+
+    e = (dx**2 + dy**2) / vars / areas / 2
+    terms = np.exp(-e)
+    oks = np.zeros(len(terms))
+    # sum each pair over exactly its visible terms, as a row of the same
+    # length, so that numpy's pairwise summation rounds like COCOeval
+    counts = np.where(no_visible, num_keypoints, num_visible)
+    for count in np.unique(counts):
+        rows = np.flatnonzero(counts == count)
+        selected = terms[rows][visible[rows]].reshape(len(rows), count)
+        oks[rows] = selected.sum(axis=1) / count
+    return oks
+
+
+def _match(ious: np.ndarray, gt_ignore: np.ndarray, gt_crowd: np.ndarray,
+           iou_thrs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Greedy matching of ``COCOeval.evaluateImg`` for a batch of images with
+    the same numbers of detections and ground truths.
+
+    Detections are matched in order to the not yet matched (or crowd) ground
+    truth with the highest OKS above the threshold, the last one of ties,
+    preferring the regular ground truths over the ignored ones.
+
+    Args:
+        ious (np.ndarray): OKS of the detections sorted by score and the
+            ground truths. Shape: (B, D, G)
+        gt_ignore (np.ndarray): Shape: (B, G)
+        gt_crowd (np.ndarray): Shape: (B, G)
+        iou_thrs (np.ndarray): Shape: (T, )
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Whether every detection is matched and
+        whether it is matched to an ignored ground truth. Shape: (B, T, D)
+    """
+    B, D, G = ious.shape
+    T = len(iou_thrs)
+    thrs = np.minimum(iou_thrs, 1 - 1e-10)[None, :, None]
+    taken = np.zeros((B, T, G), dtype=bool)
+    matched = np.zeros((B, T, D), dtype=bool)
+    matched_ignored = np.zeros((B, T, D), dtype=bool)
+    batch_ids, thr_ids = np.meshgrid(
+        np.arange(B), np.arange(T), indexing='ij')
+    for d in range(D):
+        iou = ious[:, None, d, :]
+        candidate = (~taken | gt_crowd[:, None]) & (iou >= thrs)
+        found = np.zeros((B, T), dtype=bool)
+        best = np.zeros((B, T), dtype=np.int64)
+        for ignored in (False, True):
+            cand = candidate & (gt_ignore[:, None] == ignored) & \
+                ~found[..., None]
+            has = cand.any(axis=-1)
+            value = np.where(cand, iou, -np.inf)
+            last = G - 1 - np.argmax(value[..., ::-1], axis=-1)
+            best = np.where(has, last, best)
+            if ignored:
+                matched_ignored[:, :, d] = has
+            found |= has
+        matched[:, :, d] = found
+        taken[batch_ids[found], thr_ids[found], best[found]] = True
+    return matched, matched_ignored
+
+
+class KeypointAPEvaluator:
+    """COCO keypoint AP / AR of detections held in arrays.
+
+    Reproduces ``xtcocotools.cocoeval.COCOeval`` with the keypoint parameters
+    (``maxDets=[20]``, the ``all``, ``medium`` and ``large`` area ranges)
+    without json files or per-instance dicts: the ground truth is read from
+    the ``COCO`` helper once into columns, the OKS of all the detection and
+    ground truth pairs are computed at once, and the per-image greedy
+    matching runs for all the images with the same number of instances and
+    all the thresholds together.
+
+    Args:
+        coco (COCO): The ground truth.
+        sigmas (np.ndarray): Keypoint labelling uncertainty of the evaluated
+            keypoints.
+        gt_key (str): The annotation field of the keypoints, e.g.
+            ``'foot_kpts'``. Defaults to ``'keypoints'``
+        keypoint_ids (Sequence[int], optional): The indices of the evaluated
+            keypoints in the detected keypoints. Defaults to all of them
+        use_area (bool): Whether to use the ``'area'`` of the annotations,
+            see :class:`CocoMetric`. Defaults to ``True``
+        max_dets (int): Detections per image. Defaults to 20
+        device (str, optional): Compute the OKS with torch on this device.
+            See :func:`keypoint_pair_oks`. Defaults to ``None``
+    """
+
+    def __init__(self,
+                 coco,
+                 sigmas: np.ndarray,
+                 gt_key: str = 'keypoints',
+                 keypoint_ids: Optional[Sequence[int]] = None,
+                 use_area: bool = True,
+                 max_dets: int = 20,
+                 device: Optional[str] = None) -> None:
+        self.sigmas = sigmas
+        self.keypoint_ids = keypoint_ids
+        self.use_area = use_area
+        self.max_dets = max_dets
+        self.device = device
+        # the parameters of ``xtcocotools.cocoeval.Params.setKpParams``
+        self.iou_thrs = np.linspace(
+            .5, 0.95, int(np.round((0.95 - .5) / .05)) + 1, endpoint=True)
+        self.rec_thrs = np.linspace(
+            .0, 1.00, int(np.round((1.00 - .0) / .01)) + 1, endpoint=True)
+        self.area_rngs = [[0**2, 1e5**2], [32**2, 96**2], [96**2, 1e5**2]]
+        self.area_rng_lbls = ['all', 'medium', 'large']
+
+        self.img_ids = np.unique(sorted(coco.getImgIds()))
+        self.cat_ids = list(np.unique(sorted(coco.getCatIds())))
+        cat_set = set(self.cat_ids)
+
+        img_pos, cat_ids, keypoints, crowd = [], [], [], []
+        areas, rng_areas, bboxes = [], [], []
+        # the annotations of every image in the order of ``getAnnIds``
+        for pos, img_id in enumerate(self.img_ids.tolist()):
+            for ann in coco.imgToAnns.get(img_id, []):
+                if ann['category_id'] not in cat_set:
+                    continue
+                bbox = ann['bbox']
+                box_area = bbox[2] * bbox[3] * 0.53
+                img_pos.append(pos)
+                cat_ids.append(ann['category_id'])
+                keypoints.append(ann[gt_key])
+                crowd.append(bool('iscrowd' in ann and ann['iscrowd']))
+                areas.append(ann['area'] if use_area else box_area)
+                rng_areas.append(ann['area'] if use_area and
+                                 'area' in ann else box_area)
+                bboxes.append(bbox)
+        self.gt_img_pos = np.array(img_pos, dtype=np.int64)
+        self.gt_cat_ids = np.array(cat_ids)
+        self.gt_keypoints = _compact(
+            np.array(keypoints, dtype=np.float64).reshape(
+                len(img_pos), len(sigmas), 3))
+        self.gt_crowd = np.array(crowd, dtype=bool)
+        self.gt_areas = np.array(areas, dtype=np.float64)
+        self.gt_rng_areas = np.array(rng_areas, dtype=np.float64)
+        self.gt_bboxes = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+        num_visible = np.count_nonzero(self.gt_keypoints[..., 2] > 0, axis=1)
+        self.gt_ignore = self.gt_crowd | (num_visible == 0)
+
+    def _evaluate_category(self, dt_img_pos: np.ndarray,
+                           dt_keypoints: np.ndarray, dt_scores: np.ndarray,
+                           dt_areas: np.ndarray, gt_rows: np.ndarray,
+                           precision: np.ndarray, recall: np.ndarray,
+                           k: int) -> None:
+        T, A = len(self.iou_thrs), len(self.area_rngs)
+        num_imgs = len(self.img_ids)
+
+        # sort the detections of every image by score and keep max_dets
+        order = np.lexsort((-dt_scores, dt_img_pos))
+        dt_img_pos = dt_img_pos[order]
+        dt_counts = np.bincount(dt_img_pos, minlength=num_imgs)
+        dt_starts = np.cumsum(dt_counts) - dt_counts
+        rank = np.arange(len(order)) - dt_starts[dt_img_pos]
+        order = order[rank < self.max_dets]
+        dt_img_pos = dt_img_pos[rank < self.max_dets]
+        dt_counts = np.minimum(dt_counts, self.max_dets)
+        dt_starts = np.cumsum(dt_counts) - dt_counts
+        dt_keypoints = dt_keypoints[order]
+        dt_scores = dt_scores[order]
+        dt_areas = dt_areas[order]
+
+        gt_counts = np.bincount(
+            self.gt_img_pos[gt_rows], minlength=num_imgs)
+        gt_starts = np.cumsum(gt_counts) - gt_counts
+        if len(dt_scores) == 0 and len(gt_rows) == 0:
+            return
+
+        num_dts = len(dt_scores)
+        matched = np.zeros((A, T, num_dts), dtype=bool)
+        matched_ignored = np.zeros((A, T, num_dts), dtype=bool)
+        gt_ignore = np.stack([
+            self.gt_ignore[gt_rows] | (self.gt_rng_areas[gt_rows] < lo) |
+            (self.gt_rng_areas[gt_rows] > hi) for lo, hi in self.area_rngs
+        ])
+
+        # match all the images with the same number of instances together
+        both = np.flatnonzero((dt_counts > 0) & (gt_counts > 0))
+        shapes = np.stack([dt_counts[both], gt_counts[both]], axis=1)
+        for D, G in np.unique(shapes, axis=0):
+            imgs = both[(shapes[:, 0] == D) & (shapes[:, 1] == G)]
+            dt_idx = dt_starts[imgs][:, None] + np.arange(D)
+            gt_idx = gt_starts[imgs][:, None] + np.arange(G)
+            pair_dt = np.broadcast_to(dt_idx[:, :, None],
+                                      (len(imgs), D, G)).reshape(-1)
+            pair_gt = gt_rows[np.broadcast_to(gt_idx[:, None, :],
+                                              (len(imgs), D, G)).reshape(-1)]
+            ious = np.empty(len(pair_dt))
+            block = max(1, (1 << 24) // dt_keypoints.shape[1])
+            for start in range(0, len(pair_dt), block):
+                pd = pair_dt[start:start + block]
+                pg = pair_gt[start:start + block]
+                ious[start:start + block] = keypoint_pair_oks(
+                    self.gt_keypoints[pg], self.gt_areas[pg],
+                    self.gt_bboxes[pg], dt_keypoints[pd], self.sigmas,
+                    self.device)
+            ious = ious.reshape(len(imgs), D, G)
+            crowd = self.gt_crowd[gt_rows[gt_idx]]
+            for a in range(A):
+                m, mi = _match(ious, gt_ignore[a][gt_idx], crowd,
+                               self.iou_thrs)
+                matched[a][:, dt_idx] = m.transpose(1, 0, 2)
+                matched_ignored[a][:, dt_idx] = mi.transpose(1, 0, 2)
+
+        # accumulate over the images as in ``COCOeval.accumulate``
+        inds = np.argsort(-dt_scores, kind='mergesort')
+        for a, (lo, hi) in enumerate(self.area_rngs):
+            npig = np.count_nonzero(~gt_ignore[a])
+            if npig == 0:
+                continue
+            out_of_rng = (dt_areas < lo) | (dt_areas > hi)
+            dt_ig = matched_ignored[a] | (~matched[a] & out_of_rng[None])
+            dtm = matched[a][:, inds]
+            dt_ig = dt_ig[:, inds]
+            tps = np.logical_and(dtm, np.logical_not(dt_ig))
+            fps = np.logical_and(~dtm, np.logical_not(dt_ig))
+            tp_sum = np.cumsum(tps, axis=1).astype(dtype=np.float64)
+            fp_sum = np.cumsum(fps, axis=1).astype(dtype=np.float64)
+            nd = tp_sum.shape[1]
+            rc = tp_sum / npig
+            pr = tp_sum / (fp_sum + tp_sum + np.spacing(1))
+            recall[:, k, a, 0] = rc[:, -1] if nd else 0
+            if nd:
+                pr = np.maximum.accumulate(pr[:, ::-1], axis=1)[:, ::-1]
+            q = np.zeros((T, len(self.rec_thrs)))
+            for t in range(T):
+                pi = np.searchsorted(rc[t], self.rec_thrs, side='left')
+                valid = pi < nd
+                q[t, valid] = pr[t, pi[valid]]
+            precision[:, :, k, a, 0] = q
+
+    def evaluate(self,
+                 img_ids: np.ndarray,
+                 keypoints: np.ndarray,
+                 scores: np.ndarray,
+                 areas: np.ndarray,
+                 cat_ids: Optional[np.ndarray] = None,
+                 name: str = 'keypoints') -> List[float]:
+        """Evaluate the detections.
+
+        Note:
+
+            - number of detections: N
+            - number of detected keypoints: K
+
+        Args:
+            img_ids (np.ndarray): The image id of every detection.
+                Shape: (N, )
+            keypoints (np.ndarray): Keypoints with scores in the last
+                channel. Shape: (N, K, 3)
+            scores (np.ndarray): Detection scores. Shape: (N, )
+            areas (np.ndarray): Detection areas, the area of the keypoint
+                bbox in ``COCO.loadRes``. Shape: (N, )
+            cat_ids (np.ndarray, optional): Category of every detection.
+                Defaults to 1
+            name (str): Printed in the summary. Defaults to ``'keypoints'``
+
+        Returns:
+            list[float]: The ten stats of ``COCOeval.summarize``.
+        """
+        img_pos = np.searchsorted(self.img_ids, img_ids)
+        assert len(img_ids) == 0 or (
+            img_pos.max() < len(self.img_ids)
+            and np.all(self.img_ids[img_pos] == img_ids)), \
+            'Results do not correspond to current coco set'
+        if self.keypoint_ids is not None:
+            keypoints = keypoints[:, self.keypoint_ids]
+        if cat_ids is None:
+            cat_ids = np.ones(len(img_ids), dtype=np.int64)
+        # detections without a keypoint score above 0 are skipped
+        keep = np.count_nonzero(keypoints[..., 2] > 0, axis=1) > 0
+
+        T, R = len(self.iou_thrs), len(self.rec_thrs)
+        K, A = len(self.cat_ids), len(self.area_rngs)
+        precision = -np.ones((T, R, K, A, 1))
+        recall = -np.ones((T, K, A, 1))
+        for k, cat_id in enumerate(self.cat_ids):
+            dt = np.flatnonzero(keep & (cat_ids == cat_id))
+            self._evaluate_category(img_pos[dt], keypoints[dt],
+                                    np.asarray(scores, np.float64)[dt],
+                                    np.asarray(areas, np.float64)[dt],
+                                    np.flatnonzero(self.gt_cat_ids == cat_id),
+                                    precision, recall, k)
+        return self._summarize(precision, recall, name)
+
+    def _summarize(self, precision: np.ndarray, recall: np.ndarray,
+                   name: str) -> List[float]:
+        """``COCOeval.summarize`` for the keypoint parameters."""
+        i_str = ' {:<18} {} @[ IoU={:<9} | area={:>6s} | maxDets={:>3d} ]' \
+            ' = {: 0.3f}'
+
+        def _summarize(ap=1, iou_thr=None, area_rng='all'):
+            title = 'Average Precision' if ap == 1 else 'Average Recall'
+            type_str = '(AP)' if ap == 1 else '(AR)'
+            iou_str = '{:0.2f}:{:0.2f}'.format(
+                self.iou_thrs[0], self.iou_thrs[-1]) \
+                if iou_thr is None else '{:0.2f}'.format(iou_thr)
+            aind = [
+                i for i, rng in enumerate(self.area_rng_lbls)
+                if rng == area_rng
+            ]
+            s = precision if ap == 1 else recall
+            if iou_thr is not None:
+                s = s[np.where(iou_thr == self.iou_thrs)[0]]
+            s = s[:, :, :, aind, [0]] if ap == 1 else s[:, :, aind, [0]]
+            mean_s = -1 if len(s[s > -1]) == 0 else np.mean(s[s > -1])
+            print(
+                i_str.format(title, type_str, iou_str, area_rng,
+                             self.max_dets, mean_s))
+            return mean_s
+
+        print(f'Evaluate annotation type *{name}*')
+        return [
+            _summarize(1),
+            _summarize(1, iou_thr=.5),
+            _summarize(1, iou_thr=.75),
+            _summarize(1, area_rng='medium'),
+            _summarize(1, area_rng='large'),
+            _summarize(0),
+            _summarize(0, iou_thr=.5),
+            _summarize(0, iou_thr=.75),
+            _summarize(0, area_rng='medium'),
+            _summarize(0, area_rng='large'),
+        ]
@@ -13,6 +13,60 @@
 from typing import List, Optional
 
 import numpy as np
+import torch
+
+
+def box_iou_matrix(boxes: np.ndarray) -> np.ndarray:
+    """Calculate the pairwise IoU of boxes.
+
+    Note:
+
+        - number of boxes: N
+
+    Args:
+        boxes (np.ndarray): Boxes in (x1, y1, x2, y2) format. Shape: (N, 4)
+
+    Returns:
+        np.ndarray: The pairwise IoU. Shape: (N, N)
+    """
+    x1, y1, x2, y2 = (boxes[:, i] for i in range(4))
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+
+    w = np.maximum(
+        0.0,
+        np.minimum(x2[:, None], x2[None]) - np.maximum(x1[:, None], x1[None]) +
+        1)
+    h = np.maximum(
+        0.0,
+        np.minimum(y2[:, None], y2[None]) - np.maximum(y1[:, None], y1[None]) +
+        1)
+    inter = w * h
+    return inter / (areas[:, None] + areas[None] - inter)
+
+
+def _greedy_suppress(order: np.ndarray, overlap: np.ndarray,
+                     thr: float) -> List[int]:
+    """Greedily keep instances in ``order`` and suppress the instances whose
+    overlap with a kept instance is not <= thr.
+
+    Args:
+        order (np.ndarray): Instance indexes sorted by descending score.
+        overlap (np.ndarray): The pairwise overlap. Shape: (N, N)
+        thr (float): Retain overlap <= thr.
+
+    Returns:
+        list: Indexes to keep.
+    """
+    # the negated comparison also suppresses NaN overlaps like the reference
+    suppress = ~(overlap <= thr)
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= suppress[i]
+    return keep
 
 
 def nms(dets: np.ndarray, thr: float) -> List[int]:
@@ -28,33 +82,16 @@ def nms(dets: np.ndarray, thr: float) -> List[int]:
     if len(dets) == 0:
         return []
 
-    x1 = dets[:, 0]
-    y1 = dets[:, 1]
-    x2 = dets[:, 2]
-    y2 = dets[:, 3]
-    scores = dets[:, 4]
-
-    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-    order = scores.argsort()[::-1]
+    # a stable sort breaks ties by the higher index first on all platforms
+    order = dets[:, 4].argsort(kind='stable')[::-1]
+    return _greedy_suppress(order, box_iou_matrix(dets[:, :4]), thr)
 
-    keep = []
-    while len(order) > 0:
-        i = order[0]
-        keep.append(i)
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
 
-        w = np.maximum(0.0, xx2 - xx1 + 1)
-        h = np.maximum(0.0, yy2 - yy1 + 1)
-        inter = w * h
-        ovr = inter / (areas[i] + areas[order[1:]] - inter)
-
-        inds = np.where(ovr <= thr)[0]
-        order = order[inds + 1]
-
-    return keep
+def _default_sigmas() -> np.ndarray:
+    return np.array([
+        .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87,
+        .87, .89, .89
+    ]) / 10.0
 
 
 def oks_iou(g: np.ndarray,
@@ -90,27 +127,67 @@ def oks_iou(g: np.ndarray,
     Returns:
         np.ndarray: The oks ious.
     """
+    return oks_iou_matrix(g[None], d, np.array([a_g]), a_d, sigmas,
+                          vis_thr)[0]
+
+
+def oks_iou_matrix(g: np.ndarray,
+                   d: np.ndarray,
+                   a_g: np.ndarray,
+                   a_d: np.ndarray,
+                   sigmas: Optional[np.ndarray] = None,
+                   vis_thr: Optional[float] = None,
+                   max_elements: int = 1 << 24) -> np.ndarray:
+    """Calculate the pairwise oks ious of two sets of instances.
+
+    Note:
+
+        - number of keypoints: K
+        - number of instances: M, N
+
+    Args:
+        g (np.ndarray): The keypoints of the first set. Shape: (M, K*3)
+        d (np.ndarray): The keypoints of the second set. Shape: (N, K*3)
+        a_g (np.ndarray): Areas of the first set. Shape: (M, )
+        a_d (np.ndarray): Areas of the second set. Shape: (N, )
+        sigmas (np.ndarray, optional): Keypoint labelling uncertainty. If not
+            given, use the sigmas on COCO dataset. Defaults to ``None``
+        vis_thr(float, optional): Threshold of the keypoint visibility. See
+            :func:`oks_iou`. Defaults to ``None``
+        max_elements (int): The (M, N, K) intermediate is computed in blocks
+            of rows with at most this many elements. Defaults to ``1 << 24``
+
+    Returns:
+        np.ndarray: The oks ious. Shape: (M, N)
+    """
     if sigmas is None:
-        sigmas = np.array([
-            .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07,
-            .87, .87, .89, .89
-        ]) / 10.0
+        sigmas = _default_sigmas()
     vars = (sigmas * 2)**2
-    xg = g[0::3]
-    yg = g[1::3]
-    vg = g[2::3]
-    ious = np.zeros(len(d), dtype=np.float32)
-    for n_d in range(0, len(d)):
-        xd = d[n_d, 0::3]
-        yd = d[n_d, 1::3]
-        vd = d[n_d, 2::3]
-        dx = xd - xg
-        dy = yd - yg
-        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
+
+    g = g.reshape(len(g), -1, 3)
+    d = d.reshape(len(d), -1, 3)
+    a_g = np.asarray(a_g)
+    a_d = np.asarray(a_d)
+    ious = np.zeros((len(g), len(d)), dtype=np.float32)
+    if len(g) == 0 or len(d) == 0:
+        return ious
+
+    block = max(1, max_elements // (len(d) * d.shape[1]))
+    for start in range(0, len(g), block):
+        gb = g[start:start + block]
+        dx = d[None, :, :, 0] - gb[:, None, :, 0]
+        dy = d[None, :, :, 1] - gb[:, None, :, 1]
+        area = (a_g[start:start + block, None] + a_d[None]) / 2 + np.spacing(1)
+        e = (dx**2 + dy**2) / vars / area[..., None] / 2
         if vis_thr is not None:
-            ind = list((vg > vis_thr) & (vd > vis_thr))
-            e = e[ind]
-        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
+            valid = (gb[:, None, :, 2] > vis_thr) & (
+                d[None, :, :, 2] > vis_thr)
+            num_valid = valid.sum(axis=-1)
+            total = np.where(valid, np.exp(-e), 0.).sum(axis=-1)
+            ious[start:start + block] = np.where(
+                num_valid > 0, total / np.maximum(num_valid, 1), 0.)
+        else:
+            ious[start:start + block] = np.exp(-e).sum(axis=-1) / e.shape[-1]
     return ious
 
 
@@ -149,24 +226,129 @@ def oks_nms(kpts_db: List[dict],
     kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
     areas = np.array([k['area'] for k in kpts_db])
 
-    order = scores.argsort()[::-1]
+    order = scores.argsort(kind='stable')[::-1]
+    oks = oks_iou_matrix(kpts, kpts, areas, areas, sigmas, vis_thr)
+    keep = np.array(_greedy_suppress(order, oks, thr))
 
-    keep = []
-    while len(order) > 0:
-        i = order[0]
-        keep.append(i)
-
-        oks_ovr = oks_iou(kpts[i], kpts[order[1:]], areas[i], areas[order[1:]],
-                          sigmas, vis_thr)
+    return keep
 
-        inds = np.where(oks_ovr <= thr)[0]
-        order = order[inds + 1]
 
-    keep = np.array(keep)
+def _batched_greedy_suppress(scores: torch.Tensor, overlap: torch.Tensor,
+                             thr: float,
+                             valid: Optional[torch.Tensor]) -> torch.Tensor:
+    """Batched version of :func:`_greedy_suppress` on (B, N, N) overlaps.
 
+    Returns:
+        torch.Tensor: The mask of kept instances. Shape: (B, N)
+    """
+    B, N = scores.shape
+    if valid is None:
+        valid = torch.ones_like(scores, dtype=torch.bool)
+    scores = scores.masked_fill(~valid, float('-inf'))
+    # rank by descending score with ties broken by the higher index first,
+    # like the stable ``argsort()[::-1]`` of :func:`nms` and :func:`oks_nms`
+    index = torch.arange(N, device=scores.device)
+    higher = (scores[:, None] > scores[:, :, None]) | (
+        (scores[:, None] == scores[:, :, None]) & (index > index[:, None]))
+    order = higher.sum(dim=2).argsort(dim=1)
+    suppress = ~(overlap <= thr)
+
+    batch_ids = torch.arange(B, device=scores.device)
+    suppressed = ~valid
+    keep = torch.zeros_like(valid)
+    for r in range(N):
+        idx = order[:, r]
+        kept = ~suppressed[batch_ids, idx]
+        keep[batch_ids, idx] = kept
+        suppressed = suppressed | (suppress[batch_ids, idx] & kept[:, None])
     return keep
 
 
+def batched_nms(boxes: torch.Tensor,
+                scores: torch.Tensor,
+                thr: float,
+                valid: Optional[torch.Tensor] = None) -> torch.Tensor:
+    """Box NMS of several images at once, with the same suppression rule as
+    :func:`nms`.
+
+    Note:
+
+        - number of images: B
+        - number of boxes per image (padded): N
+
+    Args:
+        boxes (torch.Tensor): Boxes in (x1, y1, x2, y2) format.
+            Shape: (B, N, 4)
+        scores (torch.Tensor): Box scores. Shape: (B, N)
+        thr (float): Retain overlap <= thr.
+        valid (torch.Tensor, optional): Mask of the non-padding boxes.
+            Shape: (B, N). Defaults to ``None``
+
+    Returns:
+        torch.Tensor: The mask of kept boxes. Shape: (B, N)
+    """
+    x1, y1, x2, y2 = boxes.unbind(dim=-1)
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    w = (torch.minimum(x2[:, :, None], x2[:, None]) -
+         torch.maximum(x1[:, :, None], x1[:, None]) + 1).clamp(min=0)
+    h = (torch.minimum(y2[:, :, None], y2[:, None]) -
+         torch.maximum(y1[:, :, None], y1[:, None]) + 1).clamp(min=0)
+    inter = w * h
+    iou = inter / (areas[:, :, None] + areas[:, None] - inter)
+    return _batched_greedy_suppress(scores, iou, thr, valid)
+
+
+def batched_oks_nms(keypoints: torch.Tensor,
+                    areas: torch.Tensor,
+                    scores: torch.Tensor,
+                    thr: float,
+                    sigmas: Optional[np.ndarray] = None,
+                    vis_thr: Optional[float] = None,
+                    valid: Optional[torch.Tensor] = None) -> torch.Tensor:
+    """OKS NMS of several images at once, with the same suppression rule as
+    :func:`oks_nms`.
+
+    Note:
+
+        - number of images: B
+        - number of instances per image (padded): N
+        - number of keypoints: K
+
+    Args:
+        keypoints (torch.Tensor): Keypoints with visibility in the last
+            channel. Shape: (B, N, K, 3)
+        areas (torch.Tensor): Instance areas. Shape: (B, N)
+        scores (torch.Tensor): Instance scores. Shape: (B, N)
+        thr (float): Retain oks overlap <= thr.
+        sigmas (np.ndarray, optional): Keypoint labelling uncertainty. If not
+            given, use the sigmas on COCO dataset. Defaults to ``None``
+        vis_thr(float, optional): Threshold of the keypoint visibility. See
+            :func:`oks_iou`. Defaults to ``None``
+        valid (torch.Tensor, optional): Mask of the non-padding instances.
+            Shape: (B, N). Defaults to ``None``
+
+    Returns:
+        torch.Tensor: The mask of kept instances. Shape: (B, N)
+    """
+    if sigmas is None:
+        sigmas = _default_sigmas()
+    vars = keypoints.new_tensor((sigmas * 2)**2)
+
+    xy, vis = keypoints[..., :2], keypoints[..., 2]
+    dist = (xy[:, :, None] - xy[:, None]).pow(2).sum(dim=-1)
+    area = (areas[:, :, None] + areas[:, None]) / 2 + np.spacing(1)
+    e = dist / vars / area[..., None] / 2
+    if vis_thr is not None:
+        mask = (vis[:, :, None] > vis_thr) & (vis[:, None] > vis_thr)
+        num_valid = mask.sum(dim=-1)
+        total = torch.where(mask, torch.exp(-e), e.new_zeros(())).sum(dim=-1)
+        oks = torch.where(num_valid > 0, total / num_valid.clamp(min=1),
+                          total.new_zeros(()))
+    else:
+        oks = torch.exp(-e).mean(dim=-1)
+    return _batched_greedy_suppress(scores, oks.float(), thr, valid)
+
+
 def _rescore(overlap: np.ndarray,
              scores: np.ndarray,
              thr: float,
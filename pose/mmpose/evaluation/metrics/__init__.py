@@ -4,20 +4,20 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .coco_metric import CocoMetric
-from .coco_wholebody_metric import CocoWholeBodyMetric
-from .keypoint_2d_metrics import (AUC, EPE, NME, JhmdbPCKAccuracy,
-                                  MpiiPCKAccuracy, PCKAccuracy)
-from .keypoint_3d_metrics import MPJPE
-from .keypoint_partition_metric import KeypointPartitionMetric
-from .posetrack18_metric import PoseTrack18Metric
-from .goliath_metric import GoliathMetric
-from .goliath_coco_wholebody_metric import GoliathCocoWholeBodyMetric
-from .goliath3d_coco_wholebody_metric import Goliath3dCocoWholeBodyMetric
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'CocoMetric', 'PCKAccuracy', 'MpiiPCKAccuracy', 'JhmdbPCKAccuracy', 'AUC',
-    'EPE', 'NME', 'PoseTrack18Metric', 'CocoWholeBodyMetric',
-    'KeypointPartitionMetric', 'MPJPE', 'GoliathMetric',
-    'GoliathCocoWholeBodyMetric', 'Goliath3dCocoWholeBodyMetric'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'coco_metric': ['CocoMetric'],
+        'coco_wholebody_metric': ['CocoWholeBodyMetric'],
+        'keypoint_2d_metrics': [
+            'AUC', 'EPE', 'NME', 'JhmdbPCKAccuracy', 'MpiiPCKAccuracy',
+            'PCKAccuracy'
+        ],
+        'keypoint_3d_metrics': ['MPJPE'],
+        'keypoint_partition_metric': ['KeypointPartitionMetric'],
+        'posetrack18_metric': ['PoseTrack18Metric'],
+        'goliath_metric': ['GoliathMetric'],
+        'goliath_coco_wholebody_metric': ['GoliathCocoWholeBodyMetric'],
+        'goliath3d_coco_wholebody_metric': ['Goliath3dCocoWholeBodyMetric'],
+    })
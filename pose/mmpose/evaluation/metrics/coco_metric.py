@@ -387,54 +387,12 @@ class CocoMetric(BaseMetric):
 
         # score the prediction results according to `score_mode`
         # and perform NMS according to `nms_mode`
-        valid_kpts = defaultdict(list)
-        num_keypoints = self.dataset_meta['num_keypoints']
-        for img_id, instances in kpts.items():
-            for instance in instances:
-                # concatenate the keypoint coordinates and scores
-                instance['keypoints'] = np.concatenate([
-                    instance['keypoints'], instance['keypoint_scores'][:, None]
-                ],
-                                                       axis=-1)
-                if self.score_mode == 'bbox':
-                    instance['score'] = instance['bbox_score']
-                elif self.score_mode == 'keypoint':
-                    instance['score'] = np.mean(instance['keypoint_scores'])
-                else:
-                    bbox_score = instance['bbox_score']
-                    if self.score_mode == 'bbox_rle':
-                        keypoint_scores = instance['keypoint_scores']
-                        instance['score'] = float(bbox_score +
-                                                  np.mean(keypoint_scores) +
-                                                  np.max(keypoint_scores))
-
-                    else:  # self.score_mode == 'bbox_keypoint':
-                        mean_kpt_score = 0
-                        valid_num = 0
-                        for kpt_idx in range(num_keypoints):
-                            kpt_score = instance['keypoint_scores'][kpt_idx]
-                            if kpt_score > self.keypoint_score_thr:
-                                mean_kpt_score += kpt_score
-                                valid_num += 1
-                        if valid_num != 0:
-                            mean_kpt_score /= valid_num
-                        instance['score'] = bbox_score * mean_kpt_score
-            # perform nms
-            if self.nms_mode == 'none':
-                valid_kpts[img_id] = instances
-            else:
-                nms = oks_nms if self.nms_mode == 'oks_nms' else soft_oks_nms
-                keep = nms(
-                    instances,
-                    self.nms_thr,
-                    sigmas=self.dataset_meta['sigmas'])
-                valid_kpts[img_id] = [instances[_keep] for _keep in keep]
-
-        # convert results to coco style and dump into a json file
-        self.results2json(valid_kpts, outfile_prefix=outfile_prefix)
+        valid_kpts = self._score_and_nms(kpts)
 
         # only format the results without doing quantitative evaluation
         if self.format_only:
+            # convert results to coco style and dump into a json file
+            self.results2json(valid_kpts, outfile_prefix=outfile_prefix)
             logger.info('results are saved in '
                         f'{osp.dirname(outfile_prefix)}')
             return {}
@@ -442,7 +400,7 @@ class CocoMetric(BaseMetric):
         # evaluation results
         eval_results = OrderedDict()
         logger.info(f'Evaluating {self.__class__.__name__}...')
-        info_str = self._do_python_keypoint_eval(outfile_prefix)
+        info_str = self._do_keypoint_eval(valid_kpts, outfile_prefix)
         name_value = OrderedDict(info_str)
         eval_results.update(name_value)
 
@@ -450,6 +408,95 @@ class CocoMetric(BaseMetric):
             tmp_dir.cleanup()
         return eval_results
 
+    def _score_and_nms(self, kpts: Dict[int, list]) -> Dict[int, list]:
+        """Score the prediction results according to ``score_mode`` and
+        perform NMS in each image according to ``nms_mode``.
+
+        Args:
+            kpts (Dict[int, list]): keypoint prediction results grouped by
+                ``img_id``.
+
+        Returns:
+            Dict[int, list]: The kept prediction results of each image, with
+            the keypoint scores concatenated to the keypoints and the
+            ``'score'`` of each instance.
+        """
+        instances = [
+            instance for img_instances in kpts.values()
+            for instance in img_instances
+        ]
+        for instance in instances:
+            # concatenate the keypoint coordinates and scores
+            instance['keypoints'] = np.concatenate(
+                [instance['keypoints'], instance['keypoint_scores'][:, None]],
+                axis=-1)
+
+        if self.score_mode == 'bbox_keypoint' and instances:
+            num_keypoints = self.dataset_meta['num_keypoints']
+            keypoint_scores = np.stack([
+                instance['keypoint_scores'][:num_keypoints]
+                for instance in instances
+            ])
+            valid = keypoint_scores > self.keypoint_score_thr
+            # sum up the scores in keypoint order and in the dtype that
+            # `0 + score` promotes to, which rounds like a python loop
+            acc_dtype = (0 + keypoint_scores.dtype.type(0)).dtype
+            total = np.cumsum(
+                np.where(valid, keypoint_scores, 0), axis=1,
+                dtype=acc_dtype)[:, -1]
+            valid_num = valid.sum(axis=1)
+            mean_kpt_scores = np.where(
+                valid_num > 0,
+                total / np.maximum(valid_num, 1).astype(total.dtype), 0)
+            for instance, mean_kpt_score in zip(instances, mean_kpt_scores):
+                instance['score'] = instance['bbox_score'] * mean_kpt_score
+
+        for instance in instances:
+            if self.score_mode == 'bbox':
+                instance['score'] = instance['bbox_score']
+            elif self.score_mode == 'keypoint':
+                instance['score'] = np.mean(instance['keypoint_scores'])
+            elif self.score_mode == 'bbox_rle':
+                keypoint_scores = instance['keypoint_scores']
+                instance['score'] = float(instance['bbox_score'] +
+                                          np.mean(keypoint_scores) +
+                                          np.max(keypoint_scores))
+
+        valid_kpts = defaultdict(list)
+        for img_id, instances in kpts.items():
+            # a single instance is always kept by oks_nms
+            if self.nms_mode == 'none' or (self.nms_mode == 'oks_nms'
+                                           and len(instances) == 1):
+                valid_kpts[img_id] = instances
+            else:
+                nms = oks_nms if self.nms_mode == 'oks_nms' else soft_oks_nms
+                keep = nms(
+                    instances,
+                    self.nms_thr,
+                    sigmas=self.dataset_meta['sigmas'])
+                valid_kpts[img_id] = [instances[_keep] for _keep in keep]
+        return valid_kpts
+
+    def _do_keypoint_eval(self, keypoints: Dict[int, list],
+                          outfile_prefix: str) -> list:
+        """Evaluate the kept keypoint detection results.
+
+        Dumps the results to a json file and evaluates them with COCOAPI.
+        Subclasses may evaluate the results in memory instead.
+
+        Args:
+            keypoints (Dict[int, list]): Keypoint detection results
+                of the dataset.
+            outfile_prefix (str): The filename prefix of the json files.
+
+        Returns:
+            list: a list of tuples. Each tuple contains the evaluation stats
+            name and corresponding stats value.
+        """
+        # convert results to coco style and dump into a json file
+        self.results2json(keypoints, outfile_prefix=outfile_prefix)
+        return self._do_python_keypoint_eval(outfile_prefix)
+
     def results2json(self, keypoints: Dict[int, list],
                      outfile_prefix: str) -> str:
         """Dump the keypoint detection results to a COCO style json file.
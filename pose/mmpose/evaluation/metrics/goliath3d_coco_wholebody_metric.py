@@ -7,20 +7,13 @@
 import datetime
 from typing import Dict, Optional, Sequence
 import numpy as np
-import os
 from mmpose.registry import METRICS
 from .coco_metric import CocoMetric
-import os.path as osp
-import tempfile
-from collections import OrderedDict, defaultdict
-from mmengine.evaluator import BaseMetric
-from mmengine.fileio import dump, get_local_path, load
-from mmengine.logging import MMLogger
-from xtcocotools.coco import COCO
+from mmengine.fileio import dump
 from xtcocotools.cocoeval import COCOeval
-from ..functional import oks_nms, soft_oks_nms
 
 from .coco_wholebody_metric import CocoWholeBodyMetric
+from .goliath_metric import goliath_keypoint_eval
 from mmpose.datasets.datasets.utils import parse_pose_metainfo
 
 try:
@@ -53,11 +46,18 @@ class Goliath3dCocoWholeBodyMetric(CocoMetric):
                  format_only: bool = False,
                  outfile_prefix: Optional[str] = None,
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
+                 prefix: Optional[str] = None,
+                 fast_eval: bool = True,
+                 eval_device: Optional[str] = None) -> None:
 
         super().__init__(ann_file, use_area, iou_type, score_mode, keypoint_score_thr, nms_mode,\
                         nms_thr, format_only, outfile_prefix, collect_device, prefix)
 
+        ## evaluate goliath in memory, see GoliathMetric
+        self.fast_eval = fast_eval
+        self.eval_device = eval_device
+        self._keypoint_evaluators = None
+
         self.coco_wholebody_metric = CocoWholeBodyMetric(coco_wholebody_ann_file, use_area, iou_type, score_mode, keypoint_score_thr, \
                                 nms_mode, nms_thr, format_only, outfile_prefix, collect_device, 'coco-wholebody')
 
@@ -211,119 +211,9 @@ class Goliath3dCocoWholeBodyMetric(CocoMetric):
             Dict[str, float]: The computed metrics. The keys are the names of
             the metrics, and the values are corresponding results.
         """
-        logger: MMLogger = MMLogger.get_current_instance()
-
-        # split prediction and gt list
-        preds, gts = zip(*results)
-
-        tmp_dir = None
-        if self.outfile_prefix is None:
-            tmp_dir = tempfile.TemporaryDirectory()
-            outfile_prefix = osp.join(tmp_dir.name, 'results')
-        else:
-            outfile_prefix = self.outfile_prefix
-
-        if self.coco is None:
-            # use converted gt json file to initialize coco helper
-            logger.info('Converting ground truth to coco format...')
-            coco_json_path = self.gt_to_coco_json(
-                gt_dicts=gts, outfile_prefix=outfile_prefix)
-            self.coco = COCO(coco_json_path)
-
-        kpts = defaultdict(list)
-
-        # group the preds by img_id
-        for pred in preds:
-            img_id = pred['img_id']
+        for pred, _ in results:
             assert pred['img_id'] == pred['id']
-            for idx in range(len(pred['keypoints'])):
-                instance = {
-                    'id': pred['id'],
-                    'img_id': pred['img_id'],
-                    'category_id': pred['category_id'],
-                    'keypoints': pred['keypoints'][idx],
-                    'keypoint_scores': pred['keypoint_scores'][idx],
-                    'bbox_score': pred['bbox_scores'][idx],
-                }
-
-                if 'areas' in pred:
-                    instance['area'] = pred['areas'][idx]
-                else:
-                    # use keypoint to calculate bbox and get area
-                    keypoints = pred['keypoints'][idx]
-                    area = (
-                        np.max(keypoints[:, 0]) - np.min(keypoints[:, 0])) * (
-                            np.max(keypoints[:, 1]) - np.min(keypoints[:, 1]))
-                    instance['area'] = area
-
-                kpts[img_id].append(instance)
-
-        # sort keypoint results according to id and remove duplicate ones
-        kpts = self._sort_and_unique_bboxes(kpts, key='id')
-
-        # score the prediction results according to `score_mode`
-        # and perform NMS according to `nms_mode`
-        valid_kpts = defaultdict(list)
-        num_keypoints = self.dataset_meta['num_keypoints']
-        for img_id, instances in kpts.items():
-            for instance in instances:
-                # concatenate the keypoint coordinates and scores
-                instance['keypoints'] = np.concatenate([
-                        instance['keypoints'], instance['keypoint_scores'][:, None]
-                    ], axis=-1)
-                if self.score_mode == 'bbox':
-                    instance['score'] = instance['bbox_score']
-                elif self.score_mode == 'keypoint':
-                    instance['score'] = np.mean(instance['keypoint_scores'])
-                else:
-                    bbox_score = instance['bbox_score']
-                    if self.score_mode == 'bbox_rle':
-                        keypoint_scores = instance['keypoint_scores']
-                        instance['score'] = float(bbox_score +
-                                                  np.mean(keypoint_scores) +
-                                                  np.max(keypoint_scores))
-
-                    else:  # self.score_mode == 'bbox_keypoint':
-                        mean_kpt_score = 0
-                        valid_num = 0
-                        for kpt_idx in range(num_keypoints):
-                            kpt_score = instance['keypoint_scores'][kpt_idx]
-                            if kpt_score > self.keypoint_score_thr:
-                                mean_kpt_score += kpt_score
-                                valid_num += 1
-                        if valid_num != 0:
-                            mean_kpt_score /= valid_num
-                        instance['score'] = bbox_score * mean_kpt_score
-            # perform nms
-            if self.nms_mode == 'none':
-                valid_kpts[img_id] = instances
-            else:
-                nms = oks_nms if self.nms_mode == 'oks_nms' else soft_oks_nms
-                keep = nms(
-                    instances,
-                    self.nms_thr,
-                    sigmas=self.dataset_meta['sigmas'])
-                valid_kpts[img_id] = [instances[_keep] for _keep in keep]
-
-        # convert results to coco style and dump into a json file
-        self.results2json(valid_kpts, outfile_prefix=outfile_prefix)
-
-        # only format the results without doing quantitative evaluation
-        if self.format_only:
-            logger.info('results are saved in '
-                        f'{osp.dirname(outfile_prefix)}')
-            return {}
-
-        # evaluation results
-        eval_results = OrderedDict()
-        logger.info(f'Evaluating {self.__class__.__name__}...')
-        info_str = self._do_python_keypoint_eval(outfile_prefix)
-        name_value = OrderedDict(info_str)
-        eval_results.update(name_value)
-
-        if tmp_dir is not None:
-            tmp_dir.cleanup()
-        return eval_results
+        return super().compute_metrics(results)
 
     def results2json(self, keypoints: Dict[int, list],
                      outfile_prefix: str) -> str:
@@ -493,3 +383,13 @@ class Goliath3dCocoWholeBodyMetric(CocoMetric):
         info_str = list(zip(stats_names, coco_eval.stats))
 
         return info_str
+
+    def _do_keypoint_eval(self, keypoints: Dict[int, list],
+                          outfile_prefix: str) -> list:
+        """Evaluate the keypoint detection results, in memory if
+        ``fast_eval`` is set."""
+        if self.outfile_prefix is not None or not self.fast_eval:
+            self.results2json(keypoints, outfile_prefix=outfile_prefix)
+        if not self.fast_eval:
+            return self._do_python_keypoint_eval(outfile_prefix)
+        return goliath_keypoint_eval(self, keypoints)
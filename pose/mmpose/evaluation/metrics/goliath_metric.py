@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import datetime
+from collections import OrderedDict
 from typing import Dict, Optional, Sequence
 
 import numpy as np
@@ -12,12 +13,94 @@ from mmengine.fileio import dump
 from xtcocotools.cocoeval import COCOeval
 
 from mmpose.registry import METRICS
+from ..functional import KeypointAPEvaluator
+from ..functional.keypoint_ap import KEYPOINT_STATS_NAMES
 from .coco_metric import CocoMetric
 
+# the xtcocotools iou types evaluated for goliath, the annotation field of
+# their keypoints and their keypoint ids in ``goliath_info``
+GOLIATH_KEYPOINT_TYPES = [
+    ('keypoints_body', 'keypoints', 'body_keypoint_ids'),
+    ('keypoints_foot', 'foot_kpts', 'foot_keypoint_ids'),
+    ('keypoints_face', 'face_kpts', 'face_keypoint_ids'),
+    ('keypoints_lefthand', 'lefthand_kpts', 'left_hand_keypoint_ids'),
+    ('keypoints_righthand', 'righthand_kpts', 'right_hand_keypoint_ids'),
+    ('keypoints_wholebody_goliath', 'goliath_wholebody_kpts', None),
+]
+
+
+def goliath_keypoint_eval(metric: CocoMetric,
+                          keypoints: Dict[int, list]) -> list:
+    """Evaluate the goliath keypoint types of ``_do_python_keypoint_eval``
+    in memory with :class:`KeypointAPEvaluator`, giving the same stats
+    without the json files.
+
+    The evaluators read the ground truth once and are cached on the metric.
+
+    Args:
+        metric (CocoMetric): A goliath metric with ``coco`` loaded.
+        keypoints (Dict[int, list]): Keypoint detection results
+            of the dataset.
+
+    Returns:
+        list: a list of tuples. Each tuple contains the evaluation stats
+        name and corresponding stats value of the wholebody keypoints.
+    """
+    goliath_info = metric.coco.dataset['info']['goliath_info']
+    assert len(goliath_info['body_keypoint_ids']) == metric.body_num
+    assert len(goliath_info['foot_keypoint_ids']) == metric.foot_num
+    assert len(goliath_info['face_keypoint_ids']) == metric.face_num
+    assert len(goliath_info['left_hand_keypoint_ids']) == metric.left_hand_num
+    assert len(goliath_info['right_hand_keypoint_ids']) == \
+        metric.right_hand_num
+
+    if getattr(metric, '_keypoint_evaluators', None) is None:
+        sigmas = metric.dataset_meta['sigmas']
+        metric._keypoint_evaluators = OrderedDict()
+        for iou_type, gt_key, ids_key in GOLIATH_KEYPOINT_TYPES:
+            keypoint_ids = goliath_info[ids_key] if ids_key else None
+            metric._keypoint_evaluators[iou_type] = KeypointAPEvaluator(
+                metric.coco,
+                sigmas if keypoint_ids is None else sigmas[keypoint_ids],
+                gt_key=gt_key,
+                keypoint_ids=keypoint_ids,
+                use_area=True,
+                device=metric.eval_device)
+
+    instances = [
+        instance for img_instances in keypoints.values()
+        for instance in img_instances
+    ]
+    num_keypoints = metric.dataset_meta['num_keypoints']
+    img_ids = np.array([instance['img_id'] for instance in instances])
+    kpts = np.array([instance['keypoints'] for instance in instances
+                     ]).reshape(-1, num_keypoints, 3)
+    scores = np.array([float(instance['score']) for instance in instances])
+    # ``COCO.loadRes`` takes the area of the body keypoints bbox
+    body = kpts[:, goliath_info['body_keypoint_ids'], :2].astype(np.float64)
+    areas = np.ptp(body[..., 0], axis=1) * np.ptp(body[..., 1], axis=1)
+
+    for iou_type, evaluator in metric._keypoint_evaluators.items():
+        stats = evaluator.evaluate(
+            img_ids, kpts, scores, areas, name=iou_type)
+
+    return list(zip(KEYPOINT_STATS_NAMES, stats))
+
 
 @METRICS.register_module()
 class GoliathMetric(CocoMetric):
-    """
+    """Goliath keypoint evaluation metric.
+
+    Evaluates the body, foot, face, hand and wholebody keypoints. See
+    :class:`CocoMetric` for the other arguments.
+
+    Args:
+        fast_eval (bool): Whether to evaluate in memory with
+            :class:`KeypointAPEvaluator` instead of COCOAPI. The stats are
+            the same, the json files are only written when
+            ``outfile_prefix`` is given. Defaults to ``True``
+        eval_device (str, optional): Compute the OKS of ``fast_eval`` with
+            torch on this device, e.g. ``'cuda'``. Defaults to ``None``
     """
     default_prefix: Optional[str] = 'goliath'
     body_num = 17
@@ -27,6 +110,27 @@ class GoliathMetric(CocoMetric):
     right_hand_num = 20
     remaining_extra_num = 7 ## total to 308
 
+    def __init__(self,
+                 ann_file: Optional[str] = None,
+                 use_area: bool = True,
+                 iou_type: str = 'keypoints',
+                 score_mode: str = 'bbox_keypoint',
+                 keypoint_score_thr: float = 0.2,
+                 nms_mode: str = 'oks_nms',
+                 nms_thr: float = 0.9,
+                 format_only: bool = False,
+                 outfile_prefix: Optional[str] = None,
+                 collect_device: str = 'cpu',
+                 prefix: Optional[str] = None,
+                 fast_eval: bool = True,
+                 eval_device: Optional[str] = None) -> None:
+        super().__init__(ann_file, use_area, iou_type, score_mode,
+                         keypoint_score_thr, nms_mode, nms_thr, format_only,
+                         outfile_prefix, collect_device, prefix)
+        self.fast_eval = fast_eval
+        self.eval_device = eval_device
+        self._keypoint_evaluators = None
+
     def gt_to_coco_json(self, gt_dicts: Sequence[dict],
                         outfile_prefix: str) -> str:
         """
@@ -254,3 +358,13 @@ class GoliathMetric(CocoMetric):
         info_str = list(zip(stats_names, coco_eval.stats))
 
         return info_str
+
+    def _do_keypoint_eval(self, keypoints: Dict[int, list],
+                          outfile_prefix: str) -> list:
+        """Evaluate the keypoint detection results, in memory if
+        ``fast_eval`` is set."""
+        if self.outfile_prefix is not None or not self.fast_eval:
+            self.results2json(keypoints, outfile_prefix=outfile_prefix)
+        if not self.fast_eval:
+            return self._do_python_keypoint_eval(outfile_prefix)
+        return goliath_keypoint_eval(self, keypoints)
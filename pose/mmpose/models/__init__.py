@@ -4,17 +4,19 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .backbones import *  # noqa
-from .builder import (BACKBONES, HEADS, LOSSES, NECKS, build_backbone,
-                      build_head, build_loss, build_neck, build_pose_estimator,
-                      build_posenet)
-from .data_preprocessors import *  # noqa
-from .heads import *  # noqa
-from .losses import *  # noqa
-from .necks import *  # noqa
-from .pose_estimators import *  # noqa
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BACKBONES', 'HEADS', 'NECKS', 'LOSSES', 'build_backbone', 'build_head',
-    'build_loss', 'build_posenet', 'build_neck', 'build_pose_estimator'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'backbones': '*',
+        'builder': [
+            'BACKBONES', 'HEADS', 'LOSSES', 'NECKS', 'build_backbone',
+            'build_head', 'build_loss', 'build_neck', 'build_pose_estimator',
+            'build_posenet'
+        ],
+        'data_preprocessors': '*',
+        'heads': '*',
+        'losses': '*',
+        'necks': '*',
+        'pose_estimators': '*',
+    })
@@ -4,39 +4,35 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .alexnet import AlexNet
-from .cpm import CPM
-from .hourglass import HourglassNet
-from .hourglass_ae import HourglassAENet
-from .hrformer import HRFormer
-from .hrnet import HRNet
-from .litehrnet import LiteHRNet
-from .mobilenet_v2 import MobileNetV2
-from .mobilenet_v3 import MobileNetV3
-from .mspn import MSPN
-from .pvt import PyramidVisionTransformer, PyramidVisionTransformerV2
-from .regnet import RegNet
-from .resnest import ResNeSt
-from .resnet import ResNet, ResNetV1d
-from .resnext import ResNeXt
-from .rsn import RSN
-from .scnet import SCNet
-from .seresnet import SEResNet
-from .seresnext import SEResNeXt
-from .shufflenet_v1 import ShuffleNetV1
-from .shufflenet_v2 import ShuffleNetV2
-from .swin import SwinTransformer
-from .tcn import TCN
-from .v2v_net import V2VNet
-from .vgg import VGG
-from .vipnas_mbv3 import ViPNAS_MobileNetV3
-from .vipnas_resnet import ViPNAS_ResNet
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'AlexNet', 'HourglassNet', 'HourglassAENet', 'HRNet', 'MobileNetV2',
-    'MobileNetV3', 'RegNet', 'ResNet', 'ResNetV1d', 'ResNeXt', 'SCNet',
-    'SEResNet', 'SEResNeXt', 'ShuffleNetV1', 'ShuffleNetV2', 'CPM', 'RSN',
-    'MSPN', 'ResNeSt', 'VGG', 'TCN', 'ViPNAS_ResNet', 'ViPNAS_MobileNetV3',
-    'LiteHRNet', 'V2VNet', 'HRFormer', 'PyramidVisionTransformer',
-    'PyramidVisionTransformerV2', 'SwinTransformer'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'alexnet': ['AlexNet'],
+        'cpm': ['CPM'],
+        'hourglass': ['HourglassNet'],
+        'hourglass_ae': ['HourglassAENet'],
+        'hrformer': ['HRFormer'],
+        'hrnet': ['HRNet'],
+        'litehrnet': ['LiteHRNet'],
+        'mobilenet_v2': ['MobileNetV2'],
+        'mobilenet_v3': ['MobileNetV3'],
+        'mspn': ['MSPN'],
+        'pvt': ['PyramidVisionTransformer', 'PyramidVisionTransformerV2'],
+        'regnet': ['RegNet'],
+        'resnest': ['ResNeSt'],
+        'resnet': ['ResNet', 'ResNetV1d'],
+        'resnext': ['ResNeXt'],
+        'rsn': ['RSN'],
+        'scnet': ['SCNet'],
+        'seresnet': ['SEResNet'],
+        'seresnext': ['SEResNeXt'],
+        'shufflenet_v1': ['ShuffleNetV1'],
+        'shufflenet_v2': ['ShuffleNetV2'],
+        'swin': ['SwinTransformer'],
+        'tcn': ['TCN'],
+        'v2v_net': ['V2VNet'],
+        'vgg': ['VGG'],
+        'vipnas_mbv3': ['ViPNAS_MobileNetV3'],
+        'vipnas_resnet': ['ViPNAS_ResNet'],
+    })
@@ -4,6 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .data_preprocessor import PoseDataPreprocessor
+from mmengine.utils import lazy_import
 
-__all__ = ['PoseDataPreprocessor']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'data_preprocessor':
+        ['PoseDataPreprocessor', 'BatchPhotometricDistortion'],
+    })
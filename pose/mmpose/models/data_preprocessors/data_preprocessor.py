@@ -4,11 +4,192 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from mmengine.model import ImgDataPreprocessor
+from typing import List, Optional, Sequence, Tuple, Union
+
+import torch
+import torch.nn as nn
+from mmengine.model import ImgDataPreprocessor, bgr_to_hsv, hsv_to_bgr
+from mmengine.utils import is_seq_of
 
 from mmpose.registry import MODELS
+from mmpose.utils.typing import SampleList
 
 
 @MODELS.register_module()
 class PoseDataPreprocessor(ImgDataPreprocessor):
-    """Image pre-processor for pose estimation tasks."""
+    """Image pre-processor for pose estimation tasks.
+
+    Args:
+        photometric_augments (list[dict], optional): Photometric
+            augmentations applied to the BGR images in [0, 255] on the device
+            during training, before the channel conversion and
+            normalization, e.g. :class:`BatchPhotometricDistortion` in place
+            of :class:`PhotometricDistortion` in the train pipeline.
+            Defaults to None.
+
+    See :class:`mmengine.model.ImgDataPreprocessor` for the other arguments.
+    """
+
+    def __init__(self,
+                 mean: Optional[Sequence[Union[float, int]]] = None,
+                 std: Optional[Sequence[Union[float, int]]] = None,
+                 pad_size_divisor: int = 1,
+                 pad_value: Union[float, int] = 0,
+                 bgr_to_rgb: bool = False,
+                 rgb_to_bgr: bool = False,
+                 non_blocking: Optional[bool] = False,
+                 photometric_augments: Optional[List[dict]] = None):
+        super().__init__(
+            mean=mean,
+            std=std,
+            pad_size_divisor=pad_size_divisor,
+            pad_value=pad_value,
+            bgr_to_rgb=bgr_to_rgb,
+            rgb_to_bgr=rgb_to_bgr,
+            non_blocking=non_blocking)
+        if photometric_augments is not None:
+            self.photometric_augments = nn.ModuleList(
+                [MODELS.build(cfg) for cfg in photometric_augments])
+        else:
+            self.photometric_augments = None
+
+    def _photometric_augment(self, inputs: torch.Tensor,
+                             data_samples: SampleList) -> torch.Tensor:
+        for augment in self.photometric_augments:
+            inputs, data_samples = augment(inputs, data_samples)
+        return inputs
+
+    def forward(self, data: dict, training: bool = False) -> dict:
+        """Apply the photometric augmentations during training, then
+        normalize, pad and stack the images like
+        :class:`ImgDataPreprocessor`."""
+        if training and self.photometric_augments is not None:
+            data = self.cast_data(data)
+            inputs = data['inputs']
+            data_samples = data.get('data_samples', None)
+            if isinstance(inputs, torch.Tensor):
+                data['inputs'] = self._photometric_augment(
+                    inputs, data_samples)
+            elif is_seq_of(inputs, torch.Tensor) and all(
+                    _input.shape == inputs[0].shape for _input in inputs):
+                data['inputs'] = list(
+                    self._photometric_augment(torch.stack(inputs),
+                                              data_samples).unbind(dim=0))
+            else:
+                data['inputs'] = [
+                    self._photometric_augment(_input[None],
+                                              [data_sample])[0]
+                    for _input, data_sample in zip(inputs, data_samples)
+                ]
+        return super().forward(data, training)
+
+
+@MODELS.register_module()
+class BatchPhotometricDistortion(nn.Module):
+    """Apply the photometric distortion of :class:`PhotometricDistortion` to
+    a batch of images on the device, with random parameters per image.
+
+    Every distortion is applied with a probability of 0.5: random
+    brightness, random contrast first or last, random saturation and hue in
+    HSV space and a random permutation of the channels. The images are BGR
+    in [0, 255] and are clipped after every step, but not rounded to uint8.
+
+    Args:
+        brightness_delta (int): delta of brightness. Defaults to 32.
+        contrast_range (tuple): range of contrast. Defaults to (0.5, 1.5).
+        saturation_range (tuple): range of saturation.
+            Defaults to (0.5, 1.5).
+        hue_delta (int): delta of hue, in the [0, 180) hue range of OpenCV.
+            Defaults to 18.
+    """
+
+    def __init__(self,
+                 brightness_delta: int = 32,
+                 contrast_range: Sequence[float] = (0.5, 1.5),
+                 saturation_range: Sequence[float] = (0.5, 1.5),
+                 hue_delta: int = 18) -> None:
+        super().__init__()
+        self.brightness_delta = brightness_delta
+        self.contrast_lower, self.contrast_upper = contrast_range
+        self.saturation_lower, self.saturation_upper = saturation_range
+        self.hue_delta = hue_delta
+
+    def forward(self, inputs: torch.Tensor,
+                data_samples: SampleList) -> Tuple[torch.Tensor, SampleList]:
+        """Distort the images.
+
+        Args:
+            inputs (Tensor): The BGR images in shape (B, 3, H, W).
+            data_samples (list[:obj:`PoseDataSample`]): The data samples.
+
+        Returns:
+            tuple: The distorted images in float32 and the data samples.
+        """
+        B = inputs.size(0)
+        device = inputs.device
+        img = inputs.float()
+
+        def flags():
+            return torch.rand(B, device=device) < 0.5
+
+        def uniform(low, high):
+            return torch.empty(B, device=device).uniform_(low, high)
+
+        def where(flag, value, default):
+            return torch.where(flag, value,
+                               torch.full_like(value, default)).view(
+                                   B, 1, 1, 1)
+
+        # random brightness distortion
+        beta = where(flags(),
+                     uniform(-self.brightness_delta, self.brightness_delta), 0)
+        img = (img + beta).clamp(0, 255)
+
+        # random contrast distortion, first or last
+        contrast_flag = flags()
+        contrast_first = flags()
+        alpha = uniform(self.contrast_lower, self.contrast_upper)
+        img = (img * where(contrast_flag & contrast_first, alpha, 1)).clamp(
+            0, 255)
+
+        # random saturation/hue distortion
+        saturation_flag = flags()
+        hue_flag = flags()
+        h, s, v = bgr_to_hsv(img)
+        saturation = where(
+            saturation_flag,
+            uniform(self.saturation_lower, self.saturation_upper), 1)
+        s = (s * saturation[:, 0]).clamp(0, 1)
+        # the hue of OpenCV is in degrees / 2
+        hue = torch.randint(
+            -self.hue_delta, self.hue_delta + 1, (B, ),
+            device=device).float() / 30
+        h = (h + where(hue_flag, hue, 0)[:, 0]) % 6
+        img = torch.where((saturation_flag | hue_flag).view(B, 1, 1, 1),
+                          hsv_to_bgr(h, s, v), img)
+
+        img = (img * where(contrast_flag & ~contrast_first, alpha, 1)).clamp(
+            0, 255)
+
+        # randomly swap channels
+        order = torch.rand(B, 3, device=device).argsort(dim=1)
+        order = torch.where(
+            flags()[:, None], order,
+            torch.arange(3, device=device).expand(B, 3))
+        img = img.gather(1, order[:, :, None, None].expand_as(img))
+        return img, data_samples
+
+    def __repr__(self) -> str:
+        """print the basic information of the transform.
+
+        Returns:
+            str: Formatted string.
+        """
+        repr_str = self.__class__.__name__
+        repr_str += (f'(brightness_delta={self.brightness_delta}, '
+                     f'contrast_range=({self.contrast_lower}, '
+                     f'{self.contrast_upper}), '
+                     f'saturation_range=({self.saturation_lower}, '
+                     f'{self.saturation_upper}), '
+                     f'hue_delta={self.hue_delta})')
+        return repr_str
@@ -4,19 +4,19 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base_head import BaseHead
-from .coord_cls_heads import RTMCCHead, SimCCHead
-from .heatmap_heads import (AssociativeEmbeddingHead, CIDHead, CPMHead,
-                            HeatmapHead, MSPNHead, ViPNASHead)
-from .hybrid_heads import DEKRHead, VisPredictHead
-from .regression_heads import (DSNTHead, IntegralRegressionHead,
-                               RegressionHead, RLEHead, TemporalRegressionHead,
-                               TrajectoryRegressionHead)
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BaseHead', 'HeatmapHead', 'CPMHead', 'MSPNHead', 'ViPNASHead',
-    'RegressionHead', 'IntegralRegressionHead', 'SimCCHead', 'RLEHead',
-    'DSNTHead', 'AssociativeEmbeddingHead', 'DEKRHead', 'VisPredictHead',
-    'CIDHead', 'RTMCCHead', 'TemporalRegressionHead',
-    'TrajectoryRegressionHead', 
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base_head': ['BaseHead'],
+        'coord_cls_heads': ['RTMCCHead', 'SimCCHead'],
+        'heatmap_heads': [
+            'AssociativeEmbeddingHead', 'CIDHead', 'CPMHead', 'HeatmapHead',
+            'MSPNHead', 'ViPNASHead'
+        ],
+        'hybrid_heads': ['DEKRHead', 'VisPredictHead'],
+        'regression_heads': [
+            'DSNTHead', 'IntegralRegressionHead', 'RegressionHead', 'RLEHead',
+            'TemporalRegressionHead', 'TrajectoryRegressionHead'
+        ],
+    })
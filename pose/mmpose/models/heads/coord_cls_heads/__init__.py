@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .rtmcc_head import RTMCCHead
-from .simcc_head import SimCCHead
+from mmengine.utils import lazy_import
 
-__all__ = ['SimCCHead', 'RTMCCHead']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'rtmcc_head': ['RTMCCHead'],
+        'simcc_head': ['SimCCHead'],
+    })
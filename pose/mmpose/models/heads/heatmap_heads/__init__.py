@@ -4,15 +4,15 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ae_head import AssociativeEmbeddingHead
-from .cid_head import CIDHead
-from .cpm_head import CPMHead
-from .heatmap_head import HeatmapHead
-from .mspn_head import MSPNHead
-from .vipnas_head import ViPNASHead
-from .pose3d_heatmap_head import Pose3dHeatmapHead
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'HeatmapHead', 'CPMHead', 'MSPNHead', 'ViPNASHead',
-    'AssociativeEmbeddingHead', 'CIDHead', 'Pose3dHeatmapHead'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ae_head': ['AssociativeEmbeddingHead'],
+        'cid_head': ['CIDHead'],
+        'cpm_head': ['CPMHead'],
+        'heatmap_head': ['HeatmapHead'],
+        'mspn_head': ['MSPNHead'],
+        'vipnas_head': ['ViPNASHead'],
+        'pose3d_heatmap_head': ['Pose3dHeatmapHead'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .dekr_head import DEKRHead
-from .vis_head import VisPredictHead
+from mmengine.utils import lazy_import
 
-__all__ = ['DEKRHead', 'VisPredictHead']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'dekr_head': ['DEKRHead'],
+        'vis_head': ['VisPredictHead'],
+    })
@@ -4,18 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .dsnt_head import DSNTHead
-from .integral_regression_head import IntegralRegressionHead
-from .regression_head import RegressionHead
-from .rle_head import RLEHead
-from .temporal_regression_head import TemporalRegressionHead
-from .trajectory_regression_head import TrajectoryRegressionHead
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'RegressionHead',
-    'IntegralRegressionHead',
-    'DSNTHead',
-    'RLEHead',
-    'TemporalRegressionHead',
-    'TrajectoryRegressionHead',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'dsnt_head': ['DSNTHead'],
+        'integral_regression_head': ['IntegralRegressionHead'],
+        'regression_head': ['RegressionHead'],
+        'rle_head': ['RLEHead'],
+        'temporal_regression_head': ['TemporalRegressionHead'],
+        'trajectory_regression_head': ['TrajectoryRegressionHead'],
+    })
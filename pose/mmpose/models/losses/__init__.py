@@ -4,21 +4,23 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ae_loss import AssociativeEmbeddingLoss
-from .classification_loss import BCELoss, JSDiscretLoss, KLDiscretLoss
-from .heatmap_loss import (AdaptiveWingLoss, KeypointMSELoss,
-                           KeypointOHKMMSELoss)
-from .loss_wrappers import CombinedLoss, MultipleLossWrapper
-from .regression_loss import (BoneLoss, L1Loss, MPJPELoss, MSELoss, RLELoss,
-                              SemiSupervisionLoss, SmoothL1Loss, 
-                              SoftWeightSmoothL1Loss, SoftWingLoss, WingLoss)
-from .pose3d_loss import Pose3d_L1_Loss, Pose3d_K_Loss, Pose3d_RelativeDepth_Loss, Pose3d_Confidence_Loss
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'KeypointMSELoss', 'KeypointOHKMMSELoss', 'SmoothL1Loss', 'WingLoss',
-    'MPJPELoss', 'MSELoss', 'L1Loss', 'BCELoss', 'BoneLoss',
-    'SemiSupervisionLoss', 'SoftWingLoss', 'AdaptiveWingLoss', 'RLELoss',
-    'KLDiscretLoss', 'MultipleLossWrapper', 'JSDiscretLoss', 'CombinedLoss',
-    'AssociativeEmbeddingLoss', 'SoftWeightSmoothL1Loss', 'Pose3d_L1_Loss',
-    'Pose3d_K_Loss', 'Pose3d_RelativeDepth_Loss', 'Pose3d_Confidence_Loss'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ae_loss': ['AssociativeEmbeddingLoss'],
+        'classification_loss': ['BCELoss', 'JSDiscretLoss', 'KLDiscretLoss'],
+        'heatmap_loss': [
+            'AdaptiveWingLoss', 'KeypointMSELoss', 'KeypointOHKMMSELoss'
+        ],
+        'loss_wrappers': ['CombinedLoss', 'MultipleLossWrapper'],
+        'regression_loss': [
+            'BoneLoss', 'L1Loss', 'MPJPELoss', 'MSELoss', 'RLELoss',
+            'SemiSupervisionLoss', 'SmoothL1Loss', 'SoftWeightSmoothL1Loss',
+            'SoftWingLoss', 'WingLoss'
+        ],
+        'pose3d_loss': [
+            'Pose3d_L1_Loss', 'Pose3d_K_Loss', 'Pose3d_RelativeDepth_Loss',
+            'Pose3d_Confidence_Loss'
+        ],
+    })
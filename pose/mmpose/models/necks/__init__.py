@@ -4,11 +4,12 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .fmap_proc_neck import FeatureMapProcessor
-from .fpn import FPN
-from .gap_neck import GlobalAveragePooling
-from .posewarper_neck import PoseWarperNeck
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'GlobalAveragePooling', 'PoseWarperNeck', 'FPN', 'FeatureMapProcessor'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'fmap_proc_neck': ['FeatureMapProcessor'],
+        'fpn': ['FPN'],
+        'gap_neck': ['GlobalAveragePooling'],
+        'posewarper_neck': ['PoseWarperNeck'],
+    })
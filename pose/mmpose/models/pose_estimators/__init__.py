@@ -4,9 +4,12 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .bottomup import BottomupPoseEstimator
-from .pose_lifter import PoseLifter
-from .topdown import TopdownPoseEstimator
-from .topdown3d import Pose3dTopdownEstimator
+from mmengine.utils import lazy_import
 
-__all__ = ['TopdownPoseEstimator', 'BottomupPoseEstimator', 'PoseLifter', 'Pose3dTopdownEstimator']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'bottomup': ['BottomupPoseEstimator'],
+        'pose_lifter': ['PoseLifter'],
+        'topdown': ['TopdownPoseEstimator'],
+        'topdown3d': ['Pose3dTopdownEstimator'],
+    })
@@ -12,6 +12,7 @@ import warnings
 import cv2
 import torch.multiprocessing as mp
 from mmengine import DefaultScope
+from mmengine.utils import import_lazy_module
 
 
 def setup_multi_processes(cfg):
@@ -66,12 +67,11 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             Defaults to True.
     """  # noqa
 
-    import mmpose.codecs  # noqa: F401, F403
-    import mmpose.datasets  # noqa: F401,F403
-    import mmpose.engine  # noqa: F401,F403
-    import mmpose.evaluation  # noqa: F401,F403
-    import mmpose.models  # noqa: F401,F403
-    import mmpose.visualization  # noqa: F401,F403
+    # the packages import their modules lazily, see `lazy_import`
+    for package in (
+            'mmpose.codecs', 'mmpose.datasets', 'mmpose.engine',
+            'mmpose.evaluation', 'mmpose.models', 'mmpose.visualization'):
+        import_lazy_module(package)
 
     if init_default_scope:
         never_created = DefaultScope.get_current_instance() is None \
@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import cv2
+import numpy as np
 
 
 class FastVisualizer:
@@ -34,6 +35,30 @@ class FastVisualizer:
         self.skeleton_links = metainfo['skeleton_links']
         self.skeleton_link_colors = metainfo['skeleton_link_colors']
 
+        self._links = np.asarray(self.skeleton_links, dtype=np.int64).reshape(
+            -1, 2)
+        self._link_colors = np.asarray(
+            self.skeleton_link_colors, dtype=np.uint8).reshape(-1, 3)
+
+    def _draw_links(self, img, kpts, score):
+        """Draw the links with one `cv2.polylines` call per run of links of
+        the same color, which keeps the order of the links."""
+        links = self._links
+        valid = (score[links[:, 0]] >= self.kpt_thr) & (
+            score[links[:, 1]] >= self.kpt_thr)
+        links, colors = links[valid], self._link_colors[valid]
+        if len(links) == 0:
+            return
+        lines = kpts[links].astype(np.int32)
+        starts = np.flatnonzero(np.any(colors[1:] != colors[:-1], axis=1)) + 1
+        for start, end in zip(np.r_[0, starts], np.r_[starts, len(links)]):
+            cv2.polylines(
+                img,
+                list(lines[start:end]),
+                False,
+                colors[start].tolist(),
+                thickness=self.line_width)
+
     def draw_pose(self, img, instances):
         """Draw pose estimations on the given image.
 
@@ -58,16 +83,9 @@ class FastVisualizer:
         scores = instances.keypoint_scores
 
         for kpts, score in zip(keypoints, scores):
-            for sk_id, sk in enumerate(self.skeleton_links):
-                if score[sk[0]] < self.kpt_thr or score[sk[1]] < self.kpt_thr:
-                    # skip the link that should not be drawn
-                    continue
-
-                pos1 = (int(kpts[sk[0], 0]), int(kpts[sk[0], 1]))
-                pos2 = (int(kpts[sk[1], 0]), int(kpts[sk[1], 1]))
-
-                color = self.skeleton_link_colors[sk_id].tolist()
-                cv2.line(img, pos1, pos2, color, thickness=self.line_width)
+            kpts = np.asarray(kpts)
+            score = np.asarray(score)
+            self._draw_links(img, kpts, score)
 
             for kid, kpt in enumerate(kpts):
                 if score[kid] < self.kpt_thr:
@@ -0,0 +1,189 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from unittest import TestCase
+
+import numpy as np
+import torch
+
+from mmpose.evaluation.functional import (batched_nms, batched_oks_nms, nms,
+                                          oks_nms)
+
+
+def nms_loop(dets, thr):
+    """The per-iteration implementation that :func:`nms` replaces."""
+    if len(dets) == 0:
+        return []
+    x1, y1, x2, y2, scores = (dets[:, i] for i in range(5))
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    order = scores.argsort(kind='stable')[::-1]
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        w = np.maximum(0.0, xx2 - xx1 + 1)
+        h = np.maximum(0.0, yy2 - yy1 + 1)
+        inter = w * h
+        ovr = inter / (areas[i] + areas[order[1:]] - inter)
+        inds = np.where(ovr <= thr)[0]
+        order = order[inds + 1]
+    return keep
+
+
+def oks_iou_loop(g, d, a_g, a_d, sigmas, vis_thr):
+    """The per-instance implementation that ``oks_iou`` replaces."""
+    vars = (sigmas * 2)**2
+    xg, yg, vg = g[0::3], g[1::3], g[2::3]
+    ious = np.zeros(len(d), dtype=np.float32)
+    for n_d in range(0, len(d)):
+        xd, yd, vd = d[n_d, 0::3], d[n_d, 1::3], d[n_d, 2::3]
+        dx = xd - xg
+        dy = yd - yg
+        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
+        if vis_thr is not None:
+            ind = list((vg > vis_thr) & (vd > vis_thr))
+            e = e[ind]
+        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
+    return ious
+
+
+def oks_nms_loop(kpts_db, thr, sigmas, vis_thr):
+    """The while-loop implementation that :func:`oks_nms` replaces."""
+    scores = np.array([k['score'] for k in kpts_db])
+    kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
+    areas = np.array([k['area'] for k in kpts_db])
+    order = scores.argsort(kind='stable')[::-1]
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+        oks_ovr = oks_iou_loop(kpts[i], kpts[order[1:]], areas[i],
+                               areas[order[1:]], sigmas, vis_thr)
+        inds = np.where(oks_ovr <= thr)[0]
+        order = order[inds + 1]
+    return np.array(keep)
+
+
+def make_boxes(rng, num, num_scores=None):
+    """Clustered boxes, with ``num_scores`` distinct scores if given."""
+    centers = rng.uniform(100, 900, size=(max(num // 10, 1), 2))
+    xy = centers[rng.integers(0, len(centers), num)] + rng.normal(
+        0, 15, size=(num, 2))
+    wh = rng.uniform(40, 200, size=(num, 2))
+    if num_scores is None:
+        scores = rng.uniform(0, 1, size=(num, 1))
+    else:
+        scores = rng.integers(0, num_scores, size=(num, 1)) / num_scores
+    return np.hstack([xy - wh / 2, xy + wh / 2, scores])
+
+
+def make_kpts_db(rng, num, num_keypoints=17, num_scores=None):
+    kpts_db = []
+    for box in make_boxes(rng, num, num_scores):
+        wh = box[2:4] - box[:2]
+        xy = box[:2] + rng.uniform(0, 1, size=(num_keypoints, 2)) * wh
+        vis = rng.uniform(0, 1, size=(num_keypoints, 1))
+        kpts_db.append(
+            dict(
+                keypoints=np.hstack([xy, vis]),
+                score=box[4],
+                area=float(wh[0] * wh[1])))
+    return kpts_db
+
+
+class TestNMS(TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_nms(self):
+        for num_scores in (None, 3):
+            dets = make_boxes(self.rng, 200, num_scores)
+            self.assertEqual(
+                [int(i) for i in nms(dets, 0.5)],
+                [int(i) for i in nms_loop(dets, 0.5)])
+
+    def test_nms_tied_scores(self):
+        # identical boxes of the same score keep the one of the higher index
+        dets = np.array([[0, 0, 10, 10, 0.9], [0, 0, 10, 10, 0.9],
+                         [0, 0, 10, 10, 0.9], [50, 50, 60, 60, 0.9]])
+        self.assertEqual([int(i) for i in nms(dets, 0.5)], [3, 2])
+        keep = batched_nms(
+            torch.tensor(dets[None, :, :4]), torch.tensor(dets[None, :, 4]),
+            0.5)
+        self.assertEqual(keep.tolist(), [[False, False, True, True]])
+
+    def test_nms_empty(self):
+        self.assertEqual(nms(np.zeros((0, 5)), 0.5), [])
+        self.assertEqual(oks_nms([], 0.5), [])
+
+    def test_oks_nms(self):
+        sigmas = self.rng.uniform(0.025, 0.1, size=17)
+        for num_scores in (None, 3):
+            for vis_thr in (None, 0.2):
+                kpts_db = make_kpts_db(
+                    self.rng, 100, num_scores=num_scores)
+                np.testing.assert_array_equal(
+                    oks_nms(kpts_db, 0.5, sigmas, vis_thr),
+                    oks_nms_loop(kpts_db, 0.5, sigmas, vis_thr))
+
+    def test_batched_nms(self):
+        for num_scores in (None, 3):
+            batch = [make_boxes(self.rng, 50, num_scores) for _ in range(4)]
+            # the last image is padded from 40 boxes
+            valid = torch.ones(4, 50, dtype=torch.bool)
+            valid[-1, 40:] = False
+            dets = torch.tensor(np.stack(batch))
+            keep = batched_nms(dets[..., :4], dets[..., 4], 0.5, valid)
+            for b, d in enumerate(batch):
+                num = int(valid[b].sum())
+                self.assertEqual(
+                    set(torch.nonzero(keep[b]).flatten().tolist()),
+                    set(int(i) for i in nms(d[:num], 0.5)))
+
+    def test_batched_oks_nms(self):
+        sigmas = self.rng.uniform(0.025, 0.1, size=17)
+        for num_scores in (None, 3):
+            for vis_thr in (None, 0.2):
+                dbs = [
+                    make_kpts_db(self.rng, 30, num_scores=num_scores)
+                    for _ in range(4)
+                ]
+                keypoints = torch.tensor(
+                    np.stack([[k['keypoints'] for k in db] for db in dbs]))
+                areas = torch.tensor([[k['area'] for k in db] for db in dbs])
+                scores = torch.tensor([[k['score'] for k in db]
+                                       for db in dbs])
+                keep = batched_oks_nms(keypoints, areas, scores, 0.5, sigmas,
+                                       vis_thr)
+                for b, db in enumerate(dbs):
+                    self.assertEqual(
+                        set(torch.nonzero(keep[b]).flatten().tolist()),
+                        set(oks_nms(db, 0.5, sigmas, vis_thr).tolist()))
+
+    def test_batched_empty(self):
+        for num_images, num in ((2, 0), (0, 5)):
+            keep = batched_nms(
+                torch.zeros(num_images, num, 4), torch.zeros(num_images, num),
+                0.5)
+            self.assertEqual(keep.shape, (num_images, num))
+            keep = batched_oks_nms(
+                torch.zeros(num_images, num, 17, 3),
+                torch.zeros(num_images, num), torch.zeros(num_images, num),
+                0.5)
+            self.assertEqual(keep.shape, (num_images, num))
+
+        # only padding
+        keep = batched_nms(
+            torch.zeros(2, 3, 4),
+            torch.zeros(2, 3),
+            0.5,
+            valid=torch.zeros(2, 3, dtype=torch.bool))
+        self.assertFalse(keep.any())
@@ -0,0 +1,200 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Check the vectorized box NMS / OKS-NMS against the reference loop
+implementations and benchmark them at several instance counts.
+
+Example:
+    python tools/analysis_tools/benchmark_nms.py --num-instances 10 100 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from mmpose.evaluation.functional import (batched_nms, batched_oks_nms, nms,
+                                          oks_nms)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark NMS')
+    parser.add_argument(
+        '--num-instances', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--num-keypoints', type=int, default=17)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--thr', type=float, default=0.5)
+    parser.add_argument('--vis-thr', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def nms_loop(dets, thr):
+    """The reference per-iteration implementation of :func:`nms`."""
+    if len(dets) == 0:
+        return []
+    x1, y1, x2, y2, scores = (dets[:, i] for i in range(5))
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    order = scores.argsort(kind='stable')[::-1]
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        w = np.maximum(0.0, xx2 - xx1 + 1)
+        h = np.maximum(0.0, yy2 - yy1 + 1)
+        inter = w * h
+        ovr = inter / (areas[i] + areas[order[1:]] - inter)
+        inds = np.where(ovr <= thr)[0]
+        order = order[inds + 1]
+    return keep
+
+
+def oks_iou_loop(g, d, a_g, a_d, sigmas, vis_thr):
+    """The reference per-instance implementation of ``oks_iou``."""
+    vars = (sigmas * 2)**2
+    xg, yg, vg = g[0::3], g[1::3], g[2::3]
+    ious = np.zeros(len(d), dtype=np.float32)
+    for n_d in range(0, len(d)):
+        xd, yd, vd = d[n_d, 0::3], d[n_d, 1::3], d[n_d, 2::3]
+        dx = xd - xg
+        dy = yd - yg
+        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
+        if vis_thr is not None:
+            ind = list((vg > vis_thr) & (vd > vis_thr))
+            e = e[ind]
+        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
+    return ious
+
+
+def oks_nms_loop(kpts_db, thr, sigmas, vis_thr):
+    """The reference while-loop implementation of :func:`oks_nms`."""
+    scores = np.array([k['score'] for k in kpts_db])
+    kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
+    areas = np.array([k['area'] for k in kpts_db])
+    order = scores.argsort(kind='stable')[::-1]
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+        oks_ovr = oks_iou_loop(kpts[i], kpts[order[1:]], areas[i],
+                               areas[order[1:]], sigmas, vis_thr)
+        inds = np.where(oks_ovr <= thr)[0]
+        order = order[inds + 1]
+    return np.array(keep)
+
+
+def make_boxes(rng, num):
+    """Clustered boxes, like the raw output of a detector without NMS."""
+    centers = rng.uniform(100, 900, size=(max(num // 10, 1), 2))
+    xy = centers[rng.integers(0, len(centers), num)] + rng.normal(
+        0, 15, size=(num, 2))
+    wh = rng.uniform(40, 200, size=(num, 2))
+    scores = rng.uniform(0, 1, size=(num, 1))
+    return np.hstack([xy - wh / 2, xy + wh / 2, scores])
+
+
+def make_kpts_db(rng, num, num_keypoints):
+    boxes = make_boxes(rng, num)
+    kpts_db = []
+    for box in boxes:
+        wh = box[2:4] - box[:2]
+        xy = box[:2] + rng.uniform(0, 1, size=(num_keypoints, 2)) * wh
+        vis = rng.uniform(0, 1, size=(num_keypoints, 1))
+        kpts_db.append(
+            dict(
+                keypoints=np.hstack([xy, vis]),
+                score=box[4],
+                area=float(wh[0] * wh[1])))
+    return kpts_db
+
+
+def timeit(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    sigmas = rng.uniform(0.025, 0.1, size=args.num_keypoints)
+
+    print(f'{"N":>6} {"op":>8} {"loop ms":>10} {"matrix ms":>10} '
+          f'{"torch ms/img":>13} {"speedup":>8}')
+    for num in args.num_instances:
+        # box nms
+        dets = make_boxes(rng, num)
+        assert [int(i) for i in nms(dets, args.thr)] == \
+            [int(i) for i in nms_loop(dets, args.thr)], 'nms mismatch'
+
+        batch = [make_boxes(rng, num) for _ in range(args.batch_size)]
+        boxes = torch.tensor(
+            np.stack(batch)[..., :4], device=args.device, dtype=torch.float64)
+        scores = torch.tensor(
+            np.stack(batch)[..., 4], device=args.device, dtype=torch.float64)
+        keep = batched_nms(boxes, scores, args.thr).cpu().numpy()
+        for b, d in enumerate(batch):
+            assert set(np.flatnonzero(keep[b])) == \
+                set(nms_loop(d, args.thr)), 'batched nms mismatch'
+
+        t_loop = timeit(lambda: nms_loop(dets, args.thr), args.repeat)
+        t_mat = timeit(lambda: nms(dets, args.thr), args.repeat)
+        t_torch = timeit(lambda: batched_nms(boxes, scores, args.thr),
+                         args.repeat) / args.batch_size
+        print(f'{num:>6} {"nms":>8} {t_loop:>10.3f} {t_mat:>10.3f} '
+              f'{t_torch:>13.3f} {t_loop / t_mat:>7.1f}x')
+
+        # oks nms
+        kpts_db = make_kpts_db(rng, num, args.num_keypoints)
+        ref = oks_nms_loop(kpts_db, args.thr, sigmas, args.vis_thr)
+        out = oks_nms(kpts_db, args.thr, sigmas, args.vis_thr)
+        assert np.array_equal(ref, out), 'oks_nms mismatch'
+
+        dbs = [
+            make_kpts_db(rng, num, args.num_keypoints)
+            for _ in range(args.batch_size)
+        ]
+        keypoints = torch.tensor(
+            np.stack([[k['keypoints'] for k in db] for db in dbs]),
+            device=args.device)
+        areas = torch.tensor([[k['area'] for k in db] for db in dbs],
+                             device=args.device)
+        db_scores = torch.tensor([[k['score'] for k in db] for db in dbs],
+                                 device=args.device)
+        keep = batched_oks_nms(keypoints, areas, db_scores, args.thr, sigmas,
+                               args.vis_thr).cpu().numpy()
+        for b, db in enumerate(dbs):
+            assert set(np.flatnonzero(keep[b])) == set(
+                oks_nms_loop(db, args.thr, sigmas,
+                             args.vis_thr).tolist()), 'batched oks mismatch'
+
+        t_loop = timeit(
+            lambda: oks_nms_loop(kpts_db, args.thr, sigmas, args.vis_thr),
+            args.repeat)
+        t_mat = timeit(
+            lambda: oks_nms(kpts_db, args.thr, sigmas, args.vis_thr),
+            args.repeat)
+        t_torch = timeit(
+            lambda: batched_oks_nms(keypoints, areas, db_scores, args.thr,
+                                    sigmas, args.vis_thr),
+            args.repeat) / args.batch_size
+        print(f'{num:>6} {"oks_nms":>8} {t_loop:>10.3f} {t_mat:>10.3f} '
+              f'{t_torch:>13.3f} {t_loop / t_mat:>7.1f}x')
+
+    print('all results match the reference implementations')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmark the full-resolution and the reduced-resolution JPEG decoding of
+the top-down training pipeline on synthetic large JPEGs.
+
+Example:
+    python tools/analysis_tools/benchmark_reduced_decode.py \
+        --num-images 64 --image-size 4096 2668 --num-workers 4
+"""
+
+import argparse
+import io
+import time
+
+import cv2
+import numpy as np
+import torch
+from PIL import Image
+from torch.utils.data import DataLoader, Dataset
+
+from mmpose.datasets.datasets.utils import (decode_reduced_image,
+                                            get_decode_scale, is_greyscale)
+from mmpose.structures.bbox import bbox_xyxy2cs, get_udp_warp_matrix
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark reduced-resolution JPEG decoding')
+    parser.add_argument(
+        '--num-images', type=int, default=64, help='number of JPEGs')
+    parser.add_argument(
+        '--image-size',
+        type=int,
+        nargs=2,
+        default=[4096, 2668],
+        help='synthetic image size (w, h)')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        nargs=2,
+        default=[768, 1024],
+        help='model input size (w, h)')
+    parser.add_argument(
+        '--person-ratio',
+        type=float,
+        nargs=2,
+        default=[0.1, 0.6],
+        help='range of the person height relative to the image height')
+    parser.add_argument(
+        '--min-crop-ratio',
+        type=float,
+        default=0.3,
+        help='smallest crop relative to the padded bbox')
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--num-workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def make_synthetic_jpegs(num_images, image_size, person_ratio, seed):
+    """Encode smooth random color images with a random person bbox."""
+    rng = np.random.default_rng(seed)
+    w, h = image_size
+    samples = []
+    for _ in range(num_images):
+        # a low-frequency image compresses like a natural photo
+        low = rng.integers(0, 256, size=(h // 64, w // 64, 3), dtype=np.uint8)
+        img = cv2.resize(low, (w, h), interpolation=cv2.INTER_CUBIC)
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        assert ok
+
+        box_h = h * rng.uniform(*person_ratio)
+        box_w = box_h * 0.4
+        x1 = rng.uniform(0, w - box_w)
+        y1 = rng.uniform(0, h - box_h)
+        bbox = np.array([x1, y1, x1 + box_w, y1 + box_h], dtype=np.float32)
+        samples.append((buf.tobytes(), bbox))
+    return samples
+
+
+class TopdownDecodeDataset(Dataset):
+    """Decode, greyscale-check and crop a sample like ``GoliathDataset`` +
+    ``TopdownAffine``."""
+
+    def __init__(self, samples, input_size, reduced, min_crop_ratio):
+        self.samples = samples
+        self.input_size = tuple(input_size)
+        self.reduced = reduced
+        self.min_crop_ratio = min_crop_ratio
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getitem__(self, idx):
+        buf, bbox = self.samples[idx]
+        img = Image.open(io.BytesIO(buf))
+
+        if self.reduced:
+            scale = get_decode_scale(
+                bbox,
+                img.size,
+                self.input_size,
+                min_crop_ratio=self.min_crop_ratio)
+            img, decode_scale = decode_reduced_image(img, scale)
+            bbox = bbox / np.tile(decode_scale, 2)
+            greyscale = is_greyscale(img, thumbnail_size=128)
+        else:
+            img = np.array(img)
+            greyscale = is_greyscale(img)
+        img = img[:, :, ::-1]
+
+        center, scale = bbox_xyxy2cs(bbox, padding=1.25)
+        aspect_ratio = self.input_size[0] / self.input_size[1]
+        w, h = scale
+        scale = np.array([max(w, h * aspect_ratio),
+                          max(h, w / aspect_ratio)])
+        warp_mat = get_udp_warp_matrix(
+            center, scale, rot=0, output_size=self.input_size)
+        crop = cv2.warpAffine(
+            img, warp_mat, self.input_size, flags=cv2.INTER_LINEAR)
+        return torch.from_numpy(crop), greyscale
+
+
+def run(dataset, batch_size, num_workers, repeat):
+    loader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        persistent_workers=num_workers > 0)
+
+    # the first pass warms up the workers
+    for _ in loader:
+        pass
+
+    num_samples = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for crops, _ in loader:
+            num_samples += crops.shape[0]
+    return num_samples / (time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    samples = make_synthetic_jpegs(args.num_images, args.image_size,
+                                   args.person_ratio, args.seed)
+    print(f'{len(samples)} synthetic JPEGs of size {args.image_size}, '
+          f'input size {args.input_size}')
+
+    results = {}
+    for name, reduced in (('full', False), ('reduced', True)):
+        dataset = TopdownDecodeDataset(samples, args.input_size, reduced,
+                                       args.min_crop_ratio)
+        results[name] = run(dataset, args.batch_size, args.num_workers,
+                            args.repeat)
+        print(f'{name:>8} decode: {results[name]:8.2f} samples/s')
+
+    scales = [
+        get_decode_scale(
+            bbox,
+            args.image_size,
+            args.input_size,
+            min_crop_ratio=args.min_crop_ratio) for _, bbox in samples
+    ]
+    values, counts = np.unique(scales, return_counts=True)
+    print('decode scale histogram: ' +
+          ', '.join(f'1/{v}: {c}' for v, c in zip(values, counts)))
+    print(f'speedup: {results["reduced"] / results["full"]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
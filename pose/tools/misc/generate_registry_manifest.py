@@ -0,0 +1,31 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import argparse
+
+from mmengine.registry import dump_registry_manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Generate the registry manifest of mmpose, which lets the '
+        'registries import only the module of the name they build. Run it '
+        'again after adding or renaming a registered module.')
+    parser.add_argument(
+        '--package-dir',
+        help='the mmpose package directory, defaults to the installed one')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    manifest_file = dump_registry_manifest('mmpose', args.package_dir)
+    print(f'Registry manifest written to {manifest_file}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+_base_ = [
+    '../humans_300m_test/mae_sapiens_0.3b-p16_8xb512-coslr-1600e_humans_300m_test.py',
+]
+
+## local shards written by tools/dataset_converters/images_to_shards.py
+train_dataloader = dict(
+    _delete_=True,
+    batch_size=512,
+    num_workers=8,
+    persistent_workers=True,
+    sampler=None, ## the dataset splits the shards between the ranks
+    collate_fn=dict(type='default_collate'),
+    dataset=dict(
+        type='ShardedImageDataset',
+        data_root='data/humans300m_shards',
+        shuffle_buffer_size=10000,
+        seed=0,
+        pipeline={{_base_.train_pipeline}}))
+
+custom_hooks = [
+    dict(
+        type='PretrainVisualizationHook',
+        enable=True,
+        vis_every_iters={{_base_.vis_every_iters}},
+        vis_max_samples=16,
+        ),
+    ## sets the epoch and saves the stream position in the checkpoints
+    dict(type='ShardedDatasetHook'),
+]
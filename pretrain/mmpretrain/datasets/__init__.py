@@ -25,6 +25,7 @@ from .nlvr2 import NLVR2
 from .oxfordiiitpet import OxfordIIITPet
 from .places205 import Places205
 from .samplers import *  # noqa: F401,F403
+from .sharded_dataset import ShardedImageDataset, ShardWriter
 from .stanfordcars import StanfordCars
 from .sun397 import SUN397
 from .transforms import *  # noqa: F401,F403
@@ -35,7 +36,8 @@ __all__ = [
     'DTD', 'FGVCAircraft', 'FashionMNIST', 'Flowers102', 'Food101', 'ImageNet',
     'ImageNet21k', 'InShop', 'KFoldDataset', 'MNIST', 'MultiLabelDataset',
     'MultiTaskDataset', 'NLVR2', 'OxfordIIITPet', 'Places205', 'SUN397',
-    'StanfordCars', 'VOC', 'build_dataset',
+    'StanfordCars', 'VOC', 'build_dataset', 'ShardedImageDataset',
+    'ShardWriter'
 ]
 
 try:
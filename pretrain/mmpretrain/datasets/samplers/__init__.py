@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .repeat_aug import RepeatAugSampler
-from .sequential import SequentialSampler
+from mmengine.utils import lazy_import
 
-__all__ = ['RepeatAugSampler', 'SequentialSampler']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'repeat_aug': ['RepeatAugSampler'],
+        'sequential': ['SequentialSampler'],
+    })
@@ -58,4 +58,27 @@ class SequentialSampler(DefaultSampler):
                               num_samples_per_rank:(self.rank + 1) *
                               num_samples_per_rank]
 
-        return iter(indices)
+        # skip the samples consumed before resuming, only once
+        start_index, self._start_index = self._start_index, 0
+        return iter(indices[start_index:])
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        """Load the state of :meth:`state_dict`.
+
+        With ``subsample_type='sequential'`` every rank consumes a contiguous
+        chunk, so the consumed samples of one world size are not a prefix of
+        the chunks of another. Resuming in the middle of an epoch therefore
+        requires the same world size.
+
+        Args:
+            state_dict (dict): The state of the sampler.
+        """
+        world_size = state_dict.get('world_size', self.world_size)
+        if self.subsample_type == 'sequential' and state_dict.get(
+                'num_consumed', 0) > 0 and world_size != self.world_size:
+            raise ValueError(
+                'Cannot resume a SequentialSampler with '
+                '`subsample_type="sequential"` in the middle of an epoch '
+                f'with world size {self.world_size}, the checkpoint was saved '
+                f'with world size {world_size}.')
+        super().load_state_dict(state_dict)
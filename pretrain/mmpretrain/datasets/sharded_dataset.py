@@ -0,0 +1,459 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import io
+import itertools
+import json
+import logging
+import math
+import os.path as osp
+import random
+import tarfile
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import mmcv
+import mmengine
+import numpy as np
+from mmengine.dataset import Compose
+from mmengine.dist import get_dist_info
+from mmengine.logging import print_log
+from torch.utils.data import IterableDataset, get_worker_info
+
+from mmpretrain.registry import DATASETS, TRANSFORMS
+
+INDEX_FILENAME = 'index.json'
+
+
+class ShardWriter:
+    """Write encoded images and their metadata into tar shards.
+
+    Every sample is stored as two members of a tar shard, ``{key}.{ext}``
+    with the encoded image and ``{key}.json`` with its metadata, so that the
+    shards can still be inspected with ``tar``. Next to every shard an
+    ``.idx.npy`` file stores the offset and size of the members of every
+    sample, which lets :class:`ShardedImageDataset` read a sample without
+    scanning the shard. ``index.json`` lists the shards and their number of
+    samples once the writer is closed.
+
+    Examples:
+        >>> with ShardWriter('data/humans300m_shards') as writer:
+        >>>     for path in img_paths:
+        >>>         with open(path, 'rb') as f:
+        >>>             writer.write(f.read(), dict(img_path=path))
+
+    Args:
+        out_dir (str): The directory of the shards.
+        samples_per_shard (int): The number of samples in every shard but the
+            last one. Defaults to 10000.
+        prefix (str): The prefix of the shard names. Defaults to 'shard'.
+    """
+
+    def __init__(self,
+                 out_dir: str,
+                 samples_per_shard: int = 10000,
+                 prefix: str = 'shard'):
+        assert samples_per_shard > 0
+        mmengine.mkdir_or_exist(out_dir)
+        self.out_dir = out_dir
+        self.samples_per_shard = samples_per_shard
+        self.prefix = prefix
+
+        self.shards: List[dict] = []
+        self.num_samples = 0
+        self._tar: Optional[tarfile.TarFile] = None
+        self._offsets: List[Tuple[int, int, int, int]] = []
+
+    def _add_member(self, name: str, data: bytes) -> Tuple[int, int]:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._tar.addfile(info, io.BytesIO(data))
+        # the data of a member ends at the current offset, padded to blocks
+        num_blocks = math.ceil(len(data) / tarfile.BLOCKSIZE)
+        return self._tar.offset - num_blocks * tarfile.BLOCKSIZE, len(data)
+
+    def _flush(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        name = self.shards[-1]['name']
+        np.save(
+            osp.join(self.out_dir, f'{name}.idx.npy'),
+            np.array(self._offsets, dtype=np.int64))
+        self.shards[-1]['num_samples'] = len(self._offsets)
+        self._tar = None
+        self._offsets = []
+
+    def write(self,
+              img_bytes: bytes,
+              meta: Optional[dict] = None,
+              ext: str = 'jpg',
+              key: Optional[str] = None) -> None:
+        """Write one sample.
+
+        Args:
+            img_bytes (bytes): The encoded image.
+            meta (dict, optional): Json serializable metadata of the sample,
+                e.g. the description. Defaults to None.
+            ext (str): The extension of the image format. Defaults to 'jpg'.
+            key (str, optional): The member name of the sample in the shard.
+                Defaults to the index of the sample.
+        """
+        if len(self._offsets) == self.samples_per_shard:
+            self._flush()
+        if self._tar is None:
+            name = f'{self.prefix}-{len(self.shards):06d}.tar'
+            self._tar = tarfile.open(osp.join(self.out_dir, name), 'w')
+            self.shards.append(dict(name=name, num_samples=0))
+
+        key = f'{self.num_samples:09d}' if key is None else key
+        meta_bytes = json.dumps(meta or dict()).encode('utf-8')
+        img_offset, img_size = self._add_member(f'{key}.{ext}', img_bytes)
+        meta_offset, meta_size = self._add_member(f'{key}.json', meta_bytes)
+        self._offsets.append((img_offset, img_size, meta_offset, meta_size))
+        self.num_samples += 1
+
+    def close(self) -> str:
+        """Close the last shard and write the index.
+
+        Returns:
+            str: The index file.
+        """
+        self._flush()
+        index_file = osp.join(self.out_dir, INDEX_FILENAME)
+        mmengine.dump(
+            dict(num_samples=self.num_samples, shards=self.shards),
+            index_file,
+            indent=2)
+        return index_file
+
+    def __enter__(self) -> 'ShardWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+@DATASETS.register_module()
+class ShardedImageDataset(IterableDataset):
+    """Stream images from local tar shards written by :class:`ShardWriter`.
+
+    The shards are split between all the dataloader workers of all the ranks.
+    Every worker reads its shards in order through a bounded shuffle buffer
+    and decodes the images itself, so that the main process only collates.
+
+    The stream of every worker is deterministic: it only depends on
+    ``seed``, the epoch and the number of ranks and workers. The shards are
+    permuted again every time a worker has read all of its shards, and every
+    epoch takes the same number of samples from every worker, so that all
+    the ranks run the same number of iterations. This also makes the stream
+    position of every worker a function of the epoch and the number of
+    batches consumed in it, which :class:`ShardedDatasetHook` saves in the
+    checkpoints and restores on resume. The hook also tells the dataset the
+    current epoch, which the workers cannot know otherwise.
+
+    Args:
+        data_root (str): The directory of the shards and ``index.json``.
+        pipeline (Sequence): Processing pipeline. Defaults to an empty tuple.
+        shuffle_buffer_size (int): The number of samples to shuffle between.
+            Set it to 0 to read the shards in order. Defaults to 10000.
+        seed (int): The seed of the shard permutations and the shuffle
+            buffers. It must be the same on all the ranks. Defaults to 0.
+        color_type (str): The flag of :func:`mmcv.imfrombytes`. Defaults to
+            'color'.
+        imdecode_backend (str): The image decoding backend. Defaults to
+            'cv2'.
+        metainfo (dict, optional): Meta information of the dataset. Defaults
+            to None.
+        max_open_shards (int): The number of shard files kept open by every
+            worker. Defaults to 4.
+    """
+
+    def __init__(self,
+                 data_root: str,
+                 pipeline: Sequence = (),
+                 shuffle_buffer_size: int = 10000,
+                 seed: int = 0,
+                 color_type: str = 'color',
+                 imdecode_backend: str = 'cv2',
+                 metainfo: Optional[dict] = None,
+                 max_open_shards: int = 4):
+        self.data_root = data_root
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.seed = seed
+        self.color_type = color_type
+        self.imdecode_backend = imdecode_backend
+        self._metainfo = dict(metainfo or dict())
+        self.max_open_shards = max_open_shards
+
+        transforms = []
+        for transform in pipeline:
+            if isinstance(transform, dict):
+                transforms.append(TRANSFORMS.build(transform))
+            else:
+                transforms.append(transform)
+        self.pipeline = Compose(transforms)
+
+        index = mmengine.load(osp.join(data_root, INDEX_FILENAME))
+        self.shard_names = [shard['name'] for shard in index['shards']]
+        self.shard_sizes = np.array(
+            [shard['num_samples'] for shard in index['shards']],
+            dtype=np.int64)
+        self.shard_starts = np.cumsum(self.shard_sizes) - self.shard_sizes
+        self.num_samples = int(self.shard_sizes.sum())
+
+        # the ranks are only known in the main process
+        self.rank, self.world_size = get_dist_info()
+
+        self._epoch = 0
+        self._batch_size = 1
+        self._num_iters = 0
+        self._resume_state: Optional[dict] = None
+        self._offsets: dict = dict()
+        self._files: OrderedDict = OrderedDict()
+
+    @property
+    def metainfo(self) -> dict:
+        """dict: Meta information of the dataset."""
+        return self._metainfo
+
+    def __len__(self) -> int:
+        """The number of samples of every rank in an epoch."""
+        return self.num_samples // self.world_size
+
+    def set_epoch(self, epoch: int, batch_size: int = 1) -> None:
+        """Set the epoch before the dataloader workers are started.
+
+        Persistent workers keep the dataset of the epoch they were started
+        in, and count the epochs themselves from there.
+
+        Args:
+            epoch (int): The epoch.
+            batch_size (int): The batch size of the dataloader. Every worker
+                yields whole batches when given. Defaults to 1.
+        """
+        self._epoch = epoch
+        self._batch_size = batch_size
+        self._num_iters = 0
+
+    def state_dict(self, epoch: int, num_batches: int,
+                   num_workers: int) -> dict:
+        """The stream position after ``num_batches`` batches of ``epoch``.
+
+        Args:
+            epoch (int): The epoch.
+            num_batches (int): The number of batches that the rank consumed in
+                the epoch.
+            num_workers (int): The number of dataloader workers.
+
+        Returns:
+            dict: The state of the stream.
+        """
+        return dict(
+            epoch=epoch,
+            num_batches=num_batches,
+            batch_size=self._batch_size,
+            num_workers=max(num_workers, 1),
+            world_size=self.world_size,
+            seed=self.seed,
+            num_samples=self.num_samples)
+
+    def load_state_dict(self, state: dict) -> None:
+        """Resume the stream in the epoch of ``state``, after the batches that
+        were consumed in it."""
+        expected = dict(
+            world_size=self.world_size,
+            seed=self.seed,
+            num_samples=self.num_samples)
+        changed = [k for k, v in expected.items() if state[k] != v]
+        if changed:
+            print_log(
+                f'Cannot resume the stream of {self.data_root} because '
+                f'{", ".join(changed)} changed, the epoch {state["epoch"]} '
+                'restarts from its first sample.',
+                logger='current',
+                level=logging.WARNING)
+            return
+        self._resume_state = state
+
+    def _quota(self, worker: int, num_workers: int) -> int:
+        """The number of samples of a worker in every epoch."""
+        num_batches = len(self) // self._batch_size
+        worker_batches = num_batches // num_workers + int(
+            worker < num_batches % num_workers)
+        return worker_batches * self._batch_size
+
+    def _resume_position(self, worker: int,
+                         num_workers: int) -> Tuple[int, int]:
+        """The stream that a worker continues on resume and the number of its
+        samples consumed before.
+
+        The dataloader takes the batches from the workers in turn, skipping
+        the exhausted ones. The workers of the resumed dataloader continue
+        the streams in the order they would have been taken from, so that
+        the batches also come in the same order.
+
+        Returns:
+            tuple[int, int]: The worker of the stream and the number of
+            consumed samples.
+        """
+        state = self._resume_state
+        if state['num_workers'] != num_workers or \
+                state['batch_size'] != self._batch_size:
+            print_log(
+                'Cannot resume the stream in the middle of an epoch with '
+                'another number of workers or batch size, the epoch '
+                f'{state["epoch"]} restarts from its first sample.',
+                logger='current',
+                level=logging.WARNING)
+            return worker, 0
+        batches = [
+            self._quota(w, num_workers) // self._batch_size
+            for w in range(num_workers)
+        ]
+        produced = [0] * num_workers
+        w = 0
+        for _ in range(min(state['num_batches'], sum(batches))):
+            while produced[w] == batches[w]:
+                w = (w + 1) % num_workers
+            produced[w] += 1
+            w = (w + 1) % num_workers
+        order = [(w + i) % num_workers for i in range(num_workers)]
+        order = [i for i in order if produced[i] < batches[i]] + \
+            [i for i in order if produced[i] == batches[i]]
+        return order[worker], produced[order[worker]] * self._batch_size
+
+    def _worker_shards(self, shard_epoch: int, worker: int,
+                       num_workers: int) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, shard_epoch])
+        return rng.permutation(len(self.shard_names))[worker::num_workers]
+
+    def _shuffle(self, shards: np.ndarray,
+                 rng: random.Random) -> Iterator[Tuple[int, int]]:
+        """Yield ``(shard, index)`` of the samples of ``shards`` through the
+        shuffle buffer.
+
+        Only the locations are buffered, which makes skipping samples on
+        resume cheap, the samples are read when they leave the buffer.
+        """
+        samples = ((shard, idx) for shard in shards
+                   for idx in range(self.shard_sizes[shard]))
+        if self.shuffle_buffer_size <= 1:
+            yield from samples
+            return
+        buffer = list(itertools.islice(samples, self.shuffle_buffer_size))
+        for sample in samples:
+            i = rng.randrange(len(buffer))
+            yield buffer[i]
+            buffer[i] = sample
+        rng.shuffle(buffer)
+        yield from buffer
+
+    def _stream(self, worker: int, num_workers: int,
+                start: int) -> Iterator[Tuple[int, int]]:
+        """The endless stream of a worker, from the ``start``-th sample."""
+        for shard_epoch in itertools.count():
+            shards = self._worker_shards(shard_epoch, worker, num_workers)
+            length = int(self.shard_sizes[shards].sum())
+            if start >= length:
+                start -= length
+                continue
+            rng = random.Random(
+                (self.seed * 1000003 + shard_epoch) * 1000003 + worker)
+            yield from itertools.islice(self._shuffle(shards, rng), start,
+                                        None)
+            start = 0
+
+    def _read(self, shard: int, offset: int, size: int) -> bytes:
+        f = self._files.pop(shard, None)
+        if f is None:
+            f = open(osp.join(self.data_root, self.shard_names[shard]), 'rb')
+            if len(self._files) >= self.max_open_shards:
+                self._files.popitem(last=False)[1].close()
+        self._files[shard] = f
+        f.seek(offset)
+        return f.read(size)
+
+    def get_data_info(self, shard: int, idx: int) -> dict:
+        """Read and decode the ``idx``-th sample of a shard.
+
+        Args:
+            shard (int): The index of the shard.
+            idx (int): The index of the sample in the shard.
+
+        Returns:
+            dict: The decoded image and the metadata of the sample.
+        """
+        if shard not in self._offsets:
+            self._offsets[shard] = np.load(
+                osp.join(self.data_root,
+                         f'{self.shard_names[shard]}.idx.npy'),
+                mmap_mode='r')
+        img_offset, img_size, meta_offset, meta_size = \
+            self._offsets[shard][idx].tolist()
+
+        img = mmcv.imfrombytes(
+            self._read(shard, img_offset, img_size),
+            flag=self.color_type,
+            backend=self.imdecode_backend)
+        if img is None:
+            raise IOError(f'Failed to decode the sample {idx} of '
+                          f'{self.shard_names[shard]}')
+        data_info = json.loads(self._read(shard, meta_offset, meta_size))
+        data_info.update(
+            img=img,
+            img_shape=img.shape[:2],
+            ori_shape=img.shape[:2],
+            sample_idx=int(self.shard_starts[shard]) + idx)
+        return data_info
+
+    def __iter__(self):
+        worker_info = get_worker_info()
+        if worker_info is None:
+            worker, num_workers = 0, 1
+        else:
+            worker, num_workers = worker_info.id, worker_info.num_workers
+        epoch = self._epoch + self._num_iters
+        self._num_iters += 1
+
+        global_workers = self.world_size * num_workers
+        if len(self.shard_names) < global_workers:
+            raise ValueError(
+                f'{self.data_root} has {len(self.shard_names)} shards for '
+                f'{global_workers} dataloader workers, write smaller shards '
+                'or use less workers.')
+
+        consumed = 0
+        if self._resume_state is not None and \
+                self._resume_state['epoch'] == epoch:
+            worker, consumed = self._resume_position(worker, num_workers)
+        quota = self._quota(worker, num_workers)
+        start = epoch * quota + consumed
+        end = (epoch + 1) * quota
+
+        stream = self._stream(self.rank * num_workers + worker,
+                              self.world_size * num_workers, start)
+        for shard, idx in itertools.islice(stream, end - start):
+            yield self.pipeline(self.get_data_info(shard, idx))
+
+    def __getstate__(self) -> dict:
+        # the open files are not shared with the workers
+        state = self.__dict__.copy()
+        state['_offsets'] = dict()
+        state['_files'] = OrderedDict()
+        return state
+
+    def __repr__(self) -> str:
+        head = 'Dataset ' + self.__class__.__name__
+        body = [
+            f'Number of samples: \t{self.num_samples}',
+            f'Number of shards: \t{len(self.shard_names)}',
+            f'Root of dataset: \t{self.data_root}',
+            f'Shuffle buffer size: \t{self.shuffle_buffer_size}',
+        ]
+        lines = [head] + [' ' * 4 + line for line in body]
+        return '\n'.join(lines)
+
@@ -4,7 +4,12 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .hooks import *  # noqa: F401, F403
-from .optimizers import *  # noqa: F401, F403
-from .runners import *  # noqa: F401, F403
-from .schedulers import *  # noqa: F401, F403
+from mmengine.utils import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'hooks': '*',
+        'optimizers': '*',
+        'runners': '*',
+        'schedulers': '*',
+    })
@@ -0,0 +1,73 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Optional, Sequence
+
+from mmengine.hooks import Hook
+from mmengine.runner import EpochBasedTrainLoop
+
+from mmpretrain.registry import HOOKS
+
+
+@HOOKS.register_module()
+class ShardedDatasetHook(Hook):
+    """Hook for :class:`ShardedImageDataset`.
+
+    This hook sets the epoch of the dataset before every train epoch, saves
+    the stream position of the dataset in the checkpoints and restores it on
+    resume, so that a run resumed in the middle of an epoch continues with
+    the next batch it would have trained on. The stream position is kept
+    per epoch, so the train loop has to be an :class:`EpochBasedTrainLoop`.
+    """
+
+    priority = 'NORMAL'
+
+    def __init__(self) -> None:
+        self._num_batches = 0
+        self._resume_state: Optional[dict] = None
+
+    def _dataset(self, runner):
+        dataset = runner.train_dataloader.dataset
+        assert hasattr(dataset, 'set_epoch'), \
+            f'{type(dataset).__name__} is not a sharded dataset.'
+        return dataset
+
+    def before_train(self, runner) -> None:
+        """Check that the train loop runs by epoch."""
+        assert isinstance(runner.train_loop, EpochBasedTrainLoop), \
+            'ShardedDatasetHook requires an EpochBasedTrainLoop, but got ' \
+            f'{type(runner.train_loop).__name__}.'
+
+    def before_train_epoch(self, runner) -> None:
+        """Set the epoch of the dataset before the workers start."""
+        state = self._resume_state
+        if state is not None and state['epoch'] == runner.epoch:
+            self._num_batches = state['num_batches']
+        else:
+            self._num_batches = 0
+        self._dataset(runner).set_epoch(runner.epoch,
+                                        runner.train_dataloader.batch_size)
+
+    def after_train_iter(self,
+                         runner,
+                         batch_idx: int,
+                         data_batch: Optional[Sequence[dict]] = None,
+                         outputs: Optional[dict] = None) -> None:
+        """Count the consumed batches."""
+        self._num_batches += 1
+
+    def before_save_checkpoint(self, runner, checkpoint: dict) -> None:
+        """Save the stream position of the dataset."""
+        checkpoint['sharded_dataset'] = self._dataset(runner).state_dict(
+            runner.epoch, self._num_batches,
+            runner.train_dataloader.num_workers)
+
+    def after_load_checkpoint(self, runner, checkpoint: dict) -> None:
+        """Restore the stream position of the dataset."""
+        if 'sharded_dataset' not in checkpoint:
+            return
+        self._resume_state = checkpoint['sharded_dataset']
+        self._dataset(runner).load_state_dict(self._resume_state)
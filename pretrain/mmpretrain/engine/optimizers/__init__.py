@@ -4,10 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .adan_t import Adan
-from .lamb import Lamb
-from .lars import LARS
-from .layer_decay_optim_wrapper_constructor import \
-    LearningRateDecayOptimWrapperConstructor
+from mmengine.utils import lazy_import
 
-__all__ = ['Lamb', 'Adan', 'LARS', 'LearningRateDecayOptimWrapperConstructor']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'adan_t': ['Adan'],
+        'lamb': ['Lamb'],
+        'lars': ['LARS'],
+        'layer_decay_optim_wrapper_constructor': [
+            'LearningRateDecayOptimWrapperConstructor'
+        ],
+    })
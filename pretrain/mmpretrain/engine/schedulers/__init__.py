@@ -4,6 +4,9 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .weight_decay_scheduler import CosineAnnealingWeightDecay
+from mmengine.utils import lazy_import
 
-__all__ = ['CosineAnnealingWeightDecay']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'weight_decay_scheduler': ['CosineAnnealingWeightDecay'],
+    })
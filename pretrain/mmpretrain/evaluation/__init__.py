@@ -4,5 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .functional import *  # noqa: F401,F403
-from .metrics import *  # noqa: F401,F403
+from mmengine.utils import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'functional': [],
+        'metrics': '*',
+    })
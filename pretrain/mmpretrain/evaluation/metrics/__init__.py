@@ -4,24 +4,21 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ANLS import ANLS
-from .caption import COCOCaption
-from .gqa import GQAAcc
-from .multi_label import AveragePrecision, MultiLabelMetric
-from .multi_task import MultiTasksMetric
-from .nocaps import NocapsSave
-from .retrieval import RetrievalAveragePrecision, RetrievalRecall
-from .scienceqa import ScienceQAMetric
-from .shape_bias_label import ShapeBiasMetric
-from .single_label import Accuracy, ConfusionMatrix, SingleLabelMetric
-from .visual_grounding_eval import VisualGroundingMetric
-from .voc_multi_label import VOCAveragePrecision, VOCMultiLabelMetric
-from .vqa import ReportVQA, VQAAcc
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'Accuracy', 'SingleLabelMetric', 'MultiLabelMetric', 'AveragePrecision',
-    'MultiTasksMetric', 'VOCAveragePrecision', 'VOCMultiLabelMetric',
-    'ConfusionMatrix', 'RetrievalRecall', 'VQAAcc', 'ReportVQA', 'COCOCaption',
-    'VisualGroundingMetric', 'ScienceQAMetric', 'GQAAcc', 'NocapsSave',
-    'RetrievalAveragePrecision', 'ShapeBiasMetric', 'ANLS'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ANLS': ['ANLS'],
+        'caption': ['COCOCaption'],
+        'gqa': ['GQAAcc'],
+        'multi_label': ['AveragePrecision', 'MultiLabelMetric'],
+        'multi_task': ['MultiTasksMetric'],
+        'nocaps': ['NocapsSave'],
+        'retrieval': ['RetrievalAveragePrecision', 'RetrievalRecall'],
+        'scienceqa': ['ScienceQAMetric'],
+        'shape_bias_label': ['ShapeBiasMetric'],
+        'single_label': ['Accuracy', 'ConfusionMatrix', 'SingleLabelMetric'],
+        'visual_grounding_eval': ['VisualGroundingMetric'],
+        'voc_multi_label': ['VOCAveragePrecision', 'VOCMultiLabelMetric'],
+        'vqa': ['ReportVQA', 'VQAAcc'],
+    })
@@ -4,22 +4,46 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .backbones import *  # noqa: F401,F403
-from .builder import (BACKBONES, CLASSIFIERS, HEADS, LOSSES, NECKS,
-                      build_backbone, build_classifier, build_head, build_loss,
-                      build_neck)
-from .classifiers import *  # noqa: F401,F403
-from .heads import *  # noqa: F401,F403
-from .losses import *  # noqa: F401,F403
-from .multimodal import *  # noqa: F401,F403
-from .necks import *  # noqa: F401,F403
-from .peft import *  # noqa: F401,F403
-from .retrievers import *  # noqa: F401,F403
-from .selfsup import *  # noqa: F401,F403
-from .tta import *  # noqa: F401,F403
-from .utils import *  # noqa: F401,F403
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BACKBONES', 'HEADS', 'NECKS', 'LOSSES', 'CLASSIFIERS', 'build_backbone',
-    'build_head', 'build_neck', 'build_loss', 'build_classifier'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'backbones': '*',
+        'builder': [
+            'BACKBONES', 'CLASSIFIERS', 'HEADS', 'LOSSES', 'NECKS',
+            'build_backbone', 'build_classifier', 'build_head', 'build_loss',
+            'build_neck'
+        ],
+        'classifiers': '*',
+        'heads': '*',
+        'losses': '*',
+        # registers placeholders without the multimodal dependencies
+        'multimodal': [],
+        'necks': '*',
+        'peft': '*',
+        'retrievers': '*',
+        'selfsup': '*',
+        'tta': '*',
+        'utils': [
+            'channel_shuffle', 'make_divisible', 'InvertedResidual',
+            'SELayer', 'to_ntuple', 'to_2tuple', 'to_3tuple', 'to_4tuple',
+            'PatchEmbed', 'PatchMerging', 'HybridEmbed', 'RandomBatchAugment',
+            'ShiftWindowMSA', 'is_tracing', 'MultiheadAttention',
+            'ConditionalPositionEncoding', 'resize_pos_embed',
+            'resize_relative_position_bias_table', 'ClsDataPreprocessor',
+            'Mixup', 'CutMix', 'ResizeMix', 'BEiTAttention', 'LayerScale',
+            'WindowMSA', 'WindowMSAV2', 'ChannelMultiheadAttention',
+            'PositionEncodingFourier', 'LeAttention', 'GRN', 'LayerNorm2d',
+            'build_norm_layer', 'CrossMultiheadAttention',
+            'build_2d_sincos_position_embedding', 'PromptMultiheadAttention',
+            'NormEMAVectorQuantizer', 'build_clip_model', 'batch_shuffle_ddp',
+            'batch_unshuffle_ddp', 'SelfSupDataPreprocessor',
+            'TwoNormDataPreprocessor', 'VideoDataPreprocessor', 'CosineEMA',
+            'ResLayerExtraNorm', 'MultiModalDataPreprocessor', 'QuickGELU',
+            'SwiGLUFFN', 'SwiGLUFFNFused', 'RotaryEmbeddingFast',
+            'SparseAvgPooling', 'SparseConv2d', 'SparseHelper',
+            'SparseMaxPooling', 'SparseBatchNorm2d', 'SparseLayerNorm2D',
+            'SparseSyncBatchNorm2d', 'WeightOnlyQuantLinear',
+            'collect_act_amax', 'quantize_linear_layers', 'vit_norm_inputs'
+        ],
+    })
@@ -9,6 +9,7 @@ from typing import Sequence
 import numpy as np
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from mmcv.cnn.bricks.transformer import FFN, PatchEmbed
 from mmengine.model import BaseModule, ModuleList
 from mmengine.model.weight_init import trunc_normal_
@@ -139,7 +140,8 @@ class VisionTransformer(BaseBackbone):
         patch_size (int | tuple): The patch size in patch embedding.
             Defaults to 16.
         in_channels (int): The num of input channels. Defaults to 3.
-        out_indices (Sequence | int): Output from which stages.
+        out_indices (Sequence | int): Output from which stages. The layers
+            after the last output are skipped in forward.
             Defaults to -1, means the last stage.
         drop_rate (float): Probability of an element to be zeroed.
             Defaults to 0.
@@ -172,6 +174,28 @@ class VisionTransformer(BaseBackbone):
         patch_cfg (dict): Configs of patch embeding. Defaults to an empty dict.
         layer_cfgs (Sequence | dict): Configs of each transformer layer in
             encoder. Defaults to an empty dict.
+        token_pruning (dict, optional): Drop or merge low-saliency patch
+            tokens before some layers. The dropped tokens keep the features
+            of the layer they were dropped at and are scattered back into the
+            dense output, so ``featmap`` outputs keep their shape. It accepts
+            the following keys:
+
+            - **prune_layers** (Sequence[int]): Indices of the layers before
+              which tokens are pruned.
+            - **keep_ratio** (float): Ratio of the remaining patch tokens kept
+              at every pruning step. Defaults to 0.7.
+            - **saliency** (str): ``"attn"`` scores tokens by the attention
+              they receive from the mean query (the class token if present)
+              of the next layer. ``"fg"`` scores tokens with a linear
+              foreground predictor ``token_saliency``, which is trained
+              through the fused token and a straight-through gate on the
+              kept tokens. Defaults to ``"attn"``.
+            - **mode** (str): ``"drop"`` removes the pruned tokens from the
+              sequence. ``"merge"`` additionally fuses them into one token per
+              pruning step (weighted by saliency) that keeps attending as
+              context. Defaults to ``"drop"``.
+
+            Defaults to None, which processes all tokens in every layer.
         init_cfg (dict, optional): Initialization config dict.
             Defaults to None.
     """
@@ -328,6 +352,7 @@ class VisionTransformer(BaseBackbone):
                  patch_cfg=dict(),
                  layer_cfgs=dict(),
                  pre_norm=False,
+                 token_pruning=None,
                  init_cfg=None):
         super(VisionTransformer, self).__init__(init_cfg)
 
@@ -433,12 +458,41 @@ class VisionTransformer(BaseBackbone):
         if self.out_type == 'avg_featmap':
             self.ln2 = build_norm_layer(norm_cfg, self.embed_dims)
 
+        self.token_pruning = None
+        if token_pruning is not None:
+            self._init_token_pruning(token_pruning)
+
         # freeze stages only when self.frozen_stages > 0
         if self.frozen_stages > 0:
             self._freeze_stages()
 
         return
 
+    def _init_token_pruning(self, token_pruning):
+        token_pruning = {
+            **dict(keep_ratio=0.7, saliency='attn', mode='drop'),
+            **token_pruning
+        }
+        assert 'prune_layers' in token_pruning, \
+            '`prune_layers` is required in `token_pruning`'
+        assert 0 < token_pruning['keep_ratio'] <= 1, \
+            f'Invalid keep_ratio {token_pruning["keep_ratio"]}'
+        assert token_pruning['saliency'] in ('attn', 'fg'), \
+            f'Unsupported saliency {token_pruning["saliency"]}'
+        assert token_pruning['mode'] in ('drop', 'merge'), \
+            f'Unsupported mode {token_pruning["mode"]}'
+
+        prune_layers = sorted(
+            self.num_layers + i if i < 0 else i
+            for i in token_pruning['prune_layers'])
+        for i in prune_layers:
+            assert 0 < i < self.num_layers, f'Invalid prune layer {i}'
+        token_pruning['prune_layers'] = prune_layers
+
+        if token_pruning['saliency'] == 'fg':
+            self.token_saliency = nn.Linear(self.embed_dims, 1)
+        self.token_pruning = token_pruning
+
     @property
     def norm1(self):
         return self.ln1
@@ -550,18 +604,163 @@ class VisionTransformer(BaseBackbone):
 
         x = self.pre_norm(x) ## B x (num tokens) x embed_dim
 
+        prune_layers = (
+            self.token_pruning['prune_layers'] if self.token_pruning else ())
+        # original positions of the kept patch tokens, the dense patch tokens
+        # with the features of dropped tokens and the number of fused tokens
+        keep_idx, dense, num_fused = None, None, 0
+
         outs = []
         for i, layer in enumerate(self.layers):
+            if i in prune_layers:
+                x, keep_idx, dense, num_fused = self._prune_tokens(
+                    x, layer, keep_idx, dense, num_fused)
+
             x = layer(x)
 
+            if i == len(self.layers) - 1 and keep_idx is not None:
+                x = self._restore_tokens(x, keep_idx, dense, num_fused)
+                keep_idx = None
+
             if i == len(self.layers) - 1 and self.final_norm:
                 x = self.ln1(x)
 
             if i in self.out_indices:
-                outs.append(self._format_output(x, patch_resolution))
+                x_out = x if keep_idx is None else self._restore_tokens(
+                    x, keep_idx, dense, num_fused)
+                outs.append(self._format_output(x_out, patch_resolution))
+
+            # the layers after the last requested output are not needed
+            if i == self.last_out_index:
+                break
 
         return tuple(outs)
 
+    @property
+    def last_out_index(self):
+        """int: Index of the last layer that has to be run."""
+        return min(max(self.out_indices), self.num_layers - 1)
+
+    def _token_saliency(self, x, layer, num_fused):
+        """Score the patch tokens of ``x`` before ``layer``."""
+        E = self.num_extra_tokens
+        L = x.shape[1]
+        h = layer.ln1(x)
+
+        if self.token_pruning['saliency'] == 'fg':
+            return self.token_saliency(h[:, E:L - num_fused]).squeeze(-1)
+
+        # attention that every token receives from a reference query, using
+        # the query/key projections of the next layer
+        attn = layer.attn
+        C = attn.embed_dims
+        weight, bias = attn.qkv.weight[:2 * C], None
+        if attn.qkv.bias is not None:
+            bias = attn.qkv.bias[:2 * C]
+        q, k = F.linear(h, weight, bias).chunk(2, dim=-1)
+        q_ref = q[:, :E].mean(dim=1) if E > 0 else q.mean(dim=1)
+
+        B = x.shape[0]
+        q_ref = q_ref.reshape(B, attn.num_heads, 1, attn.head_dims)
+        k = k.reshape(B, L, attn.num_heads, attn.head_dims).transpose(1, 2)
+        scores = (q_ref @ k.transpose(-2, -1)) * attn.head_dims**-0.5
+        scores = scores.softmax(dim=-1).mean(dim=1).squeeze(1)
+        return scores[:, E:L - num_fused]
+
+    def _prune_tokens(self, x, layer, keep_idx, dense, num_fused):
+        """Keep the most salient patch tokens of ``x``.
+
+        Returns:
+            tuple: The pruned tokens, the original positions of the kept
+            patch tokens, the dense patch tokens and the number of fused
+            tokens.
+        """
+        E = self.num_extra_tokens
+        B, L, C = x.shape
+        patches = x[:, E:L - num_fused]
+        N = patches.shape[1]
+        if keep_idx is None:
+            keep_idx = torch.arange(N, device=x.device).expand(B, N)
+            dense = patches
+        else:
+            # freeze the current features of all remaining tokens
+            dense = dense.scatter(1, keep_idx[..., None].expand(-1, -1, C),
+                                  patches)
+
+        saliency = self._token_saliency(x, layer, num_fused)
+        num_keep = max(1, int(round(N * self.token_pruning['keep_ratio'])))
+        # sort the kept tokens to preserve their spatial order
+        top = saliency.topk(num_keep, dim=1).indices.sort(dim=1).values
+
+        kept = patches.gather(1, top[..., None].expand(-1, -1, C))
+        if self.token_pruning['saliency'] == 'fg':
+            # a gate of exactly 1 in the forward pass, so that the
+            # predictor receives gradients through the top-k selection
+            gate = saliency.gather(1, top).sigmoid()[..., None]
+            kept = kept * (gate / gate.detach())
+        tokens = [x[:, :E], kept, x[:, L - num_fused:]]
+        if self.token_pruning['mode'] == 'merge' and num_keep < N:
+            dropped = torch.ones_like(saliency, dtype=torch.bool).scatter(
+                1, top, False)
+            weight = saliency.masked_fill(~dropped, float('-inf'))
+            weight = weight.softmax(dim=1)
+            tokens.append((weight[..., None] * patches).sum(1, keepdim=True))
+            num_fused += 1
+
+        return torch.cat(tokens, dim=1), keep_idx.gather(1, top), dense, \
+            num_fused
+
+    def _restore_tokens(self, x, keep_idx, dense, num_fused):
+        """Scatter the kept patch tokens back into the dense sequence."""
+        E = self.num_extra_tokens
+        L, C = x.shape[1], x.shape[2]
+        patches = dense.scatter(1, keep_idx[..., None].expand(-1, -1, C),
+                                x[:, E:L - num_fused])
+        return torch.cat([x[:, :E], patches], dim=1)
+
+    def get_token_counts(self, num_patches):
+        """Get the number of tokens processed by every layer.
+
+        Args:
+            num_patches (int): The number of patch tokens of the input.
+
+        Returns:
+            List[int]: The sequence length of every layer that is run.
+        """
+        prune_layers = (
+            self.token_pruning['prune_layers'] if self.token_pruning else ())
+        num_fused = 0
+        counts = []
+        for i in range(self.last_out_index + 1):
+            if i in prune_layers:
+                num_keep = max(
+                    1, int(round(num_patches *
+                                 self.token_pruning['keep_ratio'])))
+                if self.token_pruning['mode'] == 'merge' and \
+                        num_keep < num_patches:
+                    num_fused += 1
+                num_patches = num_keep
+            counts.append(self.num_extra_tokens + num_patches + num_fused)
+        return counts
+
+    def estimate_layer_flops(self, token_counts):
+        """Estimate the multiply-accumulate count of the encoder layers.
+
+        Args:
+            token_counts (List[int]): The sequence length of every layer, see
+                :meth:`get_token_counts`.
+
+        Returns:
+            int: The MACs of all encoder layers for one image.
+        """
+        C = self.embed_dims
+        F_ = self.arch_settings['feedforward_channels']
+        flops = 0
+        for N in token_counts:
+            # qkv + proj, attention matrix and weighted sum, ffn
+            flops += N * 4 * C * C + 2 * N * N * C + N * 2 * C * F_
+        return flops
+
     def _format_output(self, x, hw):
         if self.out_type == 'raw':
             return x
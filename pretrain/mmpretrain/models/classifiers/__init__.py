@@ -4,12 +4,12 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base import BaseClassifier
-from .hugging_face import HuggingFaceClassifier
-from .image import ImageClassifier
-from .timm import TimmClassifier
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BaseClassifier', 'ImageClassifier', 'TimmClassifier',
-    'HuggingFaceClassifier'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base': ['BaseClassifier'],
+        'hugging_face': ['HuggingFaceClassifier'],
+        'image': ['ImageClassifier'],
+        'timm': ['TimmClassifier'],
+    })
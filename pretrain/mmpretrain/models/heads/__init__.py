@@ -4,72 +4,41 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .beitv1_head import BEiTV1Head
-from .beitv2_head import BEiTV2Head
-from .cae_head import CAEHead
-from .cls_head import ClsHead
-from .conformer_head import ConformerHead
-from .contrastive_head import ContrastiveHead
-from .deit_head import DeiTClsHead
-from .efficientformer_head import EfficientFormerClsHead
-from .grounding_head import GroundingHead
-from .itc_head import ITCHead
-from .itm_head import ITMHead
-from .itpn_clip_head import iTPNClipHead
-from .latent_heads import LatentCrossCorrelationHead, LatentPredictHead
-from .levit_head import LeViTClsHead
-from .linear_head import LinearClsHead
-from .mae_head import MAEPretrainHead
-from .mae_head2 import MAEPretrainHead2
-from .margin_head import ArcFaceClsHead
-from .mim_head import MIMHead
-from .mixmim_head import MixMIMPretrainHead
-from .mocov3_head import MoCoV3Head
-from .multi_label_cls_head import MultiLabelClsHead
-from .multi_label_csra_head import CSRAClsHead
-from .multi_label_linear_head import MultiLabelLinearClsHead
-from .multi_task_head import MultiTaskHead
-from .seq_gen_head import SeqGenerationHead
-from .simmim_head import SimMIMHead
-from .spark_head import SparKPretrainHead
-from .stacked_head import StackedLinearClsHead
-from .swav_head import SwAVHead
-from .vig_head import VigClsHead
-from .vision_transformer_head import VisionTransformerClsHead
-from .vqa_head import VQAGenerationHead
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'ClsHead',
-    'LinearClsHead',
-    'StackedLinearClsHead',
-    'MultiLabelClsHead',
-    'MultiLabelLinearClsHead',
-    'VisionTransformerClsHead',
-    'DeiTClsHead',
-    'ConformerHead',
-    'EfficientFormerClsHead',
-    'ArcFaceClsHead',
-    'CSRAClsHead',
-    'MultiTaskHead',
-    'LeViTClsHead',
-    'VigClsHead',
-    'BEiTV1Head',
-    'BEiTV2Head',
-    'CAEHead',
-    'ContrastiveHead',
-    'LatentCrossCorrelationHead',
-    'LatentPredictHead',
-    'MAEPretrainHead',
-    'MixMIMPretrainHead',
-    'SwAVHead',
-    'MoCoV3Head',
-    'MIMHead',
-    'SimMIMHead',
-    'SeqGenerationHead',
-    'VQAGenerationHead',
-    'ITCHead',
-    'ITMHead',
-    'GroundingHead',
-    'iTPNClipHead',
-    'SparKPretrainHead',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'beitv1_head': ['BEiTV1Head'],
+        'beitv2_head': ['BEiTV2Head'],
+        'cae_head': ['CAEHead'],
+        'cls_head': ['ClsHead'],
+        'conformer_head': ['ConformerHead'],
+        'contrastive_head': ['ContrastiveHead'],
+        'deit_head': ['DeiTClsHead'],
+        'efficientformer_head': ['EfficientFormerClsHead'],
+        'grounding_head': ['GroundingHead'],
+        'itc_head': ['ITCHead'],
+        'itm_head': ['ITMHead'],
+        'itpn_clip_head': ['iTPNClipHead'],
+        'latent_heads': ['LatentCrossCorrelationHead', 'LatentPredictHead'],
+        'levit_head': ['LeViTClsHead'],
+        'linear_head': ['LinearClsHead'],
+        'mae_head': ['MAEPretrainHead'],
+        'mae_head2': ['MAEPretrainHead2'],
+        'margin_head': ['ArcFaceClsHead'],
+        'mim_head': ['MIMHead'],
+        'mixmim_head': ['MixMIMPretrainHead'],
+        'mocov3_head': ['MoCoV3Head'],
+        'multi_label_cls_head': ['MultiLabelClsHead'],
+        'multi_label_csra_head': ['CSRAClsHead'],
+        'multi_label_linear_head': ['MultiLabelLinearClsHead'],
+        'multi_task_head': ['MultiTaskHead'],
+        'seq_gen_head': ['SeqGenerationHead'],
+        'simmim_head': ['SimMIMHead'],
+        'spark_head': ['SparKPretrainHead'],
+        'stacked_head': ['StackedLinearClsHead'],
+        'swav_head': ['SwAVHead'],
+        'vig_head': ['VigClsHead'],
+        'vision_transformer_head': ['VisionTransformerClsHead'],
+        'vqa_head': ['VQAGenerationHead'],
+    })
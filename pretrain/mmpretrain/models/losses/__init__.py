@@ -4,37 +4,24 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .asymmetric_loss import AsymmetricLoss, asymmetric_loss
-from .cae_loss import CAELoss
-from .cosine_similarity_loss import CosineSimilarityLoss
-from .cross_correlation_loss import CrossCorrelationLoss
-from .cross_entropy_loss import (CrossEntropyLoss, binary_cross_entropy,
-                                 cross_entropy)
-from .focal_loss import FocalLoss, sigmoid_focal_loss
-from .label_smooth_loss import LabelSmoothLoss
-from .reconstruction_loss import PixelReconstructionLoss
-from .seesaw_loss import SeesawLoss
-from .swav_loss import SwAVLoss
-from .utils import (convert_to_one_hot, reduce_loss, weight_reduce_loss,
-                    weighted_loss)
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'asymmetric_loss',
-    'AsymmetricLoss',
-    'cross_entropy',
-    'binary_cross_entropy',
-    'CrossEntropyLoss',
-    'reduce_loss',
-    'weight_reduce_loss',
-    'LabelSmoothLoss',
-    'weighted_loss',
-    'FocalLoss',
-    'sigmoid_focal_loss',
-    'convert_to_one_hot',
-    'SeesawLoss',
-    'CAELoss',
-    'CosineSimilarityLoss',
-    'CrossCorrelationLoss',
-    'PixelReconstructionLoss',
-    'SwAVLoss',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'asymmetric_loss': ['AsymmetricLoss', 'asymmetric_loss'],
+        'cae_loss': ['CAELoss'],
+        'cosine_similarity_loss': ['CosineSimilarityLoss'],
+        'cross_correlation_loss': ['CrossCorrelationLoss'],
+        'cross_entropy_loss': [
+            'CrossEntropyLoss', 'binary_cross_entropy', 'cross_entropy'
+        ],
+        'focal_loss': ['FocalLoss', 'sigmoid_focal_loss'],
+        'label_smooth_loss': ['LabelSmoothLoss'],
+        'reconstruction_loss': ['PixelReconstructionLoss'],
+        'seesaw_loss': ['SeesawLoss'],
+        'swav_loss': ['SwAVLoss'],
+        'utils': [
+            'convert_to_one_hot', 'reduce_loss', 'weight_reduce_loss',
+            'weighted_loss'
+        ],
+    })
@@ -4,14 +4,16 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .blip_caption import BlipCaption
-from .blip_grounding import BlipGrounding
-from .blip_nlvr import BlipNLVR
-from .blip_retrieval import BlipRetrieval
-from .blip_vqa import BlipVQA
-from .language_model import BertLMHeadModel, XBertEncoder, XBertLMHeadDecoder
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BertLMHeadModel', 'BlipCaption', 'BlipGrounding', 'BlipNLVR',
-    'BlipRetrieval', 'BlipVQA', 'XBertEncoder', 'XBertLMHeadDecoder'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'blip_caption': ['BlipCaption'],
+        'blip_grounding': ['BlipGrounding'],
+        'blip_nlvr': ['BlipNLVR'],
+        'blip_retrieval': ['BlipRetrieval'],
+        'blip_vqa': ['BlipVQA'],
+        'language_model': [
+            'BertLMHeadModel', 'XBertEncoder', 'XBertLMHeadDecoder'
+        ],
+    })
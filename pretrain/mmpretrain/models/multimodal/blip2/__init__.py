@@ -4,12 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .blip2_caption import Blip2Caption
-from .blip2_opt_vqa import Blip2VQA
-from .blip2_retriever import Blip2Retrieval
-from .modeling_opt import OPTForCausalLM
-from .Qformer import Qformer
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'Blip2Caption', 'Blip2Retrieval', 'Blip2VQA', 'OPTForCausalLM', 'Qformer'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'blip2_caption': ['Blip2Caption'],
+        'blip2_opt_vqa': ['Blip2VQA'],
+        'blip2_retriever': ['Blip2Retrieval'],
+        'modeling_opt': ['OPTForCausalLM'],
+        'Qformer': ['Qformer'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .bert import BertModelCN
-from .chinese_clip import ChineseCLIP, ModifiedResNet
+from mmengine.utils import lazy_import
 
-__all__ = ['ChineseCLIP', 'ModifiedResNet', 'BertModelCN']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'bert': ['BertModelCN'],
+        'chinese_clip': ['ChineseCLIP', 'ModifiedResNet'],
+    })
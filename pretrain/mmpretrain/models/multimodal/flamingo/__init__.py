@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .adapter import FlamingoLMAdapter
-from .flamingo import Flamingo
+from mmengine.utils import lazy_import
 
-__all__ = ['Flamingo', 'FlamingoLMAdapter']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'adapter': ['FlamingoLMAdapter'],
+        'flamingo': ['Flamingo'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .llava import Llava
-from .modules import LlavaLlamaForCausalLM
+from mmengine.utils import lazy_import
 
-__all__ = ['Llava', 'LlavaLlamaForCausalLM']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'llava': ['Llava'],
+        'modules': ['LlavaLlamaForCausalLM'],
+    })
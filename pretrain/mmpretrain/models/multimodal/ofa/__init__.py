@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ofa import OFA
-from .ofa_modules import OFADecoder, OFAEncoder, OFAEncoderDecoder
+from mmengine.utils import lazy_import
 
-__all__ = ['OFAEncoderDecoder', 'OFA', 'OFAEncoder', 'OFADecoder']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ofa': ['OFA'],
+        'ofa_modules': ['OFADecoder', 'OFAEncoder', 'OFAEncoderDecoder'],
+    })
@@ -4,6 +4,9 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .otter import Otter
+from mmengine.utils import lazy_import
 
-__all__ = ['Otter']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'otter': ['Otter'],
+    })
@@ -4,41 +4,25 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .beitv2_neck import BEiTV2Neck
-from .cae_neck import CAENeck
-from .densecl_neck import DenseCLNeck
-from .gap import GlobalAveragePooling
-from .gem import GeneralizedMeanPooling
-from .hr_fuse import HRFuseScales
-from .itpn_neck import iTPNPretrainDecoder
-from .linear_neck import LinearNeck
-from .mae_neck import ClsBatchNormNeck, MAEPretrainDecoder
-from .milan_neck import MILANPretrainDecoder
-from .mixmim_neck import MixMIMPretrainDecoder
-from .mocov2_neck import MoCoV2Neck
-from .nonlinear_neck import NonLinearNeck
-from .simmim_neck import SimMIMLinearDecoder
-from .spark_neck import SparKLightDecoder
-from .swav_neck import SwAVNeck
-from .mae_neck2 import MAEPretrainDecoder2
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'GlobalAveragePooling',
-    'GeneralizedMeanPooling',
-    'HRFuseScales',
-    'LinearNeck',
-    'BEiTV2Neck',
-    'CAENeck',
-    'DenseCLNeck',
-    'MAEPretrainDecoder',
-    'ClsBatchNormNeck',
-    'MILANPretrainDecoder',
-    'MixMIMPretrainDecoder',
-    'MoCoV2Neck',
-    'NonLinearNeck',
-    'SimMIMLinearDecoder',
-    'SwAVNeck',
-    'iTPNPretrainDecoder',
-    'SparKLightDecoder',
-    'MAEPretrainDecoder2',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'beitv2_neck': ['BEiTV2Neck'],
+        'cae_neck': ['CAENeck'],
+        'densecl_neck': ['DenseCLNeck'],
+        'gap': ['GlobalAveragePooling'],
+        'gem': ['GeneralizedMeanPooling'],
+        'hr_fuse': ['HRFuseScales'],
+        'itpn_neck': ['iTPNPretrainDecoder'],
+        'linear_neck': ['LinearNeck'],
+        'mae_neck': ['ClsBatchNormNeck', 'MAEPretrainDecoder'],
+        'milan_neck': ['MILANPretrainDecoder'],
+        'mixmim_neck': ['MixMIMPretrainDecoder'],
+        'mocov2_neck': ['MoCoV2Neck'],
+        'nonlinear_neck': ['NonLinearNeck'],
+        'simmim_neck': ['SimMIMLinearDecoder'],
+        'spark_neck': ['SparKLightDecoder'],
+        'swav_neck': ['SwAVNeck'],
+        'mae_neck2': ['MAEPretrainDecoder2'],
+    })
@@ -4,7 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base import BaseRetriever
-from .image2image import ImageToImageRetriever
+from mmengine.utils import lazy_import
 
-__all__ = ['BaseRetriever', 'ImageToImageRetriever']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base': ['BaseRetriever'],
+        'image2image': ['ImageToImageRetriever'],
+    })
@@ -28,6 +28,8 @@ from .norm import GRN, LayerNorm2d, build_norm_layer
 from .position_encoding import (ConditionalPositionEncoding,
                                 PositionEncodingFourier, RotaryEmbeddingFast,
                                 build_2d_sincos_position_embedding)
+from .quantization import (WeightOnlyQuantLinear, collect_act_amax,
+                           quantize_linear_layers, vit_norm_inputs)
 from .res_layer_extra_norm import ResLayerExtraNorm
 from .se_layer import SELayer
 from .sparse_modules import (SparseAvgPooling, SparseBatchNorm2d, SparseConv2d,
@@ -93,6 +95,10 @@ __all__ = [
     'SparseBatchNorm2d',
     'SparseLayerNorm2D',
     'SparseSyncBatchNorm2d',
+    'WeightOnlyQuantLinear',
+    'collect_act_amax',
+    'quantize_linear_layers',
+    'vit_norm_inputs',
 ]
 
 if WITH_MULTIMODAL:
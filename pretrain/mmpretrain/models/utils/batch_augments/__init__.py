@@ -4,9 +4,12 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .cutmix import CutMix
-from .mixup import Mixup
-from .resizemix import ResizeMix
-from .wrapper import RandomBatchAugment
+from mmengine.utils import lazy_import
 
-__all__ = ('RandomBatchAugment', 'CutMix', 'Mixup', 'ResizeMix')
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'cutmix': ['CutMix'],
+        'mixup': ['Mixup'],
+        'resizemix': ['ResizeMix'],
+        'wrapper': ['RandomBatchAugment'],
+    })
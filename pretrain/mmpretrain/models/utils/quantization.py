@@ -0,0 +1,287 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Weight-only int8 / int4 quantization of linear layers.
+
+The weights are stored as integers with one scale per group of input
+channels and dequantized in the forward pass. The quantized model stays a
+graph of plain aten ops, so it can be exported with ``torch.export`` and run
+wherever the float model runs; inductor fuses the dequantization into the
+matmul on both cuda and cpu.
+"""
+from typing import Dict, Iterable, Optional, Sequence
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+def quantize_weight(weight: torch.Tensor,
+                    bits: int = 8,
+                    group_size: Optional[int] = 128):
+    """Symmetric group-wise quantization of a linear weight.
+
+    Args:
+        weight (Tensor): The weight of shape (out_features, in_features).
+        bits (int): 8 or 4. Defaults to 8.
+        group_size (int, optional): Number of input channels sharing a
+            scale. None for one scale per output channel. Defaults to 128.
+
+    Returns:
+        tuple[Tensor, Tensor]: The int8 values of shape
+        (out_features, in_features) and the float32 scales of shape
+        (out_features, in_features // group_size).
+    """
+    out_features, in_features = weight.shape
+    group_size = group_size or in_features
+    assert in_features % group_size == 0, \
+        f'{in_features} input channels are not divisible by {group_size}'
+    qmax = 2**(bits - 1) - 1
+    groups = weight.float().reshape(out_features, -1, group_size)
+    scales = groups.abs().amax(dim=-1, keepdim=True).clamp(min=1e-8) / qmax
+    qweight = torch.clamp(torch.round(groups / scales), -qmax - 1, qmax)
+    return (qweight.to(torch.int8).reshape(out_features, in_features),
+            scales.squeeze(-1))
+
+
+def pack_int4(qweight: torch.Tensor) -> torch.Tensor:
+    """Pack pairs of int4 values in ``[-8, 7]`` into one uint8."""
+    qweight = (qweight + 8).to(torch.uint8)
+    return qweight[:, 0::2] | (qweight[:, 1::2] << 4)
+
+
+def unpack_int4(packed: torch.Tensor) -> torch.Tensor:
+    """Inverse of :func:`pack_int4`."""
+    qweight = torch.stack([packed & 0xF, packed >> 4], dim=-1)
+    return qweight.flatten(-2).to(torch.int8) - 8
+
+
+class WeightOnlyQuantLinear(nn.Module):
+    """A linear layer with int8 or int4 weights and group-wise scales.
+
+    Args:
+        in_features (int): Number of input channels.
+        out_features (int): Number of output channels.
+        bias (bool): Whether the layer has a bias. Defaults to True.
+        bits (int): 8 or 4. Defaults to 8.
+        group_size (int, optional): Number of input channels sharing a
+            scale. None for one scale per output channel. Defaults to 128.
+        act_scale (bool): Whether the inputs are multiplied by a per-channel
+            scale, see :func:`quantize_linear_layers`. Defaults to False.
+    """
+
+    def __init__(self,
+                 in_features: int,
+                 out_features: int,
+                 bias: bool = True,
+                 bits: int = 8,
+                 group_size: Optional[int] = 128,
+                 act_scale: bool = False):
+        super().__init__()
+        assert bits in (8, 4), f'{bits}-bit weights are not supported'
+        self.in_features = in_features
+        self.out_features = out_features
+        self.bits = bits
+        self.group_size = group_size or in_features
+
+        if bits == 4:
+            shape, dtype = (out_features, in_features // 2), torch.uint8
+        else:
+            shape, dtype = (out_features, in_features), torch.int8
+        self.register_buffer('qweight', torch.zeros(shape, dtype=dtype))
+        self.register_buffer(
+            'scales',
+            torch.ones(out_features, in_features // self.group_size))
+        self.register_buffer('bias',
+                             torch.zeros(out_features) if bias else None)
+        self.register_buffer('act_scale',
+                             torch.ones(in_features) if act_scale else None)
+
+    @classmethod
+    def from_linear(cls,
+                    linear: nn.Linear,
+                    bits: int = 8,
+                    group_size: Optional[int] = 128,
+                    act_scale: Optional[torch.Tensor] = None):
+        """Quantize a float linear layer.
+
+        Args:
+            linear (nn.Linear): The layer to quantize.
+            bits (int): 8 or 4. Defaults to 8.
+            group_size (int, optional): See :func:`quantize_weight`.
+                Defaults to 128.
+            act_scale (Tensor, optional): Per input channel smoothing
+                factors ``s``. The weight is quantized as ``W * s`` and the
+                inputs are divided by ``s``. Defaults to None.
+        """
+        weight = linear.weight.detach().float()
+        if act_scale is not None:
+            weight = weight * act_scale.to(weight)
+        module = cls(
+            linear.in_features,
+            linear.out_features,
+            bias=linear.bias is not None,
+            bits=bits,
+            group_size=group_size,
+            act_scale=act_scale is not None)
+        qweight, scales = quantize_weight(weight, bits, group_size)
+        module.qweight.copy_(pack_int4(qweight) if bits == 4 else qweight)
+        module.scales.copy_(scales)
+        if linear.bias is not None:
+            module.bias.copy_(linear.bias.detach())
+        if act_scale is not None:
+            module.act_scale.copy_(act_scale.reciprocal())
+        return module.to(linear.weight.device)
+
+    def dequantize(self, dtype: torch.dtype) -> torch.Tensor:
+        qweight = self.qweight
+        if self.bits == 4:
+            qweight = unpack_int4(qweight)
+        weight = qweight.reshape(self.out_features, -1, self.group_size).to(
+            dtype) * self.scales.to(dtype).unsqueeze(-1)
+        return weight.reshape(self.out_features, self.in_features)
+
+    @property
+    def weight(self) -> torch.Tensor:
+        """The dequantized weight, for code that reads ``linear.weight``."""
+        return self.dequantize(self.scales.dtype)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if self.act_scale is not None:
+            x = x * self.act_scale.to(x.dtype)
+        bias = self.bias.to(x.dtype) if self.bias is not None else None
+        return F.linear(x, self.dequantize(x.dtype), bias)
+
+    def extra_repr(self) -> str:
+        return (f'in_features={self.in_features}, '
+                f'out_features={self.out_features}, bits={self.bits}, '
+                f'group_size={self.group_size}')
+
+
+@torch.no_grad()
+def collect_act_amax(model: nn.Module, linear_names: Sequence[str],
+                     batches: Iterable[torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """Record the per-channel absolute maximum of the inputs of linear
+    layers over calibration batches.
+
+    Args:
+        model (nn.Module): The model, called as ``model(batch)``.
+        linear_names (Sequence[str]): Names of the linear layers in
+            ``model``.
+        batches (Iterable[Tensor]): Calibration inputs.
+
+    Returns:
+        dict[str, Tensor]: The float32 maxima of shape (in_features, ).
+    """
+    amax = {}
+
+    def hook(name, module, args):
+        x = args[0].detach().flatten(0, -2).abs().amax(dim=0).float()
+        amax[name] = torch.maximum(amax[name], x) if name in amax else x
+
+    handles = [
+        model.get_submodule(name).register_forward_pre_hook(
+            lambda module, args, name=name: hook(name, module, args))
+        for name in linear_names
+    ]
+    try:
+        for batch in batches:
+            model(batch)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return amax
+
+
+def smooth_scales(act_amax: torch.Tensor,
+                  weight: torch.Tensor,
+                  alpha: float = 0.5) -> torch.Tensor:
+    """SmoothQuant factors ``s = amax(|X|)^alpha / amax(|W|)^(1 - alpha)``.
+
+    Input channels with large activations get larger weights, so that the
+    group-wise rounding error is smallest where the activations amplify it.
+    """
+    w_amax = weight.detach().float().abs().amax(dim=0).clamp(min=1e-5)
+    scales = act_amax.clamp(min=1e-5).pow(alpha) / w_amax.pow(1 - alpha)
+    return scales.clamp(min=1e-5)
+
+
+def vit_norm_inputs(backbone: nn.Module,
+                    prefix: str = '') -> Dict[str, nn.Module]:
+    """The layer norm feeding each qkv and first FFN projection of a ViT.
+
+    Returns:
+        dict[str, nn.Module]: Maps the linear layer names, relative to the
+        module that owns ``backbone`` under ``prefix``, to their norms.
+    """
+    norms = {}
+    for i, layer in enumerate(backbone.layers):
+        name = f'{prefix}layers.{i}'
+        norms[f'{name}.attn.qkv'] = layer.ln1
+        for ffn_name, module in layer.ffn.named_modules():
+            if isinstance(module, nn.Linear):
+                norms[f'{name}.ffn.{ffn_name}'] = layer.ln2
+                break
+    return norms
+
+
+@torch.no_grad()
+def quantize_linear_layers(module: nn.Module,
+                           linear_names: Sequence[str],
+                           bits: int = 8,
+                           group_size: Optional[int] = 128,
+                           act_amax: Optional[Dict[str,
+                                                   torch.Tensor]] = None,
+                           alpha: float = 0.5,
+                           norm_inputs: Optional[Dict[str,
+                                                      nn.Module]] = None):
+    """Replace linear layers of a module with :class:`WeightOnlyQuantLinear`
+    in place.
+
+    Args:
+        module (nn.Module): The module owning the layers.
+        linear_names (Sequence[str]): Names of the ``nn.Linear`` layers to
+            quantize. Layers whose input channels are not divisible by
+            ``group_size`` get one scale per output channel.
+        bits (int): 8 or 4. Defaults to 8.
+        group_size (int, optional): See :func:`quantize_weight`.
+            Defaults to 128.
+        act_amax (dict[str, Tensor], optional): Calibrated input maxima from
+            :func:`collect_act_amax`. If given, the weights are smoothed
+            before quantization. Defaults to None.
+        alpha (float): Migration strength of the smoothing. Defaults to 0.5.
+        norm_inputs (dict[str, nn.Module], optional): Layer norms feeding
+            some of the layers, see :func:`vit_norm_inputs`. The smoothing
+            of these layers is folded into the affine parameters of the
+            norm, which must not feed any other layer. The other layers
+            rescale their inputs at runtime. Defaults to None.
+    """
+    norm_inputs = norm_inputs or {}
+    for name in linear_names:
+        linear = module.get_submodule(name)
+        assert isinstance(linear, nn.Linear), f'{name} is not nn.Linear'
+        layer_group_size = group_size
+        if group_size and linear.in_features % group_size != 0:
+            layer_group_size = None
+
+        scale = None
+        if act_amax is not None:
+            scale = smooth_scales(act_amax[name].to(linear.weight.device),
+                                  linear.weight, alpha)
+        quant_linear = WeightOnlyQuantLinear.from_linear(
+            linear, bits, layer_group_size, act_scale=scale)
+
+        norm = norm_inputs.get(name)
+        if (scale is not None and isinstance(norm, nn.LayerNorm)
+                and norm.elementwise_affine):
+            norm.weight.div_(scale.to(norm.weight))
+            if norm.bias is not None:
+                norm.bias.div_(scale.to(norm.bias))
+            quant_linear.act_scale = None
+
+        parent_name, _, attr = name.rpartition('.')
+        setattr(module.get_submodule(parent_name), attr, quant_linear)
+    return module
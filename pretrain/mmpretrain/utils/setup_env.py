@@ -8,6 +8,7 @@ import datetime
 import warnings
 
 from mmengine import DefaultScope
+from mmengine.utils import import_lazy_module
 
 
 def register_all_modules(init_default_scope: bool = True) -> None:
@@ -22,12 +23,12 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             https://github.com/open-mmlab/mmengine/blob/main/docs/en/tutorials/registry.md
             Defaults to True.
     """  # noqa: E501
-    import mmpretrain.datasets  # noqa: F401,F403
-    import mmpretrain.engine  # noqa: F401,F403
-    import mmpretrain.evaluation  # noqa: F401,F403
-    import mmpretrain.models  # noqa: F401,F403
-    import mmpretrain.structures  # noqa: F401,F403
-    import mmpretrain.visualization  # noqa: F401,F403
+    # the packages import their modules lazily, see `lazy_import`
+    for package in (
+            'mmpretrain.datasets', 'mmpretrain.engine',
+            'mmpretrain.evaluation', 'mmpretrain.models',
+            'mmpretrain.structures', 'mmpretrain.visualization'):
+        import_lazy_module(package)
 
     if not init_default_scope:
         return
@@ -0,0 +1,45 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from unittest import TestCase
+
+from mmengine.runner.loops import _load_dataloader_state_dict
+from torch.utils.data import DataLoader
+
+from mmpretrain.datasets.samplers import SequentialSampler
+
+
+class TestSequentialSampler(TestCase):
+
+    def _dataloader(self, subsample_type):
+        dataset = list(range(16))
+        sampler = SequentialSampler(
+            dataset=dataset, subsample_type=subsample_type)
+        return DataLoader(dataset, batch_size=2, sampler=sampler)
+
+    def test_resume_same_world_size(self):
+        dataloader = self._dataloader('sequential')
+        state_dict = dict(
+            dataloader.sampler.state_dict(), num_consumed=6, world_size=1)
+        num_consumed = _load_dataloader_state_dict(dataloader, state_dict)
+        self.assertEqual(num_consumed, 6)
+        self.assertEqual(list(dataloader.sampler), list(range(6, 16)))
+        # only the first iteration after resuming is shortened
+        self.assertEqual(list(dataloader.sampler), list(range(16)))
+
+    def test_resume_other_world_size(self):
+        # saved by 2 ranks with contiguous chunks, resumed on 1 rank
+        dataloader = self._dataloader('sequential')
+        state_dict = dict(
+            dataloader.sampler.state_dict(), num_consumed=4, world_size=2)
+        with self.assertRaisesRegex(ValueError, 'world size'):
+            _load_dataloader_state_dict(dataloader, state_dict)
+
+        # interleaved indices are rescaled
+        dataloader = self._dataloader('default')
+        num_consumed = _load_dataloader_state_dict(dataloader, state_dict)
+        self.assertEqual(num_consumed, 8)
+        self.assertEqual(list(dataloader.sampler), list(range(8, 16)))
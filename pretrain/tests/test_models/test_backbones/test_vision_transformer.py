@@ -0,0 +1,57 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from unittest import TestCase
+
+import torch
+
+from mmpretrain.models.backbones import VisionTransformer
+
+
+class TestVisionTransformer(TestCase):
+
+    def setUp(self):
+        self.cfg = dict(
+            arch=dict(
+                embed_dims=32,
+                num_layers=4,
+                num_heads=2,
+                feedforward_channels=64),
+            img_size=64,
+            patch_size=16,
+            out_type='featmap')
+
+    def test_token_pruning_defaults(self):
+        model = VisionTransformer(
+            **self.cfg, token_pruning=dict(prune_layers=[2]))
+        self.assertEqual(model.token_pruning['keep_ratio'], 0.7)
+        self.assertEqual(model.token_pruning['saliency'], 'attn')
+        self.assertEqual(model.token_pruning['mode'], 'drop')
+        self.assertFalse(hasattr(model, 'token_saliency'))
+
+    def test_token_pruning_overrides(self):
+        model = VisionTransformer(
+            **self.cfg,
+            token_pruning=dict(
+                prune_layers=[1, -1],
+                keep_ratio=0.5,
+                saliency='fg',
+                mode='merge'))
+        self.assertEqual(model.token_pruning['keep_ratio'], 0.5)
+        self.assertEqual(model.token_pruning['saliency'], 'fg')
+        self.assertEqual(model.token_pruning['mode'], 'merge')
+        self.assertEqual(model.token_pruning['prune_layers'], [1, 3])
+
+        outs = model(torch.randn(2, 3, 64, 64))
+        self.assertEqual(outs[-1].shape, (2, 32, 4, 4))
+
+    def test_token_pruning_fg_drop_gradient(self):
+        model = VisionTransformer(
+            **self.cfg,
+            token_pruning=dict(prune_layers=[2], saliency='fg', mode='drop'))
+        outs = model(torch.randn(2, 3, 64, 64))
+        outs[-1].sum().backward()
+        self.assertIsNotNone(model.token_saliency.weight.grad)
@@ -0,0 +1,156 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmark the EMA update of a Sapiens backbone.
+
+Compares the per-parameter reference update with the multi-tensor update of
+:class:`ExponentialMovingAverage` and, optionally, the asynchronous update of
+a cpu copy. Also checks that swapping a bf16 ema model in and out of the
+model for validation with :class:`EMAHook` restores the training weights
+bit-identical.
+
+Example:
+    python tools/analysis_tools/benchmark_ema.py --arch sapiens_1b
+"""
+
+import argparse
+import copy
+import time
+
+import torch
+from mmengine.hooks import EMAHook
+from mmengine.model import ExponentialMovingAverage
+
+from mmpretrain.models import VisionTransformer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark EMA updates')
+    parser.add_argument('--arch', default='sapiens_1b', help='ViT arch')
+    parser.add_argument('--img-size', type=int, default=224)
+    parser.add_argument('--momentum', type=float, default=0.0002)
+    parser.add_argument('--iters', type=int, default=20)
+    parser.add_argument(
+        '--device',
+        default='cuda' if torch.cuda.is_available() else 'cpu',
+        help='device of the source model')
+    parser.add_argument(
+        '--cpu-async',
+        action='store_true',
+        help='also benchmark an asynchronously updated cpu copy')
+    return parser.parse_args()
+
+
+def reference_update(ema, model):
+    """The previous per-parameter update."""
+    src_parameters = dict(model.named_parameters())
+    for k, p_avg in ema.avg_parameters.items():
+        if p_avg.dtype.is_floating_point:
+            p_avg.data.lerp_(src_parameters[k].data.to(p_avg.device),
+                             ema.momentum)
+    ema.steps += 1
+
+
+def perturb(model):
+    with torch.no_grad():
+        for p in model.parameters():
+            p.add_(torch.randn_like(p), alpha=1e-3)
+
+
+def synchronize():
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+
+def timeit(update, ema, model, iters):
+    # the first update copies the weights
+    update(ema, model)
+    synchronize()
+    start = time.perf_counter()
+    for _ in range(iters):
+        update(ema, model)
+    ema.sync()
+    synchronize()
+    return (time.perf_counter() - start) / iters * 1000
+
+
+def check_parity(model, momentum, steps=3, **kwargs):
+    """Max abs difference to the reference update while the model moves."""
+    model = copy.deepcopy(model)
+    ema_ref = ExponentialMovingAverage(model, momentum=momentum)
+    ema = ExponentialMovingAverage(model, momentum=momentum, **kwargs)
+    for _ in range(steps):
+        reference_update(ema_ref, model)
+        ema.update_parameters(model)
+        perturb(model)
+    ema.sync()
+    return max((a.float() - b.float().to(a.device)).abs().max().item()
+               for a, b in zip(ema_ref.module.parameters(),
+                               ema.module.parameters()))
+
+
+def check_swap_round_trip(model, momentum):
+    """Whether the weights are bit-identical after :class:`EMAHook` swaps a
+    bf16 ema model in and out, like before and after validation."""
+    model = copy.deepcopy(model)
+    hook = EMAHook(momentum=momentum, dtype=torch.bfloat16)
+    hook.src_model = model
+    hook.ema_model = ExponentialMovingAverage(
+        model, momentum=momentum, dtype=torch.bfloat16)
+    perturb(model)
+    hook.ema_model.update_parameters(model)
+    weights = [p.detach().clone() for p in model.parameters()]
+    hook._swap_ema_parameters()
+    hook._swap_ema_parameters()
+    return all(
+        torch.equal(w, p) for w, p in zip(weights, model.parameters()))
+
+
+def main():
+    args = parse_args()
+    model = VisionTransformer(
+        arch=args.arch, img_size=args.img_size).to(args.device)
+    num_tensors = len(list(model.parameters()))
+    num_params = sum(p.numel() for p in model.parameters())
+    print(f'{args.arch}: {num_tensors} parameter tensors, '
+          f'{num_params / 1e6:.0f}M parameters')
+
+    ema_ref = ExponentialMovingAverage(model, momentum=args.momentum)
+    ema_fused = ExponentialMovingAverage(model, momentum=args.momentum)
+
+    t_ref = timeit(reference_update, ema_ref, model, args.iters)
+    t_fused = timeit(lambda ema, m: ema.update_parameters(m), ema_fused,
+                     model, args.iters)
+    print(f'per-parameter update: {t_ref:8.2f} ms')
+    print(f'multi-tensor update:  {t_fused:8.2f} ms '
+          f'({t_ref / t_fused:.1f}x)')
+    print('max abs diff to the reference: '
+          f'{check_parity(model, args.momentum):.3e}')
+    print('weights bit-identical after swapping a bf16 ema in and out: '
+          f'{check_swap_round_trip(model, args.momentum)}')
+
+    if args.cpu_async:
+        ema_cpu = ExponentialMovingAverage(
+            copy.deepcopy(model), momentum=args.momentum, device='cpu')
+        ema_async = ExponentialMovingAverage(
+            copy.deepcopy(model),
+            momentum=args.momentum,
+            device='cpu',
+            async_update=True)
+        t_cpu = timeit(lambda ema, m: ema.update_parameters(m), ema_cpu,
+                       model, args.iters)
+        t_async = timeit(lambda ema, m: ema.update_parameters(m), ema_async,
+                         model, args.iters)
+        print(f'cpu copy update:      {t_cpu:8.2f} ms')
+        print(f'async cpu update:     {t_async:8.2f} ms (includes the final '
+              'sync, the training loop only waits for the staging copies)')
+        diff = check_parity(
+            model, args.momentum, device='cpu', async_update=True)
+        print(f'max abs diff to the reference: {diff:.3e}')
+
+
+if __name__ == '__main__':
+    main()
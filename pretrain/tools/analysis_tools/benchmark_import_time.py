@@ -0,0 +1,100 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+STATEMENTS = {
+    'import mmpretrain': 'import mmpretrain',
+    'import mmpretrain.models': 'import mmpretrain.models',
+    'import mmpretrain.datasets': 'import mmpretrain.datasets',
+}
+
+BUILD_MODEL = '''
+from mmengine import Config
+from mmengine.registry import init_default_scope
+from mmpretrain.registry import MODELS
+cfg = Config.fromfile({config!r})
+init_default_scope(cfg.get('default_scope', 'mmpretrain'))
+import torch
+with torch.device('meta'):
+    MODELS.build(cfg.model)
+'''
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the import time of mmpretrain with and without the '
+        'lazy registry imports')
+    parser.add_argument(
+        '--config', help='also time building the model of this config')
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='runs of every statement')
+    parser.add_argument(
+        '--show-modules',
+        type=int,
+        default=0,
+        help='print the slowest modules imported by every statement, '
+        'from `python -X importtime`')
+    args = parser.parse_args()
+    return args
+
+
+def run(statement, lazy, importtime=False):
+    env = dict(os.environ, MMENGINE_LAZY_REGISTRY='1' if lazy else '0')
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else [])
+    start = time.perf_counter()
+    proc = subprocess.run(
+        cmd + ['-c', statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+    return time.perf_counter() - start, proc.stderr
+
+
+def slowest_modules(stderr, topk):
+    # lines like `import time:   self [us] | cumulative | imported package`
+    modules = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)',
+                         line)
+        if match:
+            modules.append((int(match.group(1)), match.group(4)))
+    return sorted(modules, reverse=True)[:topk]
+
+
+def main():
+    args = parse_args()
+    statements = dict(STATEMENTS)
+    if args.config:
+        statements['build model'] = BUILD_MODEL.format(config=args.config)
+
+    print(f'{"statement":<24}{"eager (s)":>12}{"lazy (s)":>12}{"speedup":>10}')
+    for name, statement in statements.items():
+        times = {}
+        for lazy in (False, True):
+            times[lazy] = np.median(
+                [run(statement, lazy)[0] for _ in range(args.repeat)])
+        print(f'{name:<24}{times[False]:>12.3f}{times[True]:>12.3f}'
+              f'{times[False] / times[True]:>9.2f}x')
+        if args.show_modules:
+            for lazy in (False, True):
+                _, stderr = run(statement, lazy, importtime=True)
+                print(f'  slowest modules ({"lazy" if lazy else "eager"}):')
+                for self_us, module in slowest_modules(stderr,
+                                                       args.show_modules):
+                    print(f'    {self_us / 1e3:>10.1f} ms  {module}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmark :class:`ShardedImageDataset` on synthetic shards.
+
+Writes random jpeg images into shards and measures the writing throughput,
+the loading throughput with the MAE pretraining pipeline and the time to
+the first batch when resuming in the middle of an epoch.
+
+Example:
+    python tools/analysis_tools/benchmark_sharded_dataset.py \
+        --num-samples 20000 --num-workers 8 --batch-size 64
+"""
+
+import argparse
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from mmengine.dataset import default_collate
+from torch.utils.data import DataLoader
+
+from mmpretrain.datasets import ShardedImageDataset, ShardWriter
+from mmpretrain.utils import register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the sharded streaming dataset')
+    parser.add_argument('--num-samples', type=int, default=20000)
+    parser.add_argument('--samples-per-shard', type=int, default=1000)
+    parser.add_argument(
+        '--img-size', type=int, default=1024, help='synthetic image size')
+    parser.add_argument(
+        '--crop-size', type=int, default=224, help='pipeline crop size')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--num-workers', type=int, default=8)
+    parser.add_argument('--shuffle-buffer-size', type=int, default=10000)
+    parser.add_argument(
+        '--data-root',
+        help='existing shards to read, synthetic shards are written into a '
+        'temporary directory otherwise')
+    return parser.parse_args()
+
+
+def write_shards(args, data_root):
+    rng = np.random.default_rng(0)
+    # a few smooth images, noise does not compress like photos
+    imgs = []
+    for _ in range(16):
+        small = rng.integers(0, 255, (16, 16, 3), dtype=np.uint8)
+        img = cv2.resize(small, (args.img_size, args.img_size),
+                         interpolation=cv2.INTER_CUBIC)
+        imgs.append(cv2.imencode('.jpg', img)[1].tobytes())
+
+    start = time.perf_counter()
+    with ShardWriter(data_root, args.samples_per_shard) as writer:
+        for i in range(args.num_samples):
+            writer.write(imgs[i % len(imgs)], dict(description=f'image {i}'))
+    elapsed = time.perf_counter() - start
+    print(f'write: {args.num_samples / elapsed:.0f} samples/s')
+
+
+def build_loader(args, data_root):
+    pipeline = [
+        dict(
+            type='RandomResizedCrop',
+            scale=args.crop_size,
+            crop_ratio_range=(0.2, 1.0)),
+        dict(type='RandomFlip', prob=0.5),
+        dict(type='PackInputs'),
+    ]
+    dataset = ShardedImageDataset(
+        data_root,
+        pipeline=pipeline,
+        shuffle_buffer_size=args.shuffle_buffer_size)
+    return dataset, DataLoader(
+        dataset,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        collate_fn=default_collate)
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_root = args.data_root
+        if data_root is None:
+            data_root = tmp_dir
+            write_shards(args, data_root)
+
+        dataset, loader = build_loader(args, data_root)
+        dataset.set_epoch(0, args.batch_size)
+        start = time.perf_counter()
+        num_samples = 0
+        for i, data_batch in enumerate(loader):
+            if i == 0:
+                first_batch = time.perf_counter() - start
+                start = time.perf_counter()
+            else:
+                num_samples += len(data_batch['inputs'])
+        elapsed = time.perf_counter() - start
+        print(f'read: {num_samples / elapsed:.0f} samples/s, '
+              f'first batch {first_batch:.2f}s')
+
+        # resume in the middle of the next epoch
+        dataset, loader = build_loader(args, data_root)
+        dataset.set_epoch(1, args.batch_size)
+        dataset.load_state_dict(
+            dataset.state_dict(1,
+                               len(loader) // 2, args.num_workers))
+        start = time.perf_counter()
+        next(iter(loader))
+        print('first batch after resuming in the middle of an epoch: '
+              f'{time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Write images into the tar shards of :class:`ShardedImageDataset`.
+
+The images are stored as they are encoded, without decoding them, unless
+``--check`` is given. The metadata of every image, e.g. its description, can
+be given as a json lines file with an ``img_path`` relative to ``src`` in
+every line.
+
+Example:
+    python tools/dataset_converters/images_to_shards.py \
+        data/humans300m/images data/humans300m_shards \
+        --ann-file data/humans300m/descriptions.jsonl --shuffle
+"""
+
+import argparse
+import json
+import os.path as osp
+import random
+
+import mmcv
+import mmengine
+from mmengine.utils import scandir
+
+from mmpretrain.datasets import ShardWriter
+
+IMG_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Write images into the shards of ShardedImageDataset')
+    parser.add_argument('src', help='the directory of the images')
+    parser.add_argument('out_dir', help='the directory of the shards')
+    parser.add_argument(
+        '--ann-file',
+        help='json lines with the `img_path` and the metadata of every '
+        'image, defaults to all the images in `src`')
+    parser.add_argument(
+        '--samples-per-shard',
+        type=int,
+        default=10000,
+        help='there must be at least one shard for every dataloader worker '
+        'of every rank')
+    parser.add_argument(
+        '--shuffle',
+        action='store_true',
+        help='shuffle the images before writing them, the shuffle buffer of '
+        'the dataset only mixes close samples')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='decode every image and skip the ones that fail')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.ann_file:
+        with open(args.ann_file) as f:
+            samples = [json.loads(line) for line in f if line.strip()]
+    else:
+        samples = [
+            dict(img_path=img_path) for img_path in sorted(
+                scandir(args.src, IMG_EXTENSIONS, recursive=True))
+        ]
+    if args.shuffle:
+        random.Random(args.seed).shuffle(samples)
+
+    num_skipped = 0
+    writer = ShardWriter(args.out_dir, args.samples_per_shard)
+    for meta in mmengine.track_iter_progress(samples):
+        img_path = meta['img_path']
+        with open(osp.join(args.src, img_path), 'rb') as f:
+            img_bytes = f.read()
+        if args.check and mmcv.imfrombytes(img_bytes) is None:
+            num_skipped += 1
+            continue
+        ext = osp.splitext(img_path)[1][1:].lower() or 'jpg'
+        writer.write(img_bytes, meta, ext=ext)
+    index_file = writer.close()
+
+    print(f'Wrote {writer.num_samples} images into {len(writer.shards)} '
+          f'shards, see {index_file}')
+    if num_skipped:
+        print(f'Skipped {num_skipped} images that failed to decode')
+
+
+if __name__ == '__main__':
+    main()
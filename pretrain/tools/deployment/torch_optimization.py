@@ -209,6 +209,14 @@ def parse_args():
     parser.add_argument(
         "--fp16", action="store_true", help="To enable fp16. Default is bf16"
     )
+    parser.add_argument(
+        "--out-indices",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Backbone layers returned by the exported model. The layers after "
+        "the last one are not exported. Defaults to the config",
+    )
     args = parser.parse_args()
     return args
 
@@ -235,11 +243,18 @@ def main():
 
     os.makedirs(args.output_dir, exist_ok=True)
     checkpoint_basename = Path(args.checkpoint).stem
+    if args.out_indices is not None:
+        checkpoint_basename += "_layers" + "-".join(map(str, args.out_indices))
 
     model = FeatureExtractor(model=args.config, pretrained=args.checkpoint).model
     model.backbone.out_type = (
         "featmap"  ## removes cls_token and returns spatial feature maps.
     )
+    if args.out_indices is not None:
+        num_layers = model.backbone.num_layers
+        model.backbone.out_indices = [
+            num_layers + i if i < 0 else i for i in args.out_indices
+        ]
     model.eval()
     max_batch_size = args.max_batch_size
     input_shape = (max(1, min(input_shape[0], max_batch_size)), *input_shape[1:])
@@ -6,8 +6,8 @@
 
 import argparse
 import os
-import torch
-from mmengine.runner.checkpoint import _load_checkpoint
+from mmengine.runner.checkpoint import (_load_checkpoint, get_peak_rss,
+                                        save_checkpoint)
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Clean checkpoints by removing unnecessary data')
@@ -37,7 +37,8 @@ def clean_checkpoint(checkpoint_path):
 
     print("\033[96m" + f"Cleaning checkpoint: {checkpoint_path}" + "\033[0m")
 
-    checkpoint = _load_checkpoint(checkpoint_path)
+    ## memory-mapped, the optimizer state is never read
+    checkpoint = _load_checkpoint(checkpoint_path, map_location='cpu')
 
     # Remove unnecessary parts of the checkpoint
     clean_checkpoint = {'state_dict': checkpoint['state_dict'], 'meta': checkpoint['meta']}
@@ -45,8 +46,12 @@ def clean_checkpoint(checkpoint_path):
     new_checkpoint_path = checkpoint_path
 
     print('\033[93m' + f'Saving cleaned checkpoint to {new_checkpoint_path}' + '\033[0m')
+    ## written to a temporary file and renamed, the source file stays mapped
+    save_checkpoint(clean_checkpoint, new_checkpoint_path)
+    peak_rss = get_peak_rss()
+    if peak_rss is not None:
+        print(f'Peak RSS: {peak_rss:.2f} GB')
     print()
-    torch.save(clean_checkpoint, new_checkpoint_path)
     return
 
 def main():
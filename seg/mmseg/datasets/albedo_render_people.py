@@ -6,6 +6,7 @@
 
 from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
+from .render_people_index import load_sample_index
 
 import numpy as np
 import os
@@ -31,8 +32,13 @@ class AlbedoRenderPeopleDataset(BaseSegDataset):
     """
 
     def __init__(self,
+                 sample_index_dir: Optional[str] = None,
                  **kwargs) -> None:
 
+        self.sample_index_dir = sample_index_dir ## defaults to data_root/.sample_index
+
+        ## the data list is backed by the memory mapped sample index, which the workers share already
+        kwargs['serialize_data'] = False
         super().__init__(**kwargs)
         return
 
@@ -42,31 +48,11 @@ class AlbedoRenderPeopleDataset(BaseSegDataset):
         Returns:
             list[dict]: All data info of dataset.
         """
-        data_list = []
-
-        self.rgb_dir = os.path.join(self.data_root, 'rgb')
-        self.albedo_dir = os.path.join(self.data_root, 'albedo')
-        self.mask_dir = os.path.join(self.data_root, 'mask')
-
         print('\033[92mLoading AlbedoRenderPeople!\033[0m')
 
-        # Create a set of common file names from all three directories
-        rgb_files = {x for x in os.listdir(self.rgb_dir) if x.endswith('.png')}
-        mask_files = {x for x in os.listdir(self.mask_dir) if x.endswith('.png')}
-        albedo_files = {x for x in os.listdir(self.albedo_dir) if x.endswith('.png')}
-
-        # Find the intersection of file names between images, masks, and normals
-        common_names = rgb_files & mask_files & albedo_files
-
-        # Create data list using the common file names
-        data_list = [
-                {
-                    'rgb_path': os.path.join(self.rgb_dir, name),
-                    'mask_path': os.path.join(self.mask_dir, name),
-                    'albedo_path': os.path.join(self.albedo_dir, name),
-                }
-                for name in common_names
-            ]
+        ## paths, mask bboxes and cameras from the sample index of data_root, rebuilt when a directory changes
+        index = load_sample_index(self.data_root, self.sample_index_dir)
+        data_list = index.samples(['rgb', 'mask', 'albedo'])
 
         print('\033[92mDone! AlbedoRenderPeople. Loaded total samples: {}\033[0m'.format(len(data_list)))
         return data_list
@@ -96,14 +82,7 @@ class AlbedoRenderPeopleDataset(BaseSegDataset):
         # Normalize albedo to the range 0-1
         albedo = albedo.astype(float) / 255.0
 
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-
-        # Find the bounding box's bounds
-        y1, y2 = np.where(rows)[0][[0, -1]]
-        x1, x2 = np.where(cols)[0][[0, -1]]
-
-        bbox = np.array([x1, y1, x2, y2], dtype=np.float32).reshape(1, 4)
+        bbox = data_info['bbox'] ## precomputed from the mask by the sample index
 
         data_info = {
             'img': img,
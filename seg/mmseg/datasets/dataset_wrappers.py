@@ -4,8 +4,10 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import bisect
 import collections
 import copy
+import itertools
 from copy import deepcopy
 from typing import List, Optional, Sequence, Union, Any, Tuple, Callable
 
@@ -16,9 +18,13 @@ from mmseg.datasets import BaseSegDataset
 from mmengine.registry import build_from_cfg
 
 ##----------------------------------------------------------------------
-@DATASETS.register_module()
-class CombinedDataset(BaseSegDataset):
-    """A wrapper of combined dataset.
+class BaseCombinedDataset(BaseSegDataset):
+    """The base of the wrappers of combined datasets.
+
+    The global index of a sample is mapped to its sub-dataset with a binary
+    search over the cumulative sizes of the sub-datasets, which are also used
+    by :class:`WeightedSubsetSampler` to weight the sub-datasets.
+
     Args:
         metainfo (dict): The meta information of combined dataset.
         datasets (list): The configs of datasets to be combined.
@@ -39,15 +45,14 @@ class CombinedDataset(BaseSegDataset):
 
         self._lens = [len(dataset) for dataset in self.datasets]
         self._len = sum(self._lens)
+        # the global index of the end of every sub-dataset
+        self.cumulative_sizes = list(itertools.accumulate(self._lens))
 
-        super(CombinedDataset, self).__init__(pipeline=pipeline, **kwargs)
+        super(BaseCombinedDataset, self).__init__(pipeline=pipeline, **kwargs)
         self._metainfo = self._load_metainfo(copy.deepcopy(metainfo))
 
         assert len(self.datasets) > 0
 
-        self._metainfo['classes'] = self.datasets[0]._metainfo['classes']
-        self._metainfo['palette'] = self.datasets[0]._metainfo['palette']
-
         return
 
     @property
@@ -78,10 +83,9 @@ class CombinedDataset(BaseSegDataset):
         if index < 0:
             index = index + len(self)
 
-        subset_index = 0
-        while index >= self._lens[subset_index]:
-            index -= self._lens[subset_index]
-            subset_index += 1
+        subset_index = bisect.bisect_right(self.cumulative_sizes, index)
+        if subset_index > 0:
+            index -= self.cumulative_sizes[subset_index - 1]
         return subset_index, index
 
     def prepare_data(self, idx: int) -> Any:
@@ -93,24 +97,12 @@ class CombinedDataset(BaseSegDataset):
             Any: Depends on ``self.pipeline``.
         """
         data_info = self.get_data_info(idx)
-
-        ## check if sample belongs to the goliath dataset
-        subset_idx, sample_idx = self._get_subset_index(idx)
-
-        # try:
-        #     transformed_data_info = self.pipeline(data_info)
-        # except Exception as e:
-        #     print('Exception raised during processing sample {}, subset idx:{}'.format(idx, subset_idx), e)
-        #     return None
-
-        transformed_data_info = self.pipeline(data_info)
-
-        return transformed_data_info
+        return self.pipeline(data_info)
 
     def get_data_info(self, idx: int) -> dict:
         """Get annotation by index.
         Args:
-            idx (int): Global index of ``CombinedDataset``.
+            idx (int): Global index of the combined dataset.
         Returns:
             dict: The idx-th annotation of the datasets.
         """
@@ -131,6 +123,29 @@ class CombinedDataset(BaseSegDataset):
         self._fully_initialized = True
 
 
+##----------------------------------------------------------------------
+@DATASETS.register_module()
+class CombinedDataset(BaseCombinedDataset):
+    """A wrapper of combined dataset, with the classes and palette of the
+    first dataset.
+    Args:
+        metainfo (dict): The meta information of combined dataset.
+        datasets (list): The configs of datasets to be combined.
+        pipeline (list, optional): Processing pipeline. Defaults to [].
+    """
+
+    def __init__(self,
+                 metainfo: dict,
+                 datasets: list,
+                 pipeline: List[Union[dict, Callable]] = [],
+                 **kwargs):
+        super(CombinedDataset, self).__init__(
+            metainfo=metainfo, datasets=datasets, pipeline=pipeline, **kwargs)
+
+        self._metainfo['classes'] = self.datasets[0]._metainfo['classes']
+        self._metainfo['palette'] = self.datasets[0]._metainfo['palette']
+
+
 ##----------------------------------------------------------------------
 @DATASETS.register_module()
 class MultiImageMixDataset:
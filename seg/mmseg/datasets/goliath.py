@@ -8,7 +8,6 @@ from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
 
 import numpy as np
-import os
 import cv2
 import pickle
 from PIL import ImageDraw
@@ -20,24 +19,9 @@ import os.path as osp
 from PIL import Image
 from concurrent.futures import ThreadPoolExecutor
 import random
-from matplotlib import pyplot as plt
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import mmengine.fileio as fileio
 
-from contextlib import redirect_stderr
-
-with open(os.devnull, 'w') as f, redirect_stderr(f):
-    try:
-        from care.data.io import typed
-    except Exception:
-        # If the import fails, you can handle it here without printing any errors.
-        pass
-
-try:
-    from care.strict.data.io.file_system.airstore_client import register_airstore_in_fsspec
-    register_airstore_in_fsspec()
-except:
-    print('Warning: cannot import airstore!')
 
 ## 34 classes in total
 ORIGINAL_GOLIATH_CLASSES=(
@@ -94,13 +78,23 @@ class GoliathDataset(BaseSegDataset):
 
     def __init__(self,
                  **kwargs) -> None:
-        self.path_template = "airstoreds://rlr_detection_services_ml_datasets_no_user_data"
-        self.airstore = True
+        self._register_airstore_handler()
 
         super().__init__(**kwargs)
         return
 
+    ## imported here and not at module level, the care imports are slow
+    def _register_airstore_handler(self) -> None:
+        try:
+            from care.strict.data.io.file_system.airstore_client import register_airstore_in_fsspec
+            register_airstore_in_fsspec()
+        except:
+            print('Warning: cannot import airstore!')
+        self.path_template = "airstoreds://rlr_detection_services_ml_datasets_no_user_data"
+        self.airstore = True
+
     def _read_from_airstore(self, asset: str, sid: str) -> io.BytesIO:
+        from care.data.io import typed
         with typed.open(self.path_template + f"/{asset}?sampleId={sid}").open() as f:
             data = io.BytesIO(f.read())
         return data
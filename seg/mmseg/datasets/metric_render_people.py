@@ -6,6 +6,7 @@
 
 from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
+from .render_people_index import load_sample_index
 
 import numpy as np
 import os
@@ -31,8 +32,13 @@ class MetricRenderPeopleDataset(BaseSegDataset):
     """
 
     def __init__(self,
+                 sample_index_dir: Optional[str] = None,
                  **kwargs) -> None:
 
+        self.sample_index_dir = sample_index_dir ## defaults to data_root/.sample_index
+
+        ## the data list is backed by the memory mapped sample index, which the workers share already
+        kwargs['serialize_data'] = False
         super().__init__(**kwargs)
         return
 
@@ -42,31 +48,11 @@ class MetricRenderPeopleDataset(BaseSegDataset):
         Returns:
             list[dict]: All data info of dataset.
         """
-        data_list = []
-
-        self.rgb_dir = os.path.join(self.data_root, 'rgb')
-        self.depth_dir = os.path.join(self.data_root, 'depth')
-        self.mask_dir = os.path.join(self.data_root, 'mask')
-
         print('\033[92mLoading MetricRenderPeople!\033[0m')
 
-        # Create a set of common file names from all three directories
-        rgb_files = {x for x in os.listdir(self.rgb_dir) if x.endswith('.png')}
-        mask_files = {x for x in os.listdir(self.mask_dir) if x.endswith('.png')}
-        depth_files = {x.replace('.npy', '.png') for x in os.listdir(self.depth_dir) if x.endswith('.npy')}
-
-        # Find the intersection of file names between images, masks, and depths
-        common_names = rgb_files & mask_files & depth_files
-
-        # Create data list using the common file names
-        data_list = [
-                {
-                    'rgb_path': os.path.join(self.rgb_dir, name),
-                    'mask_path': os.path.join(self.mask_dir, name),
-                    'depth_path': os.path.join(self.depth_dir, name.replace('.png', '.npy'))
-                }
-                for name in common_names
-            ]
+        ## paths, mask bboxes and cameras from the sample index of data_root, rebuilt when a directory changes
+        index = load_sample_index(self.data_root, self.sample_index_dir)
+        data_list = index.samples(['rgb', 'mask', 'depth'])
 
         print('\033[92mDone! RenderPeople. Loaded total samples: {}\033[0m'.format(len(data_list)))
         return data_list
@@ -86,14 +72,7 @@ class MetricRenderPeopleDataset(BaseSegDataset):
         mask = cv2.imread(data_info['mask_path'])
         mask = mask[:, :, 0] ## 1920 x 1440
 
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-
-        # Find the bounding box's bounds
-        y1, y2 = np.where(rows)[0][[0, -1]]
-        x1, x2 = np.where(cols)[0][[0, -1]]
-
-        bbox = np.array([x1, y1, x2, y2], dtype=np.float32).reshape(1, 4)
+        bbox = data_info['bbox'] ## precomputed from the mask by the sample index
 
         data_info = {
             'img': img,
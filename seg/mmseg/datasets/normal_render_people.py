@@ -6,6 +6,7 @@
 
 from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
+from .render_people_index import load_sample_index
 
 import numpy as np
 import os
@@ -31,8 +32,13 @@ class NormalRenderPeopleDataset(BaseSegDataset):
     """
 
     def __init__(self,
+                 sample_index_dir: Optional[str] = None,
                  **kwargs) -> None:
 
+        self.sample_index_dir = sample_index_dir ## defaults to data_root/.sample_index
+
+        ## the data list is backed by the memory mapped sample index, which the workers share already
+        kwargs['serialize_data'] = False
         super().__init__(**kwargs)
         return
 
@@ -42,31 +48,11 @@ class NormalRenderPeopleDataset(BaseSegDataset):
         Returns:
             list[dict]: All data info of dataset.
         """
-        data_list = []
-
-        self.rgb_dir = os.path.join(self.data_root, 'rgb')
-        self.normal_dir = os.path.join(self.data_root, 'normal')
-        self.mask_dir = os.path.join(self.data_root, 'mask')
-
         print('\033[92mLoading NormalRenderPeople!\033[0m')
 
-        # Create a set of common file names from all three directories
-        rgb_files = {x for x in os.listdir(self.rgb_dir) if x.endswith('.png')}
-        mask_files = {x for x in os.listdir(self.mask_dir) if x.endswith('.png')}
-        normal_files = {x.replace('.npy', '.png') for x in os.listdir(self.normal_dir) if x.endswith('.npy')}
-
-        # Find the intersection of file names between images, masks, and normals
-        common_names = rgb_files & mask_files & normal_files
-
-        # Create data list using the common file names
-        data_list = [
-                {
-                    'rgb_path': os.path.join(self.rgb_dir, name),
-                    'mask_path': os.path.join(self.mask_dir, name),
-                    'normal_path': os.path.join(self.normal_dir, name.replace('.png', '.npy'))
-                }
-                for name in common_names
-            ]
+        ## paths, mask bboxes and cameras from the sample index of data_root, rebuilt when a directory changes
+        index = load_sample_index(self.data_root, self.sample_index_dir)
+        data_list = index.samples(['rgb', 'mask', 'normal'])
 
         print('\033[92mDone! NormalRenderPeople. Loaded total samples: {}\033[0m'.format(len(data_list)))
         return data_list
@@ -98,14 +84,7 @@ class NormalRenderPeopleDataset(BaseSegDataset):
             norms = np.linalg.norm(normal, axis=2, keepdims=True) + 1e-6  # Adding epsilon to avoid division by zero
             normal = normal / norms
 
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-
-        # Find the bounding box's bounds
-        y1, y2 = np.where(rows)[0][[0, -1]]
-        x1, x2 = np.where(cols)[0][[0, -1]]
-
-        bbox = np.array([x1, y1, x2, y2], dtype=np.float32).reshape(1, 4)
+        bbox = data_info['bbox'] ## precomputed from the mask by the sample index
 
         data_info = {
             'img': img,
@@ -6,6 +6,7 @@
 
 from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
+from .render_people_index import load_sample_index
 
 import numpy as np
 import os
@@ -28,8 +29,13 @@ import mmengine.fileio as fileio
 @DATASETS.register_module()
 class PointmapRenderPeopleDataset(BaseSegDataset):
     def __init__(self,
+                 sample_index_dir: Optional[str] = None,
                  **kwargs) -> None:
 
+        self.sample_index_dir = sample_index_dir ## defaults to data_root/.sample_index
+
+        ## the data list is backed by the memory mapped sample index, which the workers share already
+        kwargs['serialize_data'] = False
         super().__init__(**kwargs)
         return
 
@@ -39,37 +45,11 @@ class PointmapRenderPeopleDataset(BaseSegDataset):
         Returns:
             list[dict]: All data info of dataset.
         """
-        data_list = []
-
-        self.rgb_dir = os.path.join(self.data_root, 'rgb')
-        self.mask_dir = os.path.join(self.data_root, 'mask')
-        self.depth_dir = os.path.join(self.data_root, 'depth')
-        self.K_dir = os.path.join(self.data_root, 'camera_intrinsics')
-        self.M_dir = os.path.join(self.data_root, 'camera_extrinsics') ## cv camera extrinsics
-
         print('\033[92mLoading PointmapRenderPeople!\033[0m')
 
-        # Create a set of common file names from all three directories
-        rgb_files = {x for x in os.listdir(self.rgb_dir) if x.endswith('.png')}
-        mask_files = {x for x in os.listdir(self.mask_dir) if x.endswith('.png')}
-        depth_files = {x.replace('.npy', '.png') for x in os.listdir(self.depth_dir) if x.endswith('.npy')}
-        K_files = {x.replace('.txt', '.png') for x in os.listdir(self.K_dir) if x.endswith('.txt')}
-        M_files = {x.replace('.txt', '.png') for x in os.listdir(self.M_dir) if x.endswith('.txt')}
-
-        # Find the intersection of file names between images, masks, and normals
-        common_names = rgb_files & mask_files & depth_files & K_files & M_files
-
-        # Create data list using the common file names
-        data_list = [
-                {
-                    'rgb_path': os.path.join(self.rgb_dir, name),
-                    'mask_path': os.path.join(self.mask_dir, name),
-                    'depth_path': os.path.join(self.depth_dir, name.replace('.png', '.npy')),
-                    'K_path': os.path.join(self.K_dir, name.replace('.png', '.txt')),
-                    'M_path': os.path.join(self.M_dir, name.replace('.png', '.txt')),
-                }
-                for name in sorted(common_names)
-            ]
+        ## paths, mask bboxes and cameras from the sample index of data_root, rebuilt when a directory changes
+        index = load_sample_index(self.data_root, self.sample_index_dir)
+        data_list = index.samples(['rgb', 'mask', 'depth', 'K', 'M'])
 
         print('\033[92mDone! PointmapRenderPeople. Loaded total samples: {}\033[0m'.format(len(data_list)))
         return data_list
@@ -82,20 +62,13 @@ class PointmapRenderPeopleDataset(BaseSegDataset):
         mask = mask[:, :, 0] ##
 
         depth = np.load(data_info['depth_path']) ## H x W, ## is not in 0 to 1
-        K = np.loadtxt(data_info['K_path']) ## intrinsics, 3 x 3
-        M = np.loadtxt(data_info['M_path']) ## extrinsics, 4 x 4
+        K = data_info['K'] ## intrinsics, 3 x 3
+        M = data_info['M'] ## extrinsics, 4 x 4
 
         if img is None or mask is None or depth is None:
             return None
 
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-
-        # Find the bounding box's bounds
-        y1, y2 = np.where(rows)[0][[0, -1]]
-        x1, x2 = np.where(cols)[0][[0, -1]]
-
-        bbox = np.array([x1, y1, x2, y2], dtype=np.float32).reshape(1, 4)
+        bbox = data_info['bbox'] ## precomputed from the mask by the sample index
 
         data_info = {
             'img': img,
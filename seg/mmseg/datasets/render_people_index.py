@@ -0,0 +1,434 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Persistent sample index of the RenderPeople-style synthetic data roots.
+
+A data root holds one sibling directory per modality (``rgb``, ``mask``,
+``depth``, ``normal``, ``albedo``, ``camera_intrinsics``,
+``camera_extrinsics``) with one file per sample, and optionally a
+``pointmap`` directory of ``<mesh>.txt`` files that list the samples rendered
+from the same mesh. Instead of listing every directory, intersecting the
+names and re-reading the masks and camera files on every access, the index
+is built once in parallel and stored as one ``.npy`` file per column:
+
+    - ``name``: sorted sample names, fixed width bytes.
+    - ``file_size``: size in bytes of the file of every column, -1 if the
+      sample has no such file.
+    - ``bbox``: the ``x1, y1, x2, y2`` box of the mask, nan if it is empty.
+    - ``K``, ``M``: the 3 x 3 intrinsics and 4 x 4 extrinsics, nan if absent.
+    - ``mesh``: the position of the mesh of the sample in ``mesh_names``,
+      -1 if it is not listed in ``pointmap``.
+
+The columns are memory mapped, so loading takes milliseconds and the pages
+are shared by all the dataloader workers of a node; the datasets only pickle
+the index directory and an array of rows to the workers. The index is
+rebuilt when the modification time of one of the directories changes,
+reusing the rows whose files kept their size.
+"""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+from mmengine.dist import barrier, get_dist_info
+from tqdm import tqdm
+
+INDEX_VERSION = 2
+
+# column: (directory, suffix)
+INDEX_COLUMNS = {
+    'rgb': ('rgb', '.png'),
+    'mask': ('mask', '.png'),
+    'depth': ('depth', '.npy'),
+    'normal': ('normal', '.npy'),
+    'albedo': ('albedo', '.png'),
+    'K': ('camera_intrinsics', '.txt'),
+    'M': ('camera_extrinsics', '.txt'),
+}
+MESH_DIR = 'pointmap'
+INDEX_ARRAYS = ('name', 'file_size', 'bbox', 'K', 'M', 'mesh', 'mesh_names')
+
+
+def _parallel_map(fn: Callable,
+                  items: list,
+                  num_workers: int,
+                  desc: Optional[str] = None,
+                  chunk_size: int = 1024) -> list:
+    """``[fn(item) for item in items]`` on a thread pool, in chunks so that
+    millions of items do not create millions of futures. The work is file
+    I/O and image decoding, both of which release the GIL."""
+    chunks = [
+        items[i:i + chunk_size] for i in range(0, len(items), chunk_size)
+    ]
+    results = []
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for chunk in tqdm(
+                executor.map(lambda chunk: [fn(x) for x in chunk], chunks),
+                total=len(chunks),
+                desc=desc,
+                disable=desc is None):
+            results.extend(chunk)
+    return results
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return -1
+
+
+def _mask_bbox(path: str) -> np.ndarray:
+    # read like the datasets read the masks, 8-bit bgr
+    mask = cv2.imread(path)
+    bbox = np.full(4, np.nan, dtype=np.float32)
+    if mask is None:
+        return bbox
+    mask = mask[:, :, 0]
+    rows = np.flatnonzero(np.any(mask, axis=1))
+    cols = np.flatnonzero(np.any(mask, axis=0))
+    if len(rows) > 0:
+        bbox[:] = cols[0], rows[0], cols[-1], rows[-1]
+    return bbox
+
+
+def _load_matrix(path: str, shape: tuple) -> np.ndarray:
+    try:
+        return np.loadtxt(path).reshape(shape)
+    except (OSError, ValueError):
+        return np.full(shape, np.nan)
+
+
+def _dir_mtimes(data_root: str) -> Dict[str, Optional[int]]:
+    dirs = [directory for directory, _ in INDEX_COLUMNS.values()]
+    mtimes = {}
+    for directory in dirs + [MESH_DIR]:
+        path = osp.join(data_root, directory)
+        mtimes[directory] = os.stat(path).st_mtime_ns if osp.isdir(
+            path) else None
+    return mtimes
+
+
+def default_index_dir(data_root: str) -> str:
+    """``<data_root>/.sample_index``, or a directory in the user cache if
+    the data root is read-only."""
+    if os.access(data_root, os.W_OK):
+        return osp.join(data_root, '.sample_index')
+    key = hashlib.sha1(osp.abspath(data_root).encode()).hexdigest()[:16]
+    return osp.join(
+        osp.expanduser('~'), '.cache', 'sapiens', 'sample_index', key)
+
+
+class RenderPeopleIndex:
+    """The memory mapped columns of a built index.
+
+    Args:
+        data_root (str): The data root the index describes.
+        index_dir (str): The directory of the columns.
+    """
+
+    def __init__(self, data_root: str, index_dir: str) -> None:
+        self.data_root = data_root
+        self.index_dir = index_dir
+        self._open()
+
+    def _open(self) -> None:
+        with open(osp.join(self.index_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.columns = self.meta['columns']
+        for key in INDEX_ARRAYS:
+            setattr(
+                self, key,
+                np.load(
+                    osp.join(self.index_dir, f'{key}.npy'), mmap_mode='r'))
+
+    def __getstate__(self) -> dict:
+        # the workers map the files again instead of receiving a copy
+        return dict(data_root=self.data_root, index_dir=self.index_dir)
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def is_valid(self) -> bool:
+        """Whether no directory of the data root changed since the build."""
+        return self.meta.get('version') == INDEX_VERSION and self.meta.get(
+            'mtimes') == _dir_mtimes(self.data_root)
+
+    def select(self, columns: List[str]) -> np.ndarray:
+        """Rows that have a file in every column and a non-empty mask."""
+        cols = [self.columns.index(column) for column in columns]
+        keep = np.all(np.asarray(self.file_size[:, cols]) >= 0, axis=1)
+        keep &= np.all(np.isfinite(self.bbox), axis=1)
+        if 'K' in columns:
+            keep &= np.all(np.isfinite(self.K), axis=(1, 2))
+        if 'M' in columns:
+            keep &= np.all(np.isfinite(self.M), axis=(1, 2))
+        return np.flatnonzero(keep)
+
+    def samples(self, columns: List[str],
+                rows: Optional[np.ndarray] = None) -> 'RenderPeopleSamples':
+        """The data list of a dataset that needs the files of ``columns``."""
+        if rows is None:
+            rows = self.select(columns)
+        return RenderPeopleSamples(self, rows, columns)
+
+    def sample(self, row: int, columns: List[str]) -> dict:
+        """The data info of one row: the paths of ``columns``, the bbox and
+        the camera and mesh if indexed."""
+        name = self.name[row].decode()
+        info = {}
+        for column in columns:
+            directory, suffix = INDEX_COLUMNS[column]
+            info[f'{column}_path'] = osp.join(self.data_root, directory,
+                                              name + suffix)
+        info['bbox'] = np.array(self.bbox[row]).reshape(1, 4)
+        if 'K' in columns:
+            info['K'] = np.array(self.K[row])
+        if 'M' in columns:
+            info['M'] = np.array(self.M[row])
+        if self.mesh[row] >= 0:
+            info['mesh_name'] = self.mesh_names[self.mesh[row]].decode()
+        return info
+
+
+class RenderPeopleSamples(Sequence):
+    """A data list backed by the rows of a :class:`RenderPeopleIndex`.
+
+    Behaves like the list of dicts that ``load_data_list`` returns, but only
+    holds an array of rows, so it costs 8 bytes per sample and pickles to
+    the workers without the paths.
+    """
+
+    def __init__(self, index: RenderPeopleIndex, rows: np.ndarray,
+                 columns: List[str]) -> None:
+        self.index = index
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.columns = columns
+        self._groups = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return RenderPeopleSamples(self.index, self.rows[idx],
+                                       self.columns)
+        return self.index.sample(int(self.rows[idx]), self.columns)
+
+    def same_mesh(self, idx: int) -> np.ndarray:
+        """Positions of the other samples rendered from the mesh of the
+        ``idx``-th sample, or ``idx`` itself if it is the only one."""
+        if self._groups is None:
+            mesh = np.asarray(self.index.mesh)[self.rows]
+            order = np.argsort(mesh, kind='stable')
+            self._groups = (mesh, order, mesh[order])
+        mesh, order, sorted_mesh = self._groups
+        start, end = np.searchsorted(sorted_mesh, mesh[idx], side='left'), \
+            np.searchsorted(sorted_mesh, mesh[idx], side='right')
+        group = order[start:end]
+        others = group[group != idx]
+        return others if len(others) > 0 else np.array([idx])
+
+    def __getstate__(self) -> dict:
+        return dict(index=self.index, rows=self.rows, columns=self.columns)
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._groups = None
+
+
+def build_sample_index(data_root: str,
+                       index_dir: str,
+                       num_workers: int = 32,
+                       previous: Optional[RenderPeopleIndex] = None) -> None:
+    """Scan a data root and write its index to ``index_dir``.
+
+    Every sample with an rgb image and a mask is indexed. Rows of
+    ``previous`` whose mask and camera files kept their size are reused
+    instead of reading the files again, unless ``previous`` was built by
+    another version.
+    """
+    columns = list(INDEX_COLUMNS)
+    mtimes = _dir_mtimes(data_root)
+
+    def list_stems(column):
+        directory, suffix = INDEX_COLUMNS[column]
+        path = osp.join(data_root, directory)
+        if not osp.isdir(path):
+            return set()
+        return {
+            name[:-len(suffix)]
+            for name in os.listdir(path) if name.endswith(suffix)
+        }
+
+    with ThreadPoolExecutor(max_workers=len(columns)) as executor:
+        stems = dict(zip(columns, executor.map(list_stems, columns)))
+    names = sorted(stems['rgb'] & stems['mask'])
+    num_samples = len(names)
+
+    jobs = [(name, column) for column in columns for name in names
+            if name in stems[column]]
+    sizes = _parallel_map(
+        lambda job: _file_size(
+            osp.join(data_root, INDEX_COLUMNS[job[1]][0],
+                     job[0] + INDEX_COLUMNS[job[1]][1])),
+        jobs,
+        num_workers,
+        desc='stat')
+    file_size = np.full((num_samples, len(columns)), -1, dtype=np.int64)
+    row_of = {name: row for row, name in enumerate(names)}
+    for (name, column), size in zip(jobs, sizes):
+        file_size[row_of[name], columns.index(column)] = size
+
+    bbox = np.full((num_samples, 4), np.nan, dtype=np.float32)
+    K = np.full((num_samples, 3, 3), np.nan)
+    M = np.full((num_samples, 4, 4), np.nan)
+    todo = {key: np.ones(num_samples, dtype=bool) for key in ('mask', 'K', 'M')}
+    if previous is not None and len(previous) > 0 and previous.meta.get(
+            'version') == INDEX_VERSION:
+        # reuse the rows whose files were not rewritten
+        prev_names = np.asarray(previous.name)
+        new_names = np.array([name.encode() for name in names], dtype=bytes)
+        pos = np.searchsorted(prev_names, new_names).clip(
+            max=len(prev_names) - 1)
+        found = prev_names[pos] == new_names
+        prev_size = np.asarray(previous.file_size)
+        for key, target, source in (('mask', bbox, previous.bbox),
+                                    ('K', K, previous.K), ('M', M,
+                                                           previous.M)):
+            col = columns.index(key)
+            prev_col = previous.columns.index(key)
+            same = found & (
+                prev_size[pos, prev_col] == file_size[:, col])
+            target[same] = np.asarray(source)[pos[same]]
+            todo[key] &= ~same
+
+    for key, target, fn in (('mask', bbox, _mask_bbox),
+                            ('K', K, lambda path: _load_matrix(path, (3, 3))),
+                            ('M', M, lambda path: _load_matrix(path, (4, 4)))):
+        col = columns.index(key)
+        rows = np.flatnonzero(todo[key] & (file_size[:, col] >= 0))
+        directory, suffix = INDEX_COLUMNS[key]
+        paths = [
+            osp.join(data_root, directory, names[row] + suffix)
+            for row in rows
+        ]
+        values = _parallel_map(fn, paths, num_workers, desc=f'read {key}')
+        if len(values) > 0:
+            target[rows] = np.stack(values)
+
+    mesh = np.full(num_samples, -1, dtype=np.int32)
+    mesh_names = []
+    mesh_dir = osp.join(data_root, MESH_DIR)
+    if osp.isdir(mesh_dir):
+        mesh_names = sorted(
+            name for name in os.listdir(mesh_dir) if name.endswith('.txt'))
+
+        def read_lines(name):
+            with open(osp.join(mesh_dir, name)) as f:
+                return [line.strip() for line in f if line.strip()]
+
+        for mesh_id, sample_names in enumerate(
+                _parallel_map(read_lines, mesh_names, num_workers)):
+            for sample_name in sample_names:
+                row = row_of.get(sample_name)
+                if row is not None:
+                    mesh[row] = mesh_id
+
+    arrays = dict(
+        name=np.array([name.encode() for name in names], dtype=bytes)
+        if num_samples > 0 else np.zeros(0, dtype='S1'),
+        file_size=file_size,
+        bbox=bbox,
+        K=K,
+        M=M,
+        mesh=mesh,
+        mesh_names=np.array([name.encode() for name in mesh_names],
+                            dtype=bytes)
+        if mesh_names else np.zeros(0, dtype='S1'))
+
+    # write next to the index and swap, so that readers never see half of it
+    tmp_dir = f'{index_dir}.tmp{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+    for key, array in arrays.items():
+        np.save(osp.join(tmp_dir, f'{key}.npy'), array)
+    with open(osp.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(
+            dict(
+                version=INDEX_VERSION,
+                data_root=osp.abspath(data_root),
+                columns=columns,
+                mtimes=mtimes,
+                num_samples=num_samples), f)
+    old_dir = f'{index_dir}.old{os.getpid()}'
+    try:
+        if osp.isdir(index_dir):
+            os.rename(index_dir, old_dir)
+        os.rename(tmp_dir, index_dir)
+    except OSError:
+        # another process swapped in its index first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _try_load(data_root: str,
+              index_dir: str) -> Optional[RenderPeopleIndex]:
+    if not osp.isfile(osp.join(index_dir, 'meta.json')):
+        return None
+    try:
+        return RenderPeopleIndex(data_root, index_dir)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_sample_index(data_root: str,
+                      index_dir: Optional[str] = None,
+                      num_workers: int = 32) -> RenderPeopleIndex:
+    """Load the index of a data root, building it first if it is missing or
+    stale.
+
+    In distributed runs rank 0 builds the index while the other ranks wait;
+    a rank that still finds no index afterwards, e.g. on a node that does
+    not share the file system, builds its own. The other ranks keep the index
+    of rank 0 even if the data root changed since, so that all the ranks see
+    the same samples.
+
+    Args:
+        data_root (str): The data root.
+        index_dir (str, optional): Where the index is stored. Defaults to
+            :func:`default_index_dir`.
+        num_workers (int): Threads that scan the data root. Defaults to 32.
+
+    Returns:
+        RenderPeopleIndex: The memory mapped index.
+    """
+    index_dir = index_dir or default_index_dir(data_root)
+    rank, _ = get_dist_info()
+
+    index = _try_load(data_root, index_dir)
+    if rank == 0 and (index is None or not index.is_valid()):
+        print(f'\033[92mBuilding the sample index of {data_root} in '
+              f'{index_dir}\033[0m')
+        os.makedirs(osp.dirname(osp.abspath(index_dir)), exist_ok=True)
+        build_sample_index(data_root, index_dir, num_workers, previous=index)
+    barrier()
+
+    index = _try_load(data_root, index_dir)
+    if index is None:
+        build_sample_index(data_root, index_dir, num_workers)
+        index = RenderPeopleIndex(data_root, index_dir)
+    return index
@@ -0,0 +1,126 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Iterator, List, Optional, Sized, Union
+
+import torch
+from mmengine.dataset import DefaultSampler
+
+from mmseg.registry import DATA_SAMPLERS
+
+
+@DATA_SAMPLERS.register_module()
+class WeightedSubsetSampler(DefaultSampler):
+    """Sample the sub-datasets of a combined dataset with given weights.
+
+    Every epoch has ``epoch_length`` samples, of which every sub-dataset
+    contributes a number proportional to its weight. The samples of a
+    sub-dataset are drawn without replacement, and repeated only if it
+    contributes more samples than it has. The samples of all the
+    sub-datasets are then shuffled together. Like :class:`DefaultSampler`,
+    every rank takes every ``world_size``-th sample of the same epoch, which
+    is drawn from ``seed + epoch``, and the sampler can be resumed in the
+    middle of an epoch with :meth:`load_state_dict`.
+
+    Examples:
+        >>> train_dataloader = dict(
+        >>>     sampler=dict(
+        >>>         type='WeightedSubsetSampler', weights=[1, 1, 0.2]),
+        >>>     dataset=dict(type='DepthCombinedDataset', datasets=[...]),
+        >>>     ...)
+
+    Args:
+        dataset (Sized): The combined dataset, with the ``cumulative_sizes``
+            of its sub-datasets, like :class:`BaseCombinedDataset` and
+            :class:`mmengine.dataset.ConcatDataset`.
+        weights (list[int | float]): The sampling weight of every
+            sub-dataset, relative to the sum of the weights. A sub-dataset
+            with weight 0 is not sampled.
+        epoch_length (int, optional): The number of samples of an epoch over
+            all the ranks. Defaults to None, the length of the dataset.
+        seed (int, optional): Random seed used to sample the sub-datasets.
+            This number should be identical across all processes in the
+            distributed group. Defaults to None.
+        round_up (bool): Whether to add extra samples to make the number of
+            samples evenly divisible by the world size. Defaults to True.
+    """
+
+    def __init__(self,
+                 dataset: Sized,
+                 weights: List[Union[int, float]],
+                 epoch_length: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 round_up: bool = True) -> None:
+        assert hasattr(dataset, 'cumulative_sizes'), \
+            'The dataset must have the `cumulative_sizes` of its ' \
+            f'sub-datasets, but got {dataset.__class__.__name__}'
+        cumulative_sizes = list(dataset.cumulative_sizes)
+        assert len(weights) == len(cumulative_sizes), \
+            'The length of weights must be equal to the number of ' \
+            f'datasets, but got weights={weights}'
+        assert min(weights) >= 0 and sum(weights) > 0, \
+            f'weights must be non-negative with a positive sum, ' \
+            f'but got weights={weights}'
+
+        self.epoch_length = len(dataset) if epoch_length is None \
+            else epoch_length
+        super().__init__(dataset, shuffle=True, seed=seed, round_up=round_up)
+
+        self.weights = weights
+        self.offsets = [0] + cumulative_sizes[:-1]
+        self.sizes = [
+            end - start for start, end in zip(self.offsets, cumulative_sizes)
+        ]
+        assert all(size > 0 for size, weight in zip(self.sizes, weights)
+                   if weight > 0), 'The weighted sub-datasets must not be empty'
+
+        # the number of samples of every sub-dataset in an epoch, rounded
+        # with the largest remainders so that they sum to the epoch length
+        weights = torch.tensor(weights, dtype=torch.float64)
+        expected = weights / weights.sum() * self.epoch_length
+        num_per_source = expected.floor().long()
+        remainder = self.epoch_length - int(num_per_source.sum())
+        num_per_source[(expected - num_per_source).argsort(
+            descending=True)[:remainder]] += 1
+        self.num_per_source = num_per_source.tolist()
+
+        if self.round_up:
+            self.num_samples = -(-self.epoch_length // self.world_size)
+            self.total_size = self.num_samples * self.world_size
+        else:
+            self.num_samples = -(-(self.epoch_length - self.rank) //
+                                 self.world_size)
+            self.total_size = self.epoch_length
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate the indices."""
+        g = torch.Generator()
+        g.manual_seed(self.seed + self.epoch)
+        indices = []
+        for offset, size, num in zip(self.offsets, self.sizes,
+                                     self.num_per_source):
+            if num == 0:
+                continue
+            num_repeats = -(-num // size)
+            local_indices = torch.cat([
+                torch.randperm(size, generator=g) for _ in range(num_repeats)
+            ])[:num]
+            indices.append(local_indices + offset)
+        indices = torch.cat(indices)
+        indices = indices[torch.randperm(len(indices), generator=g)].tolist()
+
+        # add extra samples to make it evenly divisible
+        if self.round_up:
+            indices = (
+                indices *
+                int(self.total_size / len(indices) + 1))[:self.total_size]
+
+        # subsample
+        indices = indices[self.rank:self.total_size:self.world_size]
+
+        # skip the samples consumed before resuming, only once
+        start_index, self._start_index = self._start_index, 0
+        return iter(indices[start_index:])
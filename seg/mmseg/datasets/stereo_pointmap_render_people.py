@@ -6,6 +6,7 @@
 
 from mmseg.registry import DATASETS
 from .basesegdataset import BaseSegDataset
+from .render_people_index import load_sample_index
 
 import numpy as np
 import os
@@ -31,8 +32,13 @@ class StereoPointmapRenderPeopleDataset(BaseSegDataset):
     """
 
     def __init__(self,
+                 sample_index_dir: Optional[str] = None,
                  **kwargs) -> None:
 
+        self.sample_index_dir = sample_index_dir ## defaults to data_root/.sample_index
+
+        ## the data list is backed by the memory mapped sample index, which the workers share already
+        kwargs['serialize_data'] = False
         super().__init__(**kwargs)
         return
 
@@ -42,45 +48,18 @@ class StereoPointmapRenderPeopleDataset(BaseSegDataset):
         Returns:
             list[dict]: All data info of dataset.
         """
-        data_list = []
-
-        self.pointmap_dir = os.path.join(self.data_root, 'pointmap')
-        self.rgb_dir = os.path.join(self.data_root, 'rgb')
-        self.mask_dir = os.path.join(self.data_root, 'mask')
-        self.depth_dir = os.path.join(self.data_root, 'depth')
-        self.K_dir = os.path.join(self.data_root, 'camera_intrinsics')
-        self.M_dir = os.path.join(self.data_root, 'camera_extrinsics') ## cv camera extrinsics
-
         print('\033[92mLoading StereoPointmapRenderPeople!\033[0m')
 
-        mesh_names = [x for x in os.listdir(self.pointmap_dir) if x.endswith('.txt')]
-
-        self.mesh_names_to_samples = {}
-
-        sample_count = 0
-        for mesh_name in mesh_names:
-            mesh_path = os.path.join(self.pointmap_dir, mesh_name)
-            with open(mesh_path, 'r') as f:
-                sample_names = f.readlines()
-                sample_names = [x.strip() for x in sample_names] ## these are the sample_names with the current mesh_name
+        ## paths, mask bboxes and cameras from the sample index of data_root, rebuilt when a directory changes
+        index = load_sample_index(self.data_root, self.sample_index_dir)
+        columns = ['rgb', 'mask', 'depth', 'K', 'M']
 
-            for sample_name in sample_names:
-                if mesh_name not in self.mesh_names_to_samples:
-                    self.mesh_names_to_samples[mesh_name] = []
-
-                self.mesh_names_to_samples[mesh_name].append(sample_count) ## at index sample_count in the data_list
-
-                sample_info = {
-                    'rgb_path': os.path.join(self.rgb_dir, sample_name + '.png'),
-                    'mask_path': os.path.join(self.mask_dir, sample_name + '.png'),
-                    'depth_path': os.path.join(self.depth_dir, sample_name + '.npy'),
-                    'K_path': os.path.join(self.K_dir, sample_name + '.txt'),
-                    'M_path': os.path.join(self.M_dir, sample_name + '.txt'),
-                    'mesh_name': mesh_name,
-                }
-
-                data_list.append(sample_info)
-                sample_count += 1
+        ## samples rendered from a mesh listed in pointmap/*.txt, with at least one other view of the mesh
+        rows = index.select(columns)
+        rows = rows[np.asarray(index.mesh)[rows] >= 0]
+        mesh = np.asarray(index.mesh)[rows]
+        rows = rows[np.bincount(mesh)[mesh] > 1] if len(rows) > 0 else rows
+        data_list = index.samples(columns, rows)
 
         print('\033[92mDone! StereoPointmapRenderPeople. Loaded total samples: {}\033[0m'.format(len(data_list)))
         return data_list
@@ -89,8 +68,7 @@ class StereoPointmapRenderPeopleDataset(BaseSegDataset):
         data_idx_info = copy.deepcopy(self.data_list[idx])
 
         ## sample other mesh
-        mesh_name = data_idx_info['mesh_name']
-        other_idx = random.choice([i for i in self.mesh_names_to_samples[mesh_name] if i != idx])
+        other_idx = int(random.choice(self.data_list.same_mesh(idx)))
         other_data_idx_info = copy.deepcopy(self.data_list[other_idx])
 
         data_info = self.get_data_info_helper(data_idx_info)
@@ -108,20 +86,13 @@ class StereoPointmapRenderPeopleDataset(BaseSegDataset):
         mask = mask[:, :, 0] ##
 
         depth = np.load(data_info['depth_path']) ## H x W, ## is not in 0 to 1
-        K = np.loadtxt(data_info['K_path']) ## intrinsics, 3 x 3
-        M = np.loadtxt(data_info['M_path']) ## extrinsics, 4 x 4
+        K = data_info['K'] ## intrinsics, 3 x 3
+        M = data_info['M'] ## extrinsics, 4 x 4
 
         if img is None or mask is None or depth is None:
             return None
 
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-
-        # Find the bounding box's bounds
-        y1, y2 = np.where(rows)[0][[0, -1]]
-        x1, x2 = np.where(cols)[0][[0, -1]]
-
-        bbox = np.array([x1, y1, x2, y2], dtype=np.float32).reshape(1, 4)
+        bbox = data_info['bbox'] ## precomputed from the mask by the sample index
 
         data_info = {
             'img': img,
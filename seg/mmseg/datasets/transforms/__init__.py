@@ -4,35 +4,27 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .formatting import PackSegInputs
-from .loading import (LoadAnnotations, LoadBiomedicalAnnotation,
-                      LoadBiomedicalData, LoadBiomedicalImageFromFile,
-                      LoadDepthAnnotation, LoadImageFromNDArray,
-                      LoadMultipleRSImageFromFile, LoadSingleRSImageFromFile, LoadImage,
-                      )
-# yapf: disable
-from .transforms import (CLAHE, AdjustGamma, Albu, BioMedical3DPad,
-                         BioMedical3DRandomCrop, BioMedical3DRandomFlip,
-                         BioMedicalGaussianBlur, BioMedicalGaussianNoise,
-                         BioMedicalRandomGamma, ConcatCDInput, GenerateEdge,
-                         PhotoMetricDistortion, RandomCrop, RandomCutOut,
-                         RandomDepthMix, RandomFlip, RandomMosaic,
-                         RandomRotate, RandomRotFlip, Rerange, Resize,
-                         ResizeShortestEdge, ResizeToMultiple, RGB2Gray,
-                         SegRescale, RandomBackground,
-                         RandomBrightness,
-                         )
+from mmengine.utils import lazy_import
 
-# yapf: enable
-__all__ = [
-    'LoadAnnotations', 'RandomCrop', 'BioMedical3DRandomCrop', 'SegRescale',
-    'PhotoMetricDistortion', 'RandomRotate', 'AdjustGamma', 'CLAHE', 'Rerange',
-    'RGB2Gray', 'RandomCutOut', 'RandomMosaic', 'PackSegInputs',
-    'ResizeToMultiple', 'LoadImageFromNDArray', 'LoadBiomedicalImageFromFile',
-    'LoadBiomedicalAnnotation', 'LoadBiomedicalData', 'GenerateEdge',
-    'ResizeShortestEdge', 'BioMedicalGaussianNoise', 'BioMedicalGaussianBlur',
-    'BioMedical3DRandomFlip', 'BioMedicalRandomGamma', 'BioMedical3DPad',
-    'RandomRotFlip', 'Albu', 'LoadSingleRSImageFromFile', 'ConcatCDInput',
-    'LoadMultipleRSImageFromFile', 'LoadDepthAnnotation', 'RandomDepthMix',
-    'RandomFlip', 'Resize', 'LoadImage', 'RandomBackground', 'RandomBrightness',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'formatting': ['PackSegInputs'],
+        'loading': [
+            'LoadAnnotations', 'LoadBiomedicalAnnotation',
+            'LoadBiomedicalData', 'LoadBiomedicalImageFromFile',
+            'LoadDepthAnnotation', 'LoadImageFromNDArray',
+            'LoadMultipleRSImageFromFile', 'LoadSingleRSImageFromFile',
+            'LoadImage'
+        ],
+        'transforms': [
+            'CLAHE', 'AdjustGamma', 'Albu', 'BioMedical3DPad',
+            'BioMedical3DRandomCrop', 'BioMedical3DRandomFlip',
+            'BioMedicalGaussianBlur', 'BioMedicalGaussianNoise',
+            'BioMedicalRandomGamma', 'ConcatCDInput', 'GenerateEdge',
+            'PhotoMetricDistortion', 'RandomCrop', 'RandomCutOut',
+            'RandomDepthMix', 'RandomFlip', 'RandomMosaic', 'RandomRotate',
+            'RandomRotFlip', 'Rerange', 'Resize', 'ResizeShortestEdge',
+            'ResizeToMultiple', 'RGB2Gray', 'SegRescale', 'RandomBackground',
+            'RandomBrightness'
+        ],
+    })
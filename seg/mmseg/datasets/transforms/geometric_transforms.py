@@ -0,0 +1,348 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import math
+from typing import Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from mmcv.transforms.base import BaseTransform
+from mmcv.transforms.utils import cache_randomness
+
+from mmseg.registry import TRANSFORMS
+
+cv2_interp_codes = {
+    'nearest': cv2.INTER_NEAREST,
+    'bilinear': cv2.INTER_LINEAR,
+    'bicubic': cv2.INTER_CUBIC,
+}
+
+
+def resize_matrix(src_size: Tuple[int, int],
+                  dst_size: Tuple[int, int]) -> np.ndarray:
+    """The affine matrix of ``cv2.resize`` from ``src_size`` to ``dst_size``,
+    both (w, h), in pixel center coordinates."""
+    sx, sy = dst_size[0] / src_size[0], dst_size[1] / src_size[1]
+    return np.array([[sx, 0, 0.5 * sx - 0.5], [0, sy, 0.5 * sy - 0.5],
+                     [0, 0, 1]])
+
+
+def translate_matrix(tx: float, ty: float) -> np.ndarray:
+    return np.array([[1, 0, tx], [0, 1, ty], [0, 0, 1]], dtype=np.float64)
+
+
+@TRANSFORMS.register_module()
+class RandomGeometricWarp(BaseTransform):
+    """Randomly resize, crop, rotate and flip the image and the dense
+    annotations with one warp per field.
+
+    This transform replaces the chain of separate transforms of the dense
+    pipelines, e.g.
+
+    .. code-block:: python
+
+        dict(type='RandomResize', scale=(768, 1024), ratio_range=(0.2, 2.0),
+             keep_ratio=True),
+        dict(type='RandomDepthResizeCompensate'),
+        dict(type='RandomDepthCrop', crop_size=(1024, 768)),
+        dict(type='DepthResize', scale=(768, 1024)),
+        dict(type='DepthRandomRotate', prob=0.5, degree=60,
+             depth_pad_val=1e10),
+        dict(type='DepthRandomFlip', prob=0.5),
+
+    with
+
+    .. code-block:: python
+
+        dict(type='RandomGeometricWarp', scale=(768, 1024),
+             ratio_range=(0.2, 2.0), crop_size=(1024, 768),
+             rotate_prob=0.5, degree=60, flip_prob=0.5),
+
+    The augmentations are sampled with the random draws of the chain, which
+    has a rotation step only if ``rotate_prob > 0``, and accumulated into one
+    affine matrix. Every field is then warped once with ``cv2.warpAffine``
+    from the part of the original array that the crop covers, without the
+    intermediate resized, cropped and rotated copies. The results match the
+    chain up to the interpolation at the borders of the crop.
+
+    The intrinsics ``K`` are multiplied by the same matrix, and the
+    horizontal flip mirrors the camera as :class:`PointmapRandomFlip` does,
+    negating the first row of the extrinsics ``M``. The x and y components
+    of the normals are rotated with the image and x is negated by the flip.
+
+    Required Keys:
+
+    - img
+    - mask, gt_depth, gt_normal, gt_val (optional)
+    - K, M (optional)
+
+    Modified Keys:
+
+    - img
+    - img_shape
+    - mask, gt_depth, gt_normal, gt_val (optional)
+    - K, M (optional)
+
+    Added Keys:
+
+    - scale_factor
+    - flip
+    - flip_direction
+
+    Args:
+        scale (tuple[int, int]): The output size (w, h), also the scale of
+            the random resize.
+        ratio_range (tuple[float, float], optional): The range of the random
+            resize ratio. The image is first rescaled to ``scale`` times the
+            ratio, keeping its aspect ratio. Defaults to None, which does not
+            resize before cropping.
+        crop_size (tuple[int, int], optional): The random crop size (h, w),
+            clipped to the resized image. The crop is then resized to
+            ``scale``. Defaults to None, which takes the whole image.
+        rotate_prob (float): The probability of rotating. Defaults to 0.
+        degree (float | tuple[float, float]): The range of the rotation
+            angle, clockwise. Defaults to 0.
+        flip_prob (float): The probability of a horizontal flip. Defaults to
+            0.
+        interpolation (dict, optional): The interpolation of every field.
+            Defaults to bilinear for the image and nearest for the
+            annotations.
+        pad_val (dict, optional): The border value of every field, where
+            the rotation leaves the image. Defaults to 0 for the image, the
+            mask and the normals and 1e10 for the depth.
+        normal_y_up (bool): Whether the y axis of the normals points up,
+            which rotates them the other way. Defaults to False, the y axis
+            of the camera pointing down as in ``K``.
+    """
+
+    default_interpolation = dict(
+        img='bilinear',
+        mask='nearest',
+        gt_depth='nearest',
+        gt_normal='nearest',
+        gt_val='nearest')
+    default_pad_val = dict(
+        img=0, mask=0, gt_depth=1e10, gt_normal=0, gt_val=1e10)
+
+    def __init__(self,
+                 scale: Tuple[int, int],
+                 ratio_range: Optional[Tuple[float, float]] = None,
+                 crop_size: Optional[Tuple[int, int]] = None,
+                 rotate_prob: float = 0.,
+                 degree: Union[float, Tuple[float, float]] = 0.,
+                 flip_prob: float = 0.,
+                 interpolation: Optional[Dict[str, str]] = None,
+                 pad_val: Optional[Dict[str, float]] = None,
+                 normal_y_up: bool = False) -> None:
+        super().__init__()
+        assert len(scale) == 2
+        self.scale = tuple(scale)
+        self.ratio_range = ratio_range
+        if isinstance(crop_size, int):
+            crop_size = (crop_size, crop_size)
+        self.crop_size = crop_size
+        assert 0 <= rotate_prob <= 1 and 0 <= flip_prob <= 1
+        self.rotate_prob = rotate_prob
+        if isinstance(degree, (float, int)):
+            degree = (-degree, degree)
+        assert len(degree) == 2, \
+            f'degree {degree} should be a tuple of (min, max)'
+        self.degree = tuple(degree)
+        self.flip_prob = flip_prob
+        self.interpolation = dict(self.default_interpolation,
+                                  **(interpolation or dict()))
+        self.pad_val = dict(self.default_pad_val, **(pad_val or dict()))
+        self.normal_y_up = normal_y_up
+
+    @cache_randomness
+    def _sample_params(self, img_shape: Tuple[int, int]) -> dict:
+        """Sample the augmentations in the order and with the distributions
+        of the chain they replace."""
+        h, w = img_shape
+        if self.ratio_range is not None:
+            # `RandomResize` with `keep_ratio=True`, as `mmcv.imrescale`
+            min_ratio, max_ratio = self.ratio_range
+            ratio = np.random.random_sample() * (max_ratio -
+                                                 min_ratio) + min_ratio
+            target = (int(self.scale[0] * ratio), int(self.scale[1] * ratio))
+            scale_factor = min(
+                max(target) / max(h, w),
+                min(target) / min(h, w))
+            resized = (int(w * scale_factor + 0.5),
+                       int(h * scale_factor + 0.5))
+        else:
+            resized = (w, h)
+
+        if self.crop_size is not None:
+            margin_h = max(resized[1] - self.crop_size[0], 0)
+            margin_w = max(resized[0] - self.crop_size[1], 0)
+            offset_h = np.random.randint(0, margin_h + 1)
+            offset_w = np.random.randint(0, margin_w + 1)
+            crop = (offset_w, offset_h,
+                    min(offset_w + self.crop_size[1], resized[0]),
+                    min(offset_h + self.crop_size[0], resized[1]))
+        else:
+            crop = (0, 0) + resized
+
+        angle = 0.
+        if self.rotate_prob > 0:
+            # `DepthRandomRotate` draws both, the chains without a rotation
+            # step draw neither
+            rotate = np.random.rand() < self.rotate_prob
+            angle = np.random.uniform(min(*self.degree), max(*self.degree))
+            angle = angle if rotate else 0.
+        flip = np.random.rand() < self.flip_prob
+        return dict(resized=resized, crop=crop, angle=angle, flip=flip)
+
+    def _warp_matrix(self, img_shape: Tuple[int, int],
+                     params: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """The affine matrix of the chain, from the original image to the
+        output, and the rotation of the image plane."""
+        h, w = img_shape
+        x1, y1, x2, y2 = params['crop']
+        matrix = resize_matrix((w, h), params['resized'])
+        matrix = translate_matrix(-x1, -y1) @ matrix
+        matrix = resize_matrix((x2 - x1, y2 - y1), self.scale) @ matrix
+
+        # `mmcv.imrotate` around the center of the output
+        rotation = np.eye(3)
+        rotation[:2] = cv2.getRotationMatrix2D(
+            ((self.scale[0] - 1) * 0.5, (self.scale[1] - 1) * 0.5),
+            -params['angle'], 1.0)
+        matrix = rotation @ matrix
+        if params['flip']:
+            matrix = np.array([[-1, 0, self.scale[0] - 1], [0, 1, 0],
+                               [0, 0, 1]]) @ matrix
+        return matrix, rotation[:2, :2]
+
+    def _source_roi(self, img_shape: Tuple[int, int],
+                    params: dict) -> Tuple[int, int, int, int]:
+        """The pixels of the original image covered by the crop, with one
+        more pixel on every side for the interpolation at the borders."""
+        h, w = img_shape
+        x1, y1, x2, y2 = params['crop']
+        sx = params['resized'][0] / w
+        sy = params['resized'][1] / h
+        return (max(math.floor(x1 / sx) - 1, 0), max(
+            math.floor(y1 / sy) - 1, 0), min(math.ceil(x2 / sx) + 1, w),
+                min(math.ceil(y2 / sy) + 1, h))
+
+    def _warp(self, key: str, array: np.ndarray, matrix: np.ndarray,
+              roi: Tuple[int, int, int, int]) -> np.ndarray:
+        x1, y1, x2, y2 = roi
+        # the pixels outside of the crop are padded as by the chain
+        matrix = matrix @ translate_matrix(x1, y1)
+        pad_val = self.pad_val.get(key, 0)
+        channels = array.shape[2] if array.ndim == 3 else 1
+        warped = cv2.warpAffine(
+            array[y1:y2, x1:x2],
+            matrix[:2],
+            self.scale,
+            flags=cv2_interp_codes[self.interpolation.get(key, 'nearest')],
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=(pad_val, ) * min(channels, 4))
+        if array.ndim == 3 and warped.ndim == 2:
+            warped = warped[..., None]
+        return warped
+
+    def _resize(self, key: str, array: np.ndarray, matrix: np.ndarray,
+                roi: Tuple[int, int, int, int],
+                flip: bool) -> Optional[np.ndarray]:
+        """Without rotation, resize the crop with ``cv2.resize``, which is a
+        few times faster than ``cv2.warpAffine``. The scale is rounded so
+        that the resized crop has whole pixels, which shifts the output by
+        less than half a pixel."""
+        x1, y1, x2, y2 = roi
+        # the flip is applied last, see `_warp_matrix`
+        if flip:
+            matrix = np.array([[-1, 0, self.scale[0] - 1], [0, 1, 0],
+                               [0, 0, 1]]) @ matrix
+        resized_size = (max(round((x2 - x1) * matrix[0, 0]), 1),
+                        max(round((y2 - y1) * matrix[1, 1]), 1))
+        # align the centers of the roi in the output and the resized roi
+        center = np.array([(x1 + x2 - 1) * 0.5, (y1 + y2 - 1) * 0.5, 1])
+        out_center = (matrix @ center)[:2]
+        resized_center = (np.array(resized_size) - 1) * 0.5
+        ox, oy = np.round(resized_center - out_center).astype(int)
+        if ox < 0 or oy < 0 or ox + self.scale[0] > resized_size[0] or \
+                oy + self.scale[1] > resized_size[1]:
+            return None
+        resized = cv2.resize(
+            array[y1:y2, x1:x2],
+            resized_size,
+            interpolation=cv2_interp_codes[self.interpolation.get(
+                key, 'nearest')])
+        resized = resized[oy:oy + self.scale[1], ox:ox + self.scale[0]]
+        # `cv2.flip` copies the crop several times faster than numpy
+        resized = cv2.flip(resized, 1) if flip else \
+            np.ascontiguousarray(resized)
+        if array.ndim == 3 and resized.ndim == 2:
+            resized = resized[..., None]
+        return resized
+
+    def transform(self, results: dict) -> dict:
+        """Transform function to resize, crop, rotate and flip the image and
+        the dense annotations.
+
+        Args:
+            results (dict): Result dict from loading pipeline.
+
+        Returns:
+            dict: The warped results.
+        """
+        img_shape = results['img'].shape[:2]
+        params = self._sample_params(img_shape)
+        matrix, rotation = self._warp_matrix(img_shape, params)
+        roi = self._source_roi(img_shape, params)
+
+        for key in self.interpolation:
+            if results.get(key, None) is None:
+                continue
+            warped = None
+            if params['angle'] == 0:
+                warped = self._resize(key, results[key], matrix, roi,
+                                      params['flip'])
+            if warped is None:
+                warped = self._warp(key, results[key], matrix, roi)
+            results[key] = warped
+
+        if results.get('gt_normal', None) is not None:
+            normal = results['gt_normal']
+            if params['angle'] != 0:
+                linear = rotation.T if self.normal_y_up else rotation
+                normal[..., :2] = normal[..., :2] @ linear.T.astype(
+                    normal.dtype)
+            if params['flip']:
+                normal[..., 0] = -normal[..., 0]
+
+        if 'K' in results:
+            K = results['K']
+            K_new = matrix @ K
+            if params['flip']:
+                # mirror the camera instead of negating the focal length
+                K_new[:, 0] = -K_new[:, 0]
+            results['K'] = K_new.astype(K.dtype)
+        if 'M' in results and params['flip']:
+            results['M'] = results['M'].copy()
+            results['M'][0, :] = -results['M'][0, :]
+
+        results['img_shape'] = results['img'].shape[:2]
+        results['scale_factor'] = (self.scale[0] / img_shape[1],
+                                   self.scale[1] / img_shape[0])
+        results['flip'] = params['flip']
+        results['flip_direction'] = 'horizontal' if params['flip'] else None
+        return results
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += f'(scale={self.scale}, ' \
+                    f'ratio_range={self.ratio_range}, ' \
+                    f'crop_size={self.crop_size}, ' \
+                    f'rotate_prob={self.rotate_prob}, ' \
+                    f'degree={self.degree}, ' \
+                    f'flip_prob={self.flip_prob}, ' \
+                    f'pad_val={self.pad_val})'
+        return repr_str
@@ -303,10 +303,48 @@ class PointmapResize(BaseTransform):
         return results
 
 
+def depth_to_pointmap(depth, K, mask=None, background_val=-1000):
+    # Create a grid of pixel coordinates
+    height, width = depth.shape
+    cols, rows = np.meshgrid(np.arange(width), np.arange(height))
+
+    z = depth
+    x = (cols - K[0, 2]) * z / K[0, 0]
+    y = (rows - K[1, 2]) * z / K[1, 1]
+    pointmap = np.stack([x, y, z], axis=-1) ## H x W x 3
+
+    if mask is not None:
+        pointmap[mask == 0] = background_val
+    return pointmap
+
+
 @TRANSFORMS.register_module()
 class GeneratePointmapTarget(BaseTransform):
-    def __init__(self, background_val=-1000):
+    """Generate the pointmap target from the depth, mask and intrinsics.
+
+    With ``unproject_on_device=True`` the pointmap is not built in the
+    dataloader worker: the depth is cast to ``depth_dtype`` and packed with
+    the mask and ``K``, and the data preprocessor unprojects the batch on
+    the device, see :func:`mmseg.models.utils.unproject_depth`.
+
+    Args:
+        background_val (float): The value of the background points. The loss
+            uses a threshold of -100 to pick them up. Defaults to -1000.
+        unproject_on_device (bool): Whether to leave the unprojection to the
+            data preprocessor. Defaults to False.
+        depth_dtype (str): The dtype of the packed depth when
+            ``unproject_on_device=True``, 'float32' or 'float16'.
+            Defaults to 'float32'.
+    """
+
+    def __init__(self,
+                 background_val=-1000,
+                 unproject_on_device=False,
+                 depth_dtype='float32'):
+        assert depth_dtype in ('float32', 'float16')
         self.background_val = background_val
+        self.unproject_on_device = unproject_on_device
+        self.depth_dtype = depth_dtype
         return
 
     def transform(self, results: dict) -> dict:
@@ -314,22 +352,32 @@ class GeneratePointmapTarget(BaseTransform):
         depth = results['gt_depth']
         K = results['K']
 
-        # Create a grid of pixel coordinates
-        height, width = depth.shape
-        cols, rows = np.meshgrid(np.arange(width), np.arange(height))
-
-        z = depth
-        x = (cols - K[0, 2]) * z / K[0, 0]
-        y = (rows - K[1, 2]) * z / K[1, 1]
-        gt_pointmap = np.stack([x, y, z], axis=-1) ## H x W x 3
+        if self.unproject_on_device:
+            results['gt_depth'] = depth.astype(self.depth_dtype, copy=False)
+            results['pointmap_background_val'] = self.background_val
+            return results
 
-        gt_pointmap[mask == 0] = self.background_val ## set the background to -1000. the loss uses a threshold of -10 to pick up.
+        gt_pointmap = depth_to_pointmap(depth, K, mask, self.background_val) ## set the background to -1000. the loss uses a threshold of -10 to pick up.
         results['gt_depth_map'] = gt_pointmap ## the key gt_depth_map is used for legacy reasons.
 
         return results
 
     def __repr__(self):
-        return self.__class__.__name__
+        repr_str = self.__class__.__name__
+        repr_str += f'(background_val={self.background_val}, '
+        repr_str += f'unproject_on_device={self.unproject_on_device}, '
+        repr_str += f'depth_dtype={self.depth_dtype})'
+        return repr_str
+
+
+def pack_depth_and_mask(data_sample, results):
+    """Pack the depth and mask that the data preprocessor unprojects."""
+    gt_depth = np.ascontiguousarray(results['gt_depth'][None]) ## 1 x H x W
+    gt_mask = np.ascontiguousarray(results['mask'][None] > 0) ## 1 x H x W
+    data_sample.set_data(
+        dict(
+            gt_depth=PixelData(data=to_tensor(gt_depth)),
+            gt_mask=PixelData(data=to_tensor(gt_mask))))
 
 
 @TRANSFORMS.register_module()
@@ -367,10 +415,17 @@ class PackPointmapInputs(BaseTransform):
             gt_depth_data = dict(data=to_tensor(gt_depth_map.copy()))
             data_sample.set_data(dict(gt_depth_map=PixelData(**gt_depth_data)))
 
+        ## unprojected to gt_depth_map by the data preprocessor
+        elif 'pointmap_background_val' in results:
+            pack_depth_and_mask(data_sample, results)
+
         img_meta = {}
         for key in self.meta_keys:
             if key in results:
                 img_meta[key] = results[key]
+        if 'pointmap_background_val' in results:
+            img_meta['pointmap_background_val'] = \
+                results['pointmap_background_val']
         data_sample.set_metainfo(img_meta)
         packed_results['data_samples'] = data_sample
 
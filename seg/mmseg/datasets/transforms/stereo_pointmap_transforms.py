@@ -29,6 +29,7 @@ from mmengine.registry import TRANSFORMS as ENGINE_TRANSFORMS
 from mmcv.transforms import to_tensor
 from mmseg.structures import SegDataSample
 from mmengine.structures import PixelData
+from .pointmap_transforms import depth_to_pointmap, pack_depth_and_mask
 
 Number = Union[int, float]
 
@@ -49,12 +50,17 @@ class GenerateStereoPointmapCorrespondences(BaseTransform):
         K1 = data_info['K'] ## 3 x 3
         K2 = other_data_info['K'] ## 3 x 3
 
-        pointmap1 = data_info['gt_depth_map'].copy() ## 1024 x 768 x 3
-        pointmap2 = other_data_info['gt_depth_map'].copy() ## 1024 x 768 x 3
-
         mask1 = data_info['mask']
         mask2 = other_data_info['mask']
 
+        ## the pointmaps are unprojected on the device, only for the correspondences here
+        if 'gt_depth_map' in data_info:
+            pointmap1 = data_info['gt_depth_map'].copy() ## 1024 x 768 x 3
+            pointmap2 = other_data_info['gt_depth_map'].copy() ## 1024 x 768 x 3
+        else:
+            pointmap1 = depth_to_pointmap(data_info['gt_depth'].astype(np.float64), K1, mask1, data_info['pointmap_background_val'])
+            pointmap2 = depth_to_pointmap(other_data_info['gt_depth'].astype(np.float64), K2, mask2, other_data_info['pointmap_background_val'])
+
         # Find correspondences
         pixel_coords1, pixel_coords2, overlap_percentage = self.find_correspondences(pointmap1, pointmap2, mask1, mask2, M1, M2, K1, K2)
 
@@ -180,6 +186,10 @@ class StereoPointmapTransformSecondaryToAnchor(BaseTransform):
         other_data_info = results['results2']
 
         # ## transform the point_map for other_data_info to the anchor coordinate system of data_info
+        ## done by the data preprocessor after the unprojection
+        if 'gt_depth_map' not in other_data_info:
+            return results
+
         M1 = data_info['M']
         M2 = other_data_info['M']
         pointmap = other_data_info['gt_depth_map']
@@ -298,6 +308,13 @@ class PackStereoPointmapInputs(BaseTransform):
             gt_depth_data = dict(data=to_tensor(gt_depth_map.copy()))
             data_sample1.set_data(dict(gt_depth_map=PixelData(**gt_depth_data)))
 
+        ## unprojected, transformed to the anchor camera and clamped by the data preprocessor
+        elif 'pointmap_background_val' in results1:
+            pack_depth_and_mask(data_sample1, results1)
+            data_sample1.set_metainfo(dict(
+                pointmap_background_val=results1['pointmap_background_val'],
+                pointmap_depth_range=(min_depth, max_depth)))
+
         if 'gt_depth_map' in results2:
             ## clamp the depth to [min_depth, max_depth] for valid pixels
             gt_depth_map = results2['gt_depth_map'] ## 1024 x 768 x 3
@@ -309,6 +326,13 @@ class PackStereoPointmapInputs(BaseTransform):
             gt_depth_data = dict(data=to_tensor(gt_depth_map.copy()))
             data_sample2.set_data(dict(gt_depth_map=PixelData(**gt_depth_data)))
 
+        ## unprojected, transformed to the anchor camera and clamped by the data preprocessor
+        elif 'pointmap_background_val' in results2:
+            pack_depth_and_mask(data_sample2, results2)
+            data_sample2.set_metainfo(dict(
+                pointmap_background_val=results2['pointmap_background_val'],
+                pointmap_depth_range=(min_depth, max_depth)))
+
         img_meta1 = {}
         img_meta2 = {}
 
@@ -4,15 +4,16 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .hooks import SegVisualizationHook
-from .optimizers import (ForceDefaultOptimWrapperConstructor,
-                         LayerDecayOptimizerConstructor,
-                         LayerDecayOptimWrapperConstructor,
-                         LearningRateDecayOptimizerConstructor)
-from .schedulers import PolyLRRatio
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'LearningRateDecayOptimizerConstructor', 'LayerDecayOptimizerConstructor',
-    'SegVisualizationHook', 'PolyLRRatio',
-    'ForceDefaultOptimWrapperConstructor', 'LayerDecayOptimWrapperConstructor',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'hooks': ['SegVisualizationHook'],
+        'optimizers': [
+            'ForceDefaultOptimWrapperConstructor',
+            'LayerDecayOptimizerConstructor',
+            'LayerDecayOptimWrapperConstructor',
+            'LearningRateDecayOptimizerConstructor'
+        ],
+        'schedulers': ['PolyLRRatio'],
+    })
@@ -4,13 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .visualization_hook import SegVisualizationHook
-from .general_seg_visualization_hook import GeneralSegVisualizationHook
-from .depth_visualization_hook import DepthVisualizationHook
-from .normal_visualization_hook import NormalVisualizationHook
-from .general_visualization_hook import GeneralVisualizationHook
+from mmengine.utils import lazy_import
 
-__all__ = ['SegVisualizationHook', 'GeneralSegVisualizationHook', 'DepthVisualizationHook', \
-            'NormalVisualizationHook', 
-            'GeneralVisualizationHook', 
-            ]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'visualization_hook': ['SegVisualizationHook'],
+        'general_seg_visualization_hook': ['GeneralSegVisualizationHook'],
+        'depth_visualization_hook': ['DepthVisualizationHook'],
+        'normal_visualization_hook': ['NormalVisualizationHook'],
+        'general_visualization_hook': ['GeneralVisualizationHook'],
+    })
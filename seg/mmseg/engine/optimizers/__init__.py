@@ -4,14 +4,17 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .force_default_constructor import ForceDefaultOptimWrapperConstructor
-from .layer_decay_optimizer_constructor import (
-    LayerDecayOptimizerConstructor, LearningRateDecayOptimizerConstructor)
-from .layer_decay_optim_wrapper import LayerDecayOptimWrapperConstructor
-from .stereo_pointmap_layer_decay_optim_wrapper import StereoPointmapLayerDecayOptimWrapperConstructor
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'LearningRateDecayOptimizerConstructor', 'LayerDecayOptimizerConstructor',
-    'ForceDefaultOptimWrapperConstructor', 'LayerDecayOptimWrapperConstructor',
-    'StereoPointmapLayerDecayOptimWrapperConstructor'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'force_default_constructor': ['ForceDefaultOptimWrapperConstructor'],
+        'layer_decay_optimizer_constructor': [
+            'LayerDecayOptimizerConstructor',
+            'LearningRateDecayOptimizerConstructor'
+        ],
+        'layer_decay_optim_wrapper': ['LayerDecayOptimWrapperConstructor'],
+        'stereo_pointmap_layer_decay_optim_wrapper': [
+            'StereoPointmapLayerDecayOptimWrapperConstructor'
+        ],
+    })
@@ -4,6 +4,9 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .poly_ratio_scheduler import PolyLRRatio
+from mmengine.utils import lazy_import
 
-__all__ = ['PolyLRRatio']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'poly_ratio_scheduler': ['PolyLRRatio'],
+    })
@@ -4,8 +4,11 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .citys_metric import CityscapesMetric
-from .depth_metric import DepthMetric
-from .iou_metric import IoUMetric
+from mmengine.utils import lazy_import
 
-__all__ = ['IoUMetric', 'CityscapesMetric', 'DepthMetric']
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'citys_metric': ['CityscapesMetric'],
+        'depth_metric': ['DepthMetric'],
+        'iou_metric': ['IoUMetric'],
+    })
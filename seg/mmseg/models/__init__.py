@@ -4,20 +4,24 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .assigners import *  # noqa: F401,F403
-from .backbones import *  # noqa: F401,F403
-from .builder import (BACKBONES, HEADS, LOSSES, SEGMENTORS, build_backbone,
-                      build_head, build_loss, build_segmentor)
-from .data_preprocessor import SegDataPreProcessor
-from .decode_heads import *  # noqa: F401,F403
-from .losses import *  # noqa: F401,F403
-from .necks import *  # noqa: F401,F403
-from .segmentors import *  # noqa: F401,F403
-from .text_encoder import *  # noqa: F401,F403
-from .data_preprocessor import StereoPointmapDataPreProcessor, StereoCorrespondencesDataPreProcessor
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BACKBONES', 'HEADS', 'LOSSES', 'SEGMENTORS', 'build_backbone',
-    'build_head', 'build_loss', 'build_segmentor', 'SegDataPreProcessor',
-    'StereoPointmapDataPreProcessor', 'StereoCorrespondencesDataPreProcessor'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'assigners': '*',
+        'backbones': '*',
+        'builder': [
+            'BACKBONES', 'HEADS', 'LOSSES', 'SEGMENTORS', 'build_backbone',
+            'build_head', 'build_loss', 'build_segmentor'
+        ],
+        'data_preprocessor': [
+            'SegDataPreProcessor', 'StereoPointmapDataPreProcessor',
+            'StereoCorrespondencesDataPreProcessor',
+            'BatchPhotoMetricDistortion', 'BatchRandomBackground'
+        ],
+        'decode_heads': '*',
+        'losses': '*',
+        'necks': '*',
+        'segmentors': '*',
+        'text_encoder': '*',
+    })
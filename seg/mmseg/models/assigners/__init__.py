@@ -4,14 +4,13 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base_assigner import BaseAssigner
-from .hungarian_assigner import HungarianAssigner
-from .match_cost import ClassificationCost, CrossEntropyLossCost, DiceCost
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BaseAssigner',
-    'HungarianAssigner',
-    'ClassificationCost',
-    'CrossEntropyLossCost',
-    'DiceCost',
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base_assigner': ['BaseAssigner'],
+        'hungarian_assigner': ['HungarianAssigner'],
+        'match_cost': [
+            'ClassificationCost', 'CrossEntropyLossCost', 'DiceCost'
+        ],
+    })
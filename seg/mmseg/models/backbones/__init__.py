@@ -4,37 +4,33 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .beit import BEiT
-from .bisenetv1 import BiSeNetV1
-from .bisenetv2 import BiSeNetV2
-from .cgnet import CGNet
-from .ddrnet import DDRNet
-from .erfnet import ERFNet
-from .fast_scnn import FastSCNN
-from .hrnet import HRNet
-from .icnet import ICNet
-from .mae import MAE
-from .mit import MixVisionTransformer
-from .mobilenet_v2 import MobileNetV2
-from .mobilenet_v3 import MobileNetV3
-from .mscan import MSCAN
-from .pidnet import PIDNet
-from .resnest import ResNeSt
-from .resnet import ResNet, ResNetV1c, ResNetV1d
-from .resnext import ResNeXt
-from .stdc import STDCContextPathNet, STDCNet
-from .swin import SwinTransformer
-from .timm_backbone import TIMMBackbone
-from .twins import PCPVT, SVT
-from .unet import UNet
-from .vit import VisionTransformer
-from .vpd import VPD
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'ResNet', 'ResNetV1c', 'ResNetV1d', 'ResNeXt', 'HRNet', 'FastSCNN',
-    'ResNeSt', 'MobileNetV2', 'UNet', 'CGNet', 'MobileNetV3',
-    'VisionTransformer', 'SwinTransformer', 'MixVisionTransformer',
-    'BiSeNetV1', 'BiSeNetV2', 'ICNet', 'TIMMBackbone', 'ERFNet', 'PCPVT',
-    'SVT', 'STDCNet', 'STDCContextPathNet', 'BEiT', 'MAE', 'PIDNet', 'MSCAN',
-    'DDRNet', 'VPD'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'beit': ['BEiT'],
+        'bisenetv1': ['BiSeNetV1'],
+        'bisenetv2': ['BiSeNetV2'],
+        'cgnet': ['CGNet'],
+        'ddrnet': ['DDRNet'],
+        'erfnet': ['ERFNet'],
+        'fast_scnn': ['FastSCNN'],
+        'hrnet': ['HRNet'],
+        'icnet': ['ICNet'],
+        'mae': ['MAE'],
+        'mit': ['MixVisionTransformer'],
+        'mobilenet_v2': ['MobileNetV2'],
+        'mobilenet_v3': ['MobileNetV3'],
+        'mscan': ['MSCAN'],
+        'pidnet': ['PIDNet'],
+        'resnest': ['ResNeSt'],
+        'resnet': ['ResNet', 'ResNetV1c', 'ResNetV1d'],
+        'resnext': ['ResNeXt'],
+        'stdc': ['STDCContextPathNet', 'STDCNet'],
+        'swin': ['SwinTransformer'],
+        'timm_backbone': ['TIMMBackbone'],
+        'twins': ['PCPVT', 'SVT'],
+        'unet': ['UNet'],
+        'vit': ['VisionTransformer'],
+        'vpd': ['VPD'],
+    })
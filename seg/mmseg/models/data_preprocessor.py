@@ -4,15 +4,82 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from numbers import Number
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import cv2
+import numpy as np
 import torch
-from mmengine.model import BaseDataPreprocessor
+import torch.nn as nn
+import torch.nn.functional as F
+from mmengine.model import BaseDataPreprocessor, bgr_to_hsv, hsv_to_bgr
+from mmengine.structures import PixelData
 
 from mmseg.registry import MODELS
-from mmseg.utils import stack_batch
+from mmseg.utils import SampleList, stack_batch
 from mmseg.utils import stack_batch_stereo_pointmap, stack_batch_stereo_correspondences
+from .utils.pointmap import unproject_depth
+
+
+def _unproject_pointmaps(data_samples: SampleList,
+                         anchor_samples: Optional[SampleList] = None) -> None:
+    """Unproject the depth packed by ``GeneratePointmapTarget`` with
+    ``unproject_on_device=True`` to the ``gt_depth_map`` pointmaps, in place.
+
+    The samples of the same size are unprojected in one batch. Does nothing
+    if the samples carry their pointmaps already.
+
+    Args:
+        data_samples (list[:obj:`SegDataSample`]): The data samples, with the
+            ``gt_depth`` and ``gt_mask`` fields and the ``K`` and
+            ``pointmap_background_val`` metainfo.
+        anchor_samples (list[:obj:`SegDataSample`], optional): The data
+            samples of the anchor views of a stereo batch. If given, the
+            pointmaps are transformed to the anchor cameras with the ``M``
+            metainfo, like ``StereoPointmapTransformSecondaryToAnchor``.
+            Defaults to None.
+    """
+    if not data_samples or 'gt_depth' not in data_samples[0] or \
+            'pointmap_background_val' not in data_samples[0]:
+        return
+
+    groups = defaultdict(list)
+    for i, data_sample in enumerate(data_samples):
+        groups[tuple(data_sample.gt_depth.shape)].append(i)
+
+    for indices in groups.values():
+        samples = [data_samples[i] for i in indices]
+        depth = torch.cat([sample.gt_depth.data for sample in samples])
+        mask = torch.cat([sample.gt_mask.data for sample in samples])
+        K = torch.from_numpy(np.stack([sample.K for sample in samples]))
+
+        pointmaps = unproject_depth(depth, K) ## B x 3 x H x W
+        if anchor_samples is not None:
+            M = np.stack([
+                anchor_samples[i].M @ np.linalg.inv(data_samples[i].M)
+                for i in indices
+            ])
+            M = torch.from_numpy(M).to(pointmaps)
+            pointmaps = torch.einsum('bij,bjhw->bihw', M[:, :3, :3],
+                                     pointmaps) + M[:, :3, 3, None, None]
+        pointmaps.masked_fill_(
+            ~mask.unsqueeze(1), samples[0].pointmap_background_val)
+
+        ## clamp the depth of the valid pixels like the stereo packing
+        if 'pointmap_depth_range' in samples[0]:
+            min_depth, max_depth = samples[0].pointmap_depth_range
+            pointmaps[:, 2] = torch.where(
+                mask, pointmaps[:, 2].clamp(min_depth, max_depth),
+                pointmaps[:, 2])
+
+        for sample, pointmap in zip(samples, pointmaps):
+            sample.gt_depth_map = PixelData(data=pointmap)
+            del sample.gt_depth
+            del sample.gt_mask
+
 
 @MODELS.register_module()
 class SegDataPreProcessor(BaseDataPreprocessor):
@@ -53,6 +120,12 @@ class SegDataPreProcessor(BaseDataPreprocessor):
         rgb_to_bgr (bool): whether to convert image from RGB to RGB.
             Defaults to False.
         batch_augments (list[dict], optional): Batch-level augmentations
+        photometric_augments (list[dict], optional): Photometric
+            augmentations applied to the BGR images in [0, 255] on the device
+            during training, before the channel conversion and
+            normalization, e.g. :class:`BatchPhotoMetricDistortion` and
+            :class:`BatchRandomBackground` in place of their transforms in
+            the train pipeline. Defaults to None.
         test_cfg (dict, optional): The padding size config in testing, if not
             specify, will use `size` and `size_divisor` params as default.
             Defaults to None, only supports keys `size` or `size_divisor`.
@@ -69,6 +142,7 @@ class SegDataPreProcessor(BaseDataPreprocessor):
         bgr_to_rgb: bool = False,
         rgb_to_bgr: bool = False,
         batch_augments: Optional[List[dict]] = None,
+        photometric_augments: Optional[List[dict]] = None,
         test_cfg: dict = None,
     ):
         super().__init__()
@@ -97,9 +171,32 @@ class SegDataPreProcessor(BaseDataPreprocessor):
         # TODO: support batch augmentations.
         self.batch_augments = batch_augments
 
+        if photometric_augments is not None:
+            self.photometric_augments = nn.ModuleList(
+                [MODELS.build(cfg) for cfg in photometric_augments])
+        else:
+            self.photometric_augments = None
+
         # Support different padding methods in testing
         self.test_cfg = test_cfg
 
+    def _photometric_augment(self, inputs: List[torch.Tensor],
+                             data_samples: SampleList) -> List[torch.Tensor]:
+        """Apply ``photometric_augments`` to the batch, or to every image if
+        their sizes differ."""
+        if all(_input.shape == inputs[0].shape for _input in inputs):
+            batches = [(torch.stack(inputs), data_samples)]
+        else:
+            batches = [(_input[None], [data_sample])
+                       for _input, data_sample in zip(inputs, data_samples)]
+        outputs = []
+        for batch_inputs, batch_data_samples in batches:
+            for augment in self.photometric_augments:
+                batch_inputs, batch_data_samples = augment(
+                    batch_inputs, batch_data_samples)
+            outputs.extend(batch_inputs.unbind(dim=0))
+        return outputs
+
     def forward(self, data: dict, training: bool = False) -> Dict[str, Any]:
         """Perform normalization、padding and bgr2rgb conversion based on
         ``BaseDataPreprocessor``.
@@ -114,6 +211,12 @@ class SegDataPreProcessor(BaseDataPreprocessor):
         data = self.cast_data(data)  # type: ignore
         inputs = data['inputs']
         data_samples = data.get('data_samples', None)
+        # before the unprojection, which drops the ``gt_mask`` that
+        # BatchRandomBackground needs
+        if training and self.photometric_augments is not None:
+            inputs = self._photometric_augment(inputs, data_samples)
+        if data_samples is not None:
+            _unproject_pointmaps(data_samples)
         # TODO: whether normalize should be after stack_batch
         if self.channel_conversion and inputs[0].size(0) == 3:
             inputs = [_input[[2, 1, 0], ...] for _input in inputs]
@@ -219,6 +322,9 @@ class StereoPointmapDataPreProcessor(BaseDataPreprocessor):
 
         data_samples1 = data.get('data_samples1', None)
         data_samples2 = data.get('data_samples2', None)
+        if data_samples1 is not None and data_samples2 is not None:
+            _unproject_pointmaps(data_samples1)
+            _unproject_pointmaps(data_samples2, data_samples1)
 
         # TODO: whether normalize should be after stack_batch
         if self.channel_conversion and inputs1[0].size(0) == 3:
@@ -395,3 +501,288 @@ class StereoCorrespondencesDataPreProcessor(BaseDataPreprocessor):
                 inputs2 = torch.stack(inputs2, dim=0)
 
         return dict(inputs1=inputs1, inputs2=inputs2, data_samples1=data_samples1, data_samples2=data_samples2)
+
+
+@MODELS.register_module()
+class BatchPhotoMetricDistortion(nn.Module):
+    """Apply the photometric distortion of :class:`PhotoMetricDistortion` to
+    a batch of images on the device, with random parameters per image.
+
+    Every distortion is applied with a probability of ``prob``: random
+    brightness, random contrast first or last, and random saturation and hue
+    in HSV space. The images are BGR in [0, 255] and are clipped after every
+    step, but not rounded to uint8. :class:`RandomBrightness` is the case of
+    ``contrast_range=(1, 1)``, ``saturation_range=(1, 1)`` and
+    ``hue_delta=0``.
+
+    Used in ``photometric_augments`` of :class:`SegDataPreProcessor`, in
+    place of the transform in the train pipeline.
+
+    Args:
+        brightness_delta (int): delta of brightness. Defaults to 32.
+        contrast_range (tuple): range of contrast. Defaults to (0.5, 1.5).
+        saturation_range (tuple): range of saturation.
+            Defaults to (0.5, 1.5).
+        hue_delta (int): delta of hue, in the [0, 180) hue range of OpenCV.
+            Defaults to 18.
+        prob (float): The probability of every distortion. Defaults to 0.5.
+    """
+
+    def __init__(self,
+                 brightness_delta: int = 32,
+                 contrast_range: Sequence[float] = (0.5, 1.5),
+                 saturation_range: Sequence[float] = (0.5, 1.5),
+                 hue_delta: int = 18,
+                 prob: float = 0.5):
+        super().__init__()
+        self.brightness_delta = brightness_delta
+        self.contrast_lower, self.contrast_upper = contrast_range
+        self.saturation_lower, self.saturation_upper = saturation_range
+        self.hue_delta = hue_delta
+        self.prob = prob
+
+    def forward(self, inputs: torch.Tensor,
+                data_samples: SampleList) -> Tuple[torch.Tensor, SampleList]:
+        """Distort the images.
+
+        Args:
+            inputs (Tensor): The BGR images in shape (B, 3, H, W).
+            data_samples (list[:obj:`SegDataSample`]): The data samples.
+
+        Returns:
+            tuple: The distorted images in float32 and the data samples.
+        """
+        B = inputs.size(0)
+        device = inputs.device
+        img = inputs.float()
+
+        def flags(prob=self.prob):
+            return torch.rand(B, device=device) < prob
+
+        def uniform(low, high):
+            return torch.empty(B, device=device).uniform_(low, high)
+
+        def where(flag, value, default):
+            return torch.where(flag, value,
+                               torch.full_like(value, default)).view(
+                                   B, 1, 1, 1)
+
+        # random brightness
+        if self.brightness_delta > 0:
+            beta = where(flags(),
+                         uniform(-self.brightness_delta,
+                                 self.brightness_delta), 0)
+            img = (img + beta).clamp(0, 255)
+
+        # random contrast, first or last
+        contrast_flag = flags()
+        contrast_first = flags(0.5)
+        alpha = uniform(self.contrast_lower, self.contrast_upper)
+        img = (img * where(contrast_flag & contrast_first, alpha, 1)).clamp(
+            0, 255)
+
+        # random saturation and hue
+        saturation_flag = flags() if (self.saturation_lower,
+                                      self.saturation_upper) != (1, 1) else \
+            torch.zeros(B, dtype=torch.bool, device=device)
+        hue_flag = flags() if self.hue_delta > 0 else \
+            torch.zeros(B, dtype=torch.bool, device=device)
+        hsv_flag = saturation_flag | hue_flag
+        if hsv_flag.any():
+            h, s, v = bgr_to_hsv(img)
+            saturation = where(
+                saturation_flag,
+                uniform(self.saturation_lower, self.saturation_upper), 1)
+            s = (s * saturation[:, 0]).clamp(0, 1)
+            if self.hue_delta > 0:
+                # the hue of OpenCV is in degrees / 2
+                hue = torch.randint(
+                    -self.hue_delta, self.hue_delta + 1, (B, ),
+                    device=device).float() / 30
+                h = (h + where(hue_flag, hue, 0)[:, 0]) % 6
+            img = torch.where(hsv_flag.view(B, 1, 1, 1), hsv_to_bgr(h, s, v),
+                              img)
+
+        img = (img * where(contrast_flag & ~contrast_first, alpha, 1)).clamp(
+            0, 255)
+        return img, data_samples
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += (f'(brightness_delta={self.brightness_delta}, '
+                     f'contrast_range=({self.contrast_lower}, '
+                     f'{self.contrast_upper}), '
+                     f'saturation_range=({self.saturation_lower}, '
+                     f'{self.saturation_upper}), '
+                     f'hue_delta={self.hue_delta}, '
+                     f'prob={self.prob})')
+        return repr_str
+
+
+@MODELS.register_module()
+class BatchRandomBackground(nn.Module):
+    """Replace the background of a batch of images on the device, like
+    :class:`RandomBackground`.
+
+    The background images are read from ``background_images_root`` into a
+    bank of ``num_backgrounds`` images on the device, which is redrawn every
+    ``refresh_interval`` batches. The next bank is read in a background
+    thread while the current one is in use, and swapped in once it is
+    ready, so that the training loop does not wait for the reads. The
+    foreground is given by ``gt_sem_seg`` or, for the pointmap samples,
+    ``gt_mask``; the samples without either are left as they are. The color
+    transfer of libcom is approximated by matching the per-channel mean and
+    standard deviation of the foreground to the ones of the background.
+
+    Args:
+        prob (float): Probability of replacing the background of an image.
+            Defaults to 0.25.
+        background_images_root (str): The directory of the background
+            images. Defaults to 'data/coco/no_humans'.
+        num_backgrounds (int): The number of background images on the
+            device. Defaults to 32.
+        refresh_interval (int): The number of batches between redrawing the
+            background images. Defaults to 100.
+        color_transfer (bool): Whether to match the colors of the foreground
+            to the background. Defaults to True.
+    """
+
+    def __init__(self,
+                 prob: float = 0.25,
+                 background_images_root: str = 'data/coco/no_humans',
+                 num_backgrounds: int = 32,
+                 refresh_interval: int = 100,
+                 color_transfer: bool = True):
+        super().__init__()
+        self.prob = prob
+        self.background_images_root = background_images_root
+        self.background_images = sorted([
+            image_name for image_name in os.listdir(background_images_root)
+            if image_name.endswith('.jpg')
+        ])
+        self.num_backgrounds = num_backgrounds
+        self.refresh_interval = refresh_interval
+        self.color_transfer = color_transfer
+        self._backgrounds = None
+        self._num_batches = 0
+        self._executor = None
+        self._pending = None
+
+    def __getstate__(self) -> dict:
+        # the reader thread is not copied with the model, e.g. for the ema
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_pending'] = None
+        return state
+
+    def _draw_backgrounds(self) -> np.ndarray:
+        return np.random.choice(
+            self.background_images,
+            min(self.num_backgrounds, len(self.background_images)),
+            replace=False)
+
+    def _read_backgrounds(self, names: Sequence[str],
+                          size: Tuple[int, int]) -> torch.Tensor:
+        """Read background images, resized to the height and center cropped
+        to the width of ``size``."""
+        height, width = size
+        backgrounds = []
+        for name in names:
+            background = cv2.imread(
+                os.path.join(self.background_images_root, name))
+            new_width = int(height * background.shape[1] /
+                            background.shape[0])
+            background = cv2.resize(background, (new_width, height))
+            if new_width > width:
+                start_x = (new_width - width) // 2
+                background = background[:, start_x:start_x + width]
+            if background.shape[:2] != (height, width):
+                background = cv2.resize(background, (width, height))
+            backgrounds.append(background)
+        backgrounds = torch.from_numpy(np.stack(backgrounds))
+        return backgrounds.permute(0, 3, 1, 2).contiguous()
+
+    def _prefetch_backgrounds(self, size: Tuple[int, int]) -> None:
+        """Start reading the next bank in the background thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        # drawn here, so that only the main thread uses the global rng
+        self._pending = self._executor.submit(self._read_backgrounds,
+                                              self._draw_backgrounds(), size)
+
+    @staticmethod
+    def _foreground(data_sample) -> Optional[torch.Tensor]:
+        if 'gt_sem_seg' in data_sample:
+            return data_sample.gt_sem_seg.data > 0
+        if 'gt_mask' in data_sample:
+            return data_sample.gt_mask.data > 0
+        return None
+
+    @staticmethod
+    def _moments(img: torch.Tensor, weight: torch.Tensor):
+        total = weight.sum(dim=(2, 3), keepdim=True).clamp(min=1)
+        mean = (img * weight).sum(dim=(2, 3), keepdim=True) / total
+        var = ((img - mean)**2 * weight).sum(dim=(2, 3), keepdim=True) / total
+        return mean, var.sqrt().clamp(min=1e-3)
+
+    def forward(self, inputs: torch.Tensor,
+                data_samples: SampleList) -> Tuple[torch.Tensor, SampleList]:
+        """Replace the backgrounds.
+
+        Args:
+            inputs (Tensor): The BGR images in shape (B, 3, H, W).
+            data_samples (list[:obj:`SegDataSample`]): The data samples.
+
+        Returns:
+            tuple: The images in float32 and the data samples.
+        """
+        img = inputs.float()
+        size = tuple(img.shape[2:])
+        if self._backgrounds is None:
+            self._backgrounds = self._read_backgrounds(
+                self._draw_backgrounds(), size).to(img.device)
+            self._num_batches = 0
+        elif self._pending is not None and self._pending.done() and \
+                self._num_batches >= self.refresh_interval:
+            self._backgrounds = self._pending.result().to(img.device)
+            self._pending = None
+            self._num_batches = 0
+        if self._pending is None:
+            self._prefetch_backgrounds(size)
+        self._num_batches += 1
+
+        indices = [
+            i for i, data_sample in enumerate(data_samples)
+            if self._foreground(data_sample) is not None
+            and np.random.rand() < self.prob
+        ]
+        if not indices:
+            return img, data_samples
+
+        mask = torch.stack([
+            self._foreground(data_samples[i]) for i in indices
+        ]).to(img)
+        choice = torch.randint(
+            len(self._backgrounds), (len(indices), ), device=img.device)
+        background = self._backgrounds[choice].float()
+        if tuple(background.shape[2:]) != size:
+            background = F.interpolate(
+                background, size=size, mode='bilinear', align_corners=False)
+
+        foreground = img[indices]
+        if self.color_transfer:
+            fg_mean, fg_std = self._moments(foreground, mask)
+            bg_mean, bg_std = self._moments(background, 1 - mask)
+            foreground = ((foreground - fg_mean) / fg_std * bg_std +
+                          bg_mean).clamp(0, 255)
+        img[indices] = mask * foreground + (1 - mask) * background
+        return img, data_samples
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += (f'(prob={self.prob}, '
+                     f'background_images_root={self.background_images_root}, '
+                     f'num_backgrounds={self.num_backgrounds}, '
+                     f'refresh_interval={self.refresh_interval}, '
+                     f'color_transfer={self.color_transfer})')
+        return repr_str
@@ -4,62 +4,55 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .ann_head import ANNHead
-from .apc_head import APCHead
-from .aspp_head import ASPPHead
-from .cc_head import CCHead
-from .da_head import DAHead
-from .ddr_head import DDRHead
-from .dm_head import DMHead
-from .dnl_head import DNLHead
-from .dpt_head import DPTHead
-from .ema_head import EMAHead
-from .enc_head import EncHead
-from .fcn_head import FCNHead
-from .fpn_head import FPNHead
-from .gc_head import GCHead
-from .ham_head import LightHamHead
-from .isa_head import ISAHead
-from .knet_head import IterativeDecodeHead, KernelUpdateHead, KernelUpdator
-from .lraspp_head import LRASPPHead
-from .mask2former_head import Mask2FormerHead
-from .maskformer_head import MaskFormerHead
-from .nl_head import NLHead
-from .ocr_head import OCRHead
-from .pid_head import PIDHead
-from .point_head import PointHead
-from .psa_head import PSAHead
-from .psp_head import PSPHead
-from .san_head import SideAdapterCLIPHead
-from .segformer_head import SegformerHead
-from .segmenter_mask_head import SegmenterMaskTransformerHead
-from .sep_aspp_head import DepthwiseSeparableASPPHead
-from .sep_fcn_head import DepthwiseSeparableFCNHead
-from .setr_mla_head import SETRMLAHead
-from .setr_up_head import SETRUPHead
-from .stdc_head import STDCHead
-from .uper_head import UPerHead
-from .vpd_depth_head import VPDDepthHead
-from .vit_head import VitHead
-from .vit_depth_head import VitDepthHead
-from .vit_metric_depth_head import VitMetricDepthHead
-from .vit_normal_head import VitNormalHead
-from .vit_hdri_head import VitHDRIHead
-from .vit_pointmap_head import VitPointmapHead
-from .vit_stereo_pointmap_head import VitStereoPointmapHead
-from .vit_stereo_correspondences_head import VitStereoCorrespondencesHead
-from .vit_normal_head2 import VitNormalHead2
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'FCNHead', 'PSPHead', 'ASPPHead', 'PSAHead', 'NLHead', 'GCHead', 'CCHead',
-    'UPerHead', 'DepthwiseSeparableASPPHead', 'ANNHead', 'DAHead', 'OCRHead',
-    'EncHead', 'DepthwiseSeparableFCNHead', 'FPNHead', 'EMAHead', 'DNLHead',
-    'PointHead', 'APCHead', 'DMHead', 'LRASPPHead', 'SETRUPHead',
-    'SETRMLAHead', 'DPTHead', 'SETRMLAHead', 'SegmenterMaskTransformerHead',
-    'SegformerHead', 'ISAHead', 'STDCHead', 'IterativeDecodeHead',
-    'KernelUpdateHead', 'KernelUpdator', 'MaskFormerHead', 'Mask2FormerHead',
-    'LightHamHead', 'PIDHead', 'DDRHead', 'VPDDepthHead', 'SideAdapterCLIPHead',
-    'VitHead', 'VitDepthHead', 'VitNormalHead', 'VitHDRIHead', 'VitPointmapHead',
-    'VitStereoPointmapHead', 'VitMetricDepthHead', 'VitStereoCorrespondencesHead',
-    'VitNormalHead2'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'ann_head': ['ANNHead'],
+        'apc_head': ['APCHead'],
+        'aspp_head': ['ASPPHead'],
+        'cc_head': ['CCHead'],
+        'da_head': ['DAHead'],
+        'ddr_head': ['DDRHead'],
+        'dm_head': ['DMHead'],
+        'dnl_head': ['DNLHead'],
+        'dpt_head': ['DPTHead'],
+        'ema_head': ['EMAHead'],
+        'enc_head': ['EncHead'],
+        'fcn_head': ['FCNHead'],
+        'fpn_head': ['FPNHead'],
+        'gc_head': ['GCHead'],
+        'ham_head': ['LightHamHead'],
+        'isa_head': ['ISAHead'],
+        'knet_head': [
+            'IterativeDecodeHead', 'KernelUpdateHead', 'KernelUpdator'
+        ],
+        'lraspp_head': ['LRASPPHead'],
+        'mask2former_head': ['Mask2FormerHead'],
+        'maskformer_head': ['MaskFormerHead'],
+        'nl_head': ['NLHead'],
+        'ocr_head': ['OCRHead'],
+        'pid_head': ['PIDHead'],
+        'point_head': ['PointHead'],
+        'psa_head': ['PSAHead'],
+        'psp_head': ['PSPHead'],
+        'san_head': ['SideAdapterCLIPHead'],
+        'segformer_head': ['SegformerHead'],
+        'segmenter_mask_head': ['SegmenterMaskTransformerHead'],
+        'sep_aspp_head': ['DepthwiseSeparableASPPHead'],
+        'sep_fcn_head': ['DepthwiseSeparableFCNHead'],
+        'setr_mla_head': ['SETRMLAHead'],
+        'setr_up_head': ['SETRUPHead'],
+        'stdc_head': ['STDCHead'],
+        'uper_head': ['UPerHead'],
+        'vpd_depth_head': ['VPDDepthHead'],
+        'vit_head': ['VitHead'],
+        'vit_depth_head': ['VitDepthHead'],
+        'vit_metric_depth_head': ['VitMetricDepthHead'],
+        'vit_normal_head': ['VitNormalHead'],
+        'vit_hdri_head': ['VitHDRIHead'],
+        'vit_pointmap_head': ['VitPointmapHead'],
+        'vit_stereo_pointmap_head': ['VitStereoPointmapHead'],
+        'vit_stereo_correspondences_head': ['VitStereoCorrespondencesHead'],
+        'vit_normal_head2': ['VitNormalHead2'],
+    })
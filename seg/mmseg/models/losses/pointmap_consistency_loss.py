@@ -11,6 +11,7 @@ import torch.nn as nn
 from torch import Tensor
 
 from mmseg.registry import MODELS
+from ..utils.pointmap import pixel_grid
 from .utils import weight_reduce_loss
 import cv2
 import numpy as np
@@ -55,8 +56,9 @@ class PointmapConsistencyLoss(nn.Module):
         # Get dimensions
         B, H, W = target_Z.shape
         device = target_Z.device
-        cols = torch.arange(W, device=device).repeat(B, H, 1)  # B x H x W
-        rows = torch.arange(H, device=device).repeat(B, W, 1).transpose(1, 2)  # B x H x W
+        grid = pixel_grid(H, W, device)  # shared with the data preprocessor
+        cols = grid[0]  # H x W, broadcast over the batch
+        rows = grid[1]  # H x W
 
         # Compute x and y from z and K
         x = (cols - gt_K[:, 0, 2].view(B, 1, 1)) * pred_Z / gt_K[:, 0, 0].view(B, 1, 1)
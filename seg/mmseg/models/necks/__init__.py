@@ -4,13 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .featurepyramid import Feature2Pyramid
-from .fpn import FPN
-from .ic_neck import ICNeck
-from .jpu import JPU
-from .mla_neck import MLANeck
-from .multilevel_neck import MultiLevelNeck
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'FPN', 'MultiLevelNeck', 'MLANeck', 'ICNeck', 'JPU', 'Feature2Pyramid'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'featurepyramid': ['Feature2Pyramid'],
+        'fpn': ['FPN'],
+        'ic_neck': ['ICNeck'],
+        'jpu': ['JPU'],
+        'mla_neck': ['MLANeck'],
+        'multilevel_neck': ['MultiLevelNeck'],
+    })
@@ -4,19 +4,18 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base import BaseSegmentor
-from .cascade_encoder_decoder import CascadeEncoderDecoder
-from .depth_estimator import DepthEstimator
-from .encoder_decoder import EncoderDecoder
-from .multimodal_encoder_decoder import MultimodalEncoderDecoder
-from .seg_tta import SegTTAModel
-from .hdri_estimator import HDRIEstimator
-from .pointmap_estimator import PointmapEstimator
-from .stereo_pointmap_estimator import StereoPointmapEstimator
-from .stereo_correspondences_estimator import StereoCorrespondencesEstimator
+from mmengine.utils import lazy_import
 
-__all__ = [
-    'BaseSegmentor', 'EncoderDecoder', 'CascadeEncoderDecoder', 'SegTTAModel',
-    'MultimodalEncoderDecoder', 'DepthEstimator', 'HDRIEstimator', 'PointmapEstimator',
-    'StereoPointmapEstimator', 'StereoCorrespondencesEstimator'
-]
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__, {
+        'base': ['BaseSegmentor'],
+        'cascade_encoder_decoder': ['CascadeEncoderDecoder'],
+        'depth_estimator': ['DepthEstimator'],
+        'encoder_decoder': ['EncoderDecoder'],
+        'multimodal_encoder_decoder': ['MultimodalEncoderDecoder'],
+        'seg_tta': ['SegTTAModel'],
+        'hdri_estimator': ['HDRIEstimator'],
+        'pointmap_estimator': ['PointmapEstimator'],
+        'stereo_pointmap_estimator': ['StereoPointmapEstimator'],
+        'stereo_correspondences_estimator': ['StereoCorrespondencesEstimator'],
+    })
@@ -10,6 +10,7 @@ from .encoding import Encoding
 from .inverted_residual import InvertedResidual, InvertedResidualV3
 from .make_divisible import make_divisible
 from .point_sample import get_uncertain_point_coords_with_randomness
+from .pointmap import pixel_grid, unproject_depth
 from .ppm import DAPPM, PAPPM
 from .res_layer import ResLayer
 from .se_layer import SELayer
@@ -28,5 +29,6 @@ __all__ = [
     'nchw_to_nlc', 'nlc_to_nchw', 'nchw2nlc2nchw', 'nlc2nchw2nlc', 'Encoding',
     'Upsample', 'resize', 'DAPPM', 'PAPPM', 'BasicBlock', 'Bottleneck',
     'cross_attn_layer', 'LayerNorm2d', 'MLP',
-    'get_uncertain_point_coords_with_randomness'
+    'get_uncertain_point_coords_with_randomness', 'pixel_grid',
+    'unproject_depth'
 ]
@@ -0,0 +1,76 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Dict, Optional, Tuple
+
+import torch
+from torch import Tensor
+
+_pixel_grids: Dict[Tuple, Tensor] = dict()
+
+
+def pixel_grid(height: int,
+               width: int,
+               device: torch.device,
+               dtype: torch.dtype = torch.float32) -> Tensor:
+    """The pixel coordinates of an image.
+
+    The grid is built once per size, device and dtype and shared by all the
+    callers, i.e. the data preprocessors that unproject the depth maps and
+    :class:`PointmapConsistencyLoss`. It must not be modified in place.
+
+    Args:
+        height (int): The image height.
+        width (int): The image width.
+        device (torch.device): The device of the grid.
+        dtype (torch.dtype): The dtype of the grid. Defaults to float32.
+
+    Returns:
+        Tensor: The column and row of every pixel, in shape (2, H, W).
+    """
+    key = (height, width, torch.device(device), dtype)
+    grid = _pixel_grids.get(key)
+    if grid is None:
+        rows, cols = torch.meshgrid(
+            torch.arange(height, device=device, dtype=dtype),
+            torch.arange(width, device=device, dtype=dtype),
+            indexing='ij')
+        grid = torch.stack([cols, rows], dim=0)
+        _pixel_grids[key] = grid
+    return grid
+
+
+def unproject_depth(depth: Tensor,
+                    K: Tensor,
+                    mask: Optional[Tensor] = None,
+                    background_val: float = -1000) -> Tensor:
+    """Unproject a batch of depth maps to pointmaps in the camera frame.
+
+    The batched equivalent of :class:`GeneratePointmapTarget`, computed in
+    float32.
+
+    Args:
+        depth (Tensor): The depth maps, in shape (B, H, W).
+        K (Tensor): The intrinsics, in shape (B, 3, 3).
+        mask (Tensor, optional): The foreground masks, in shape (B, H, W).
+            The points of the pixels where it is 0 are set to
+            ``background_val``. Defaults to None.
+        background_val (float): The value of the background points.
+            Defaults to -1000.
+
+    Returns:
+        Tensor: The pointmaps, in shape (B, 3, H, W).
+    """
+    B, H, W = depth.shape
+    z = depth.float()
+    K = K.to(device=z.device, dtype=z.dtype)
+    grid = pixel_grid(H, W, z.device, z.dtype)
+    x = (grid[0] - K[:, 0, 2].view(B, 1, 1)) * z / K[:, 0, 0].view(B, 1, 1)
+    y = (grid[1] - K[:, 1, 2].view(B, 1, 1)) * z / K[:, 1, 1].view(B, 1, 1)
+    pointmap = torch.stack([x, y, z], dim=1)
+    if mask is not None:
+        pointmap.masked_fill_((mask == 0).unsqueeze(1), background_val)
+    return pointmap
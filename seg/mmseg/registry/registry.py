@@ -51,7 +51,10 @@ HOOKS = Registry(
 # manage data-related modules
 DATASETS = Registry(
     'dataset', parent=MMENGINE_DATASETS, locations=['mmseg.datasets'])
-DATA_SAMPLERS = Registry('data sampler', parent=MMENGINE_DATA_SAMPLERS)
+DATA_SAMPLERS = Registry(
+    'data sampler',
+    parent=MMENGINE_DATA_SAMPLERS,
+    locations=['mmseg.datasets.samplers'])
 TRANSFORMS = Registry(
     'transform',
     parent=MMENGINE_TRANSFORMS,
@@ -8,6 +8,7 @@ import datetime
 import warnings
 
 from mmengine import DefaultScope
+from mmengine.utils import import_lazy_module
 
 
 def register_all_modules(init_default_scope: bool = True) -> None:
@@ -21,11 +22,11 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             to https://github.com/open-mmlab/mmengine/blob/main/docs/en/tutorials/registry.md
             Defaults to True.
     """  # noqa
-    import mmseg.datasets  # noqa: F401,F403
-    import mmseg.engine  # noqa: F401,F403
-    import mmseg.evaluation  # noqa: F401,F403
-    import mmseg.models  # noqa: F401,F403
-    import mmseg.structures  # noqa: F401,F403
+    # the packages import their modules lazily, see `lazy_import`
+    for package in (
+            'mmseg.datasets', 'mmseg.engine', 'mmseg.evaluation',
+            'mmseg.models', 'mmseg.structures'):
+        import_lazy_module(package)
 
     if init_default_scope:
         never_created = DefaultScope.get_current_instance() is None \
@@ -0,0 +1,197 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Compare :class:`RandomGeometricWarp` with the chain of geometric
+transforms that it replaces in the depth, normal and pointmap pipelines.
+
+Both run on the same synthetic samples with the same random seeds, so that
+they sample the same augmentations. Reports the cpu time per sample and the
+differences of the outputs, and fails if the outputs do not match up to the
+interpolation at the borders of the crop.
+
+Example:
+    python tools/analysis_tools/benchmark_geometric_warp.py --task depth
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+from mmengine.registry import init_default_scope
+
+from mmseg.registry import TRANSFORMS
+
+SCALE = (768, 1024)
+CROP_SIZE = (1024, 768)
+
+CHAINS = {
+    'depth': [
+        dict(type='RandomResize', scale=SCALE, ratio_range=(0.2, 2.0),
+             keep_ratio=True),
+        dict(type='RandomDepthResizeCompensate'),
+        dict(type='RandomDepthCrop', crop_size=CROP_SIZE),
+        dict(type='DepthResize', scale=SCALE),
+        dict(type='DepthRandomRotate', prob=0.5, degree=60,
+             depth_pad_val=1e10),
+        dict(type='DepthRandomFlip', prob=0.5),
+    ],
+    'normal': [
+        dict(type='RandomResize', scale=SCALE, ratio_range=(0.2, 2.0),
+             keep_ratio=True),
+        dict(type='RandomNormalResizeCompensate'),
+        dict(type='RandomNormalCrop', crop_size=CROP_SIZE),
+        dict(type='NormalResize', scale=SCALE),
+        dict(type='NormalRandomFlip', prob=0.5),
+    ],
+    'pointmap': [
+        dict(type='RandomResize', scale=SCALE, ratio_range=(0.2, 2.0),
+             keep_ratio=True),
+        dict(type='RandomPointmapResizeCompensate'),
+        dict(type='RandomPointmapCrop', crop_size=CROP_SIZE),
+        dict(type='PointmapResize', scale=SCALE),
+        dict(type='PointmapRandomFlip', prob=0.5),
+    ],
+}
+
+FUSED = {
+    'depth': dict(rotate_prob=0.5, degree=60, flip_prob=0.5),
+    'normal': dict(flip_prob=0.5),
+    'pointmap': dict(flip_prob=0.5),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the fused geometric augmentation')
+    parser.add_argument(
+        '--task', default='depth', choices=list(CHAINS), help='pipeline')
+    parser.add_argument('--num-samples', type=int, default=100)
+    parser.add_argument(
+        '--img-size',
+        type=int,
+        nargs=2,
+        default=(1500, 1100),
+        help='synthetic sample size (h, w)')
+    parser.add_argument(
+        '--max-mismatch',
+        type=float,
+        default=0.02,
+        help='largest fraction of differing annotation pixels in a sample')
+    parser.add_argument(
+        '--max-img-diff',
+        type=float,
+        default=3.0,
+        help='largest mean absolute difference of the image of a sample')
+    parser.add_argument(
+        '--max-K-diff',
+        type=float,
+        default=1.0,
+        help='largest difference of the intrinsics in pixels')
+    return parser.parse_args()
+
+
+def synthetic_sample(img_size, rng):
+    h, w = img_size
+    small = rng.integers(0, 255, (h // 25, w // 25, 3), dtype=np.uint8)
+    img = cv2.resize(small, (w, h), interpolation=cv2.INTER_CUBIC)
+    yy, xx = np.mgrid[:h, :w]
+    mask = ((yy / h - 0.5)**2 + (xx / w - 0.5)**2 < 0.16).astype(
+        np.uint8) * 255
+    depth = (2 + 1e-3 * xx + 5e-4 * yy).astype(np.float32)
+    normal = np.zeros((h, w, 3), dtype=np.float32)
+    normal[..., 0], normal[..., 2] = 0.6, 0.8
+    K = np.array([[1000., 0, (w - 1) / 2], [0, 1000., (h - 1) / 2],
+                  [0, 0, 1]])
+    return dict(
+        img=img,
+        mask=mask,
+        gt_depth=depth,
+        gt_normal=normal,
+        K=K,
+        M=np.eye(4),
+        ori_shape=(h, w),
+        img_shape=(h, w))
+
+
+def run(transforms, sample, seed):
+    results = {k: v.copy() if hasattr(v, 'copy') else v
+               for k, v in sample.items()}
+    np.random.seed(seed)
+    start = time.perf_counter()
+    for transform in transforms:
+        results = transform(results)
+    # the chain returns views, which are copied when packing the inputs
+    for key in ('img', 'mask', 'gt_depth', 'gt_normal'):
+        results[key] = np.ascontiguousarray(results[key])
+    return results, time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    init_default_scope('mmseg')
+    chain = [TRANSFORMS.build(cfg) for cfg in CHAINS[args.task]]
+    fused = [
+        TRANSFORMS.build(
+            dict(
+                type='RandomGeometricWarp',
+                scale=SCALE,
+                ratio_range=(0.2, 2.0),
+                crop_size=CROP_SIZE,
+                **FUSED[args.task]))
+    ]
+    keys = dict(
+        depth=('mask', 'gt_depth'),
+        normal=('mask', 'gt_normal'),
+        pointmap=('mask', 'gt_depth'))[args.task]
+
+    rng = np.random.default_rng(0)
+    sample = synthetic_sample(args.img_size, rng)
+    times = dict(chain=[], fused=[])
+    img_diffs, mismatches, K_diffs = [], {key: [] for key in keys}, []
+    for seed in range(args.num_samples):
+        chain_results, chain_time = run(chain, sample, seed)
+        fused_results, fused_time = run(fused, sample, seed)
+        times['chain'].append(chain_time)
+        times['fused'].append(fused_time)
+
+        img_diffs.append(
+            np.abs(chain_results['img'].astype(np.float32) -
+                   fused_results['img']).mean())
+        for key in keys:
+            diff = np.abs(chain_results[key].astype(np.float32) -
+                          fused_results[key])
+            mismatches[key].append((diff > 1e-2).mean())
+        if args.task == 'pointmap':
+            K_diffs.append(
+                np.abs(chain_results['K'] - fused_results['K']).max())
+
+    chain_ms = np.mean(times['chain']) * 1e3
+    fused_ms = np.mean(times['fused']) * 1e3
+    print(f'{args.task}: chain {chain_ms:.1f} ms, fused {fused_ms:.1f} ms '
+          f'per sample, {chain_ms / fused_ms:.2f}x')
+    print(f'img: mean absolute difference {np.mean(img_diffs):.2f}')
+    for key in keys:
+        print(f'{key}: {np.mean(mismatches[key]) * 100:.2f}% of the pixels '
+              'differ')
+    if K_diffs:
+        # the chain scales the principal point from the pixel corner
+        print(f'K: max difference {np.max(K_diffs):.2f} pixels')
+
+    # every sample, so that a different flip or rotation is not averaged out
+    assert np.max(img_diffs) <= args.max_img_diff, \
+        f'img differs by {np.max(img_diffs):.2f} on average in a sample'
+    for key in keys:
+        assert np.max(mismatches[key]) <= args.max_mismatch, \
+            f'{np.max(mismatches[key]) * 100:.2f}% of the {key} pixels ' \
+            'differ in a sample'
+    if K_diffs:
+        assert np.max(K_diffs) <= args.max_K_diff, \
+            f'K differs by {np.max(K_diffs):.2f} pixels'
+
+
+if __name__ == '__main__':
+    main()
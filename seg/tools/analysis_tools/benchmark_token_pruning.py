@@ -0,0 +1,106 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Compare the dense backbone with token pruning on a small eval subset.
+
+Reports the metrics of both runs, the estimated backbone MACs and the test
+time.
+
+Example:
+    python tools/analysis_tools/benchmark_token_pruning.py \
+        configs/sapiens_seg/goliath/sapiens_1b_goliath-1024x768.py \
+        work_dirs/sapiens_1b/iter_100000.pth \
+        --num-samples 200 --prune-layers 8 16 --keep-ratio 0.7
+"""
+
+import argparse
+import copy
+import os.path as osp
+import time
+
+import torch
+from mmengine import Config
+from mmengine.runner import Runner
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark token pruning of the ViT backbone')
+    parser.add_argument('config', help='test config file path')
+    parser.add_argument('checkpoint', help='checkpoint file')
+    parser.add_argument(
+        '--num-samples',
+        type=int,
+        default=200,
+        help='number of samples of the test set to evaluate')
+    parser.add_argument(
+        '--prune-layers',
+        type=int,
+        nargs='+',
+        required=True,
+        help='indices of the layers before which tokens are pruned')
+    parser.add_argument('--keep-ratio', type=float, default=0.7)
+    parser.add_argument(
+        '--saliency', choices=['attn', 'fg'], default='attn')
+    parser.add_argument('--mode', choices=['drop', 'merge'], default='drop')
+    parser.add_argument(
+        '--work-dir',
+        default='./work_dirs/benchmark_token_pruning',
+        help='the directory to save the logs')
+    return parser.parse_args()
+
+
+def run_test(cfg, name):
+    cfg = copy.deepcopy(cfg)
+    cfg.work_dir = osp.join(cfg.work_dir, name)
+    runner = Runner.from_cfg(cfg)
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    metrics = runner.test()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+
+    backbone = runner.model.backbone
+    num_patches = backbone.patch_resolution[0] * backbone.patch_resolution[1]
+    flops = backbone.estimate_layer_flops(
+        backbone.get_token_counts(num_patches))
+    return metrics, flops, elapsed
+
+
+def main():
+    args = parse_args()
+    cfg = Config.fromfile(args.config)
+    cfg.work_dir = args.work_dir
+    cfg.load_from = args.checkpoint
+    cfg.launcher = 'none'
+    cfg.test_dataloader.dataset.indices = args.num_samples
+
+    dense_metrics, dense_flops, dense_time = run_test(cfg, 'dense')
+
+    cfg.model.backbone.token_pruning = dict(
+        prune_layers=args.prune_layers,
+        keep_ratio=args.keep_ratio,
+        saliency=args.saliency,
+        mode=args.mode)
+    pruned_metrics, pruned_flops, pruned_time = run_test(cfg, 'pruned')
+
+    print(f'{"metric":>20} {"dense":>10} {"pruned":>10} {"delta":>10}')
+    for key, value in dense_metrics.items():
+        pruned = pruned_metrics[key]
+        print(f'{key:>20} {value:>10.4f} {pruned:>10.4f} '
+              f'{pruned - value:>+10.4f}')
+    print(f'backbone GMACs per image: {dense_flops / 1e9:.1f} -> '
+          f'{pruned_flops / 1e9:.1f} '
+          f'({1 - pruned_flops / dense_flops:.1%} saved)')
+    print(f'test time: {dense_time:.1f}s -> {pruned_time:.1f}s '
+          f'({dense_time / pruned_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Plan selective activation checkpointing for a memory budget.
+
+Measures the activations saved by every transformer layer and by the
+deconv / conv blocks of the head for one training batch, then picks the
+cheapest set of them to checkpoint (or offload to the host with
+``--offload``) so that the predicted peak memory fits the budget. The plan
+is printed as an ``activation_checkpointing`` config entry, which the Runner
+applies before training.
+
+``--mode estimate`` (default) builds the model on the meta device: nothing
+is computed and no GPU is needed, the activations follow from the shapes
+and the recompute cost from the counted FLOPs. ``--mode profile`` runs the
+batch on the GPU, times every module and verifies the plan with a real
+forward and backward pass.
+
+Works for the seg, depth, normal and pose configs.
+
+Example:
+    python tools/analysis_tools/plan_activation_checkpointing.py \
+        configs/sapiens_depth/render_people/sapiens_2b_render_people-1024x768.py \
+        --batch-size 2 --budget 75 --amp --out work_dirs/checkpointing.py
+"""
+
+import argparse
+import time
+from contextlib import nullcontext
+
+import torch
+from mmengine import Config
+from mmengine.registry import MODELS, init_default_scope
+from mmengine.runner.activation_checkpointing import (
+    find_checkpoint_candidates, plan_activation_checkpointing,
+    profile_activation_memory, summarize_plan,
+    turn_on_activation_checkpointing)
+
+GB = 2**30
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Plan activation checkpointing for a memory budget')
+    parser.add_argument('config', help='train config file path')
+    parser.add_argument(
+        '--budget', type=float, required=True, help='memory budget in GB')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=None,
+        help='batch size per GPU, defaults to the train dataloader')
+    parser.add_argument(
+        '--shape',
+        type=int,
+        nargs=2,
+        default=[1024, 768],
+        help='input image size (height, width)')
+    parser.add_argument(
+        '--mode', choices=['estimate', 'profile'], default='estimate')
+    parser.add_argument(
+        '--amp', action='store_true', help='bf16 activations as with AMP')
+    parser.add_argument(
+        '--offload',
+        action='store_true',
+        help='allow offloading activations to pinned host memory')
+    parser.add_argument(
+        '--optimizer-states',
+        type=int,
+        default=2,
+        help='fp32 optimizer states per parameter, 2 for AdamW')
+    parser.add_argument(
+        '--reserve',
+        type=float,
+        default=2.0,
+        help='GB reserved for the allocator, workspaces and the loss')
+    parser.add_argument(
+        '--tflops',
+        type=float,
+        default=100.0,
+        help='TFLOP/s that turn counted FLOPs into time in estimate mode')
+    parser.add_argument(
+        '--bandwidth',
+        type=float,
+        default=12.0,
+        help='host transfer bandwidth in GB/s')
+    parser.add_argument('--out', default=None, help='write the plan here')
+    return parser.parse_args()
+
+
+def train_step(model, inputs, amp):
+    """Run one forward and backward pass, return the peak memory and time."""
+    torch.cuda.synchronize()
+    torch.cuda.reset_peak_memory_stats()
+    start = time.perf_counter()
+    with torch.autocast('cuda', dtype=torch.bfloat16, enabled=amp):
+        outputs = model(inputs, mode='tensor')
+    if isinstance(outputs, torch.Tensor):
+        outputs = [outputs]
+    sum(output.float().mean() for output in outputs).backward()
+    torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+    model.zero_grad(set_to_none=True)
+    return torch.cuda.max_memory_allocated(), elapsed
+
+
+def format_plan(plan):
+    lines = ['activation_checkpointing = dict(']
+    for action in ('checkpoint', 'offload'):
+        lines.append(f'    {action}=[')
+        lines.extend(f"        '{name}'," for name in plan[action])
+        lines.append('    ],')
+    lines.append(')')
+    return '\n'.join(lines)
+
+
+def main():
+    args = parse_args()
+
+    cfg = Config.fromfile(args.config)
+    init_default_scope(cfg.get('default_scope', 'mmseg'))
+    cfg.model.pretrained = None
+    batch_size = args.batch_size or cfg.train_dataloader.batch_size
+    dtype = torch.bfloat16 if args.amp else torch.float32
+
+    if args.mode == 'estimate':
+        with torch.device('meta'):
+            model = MODELS.build(cfg.model)
+        device = torch.device('meta')
+        # without autocast on the meta device, cast the whole model instead
+        model.to(device=device, dtype=dtype)
+        input_dtype = dtype
+    else:
+        assert torch.cuda.is_available(), '--mode profile needs a GPU'
+        model = MODELS.build(cfg.model).cuda()
+        device = torch.device('cuda')
+        input_dtype = torch.float32
+    model.train()
+
+    inputs = torch.randn(
+        batch_size, 3, *args.shape, device=device, dtype=input_dtype)
+    candidates = find_checkpoint_candidates(model)
+    autocast = nullcontext()
+    if args.amp and device.type == 'cuda':
+        autocast = torch.autocast('cuda', dtype=torch.bfloat16)
+    with autocast:
+        profile = profile_activation_memory(
+            model, inputs, candidates, forward_kwargs=dict(mode='tensor'))
+
+    num_params = sum(p.numel() for p in model.parameters() if p.requires_grad)
+    # fp32 weights and gradients plus the optimizer states
+    fixed_bytes = num_params * 4 * (2 + args.optimizer_states)
+    fixed_bytes += int(args.reserve * GB)
+    plan = plan_activation_checkpointing(
+        profile,
+        int(args.budget * GB),
+        fixed_bytes=fixed_bytes,
+        allow_offload=args.offload,
+        device_flops=args.tflops * 1e12,
+        offload_bandwidth=args.bandwidth * 1e9)
+
+    actions = summarize_plan(profile, plan)
+    cost = 'GFLOPs' if args.mode == 'estimate' else 'ms'
+    print(f'{"module":<32} {"saved MB":>10} {"input MB":>10} '
+          f'{cost:>10} {"action":>11}')
+    for name, stat in profile['modules'].items():
+        value = stat['flops'] / 1e9 if args.mode == 'estimate' else \
+            stat['time'] * 1000
+        print(f'{name:<32} {stat["saved"] / 2**20:>10.1f} '
+              f'{stat["inputs"] / 2**20:>10.1f} {value:>10.1f} '
+              f'{actions[name]:>11}')
+    print(f'other activations: {profile["other"] / GB:.2f}GB, '
+          f'weights, gradients and optimizer states: '
+          f'{num_params * 4 * (2 + args.optimizer_states) / GB:.2f}GB')
+    print(f'predicted peak: {plan["peak"] / GB:.2f}GB of {args.budget:.2f}GB, '
+          f'recompute/offload overhead {plan["overhead"] * 1000:.1f}ms '
+          'per forward')
+    if not plan['fits']:
+        print('The budget cannot be met by checkpointing alone; reduce the '
+              'batch size' + ('' if args.offload else ' or try --offload'))
+
+    if args.mode == 'profile':
+        dense_peak, dense_time = train_step(model, inputs, args.amp)
+        turn_on_activation_checkpointing(model, plan)
+        plan_peak, plan_time = train_step(model, inputs, args.amp)
+        print(f'measured peak: {dense_peak / GB:.2f}GB -> '
+              f'{plan_peak / GB:.2f}GB, step time: {dense_time * 1000:.0f}ms '
+              f'-> {plan_time * 1000:.0f}ms (without the optimizer)')
+
+    text = format_plan(plan)
+    print(text)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Weight-only int8 / int4 quantization of a Sapiens model for lite.
+
+Quantizes the linear layers of the ViT transformer layers with group-wise
+scales; the patch embedding and the heads stay in bf16. With
+``--smooth-alpha`` the weights are smoothed with activation maxima calibrated
+on a folder of images (SmoothQuant), and the scales are folded into the layer
+norms. With ``--num-eval`` the bf16 and the quantized model are evaluated on
+the first images of the test set. The result is exported with
+``torch.export`` and loads in ``lite/demo/*`` like the bf16 checkpoints.
+
+Works for the seg, depth, normal and pose configs. ``--device cpu``
+calibrates, evaluates and exports without a GPU; the artifact then runs with
+the lite cpu backend.
+
+Example:
+    python tools/deployment/quantization.py \
+        configs/sapiens_depth/render_people/sapiens_0.3b_render_people-1024x768.py \
+        $CHECKPOINT --calib-dir $IMAGES --bits 4 --smooth-alpha 0.5 \
+        --num-eval 200 --output-dir $OUTPUT
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import cv2
+import torch
+from mmengine import Config
+from mmengine.runner import Runner
+from mmpretrain.models.utils import (collect_act_amax, quantize_linear_layers,
+                                     vit_norm_inputs)
+
+
+def load_calib_batches(calib_dir, shape, mean, std, num_images, batch_size):
+    """Preprocess images the same way as ``lite/demo/adhoc_image_dataset.py``."""
+    paths = sorted(
+        os.path.join(calib_dir, name)
+        for name in os.listdir(calib_dir)
+        if name.lower().endswith((".jpg", ".jpeg", ".png"))
+    )[:num_images]
+    assert paths, f"no images found in {calib_dir}"
+
+    mean = torch.tensor(mean).view(-1, 1, 1)
+    std = torch.tensor(std).view(-1, 1, 1)
+    imgs = []
+    for path in paths:
+        img = cv2.imread(path)
+        img = cv2.resize(img, (shape[1], shape[0]), interpolation=cv2.INTER_LINEAR)
+        img = torch.from_numpy(img.transpose(2, 0, 1))[[2, 1, 0], ...].float()
+        imgs.append((img - mean) / std)
+    return [
+        torch.stack(imgs[i : i + batch_size])
+        for i in range(0, len(imgs), batch_size)
+    ]
+
+
+def evaluate(runner, dtype, device):
+    with torch.autocast(device_type=torch.device(device).type, dtype=dtype):
+        return runner.test()
+
+
+def export_model(model, shape, dtype, device, max_batch_size, output_file):
+    imgs = torch.randn(2, 3, *shape, dtype=dtype, device=device)
+    dynamic_batch = torch.export.Dim("batch", min=1, max=max_batch_size)
+    with torch.no_grad():
+        exported_model = torch.export.export(
+            model.to(dtype),
+            args=(imgs,),
+            dynamic_shapes={"inputs": {0: dynamic_batch}},
+        )
+    torch.export.save(exported_model, output_file)
+    print(output_file)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Weight-only quantization of a Sapiens model for lite"
+    )
+    parser.add_argument("config", help="test config file path")
+    parser.add_argument("checkpoint", help="checkpoint file")
+    parser.add_argument(
+        "--output_dir", "--output-dir", type=str, help="output directory"
+    )
+    parser.add_argument("--bits", type=int, choices=[8, 4], default=8)
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=128,
+        help="Input channels sharing a weight scale, 0 for per-channel scales",
+    )
+    parser.add_argument(
+        "--smooth-alpha",
+        type=float,
+        default=None,
+        help="SmoothQuant migration strength. Disabled by default",
+    )
+    parser.add_argument(
+        "--calib-dir", default=None, help="Calibration images for --smooth-alpha"
+    )
+    parser.add_argument("--num-calib", type=int, default=64)
+    parser.add_argument(
+        "--num-eval",
+        type=int,
+        default=0,
+        help="Evaluate the bf16 and quantized models on this many test samples",
+    )
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[1024, 768],
+        help="input image size (height, width)",
+    )
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=32,
+        help="Maximum batch size for dynamic compile",
+    )
+    parser.add_argument(
+        "--device",
+        default="cuda" if torch.cuda.is_available() else "cpu",
+        help="Device to calibrate, evaluate and export on",
+    )
+    parser.add_argument(
+        "--fp16", action="store_true", help="To enable fp16. Default is bf16"
+    )
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if len(args.shape) == 1:
+        shape = (args.shape[0], args.shape[0])
+    elif len(args.shape) == 2:
+        shape = tuple(args.shape)
+    else:
+        raise ValueError("invalid input shape")
+    if args.smooth_alpha is not None:
+        assert args.calib_dir, "--smooth-alpha requires --calib-dir"
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    checkpoint_basename = Path(args.checkpoint).stem
+    dtype = torch.bfloat16 if not args.fp16 else torch.half
+
+    cfg = Config.fromfile(args.config)
+    cfg.work_dir = os.path.join(args.output_dir, "work_dir")
+    cfg.load_from = args.checkpoint
+    cfg.launcher = "none"
+    cfg.model.pretrained = None
+    if args.num_eval > 0:
+        cfg.test_dataloader.dataset.indices = args.num_eval
+
+    runner = Runner.from_cfg(cfg)
+    runner.load_or_resume()
+    model = runner.model.to(args.device).eval()
+
+    if args.num_eval > 0:
+        ref_metrics = evaluate(runner, dtype, args.device)
+
+    ## keep the patch embedding and the heads in high precision
+    linear_names = [
+        name
+        for name, module in model.backbone.layers.named_modules(prefix="backbone.layers")
+        if isinstance(module, torch.nn.Linear)
+    ]
+    act_amax = None
+    if args.smooth_alpha is not None:
+        preprocessor = cfg.model.data_preprocessor
+        batches = load_calib_batches(
+            args.calib_dir,
+            shape,
+            preprocessor.mean,
+            preprocessor.std,
+            args.num_calib,
+            args.batch_size,
+        )
+        print(f"Calibrating on {sum(len(batch) for batch in batches)} images")
+        with torch.autocast(device_type=torch.device(args.device).type, dtype=dtype):
+            act_amax = collect_act_amax(
+                model, linear_names, (batch.to(args.device) for batch in batches)
+            )
+
+    quantize_linear_layers(
+        model,
+        linear_names,
+        bits=args.bits,
+        group_size=args.group_size or None,
+        act_amax=act_amax,
+        alpha=args.smooth_alpha or 0.5,
+        norm_inputs=vit_norm_inputs(model.backbone, prefix="backbone."),
+    )
+    print(f"Quantized {len(linear_names)} linear layers to int{args.bits}")
+
+    if args.num_eval > 0:
+        quant_metrics = evaluate(runner, dtype, args.device)
+        print(f'{"metric":>20} {"bf16":>10} {f"int{args.bits}":>10} {"delta":>10}')
+        for key, value in ref_metrics.items():
+            quant = quant_metrics[key]
+            print(f"{key:>20} {value:>10.4f} {quant:>10.4f} {quant - value:>+10.4f}")
+
+    suffix = f"int{args.bits}" + (f"_g{args.group_size}" if args.group_size else "")
+    save_path = os.path.join(
+        args.output_dir,
+        f"{checkpoint_basename}_{suffix}_"
+        f"{'float16' if dtype==torch.float16 else 'bfloat16'}.pt2",
+    )
+    export_model(model, shape, dtype, args.device, args.max_batch_size, save_path)
+
+
+if __name__ == "__main__":
+    main()